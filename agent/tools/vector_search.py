@@ -11,6 +11,9 @@ from uuid import UUID
 import asyncpg
 from openai import AsyncOpenAI
 
+from intelligence_capture.embedding_batcher import AsyncEmbeddingBatcher, get_async_embedding_batcher
+from intelligence_capture.single_flight import get_async_single_flight, request_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,6 +54,7 @@ class VectorSearchTool:
         db_pool: asyncpg.Pool,
         openai_client: AsyncOpenAI,
         embedding_model: str = "text-embedding-3-small",
+        embedding_batcher: Optional[AsyncEmbeddingBatcher] = None,
     ):
         """
         Initialize vector search tool
@@ -59,10 +63,14 @@ class VectorSearchTool:
             db_pool: AsyncPG connection pool
             openai_client: OpenAI async client for embeddings
             embedding_model: Model name for embeddings
+            embedding_batcher: Optional micro-batcher for query embeddings
+                (default: the shared batcher of openai_client)
         """
         self.db_pool = db_pool
         self.openai_client = openai_client
         self.embedding_model = embedding_model
+        # Concurrent queries (parallel agent tool calls, API requests) share one batched request
+        self.embedding_batcher = embedding_batcher or get_async_embedding_batcher(openai_client, embedding_model)
 
     async def search(
         self,
@@ -90,11 +98,13 @@ class VectorSearchTool:
         logger.info(f"Vector search: org={org_id}, query='{query[:50]}...', top_k={top_k}")
 
         try:
-            embedding_response = await self.openai_client.embeddings.create(
-                model=self.embedding_model,
-                input=query,
+            # Identical queries in flight (e.g. the agent's vector and hybrid search tools) share one request
+            query_embedding, shared = await get_async_single_flight("query_embeddings").do(
+                request_key(self.embedding_model, query),
+                lambda: self.embedding_batcher.embed(query),
             )
-            query_embedding = embedding_response.data[0].embedding
+            if shared:
+                logger.debug("Query embedding shared with an identical in-flight request")
 
         except Exception as exc:
             logger.error(f"Failed to generate query embedding: {exc}")
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Candidate Index for Duplicate Detection
+
+Keeps a per-entity-type index of normalized entity names so that
+DuplicateDetector does not re-normalize and re-score every existing entity
+for every new entity.
+
+Blocking strategy:
+- Normalized names are stored once per entity (no regex work per query);
+  entities that carry a precomputed normalized name and character profile
+  (the normalized_name and name_profile columns) are not normalized at all
+- Count filter: two names share at most sum(min(count1, count2)) characters
+  in any alignment, so 2 * shared / (len1 + len2) bounds both
+  fuzz.token_sort_ratio and SequenceMatcher.ratio. The bound of every
+  indexed entity is computed in one vectorized pass over the per-entity
+  character counts (numpy); entities below the cutoff are never scored
+- Top-k: survivors are scored in descending bound order and scoring stops
+  once the bound falls below the current k-th best score, so only the
+  entities that could still enter the result are scored
+- Names are stored token-sorted, so survivors are scored with plain
+  fuzz.ratio in batched calls (rapidfuzz.process.extract), which is what
+  fuzz.token_sort_ratio computes after sorting both sides
+
+The bounds are exact: results are identical to a full linear scan for any
+cutoff > 0. Token/character n-gram LSH blocking was evaluated but is lossy at
+the 0.49-0.63 fuzzy cutoffs used in stage 1 (the q-gram count lemma gives no
+positive threshold there), so it is not used here. get_statistics() reports
+the share of entities pruned without scoring.
+"""
+import threading
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from intelligence_capture.logger import get_logger
+from intelligence_capture.name_normalizer import PROFILE_BUCKETS, PROFILE_SIZE, name_profile
+
+# Initialize logger
+logger = get_logger(__name__)
+
+# Optional: Use rapidfuzz for batched scoring (fallback to difflib)
+try:
+    from rapidfuzz import fuzz, process
+    HAVE_RAPIDFUZZ = True
+except ImportError:
+    HAVE_RAPIDFUZZ = False
+
+# Optional: Use numpy for the count filter (fallback to a length bound)
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+# Slack on bound comparisons (float rounding of scores at the cutoff)
+_SLACK = 1e-6
+
+
+class _TypeIndex:
+    """Index state for a single entity type"""
+
+    __slots__ = (
+        "source", "size", "revision", "texts", "normalized", "keys", "lengths", "profiles",
+        "matrix", "matrix_lengths", "matrix_rows", "lock"
+    )
+
+    def __init__(self, source: List[Dict]):
+        self.source = source
+        self.lock = threading.RLock()         # Held while syncing, querying or updating
+        self.size = 0
+        self.revision = None                  # Caller's revision of source at the last check
+        self.texts: List[str] = []            # Entity text by position in source
+        self.normalized: List[str] = []       # Normalized name by position in source
+        self.keys: List[str] = []             # Scoring key by position ("" never matches)
+        self.lengths: List[int] = []          # Scoring key length by position
+        self.profiles: List[bytes] = []       # Character-count profile by position
+        self.matrix = None                    # numpy profiles, rows >= matrix_rows unused
+        self.matrix_lengths = None            # numpy lengths, parallel to matrix
+        self.matrix_rows = 0                  # Positions copied into matrix
+
+
+class CandidateIndex:
+    """
+    Per-entity-type blocking index over normalized entity names
+
+    The index follows the list of existing entities handed to
+    DuplicateDetector.find_duplicates:
+    - Same list object, grown in place: only the new tail is indexed
+    - Different list object (or shrunk): the type is rebuilt
+    - Entities replaced or edited in place: callers pass a revision
+      (EntityWorkingSetCache.revision) that changes with every such edit,
+      and the next sync re-indexes the entities whose text changed; without
+      a revision only update() picks them up
+
+    The per-entity normalized names and character profiles are persisted
+    next to the entity rows (normalized_name/name_profile columns), so a
+    rebuild only copies them into memory.
+
+    Thread-safe: each entity type has its own lock, so parallel consolidation
+    workers (one per type) do not wait for each other.
+    """
+
+    # Survivors scored per rapidfuzz call before the top-k bound is re-checked
+    SCORE_CHUNK = 256
+
+    def __init__(
+        self,
+        text_getter: Callable[[Dict, str], str],
+        normalizer: Callable[[str, str], str],
+        stored_key: Optional[str] = None,
+        stored_profile_key: Optional[str] = None
+    ):
+        """
+        Initialize candidate index
+
+        Args:
+            text_getter: Function (entity, entity_type) -> comparison text
+            normalizer: Function (text, entity_type) -> normalized name
+            stored_key: Optional entity key holding a precomputed normalized name
+            stored_profile_key: Optional entity key holding the precomputed
+                name_profile of that normalized name
+        """
+        self.text_getter = text_getter
+        self.normalizer = normalizer
+        self.stored_key = stored_key
+        self.stored_profile_key = stored_profile_key
+        self._indexes: Dict[str, _TypeIndex] = {}
+        self._lock = threading.RLock()  # Guards _indexes and statistics
+
+        # Statistics
+        self.rebuilds = 0
+        self.reindexed = 0
+        self.queries = 0
+        self.candidates_considered = 0  # Entities a linear scan would score
+        self.candidates_scored = 0
+
+    def sync(self, entity_type: str, existing_entities: List[Dict], revision: Optional[Any] = None) -> _TypeIndex:
+        """
+        Bring the index for an entity type in line with existing_entities
+
+        Args:
+            entity_type: Type of entity
+            existing_entities: Current list of existing entities
+            revision: Optional stamp that changes whenever entities of the
+                list are modified in place; without it only appended
+                entities are indexed
+
+        Returns:
+            Index state for the entity type
+        """
+        with self._lock:
+            index = self._indexes.get(entity_type)
+
+            if (
+                index is None
+                or index.source is not existing_entities
+                or len(existing_entities) < index.size
+            ):
+                index = _TypeIndex(existing_entities)
+                self._indexes[entity_type] = index
+                self.rebuilds += 1
+
+        with index.lock:
+            indexed = index.size
+            if indexed and revision is not None and revision != index.revision:
+                self._reindex_changed(index, entity_type, existing_entities, indexed)
+            index.revision = revision
+
+            for position in range(index.size, len(existing_entities)):
+                entity = existing_entities[position]
+                text = self.text_getter(entity, entity_type) or ""
+                normalized, profile = self._normalize_entity(entity, text, entity_type)
+                index.texts.append(text)
+                index.normalized.append(normalized)
+                index.keys.append("")
+                index.lengths.append(0)
+                index.profiles.append(b"")
+                self._set_key(index, position, profile)
+            index.size = len(existing_entities)
+
+        return index
+
+    def update(self, entity_type: str, position: int, entity: Dict):
+        """
+        Re-index a single entity after it was replaced or modified in place
+
+        The name is always re-normalized (a stored normalized name may be
+        stale after an in-memory merge).
+
+        Args:
+            entity_type: Type of entity
+            position: Position of the entity in the indexed list
+            entity: Updated entity
+        """
+        with self._lock:
+            index = self._indexes.get(entity_type)
+        if index is None:
+            return
+
+        with index.lock:
+            if position >= index.size:
+                return
+            self._reindex(index, entity_type, position, self.text_getter(entity, entity_type) or "")
+
+    def invalidate(self, entity_type: Optional[str] = None):
+        """
+        Drop the index for one entity type (or all types)
+
+        Args:
+            entity_type: Type of entity, or None to drop everything
+        """
+        with self._lock:
+            if entity_type is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(entity_type, None)
+
+    def query(
+        self,
+        entity_type: str,
+        existing_entities: List[Dict],
+        entity_text: str,
+        cutoff: float,
+        limit: int,
+        revision: Optional[Any] = None
+    ) -> List[Tuple[Dict, str, float]]:
+        """
+        Find the top fuzzy candidates for an entity text
+
+        Equivalent to scoring every existing entity with
+        DuplicateDetector.calculate_name_similarity, keeping those with
+        score >= cutoff, and stable-sorting by score (highest first).
+
+        Args:
+            entity_type: Type of entity
+            existing_entities: Current list of existing entities
+            entity_text: Text of the new entity
+            cutoff: Minimum fuzzy score (0.0-1.0), must be > 0
+            limit: Maximum number of candidates to return
+            revision: Optional revision of existing_entities (see sync)
+
+        Returns:
+            List of (existing_entity, existing_text, fuzzy_score) tuples
+        """
+        index = self.sync(entity_type, existing_entities, revision)
+        with self._lock:
+            self.queries += 1
+
+        query_name = self.normalizer(entity_text, entity_type)
+        if not query_name or limit <= 0:
+            return []
+        query_key = self._scoring_key(query_name)
+
+        with index.lock:
+            return self._query_index(index, existing_entities, query_key, cutoff, limit)
+
+    def _query_index(
+        self,
+        index: _TypeIndex,
+        existing_entities: List[Dict],
+        query_key: str,
+        cutoff: float,
+        limit: int
+    ) -> List[Tuple[Dict, str, float]]:
+        """Score the entities whose bound reaches the cutoff (caller holds index.lock)"""
+        bounds, candidates, considered = self._bounds(index, query_key, cutoff)
+
+        best: List[Tuple[int, float]] = []  # (position, similarity), best first
+        threshold = cutoff
+        scored = 0
+        for chunk in self._by_bound(bounds, candidates):
+            if HAVE_NUMPY:
+                chunk = chunk[bounds[chunk] >= threshold - _SLACK].tolist()
+            else:
+                chunk = [position for position in chunk if bounds[position] >= threshold - _SLACK]
+            if not chunk:
+                break  # Bounds only decrease from here on
+
+            scored += len(chunk)
+            best.extend(self._score(query_key, index, chunk, threshold))
+            # Same ordering as a stable sort of a linear scan
+            best.sort(key=lambda item: (-item[1], item[0]))
+            del best[limit:]
+            if len(best) == limit:
+                threshold = max(cutoff, best[-1][1])
+
+        with self._lock:
+            self.candidates_considered += considered
+            self.candidates_scored += scored
+
+        return [
+            (existing_entities[position], index.texts[position], similarity)
+            for position, similarity in best
+        ]
+
+    def _bounds(self, index: _TypeIndex, query_key: str, cutoff: float) -> Tuple[Any, Any, int]:
+        """
+        Bound the similarity of every indexed entity to the query
+
+        Args:
+            index: Synced index state (caller holds index.lock)
+            query_key: Scoring key of the query
+            cutoff: Minimum fuzzy score (0.0-1.0)
+
+        Returns:
+            (bounds by position, positions with bound >= cutoff, number of
+            non-empty indexed entities)
+        """
+        query_length = len(query_key)
+
+        if HAVE_NUMPY:
+            profiles, lengths = self._profile_matrix(index)
+            query_profile = np.frombuffer(name_profile(query_key), dtype="<u2")
+            shared = np.minimum(profiles, query_profile).sum(axis=1, dtype=np.int64)
+            bounds = 2.0 * shared / (lengths + query_length)
+            candidates = np.flatnonzero(bounds >= cutoff - _SLACK)
+            return bounds, candidates, int(np.count_nonzero(lengths))
+
+        # Without numpy: length bound only (shared <= min(len1, len2))
+        bounds = [
+            2.0 * min(length, query_length) / (length + query_length)
+            for length in index.lengths
+        ]
+        candidates = [position for position, bound in enumerate(bounds) if bound >= cutoff - _SLACK]
+        return bounds, candidates, sum(1 for length in index.lengths if length)
+
+    def _by_bound(self, bounds: Any, candidates: Any) -> Iterator[Any]:
+        """
+        Yield candidate positions in chunks of descending bound
+
+        With numpy, only the next block of highest bounds is selected
+        (argpartition) and sorted, so a query that stops early never sorts
+        all candidates; blocks double in size.
+
+        Args:
+            bounds: Bounds by position (from _bounds)
+            candidates: Positions to order
+
+        Yields:
+            Chunks of at most SCORE_CHUNK positions
+        """
+        if not HAVE_NUMPY:
+            ordered = sorted(candidates, key=lambda position: -bounds[position])
+            for start in range(0, len(ordered), self.SCORE_CHUNK):
+                yield ordered[start:start + self.SCORE_CHUNK]
+            return
+
+        remaining = candidates
+        block = self.SCORE_CHUNK
+        while len(remaining):
+            if block < len(remaining):
+                split = np.argpartition(-bounds[remaining], block - 1)
+                head, remaining = remaining[split[:block]], remaining[split[block:]]
+            else:
+                head, remaining = remaining, remaining[:0]
+            head = head[np.argsort(-bounds[head], kind="stable")]
+            for start in range(0, len(head), self.SCORE_CHUNK):
+                yield head[start:start + self.SCORE_CHUNK]
+            block *= 2
+
+    @staticmethod
+    def _score(query_key: str, index: _TypeIndex, positions: List[int], threshold: float) -> List[Tuple[int, float]]:
+        """Score positions against the query, keeping similarity >= threshold"""
+        scored = []
+        if HAVE_RAPIDFUZZ:
+            # Small slack on the cutoff; the exact comparison happens below
+            matches = process.extract(
+                query_key,
+                [index.keys[position] for position in positions],
+                scorer=fuzz.ratio,
+                processor=None,
+                score_cutoff=max(0.0, threshold * 100.0 - _SLACK),
+                limit=None
+            )
+            for _, score, offset in matches:
+                similarity = score / 100.0
+                if similarity >= threshold:
+                    scored.append((positions[offset], similarity))
+        else:
+            for position in positions:
+                similarity = SequenceMatcher(None, query_key, index.keys[position]).ratio()
+                if similarity >= threshold:
+                    scored.append((position, similarity))
+        return scored
+
+    def get_statistics(self) -> Dict:
+        """
+        Get index statistics
+
+        Returns:
+            Dict with index size, scoring counts and the pruning ratio
+            (share of indexed entities never scored)
+        """
+        with self._lock:
+            considered = self.candidates_considered
+            return {
+                "indexed_types": len(self._indexes),
+                "indexed_entities": sum(index.size for index in self._indexes.values()),
+                "rebuilds": self.rebuilds,
+                "reindexed": self.reindexed,
+                "queries": self.queries,
+                "candidates_considered": considered,
+                "candidates_scored": self.candidates_scored,
+                "pruning_ratio": 1.0 - self.candidates_scored / considered if considered else 0.0
+            }
+
+    def _reindex_changed(self, index: _TypeIndex, entity_type: str, existing_entities: List[Dict], indexed: int):
+        """Re-index entities whose text changed since they were indexed (caller holds index.lock)"""
+        for position in range(indexed):
+            text = self.text_getter(existing_entities[position], entity_type) or ""
+            if text != index.texts[position]:
+                self._reindex(index, entity_type, position, text)
+
+    def _reindex(self, index: _TypeIndex, entity_type: str, position: int, text: str):
+        """Replace the indexed text of one position, re-normalized (caller holds index.lock)"""
+        index.texts[position] = text
+        index.normalized[position] = self._normalize(text, entity_type)
+        self._set_key(index, position)
+        with self._lock:
+            self.reindexed += 1
+
+    def _normalize_entity(self, entity: Dict, text: str, entity_type: str) -> Tuple[str, Optional[bytes]]:
+        """Use the entity's stored normalized name (and profile) if present, else normalize"""
+        if self.stored_key and text:
+            stored = entity.get(self.stored_key)
+            if stored is not None:
+                profile = entity.get(self.stored_profile_key) if self.stored_profile_key else None
+                if not isinstance(profile, bytes) or len(profile) != PROFILE_SIZE:
+                    profile = None
+                return stored, profile
+        return self._normalize(text, entity_type), None
+
+    def _normalize(self, text: str, entity_type: str) -> str:
+        """Normalize entity text (empty text stays empty)"""
+        if not text:
+            return ""
+        return self.normalizer(text, entity_type)
+
+    def _set_key(self, index: _TypeIndex, position: int, profile: Optional[bytes] = None):
+        """Derive scoring key, length and profile of a position from its normalized name"""
+        name = index.normalized[position]
+        # Empty names score 0.0 and can never pass a positive cutoff
+        key = self._scoring_key(name) if name else ""
+        if profile is None:
+            profile = name_profile(key)
+        index.keys[position] = key
+        index.lengths[position] = len(key)
+        index.profiles[position] = profile
+
+        if position < index.matrix_rows:
+            index.matrix[position] = np.frombuffer(profile, dtype="<u2")
+            index.matrix_lengths[position] = len(key)
+
+    @staticmethod
+    def _scoring_key(name: str) -> str:
+        """Token-sorted name for rapidfuzz (difflib compares names as-is)"""
+        if HAVE_RAPIDFUZZ:
+            return " ".join(sorted(name.split()))
+        return name
+
+    @staticmethod
+    def _profile_matrix(index: _TypeIndex) -> Tuple[Any, Any]:
+        """
+        Get the profiles and lengths of all positions as numpy arrays
+
+        New positions are copied in on demand; the arrays grow by doubling,
+        so appending entities between queries stays amortized O(1).
+
+        Args:
+            index: Index state (caller holds index.lock)
+
+        Returns:
+            (size x PROFILE_BUCKETS uint16 counts, size lengths)
+        """
+        rows, size = index.matrix_rows, index.size
+        if rows < size:
+            if index.matrix is None or len(index.matrix) < size:
+                capacity = max(size, 2 * rows, 1024)
+                matrix = np.zeros((capacity, PROFILE_BUCKETS), dtype="<u2")
+                lengths = np.zeros(capacity, dtype=np.int64)
+                if rows:
+                    matrix[:rows] = index.matrix[:rows]
+                    lengths[:rows] = index.matrix_lengths[:rows]
+                index.matrix, index.matrix_lengths = matrix, lengths
+
+            profiles = b"".join(index.profiles[rows:size])
+            index.matrix[rows:size] = np.frombuffer(profiles, dtype="<u2").reshape(size - rows, PROFILE_BUCKETS)
+            index.matrix_lengths[rows:size] = index.lengths[rows:size]
+            index.matrix_rows = size
+
+        return index.matrix[:size], index.matrix_lengths[:size]
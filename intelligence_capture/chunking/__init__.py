@@ -6,14 +6,19 @@ Módulo de chunking que maneja:
 - Ventanas deslizantes (300-500 tokens, 50 tokens de superposición)
 - Preservación de estructura Markdown
 - Características específicas del español (stopwords, stemming)
+- Modo "fast" por reglas (sin modelo spaCy) para texto plano y WhatsApp
 """
 
-from .spanish_chunker import SpanishChunker
+from .spanish_chunker import SpanishChunker, get_chunker, chunker_mode_for
+from .fast_tokenizer import SpanishSentenceSplitter
 from .spanish_text_utils import SpanishTextUtils
 from .chunk_metadata import ChunkMetadata
 
 __all__ = [
     'SpanishChunker',
+    'get_chunker',
+    'chunker_mode_for',
+    'SpanishSentenceSplitter',
     'SpanishTextUtils',
     'ChunkMetadata'
 ]
@@ -0,0 +1,210 @@
+"""
+Tokenizador y separador de oraciones basados en reglas para español
+
+Alternativa liviana a spaCy para el modo "fast" de SpanishChunker (texto
+plano, exportaciones de WhatsApp): no carga modelos, arranca al instante
+y solo produce lo que el chunking lee de un Doc de spaCy:
+- Tokens con texto, offset de carácter (idx), índice (i) y fin de oración
+- Segmentación compatible con el tokenizador de spaCy en los casos comunes
+  (palabras, números con separadores, signos de puntuación sueltos)
+- Fines de oración por reglas: . ! ? … seguidos de mayúscula, ¿, ¡, dígito
+  o salto de línea; abreviaturas frecuentes no cortan; un párrafo nuevo o
+  una línea nueva que empieza un mensaje/ítem también corta
+"""
+
+import re
+from typing import Iterable, Iterator, List, Tuple
+
+# Palabras (con apóstrofe o guion interno), números con separadores,
+# puntos suspensivos y cualquier otro signo suelto
+TOKEN_PATTERN = re.compile(r"\d+(?:[.,:/]\d+)*|\w+(?:['’-]\w+)*|\.{3}|\S")
+
+# Signos que pueden cerrar una oración
+SENTENCE_TERMINATORS = frozenset({'.', '!', '?', '…', '...'})
+
+# Caracteres que pueden abrir una oración o línea nueva
+SENTENCE_OPENERS = frozenset('¿¡"\'“«([-•*')
+
+# Cierres que pueden seguir al fin de oración ('dijo "listo." Luego...')
+SENTENCE_CLOSERS = frozenset('"\'”»)]')
+
+# Abreviaturas frecuentes (sin punto) tras las cuales "." no cierra oración
+ABBREVIATIONS = frozenset({
+    'sr', 'sra', 'srta', 'dr', 'dra', 'lic', 'ing', 'arq', 'prof', 'gral',
+    'ud', 'uds', 'vd', 'pág', 'págs', 'pag', 'núm', 'num', 'nro', 'art',
+    'aprox', 'ej', 'av', 'avda', 'tel', 'cel', 'dpto', 'depto', 'cía', 'cia',
+    'vs', 'hrs', 'hs'
+})
+
+
+class FastToken:
+    """Token con los atributos de spaCy que usa el chunking"""
+
+    __slots__ = ('text', 'idx', 'i', 'is_sent_end')
+
+    def __init__(self, text: str, idx: int, i: int):
+        self.text = text
+        self.idx = idx
+        self.i = i
+        self.is_sent_end = False
+
+    def __repr__(self) -> str:
+        return self.text
+
+
+class FastDoc(list):
+    """Lista de FastTokens (indexable y rebanable como un Doc de spaCy)"""
+
+    def __init__(self, text: str, tokens: Iterable[FastToken] = ()):
+        super().__init__(tokens)
+        self.text = text
+
+
+def count_tokens(text: str) -> int:
+    """
+    Contar tokens como los cuenta el chunking (compatible con spaCy)
+
+    Args:
+        text: Texto a contar
+
+    Returns:
+        Número de tokens
+    """
+    return sum(1 for _ in TOKEN_PATTERN.finditer(text))
+
+
+class SpanishSentenceSplitter:
+    """
+    Tokenizador + separador de oraciones basado en reglas
+
+    Se usa como el `nlp` de SpanishChunker en modo "fast": __call__ y pipe
+    tienen la misma forma que en spaCy.
+
+    Example:
+        >>> splitter = SpanishSentenceSplitter()
+        >>> splitter.split("El Sr. Pérez llegó. ¿Funciona el POS?")
+        ['El Sr. Pérez llegó.', '¿Funciona el POS?']
+    """
+
+    pipe_names = ['fast_tokenizer', 'rule_sentencizer']
+
+    def __call__(self, text: str) -> FastDoc:
+        """
+        Tokenizar texto y marcar fines de oración
+
+        Args:
+            text: Texto a procesar
+
+        Returns:
+            FastDoc con los tokens del texto
+        """
+        doc = FastDoc(text, (
+            FastToken(match.group(), match.start(), i)
+            for i, match in enumerate(TOKEN_PATTERN.finditer(text))
+        ))
+        self._mark_sentence_ends(text, doc)
+        return doc
+
+    def pipe(
+        self,
+        texts: Iterable,
+        as_tuples: bool = False,
+        batch_size: int = 1,
+        n_process: int = 1
+    ) -> Iterator:
+        """
+        Procesar muchos textos (interfaz de nlp.pipe)
+
+        batch_size y n_process se aceptan por compatibilidad; las reglas son
+        lo bastante baratas para procesar texto a texto en este proceso.
+
+        Args:
+            texts: Textos, o pares (texto, contexto) si as_tuples
+
+        Yields:
+            FastDoc, o (FastDoc, contexto) si as_tuples
+        """
+        if as_tuples:
+            for text, context in texts:
+                yield self(text), context
+        else:
+            for text in texts:
+                yield self(text)
+
+    def split(self, text: str) -> List[str]:
+        """
+        Dividir texto en oraciones
+
+        Args:
+            text: Texto a dividir
+
+        Returns:
+            Oraciones (texto original de cada una, sin espacios extremos)
+        """
+        return [text[start:end] for start, end in self.sentence_spans(text)]
+
+    def sentence_spans(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Offsets (inicio, fin) de cada oración en el texto
+
+        Args:
+            text: Texto a dividir
+
+        Returns:
+            Lista de (inicio, fin) de caracteres
+        """
+        spans = []
+        start = None
+        for token in self(text):
+            if start is None:
+                start = token.idx
+            if token.is_sent_end:
+                spans.append((start, token.idx + len(token.text)))
+                start = None
+        return spans
+
+    def _mark_sentence_ends(self, text: str, tokens: List[FastToken]):
+        """
+        Marcar is_sent_end en los tokens
+
+        Args:
+            text: Texto original (para ver espacios y saltos entre tokens)
+            tokens: Tokens del texto, en orden
+        """
+        if not tokens:
+            return
+
+        for position in range(len(tokens) - 1):
+            token = tokens[position]
+            following = tokens[position + 1]
+            gap = text[token.idx + len(token.text):following.idx]
+            first_char = following.text[0]
+            starts_sentence = first_char.isupper() or first_char.isdigit() or first_char in SENTENCE_OPENERS
+
+            if token.text in SENTENCE_TERMINATORS or (
+                token.text in SENTENCE_CLOSERS and position > 0
+                and tokens[position - 1].text in SENTENCE_TERMINATORS
+                and tokens[position - 1].idx + len(tokens[position - 1].text) == token.idx
+            ):
+                if token.text == '.' and '\n' not in gap and self._is_abbreviation(tokens, position):
+                    continue
+                # "2.5" y "S.A." no tienen espacio tras el punto
+                if '\n' in gap or (gap and starts_sentence):
+                    token.is_sent_end = True
+            elif gap.count('\n') >= 2 or ('\n' in gap and starts_sentence):
+                # Párrafo nuevo, o línea nueva que empieza mensaje/ítem/oración
+                token.is_sent_end = True
+
+        tokens[-1].is_sent_end = True
+
+    @staticmethod
+    def _is_abbreviation(tokens: List[FastToken], position: int) -> bool:
+        """True si el "." en position cierra una abreviatura o inicial"""
+        if position == 0:
+            return False
+        previous = tokens[position - 1]
+        # Contiguo a la palabra anterior ("Sr." y no "Sr .")
+        if previous.idx + len(previous.text) != tokens[position].idx:
+            return False
+        word = previous.text
+        return word.lower() in ABBREVIATIONS or (len(word) == 1 and word.isupper())
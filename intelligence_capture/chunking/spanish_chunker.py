@@ -7,13 +7,35 @@ Implementa chunking optimizado para español:
 - Preservación de estructura Markdown
 - Ajuste a límites de oraciones
 - Extracción de metadatos de chunks
+- Chunking masivo con nlp.pipe (batch_size, n_process)
+- Contenido de chunks como rebanadas exactas del texto original
+- Modo "fast" sin spaCy para texto plano y WhatsApp (get_chunker)
 """
 
 import re
-from typing import List, Dict, Any, Optional
+from bisect import bisect_right
+from collections import deque
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, Deque
 from intelligence_capture.models.document_payload import DocumentPayload
 from .chunk_metadata import ChunkMetadata
 from .spanish_text_utils import SpanishTextUtils
+from .fast_tokenizer import SpanishSentenceSplitter
+
+# Componentes de es_core_news_md que el chunking no usa: solo se leen
+# tokens (texto, offsets) y fines de oración
+UNUSED_COMPONENTS = ["morphologizer", "attribute_ruler", "lemmatizer", "ner"]
+
+# Componentes que solo aportan fines de oración (reemplazables por sentencizer)
+PARSER_COMPONENTS = ["tok2vec", "parser"]
+
+# Textos por lote de nlp.pipe
+DEFAULT_PIPE_BATCH_SIZE = 32
+
+# Modos: "spacy" (es_core_news_md, alta fidelidad) o "fast" (reglas, sin modelo)
+CHUNKER_MODES = ("spacy", "fast")
+
+# Formatos de origen que solo necesitan conteo de tokens y fines de oración
+FAST_SOURCE_FORMATS = frozenset({"txt", "text", "whatsapp", "whatsapp_json"})
 
 
 class SpanishChunker:
@@ -29,7 +51,7 @@ class SpanishChunker:
     - Extracción de características del español
 
     Attributes:
-        nlp: Modelo spaCy español (es_core_news_md)
+        nlp: Modelo spaCy español (es_core_news_md, sin componentes no usados)
         text_utils: Utilidades de texto español
         min_tokens: Mínimo de tokens por chunk (300)
         max_tokens: Máximo de tokens por chunk (500)
@@ -37,30 +59,70 @@ class SpanishChunker:
         target_tokens: Objetivo de tokens por chunk (400)
     """
 
-    def __init__(self):
+    def __init__(self, use_sentencizer: bool = False, mode: str = "spacy"):
         """
         Inicializar chunker con modelo spaCy español
 
+        Args:
+            use_sentencizer: Detectar oraciones con el sentencizer basado en
+                reglas en vez del parser de dependencias (más rápido; los
+                límites de oración pueden diferir)
+            mode: "spacy" (es_core_news_md) o "fast" (tokenizador y
+                separador de oraciones por reglas, sin cargar modelo)
+
+        Raises:
+            ValueError: Si el modo no existe o el modelo spaCy español no
+                está instalado
+        """
+        if mode not in CHUNKER_MODES:
+            raise ValueError(f"Modo de chunking desconocido: {mode} (opciones: {', '.join(CHUNKER_MODES)})")
+        self.mode = mode
+        self.use_sentencizer = use_sentencizer
+
+        if mode == "fast":
+            self.nlp = SpanishSentenceSplitter()
+        else:
+            self.nlp = self._load_spacy(use_sentencizer)
+
+        self.text_utils = SpanishTextUtils()
+
+        # Parámetros de chunking (de requisitos R3.1-R3.7)
+        self.min_tokens = 300
+        self.max_tokens = 500
+        self.overlap_tokens = 50
+        self.target_tokens = 400  # Punto medio del rango
+
+    @staticmethod
+    def _load_spacy(use_sentencizer: bool):
+        """
+        Cargar es_core_news_md con solo los componentes que el chunking necesita
+
+        Args:
+            use_sentencizer: Reemplazar tok2vec + parser por el sentencizer
+
+        Returns:
+            Pipeline spaCy
+
         Raises:
             ValueError: Si modelo spaCy español no está instalado
         """
+        exclude = list(UNUSED_COMPONENTS)
+        if use_sentencizer:
+            exclude += PARSER_COMPONENTS
+
         # Intentar cargar modelo spaCy español
         try:
             import spacy
-            self.nlp = spacy.load("es_core_news_md")
+            nlp = spacy.load("es_core_news_md", exclude=exclude)
         except OSError:
             raise ValueError(
                 "Modelo spaCy español no encontrado. "
                 "Instalar con: python -m spacy download es_core_news_md"
             )
 
-        self.text_utils = SpanishTextUtils()
-
-        # Parámetros de chunking (de requisitos R3.1-R3.7)
-        self.min_tokens = 300
-        self.max_tokens = 500
-        self.overlap_tokens = 50
-        self.target_tokens = 400  # Punto medio del rango
+        if use_sentencizer:
+            nlp.add_pipe("sentencizer")
+        return nlp
 
     def chunk_document(
         self,
@@ -92,49 +154,147 @@ class SpanishChunker:
             >>> print(chunks[0]['metadata']['token_count'])
         """
         # Procesar contenido con spaCy
-        doc = self.nlp(payload.content)
+        return self._chunk_doc(self.nlp(payload.content), payload)
 
-        chunks = []
-        chunk_index = 0
+    def chunk_documents(
+        self,
+        payloads: Iterable[DocumentPayload],
+        preserve_markdown: bool = False,
+        batch_size: int = DEFAULT_PIPE_BATCH_SIZE,
+        n_process: int = 1
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Dividir muchos documentos en chunks con nlp.pipe
 
-        # Convertir a lista de tokens para indexación
-        tokens = [token for token in doc]
-        total_tokens = len(tokens)
+        Los textos se procesan por lotes (y en n_process procesos) en vez de
+        una llamada a nlp por documento o sección. Los chunks de cada
+        documento son los mismos que con chunk_document (o
+        chunk_with_markdown_preservation si preserve_markdown).
 
-        # Ventana deslizante con superposición
-        start_idx = 0
-        while start_idx < total_tokens:
-            # Calcular límites del chunk
-            end_idx = min(start_idx + self.target_tokens, total_tokens)
+        Args:
+            payloads: DocumentPayloads a dividir (cualquier iterable, se
+                consume a medida que avanza el pipe)
+            preserve_markdown: Dividir por encabezados Markdown primero
+            batch_size: Textos por lote de nlp.pipe
+            n_process: Procesos de spaCy (1 = mismo proceso)
 
-            # Ajustar a límite de oración si no es el último chunk
-            if end_idx < total_tokens:
-                end_idx = self._adjust_to_sentence_boundary(tokens, start_idx, end_idx)
+        Yields:
+            Lista de chunks de cada documento, en el orden de entrada
 
-            # Validar que no sea chunk vacío
-            if end_idx <= start_idx:
-                break
+        Example:
+            >>> chunker = SpanishChunker()
+            >>> for chunks in chunker.chunk_documents(payloads, n_process=4):
+            ...     guardar(chunks)
+        """
+        # Los payloads quedan en este proceso; por el pipe solo viajan textos
+        # y contextos pequeños (se serializan con n_process > 1)
+        pending: Deque[DocumentPayload] = deque()
+        units = self._pipe_units(payloads, preserve_markdown, pending)
+        docs = self.nlp.pipe(units, as_tuples=True, batch_size=batch_size, n_process=n_process)
+
+        document_chunks: List[Dict[str, Any]] = []
+        section_starts = None
+        for doc, (heading, level, offset, is_last) in docs:
+            payload = pending[0]
+            if section_starts is None:
+                section_starts = self._section_starts(payload)
+
+            chunks = self._chunk_doc(doc, payload, offset, section_starts)
+            self._apply_heading(chunks, {'heading': heading, 'level': level})
+            document_chunks.extend(chunks)
+
+            if is_last:
+                pending.popleft()
+                yield document_chunks
+                document_chunks = []
+                section_starts = None
+
+    def _pipe_units(
+        self,
+        payloads: Iterable[DocumentPayload],
+        preserve_markdown: bool,
+        pending: Deque[DocumentPayload]
+    ) -> Iterator[Tuple[str, Tuple[Optional[str], Optional[int], int, bool]]]:
+        """
+        Textos a procesar por documento: el contenido completo, o una
+        sección por encabezado si se preserva Markdown
 
-            # Extraer chunk
-            chunk_tokens = tokens[start_idx:end_idx]
-            chunk_text = ' '.join([t.text for t in chunk_tokens])
+        Args:
+            payloads: DocumentPayloads
+            preserve_markdown: Dividir por encabezados Markdown
+            pending: Cola donde se agrega cada payload al emitir sus textos
 
-            # Encontrar información de sección
-            section_info = self._find_section(payload.sections, chunk_tokens[0].idx)
+        Yields:
+            (texto, (encabezado, nivel, offset del texto en el documento,
+            es último texto del documento))
+        """
+        for payload in payloads:
+            pending.append(payload)
+
+            sections = None
+            if preserve_markdown and self._has_markdown(payload.content):
+                sections = self._split_on_headings(payload.content)
+
+            if not sections:
+                # Documento sin secciones: un texto (vacío si solo hay encabezados)
+                content = payload.content if sections is None else ""
+                yield content, (None, None, 0, True)
+                continue
+
+            for position, section in enumerate(sections):
+                is_last = position == len(sections) - 1
+                yield section['content'], (section['heading'], section['level'], section['offset'], is_last)
+
+    def _chunk_doc(
+        self,
+        doc,
+        payload: DocumentPayload,
+        base_offset: int = 0,
+        section_starts: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Dividir un Doc de spaCy ya procesado en chunks
+
+        El contenido de cada chunk es la rebanada doc.text[inicio:fin] entre
+        el primer y el último token: conserva espacios, saltos de línea y
+        puntuación del original.
+
+        Args:
+            doc: Doc de spaCy del contenido (o sección)
+            payload: DocumentPayload de origen (document_id, sections)
+            base_offset: Offset del texto del Doc en payload.content (> 0
+                para secciones Markdown)
+            section_starts: Offsets de inicio de payload.sections (se
+                calculan si no se pasan)
+
+        Returns:
+            Lista de chunks (ver chunk_document)
+        """
+        if section_starts is None:
+            section_starts = self._section_starts(payload)
+
+        text = doc.text
+        windows = self._windows(doc)
 
-            # Extraer características del español
-            spanish_features = self.text_utils.extract_features(chunk_text)
+        # Características del español de todos los chunks en un lote (cada
+        # palabra distinta se stemmiza una vez)
+        chunk_texts = [text[span_start:span_end] for _, _, span_start, span_end in windows]
+        features = self.text_utils.extract_features_batch(chunk_texts)
+
+        chunks = []
+        for chunk_index, (window, chunk_text, spanish_features) in enumerate(zip(windows, chunk_texts, features)):
+            start_idx, end_idx, span_start, span_end = window
+
+            # Encontrar información de sección
+            section_info = self._find_section(payload.sections, base_offset + span_start, section_starts)
 
             # Construir metadatos
             metadata = ChunkMetadata(
                 document_id=payload.document_id,
                 chunk_index=chunk_index,
-                token_count=len(chunk_tokens),
+                token_count=end_idx - start_idx,
                 char_count=len(chunk_text),
-                span_offsets=(
-                    chunk_tokens[0].idx,
-                    chunk_tokens[-1].idx + len(chunk_tokens[-1].text)
-                ),
+                span_offsets=(base_offset + span_start, base_offset + span_end),
                 section_title=section_info.get('title'),
                 page_number=section_info.get('page'),
                 heading_level=section_info.get('level'),
@@ -150,16 +310,54 @@ class SpanishChunker:
                 'metadata': metadata.to_dict()
             })
 
-            chunk_index += 1
+        return chunks
+
+    def _windows(self, tokens) -> List[Tuple[int, int, int, int]]:
+        """
+        Ventanas deslizantes de un Doc ajustadas a fines de oración
+
+        Args:
+            tokens: Doc de spaCy (o FastDoc)
+
+        Returns:
+            Lista de (token inicial, token final exclusivo, offset de
+            carácter inicial, offset de carácter final) de cada chunk
+        """
+        windows = []
+        total_tokens = len(tokens)
+
+        # Ventana deslizante con superposición
+        start_idx = 0
+        while start_idx < total_tokens:
+            # Calcular límites del chunk
+            end_idx = min(start_idx + self.target_tokens, total_tokens)
+
+            # Ajustar a límite de oración si no es el último chunk
+            if end_idx < total_tokens:
+                end_idx = self._adjust_to_sentence_boundary(tokens, start_idx, end_idx)
+
+            # Validar que no sea chunk vacío
+            if end_idx <= start_idx:
+                break
+
+            # Offsets en el texto original entre el primer y el último token
+            # (el contenido se rebana de ahí, sin reconstruirlo token a token)
+            last_token = tokens[end_idx - 1]
+            windows.append((start_idx, end_idx, tokens[start_idx].idx, last_token.idx + len(last_token.text)))
+
+            # El chunk llegó al final del documento
+            if end_idx >= total_tokens:
+                break
 
             # Mover ventana con superposición
             start_idx = end_idx - self.overlap_tokens
 
             # Evitar bucles infinitos si la superposición es mayor que el avance
+            chunk_index = len(windows)
             if start_idx <= tokens[chunk_index - 1].i if chunk_index > 0 else 0:
                 start_idx = end_idx
 
-        return chunks
+        return windows
 
     def _adjust_to_sentence_boundary(
         self,
@@ -173,7 +371,7 @@ class SpanishChunker:
         Busca hacia atrás hasta 50 tokens para encontrar final de oración
 
         Args:
-            tokens: Lista de tokens spaCy
+            tokens: Doc (o lista de tokens) spaCy
             start_idx: Índice de inicio del chunk
             end_idx: Índice de fin propuesto
 
@@ -190,28 +388,62 @@ class SpanishChunker:
         # Si no se encuentra, retornar índice original
         return end_idx
 
+    def _section_starts(self, payload: DocumentPayload) -> List[int]:
+        """
+        Offset de inicio de cada sección del documento
+
+        Usa 'start_offset' si el adaptador lo provee; si no, busca el título
+        de la sección en el contenido a partir de la sección anterior. Una
+        sección cuyo título no aparece hereda el offset anterior, así la
+        lista queda ordenada para la búsqueda binaria.
+
+        Args:
+            payload: DocumentPayload con content y sections
+
+        Returns:
+            Offsets de carácter, uno por sección y en orden no decreciente
+        """
+        starts = []
+        cursor = 0
+        for section in payload.sections:
+            start = section.get('start_offset')
+            if start is None:
+                title = section.get('title')
+                found = payload.content.find(title, cursor) if title else -1
+                start = found if found >= 0 else cursor
+            cursor = max(cursor, start)
+            starts.append(cursor)
+        return starts
+
     def _find_section(
         self,
         sections: List[Dict[str, Any]],
-        char_offset: int
+        char_offset: int,
+        section_starts: Optional[List[int]] = None
     ) -> Dict[str, Any]:
         """
         Encontrar información de sección para posición de carácter
 
+        Búsqueda binaria de la última sección que empieza en o antes de
+        char_offset; el texto anterior a la primera sección se asigna a la
+        primera.
+
         Args:
             sections: Lista de secciones del documento
             char_offset: Posición de carácter en documento
+            section_starts: Offsets de inicio de cada sección (ver
+                _section_starts); sin ellos se usa la primera sección
 
         Returns:
             Diccionario con información de sección (title, page, level)
         """
-        # Implementación simple: retornar primera sección si existe
-        # En producción, esto debería mapear offsets a secciones
-        if sections:
-            # TODO: Implementar búsqueda binaria por char_offset
+        if not sections:
+            return {}
+        if not section_starts:
             return sections[0]
 
-        return {}
+        position = bisect_right(section_starts, char_offset) - 1
+        return sections[max(position, 0)]
 
     def _detect_table(self, text: str) -> bool:
         """
@@ -345,52 +577,41 @@ class SpanishChunker:
         Returns:
             Lista de chunks con estructura Markdown preservada
         """
-        # Verificar si contenido tiene Markdown
-        has_markdown = any([
-            '##' in payload.content,
-            '|' in payload.content and '-|-' in payload.content,
-            '```' in payload.content
-        ])
+        # Todas las secciones se procesan en un solo nlp.pipe
+        return next(self.chunk_documents([payload], preserve_markdown=True))
 
-        if not has_markdown:
-            # Si no hay Markdown, usar chunking estándar
-            return self.chunk_document(payload)
-
-        # Dividir en secciones por encabezados principales
-        sections = self._split_on_headings(payload.content)
-
-        all_chunks = []
-        for section in sections:
-            # Crear payload temporal para sección
-            section_payload = DocumentPayload(
-                document_id=payload.document_id,
-                org_id=payload.org_id,
-                checksum=payload.checksum,
-                source_type=payload.source_type,
-                source_format=payload.source_format,
-                mime_type=payload.mime_type,
-                original_path=payload.original_path,
-                content=section['content'],
-                language=payload.language,
-                page_count=payload.page_count,
-                sections=payload.sections,
-                tables=payload.tables,
-                images=payload.images,
-                context_tags=payload.context_tags
-            )
+    def _has_markdown(self, content: str) -> bool:
+        """
+        Verificar si contenido tiene estructura Markdown
 
-            # Chunkar sección
-            chunks = self.chunk_document(section_payload)
+        Args:
+            content: Contenido del documento
 
-            # Agregar encabezado a cada chunk si existe
-            if section.get('heading'):
-                for chunk in chunks:
-                    chunk['content'] = f"{section['heading']}\n\n{chunk['content']}"
-                    chunk['metadata']['heading_level'] = section.get('level', 2)
+        Returns:
+            True si hay encabezados, tablas o bloques de código
+        """
+        return any([
+            '##' in content,
+            '|' in content and '-|-' in content,
+            '```' in content
+        ])
 
-            all_chunks.extend(chunks)
+    def _apply_heading(
+        self,
+        chunks: List[Dict[str, Any]],
+        section: Dict[str, Any]
+    ):
+        """
+        Agregar encabezado de sección a cada chunk si existe
 
-        return all_chunks
+        Args:
+            chunks: Chunks de la sección (modificados en el lugar)
+            section: Sección con heading y level
+        """
+        if section.get('heading'):
+            for chunk in chunks:
+                chunk['content'] = f"{section['heading']}\n\n{chunk['content']}"
+                chunk['metadata']['heading_level'] = section.get('level', 2)
 
     def _split_on_headings(self, content: str) -> List[Dict[str, Any]]:
         """
@@ -400,7 +621,8 @@ class SpanishChunker:
             content: Contenido con encabezados Markdown
 
         Returns:
-            Lista de secciones con heading y content
+            Lista de secciones con heading, content y offset (posición de
+            content en el documento)
         """
         sections = []
         lines = content.split('\n')
@@ -408,8 +630,13 @@ class SpanishChunker:
         current_heading = None
         current_level = None
         current_content = []
+        current_offset = 0
+        position = 0
 
         for line in lines:
+            # Posición de la línea siguiente
+            position += len(line) + 1
+
             # Detectar encabezados Markdown (## o más)
             heading_match = re.match(r'^(#{2,6})\s+(.+)$', line)
 
@@ -419,13 +646,15 @@ class SpanishChunker:
                     sections.append({
                         'heading': current_heading,
                         'level': current_level,
-                        'content': '\n'.join(current_content)
+                        'content': '\n'.join(current_content),
+                        'offset': current_offset
                     })
 
                 # Iniciar nueva sección
                 current_level = len(heading_match.group(1))
                 current_heading = line
                 current_content = []
+                current_offset = position
             else:
                 current_content.append(line)
 
@@ -434,7 +663,47 @@ class SpanishChunker:
             sections.append({
                 'heading': current_heading,
                 'level': current_level,
-                'content': '\n'.join(current_content)
+                'content': '\n'.join(current_content),
+                'offset': current_offset
             })
 
         return sections
+
+
+# Instancias compartidas por modo (cargar spaCy cuesta segundos y cientos de MB)
+_chunkers: Dict[str, SpanishChunker] = {}
+
+
+def chunker_mode_for(source_format: Optional[str]) -> str:
+    """
+    Modo de chunking para un formato de origen
+
+    Args:
+        source_format: DocumentPayload.source_format
+
+    Returns:
+        "fast" para texto plano y WhatsApp, "spacy" para el resto
+    """
+    return "fast" if (source_format or "").lower() in FAST_SOURCE_FORMATS else "spacy"
+
+
+def get_chunker(source_format: Optional[str] = None) -> SpanishChunker:
+    """
+    Chunker compartido para un formato de origen
+
+    El modelo spaCy solo se carga la primera vez que llega un formato que
+    lo necesita.
+
+    Args:
+        source_format: DocumentPayload.source_format
+
+    Returns:
+        SpanishChunker en el modo que corresponde al formato
+
+    Example:
+        >>> chunks = get_chunker(payload.source_format).chunk_document(payload)
+    """
+    mode = chunker_mode_for(source_format)
+    if mode not in _chunkers:
+        _chunkers[mode] = SpanishChunker(mode=mode)
+    return _chunkers[mode]
@@ -4,12 +4,22 @@ Utilidades de procesamiento de texto en español
 Herramientas de NLP español para:
 - Eliminación de stopwords
 - Stemming con Snowball
-- Extracción de características del español
+- Extracción de características del español (una pasada por texto,
+  stems memoizados, API por lotes)
 """
 
-from typing import Set, List, Dict, Any
+from collections import Counter
+from functools import lru_cache
+from typing import Set, List, Dict, Any, Callable, Iterable
 from nltk.stem.snowball import SnowballStemmer
 
+# Palabras distintas cuyo stem se memoiza (el vocabulario se repite mucho
+# entre chunks de un mismo corpus)
+STEM_CACHE_SIZE = 50_000
+
+# Acentos y caracteres especiales del español
+SPANISH_CHARS = frozenset('áéíóúñüÁÉÍÓÚÑÜ¿¡')
+
 
 class SpanishTextUtils:
     """
@@ -21,9 +31,15 @@ class SpanishTextUtils:
     - Extracción de características específicas del español
     """
 
-    def __init__(self):
-        """Inicializar stemmer y stopwords del español"""
+    def __init__(self, stem_cache_size: int = STEM_CACHE_SIZE):
+        """
+        Inicializar stemmer y stopwords del español
+
+        Args:
+            stem_cache_size: Palabras distintas con stem memoizado (LRU)
+        """
         self.stemmer = SnowballStemmer('spanish')
+        self.stem_word: Callable[[str], str] = lru_cache(maxsize=stem_cache_size)(self.stemmer.stem)
 
         # Stopwords comunes del español
         # Lista expandida basada en corpus español
@@ -71,7 +87,7 @@ class SpanishTextUtils:
             Lista de stems (raíces de palabras)
         """
         words = text.lower().split()
-        return [self.stemmer.stem(w) for w in words if w]
+        return [self.stem_word(w) for w in words if w]
 
     def extract_features(self, text: str) -> Dict[str, Any]:
         """
@@ -86,6 +102,41 @@ class SpanishTextUtils:
         Args:
             text: Texto en español
 
+        Returns:
+            Diccionario con características del texto
+        """
+        return self._features(text, self.stem_word)
+
+    def extract_features_batch(self, texts: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Extraer características de muchos textos (p. ej. todos los chunks
+        de un documento)
+
+        Cada palabra distinta del lote se stemmiza una sola vez. Los
+        resultados son los mismos que con extract_features texto a texto.
+
+        Args:
+            texts: Textos en español
+
+        Returns:
+            Características de cada texto, en el orden de entrada
+        """
+        texts = list(texts)
+        stems: Dict[str, str] = {}
+        for text in texts:
+            for word in text.lower().split():
+                if word not in stems:
+                    stems[word] = self.stem_word(word)
+        return [self._features(text, stems.__getitem__) for text in texts]
+
+    def _features(self, text: str, stem: Callable[[str], str]) -> Dict[str, Any]:
+        """
+        Calcular características con una sola tokenización del texto
+
+        Args:
+            text: Texto en español
+            stem: Stem de una palabra en minúsculas
+
         Returns:
             Diccionario con características del texto
         """
@@ -102,16 +153,17 @@ class SpanishTextUtils:
                 'lexical_diversity': 0.0
             }
 
-        stopword_count = sum(1 for w in words if w in self.stopwords)
-        stems = self.stem_text(text)
-        unique_stems = set(stems)
+        # Frecuencia por palabra: stopwords y stems se calculan sobre las
+        # palabras distintas, no sobre cada ocurrencia
+        counts = Counter(words)
+        stopword_count = sum(counts[w] for w in self.stopwords.intersection(counts))
+        unique_stems = {stem(w) for w in counts}
 
         # Detectar acentos y caracteres especiales del español
-        spanish_chars = 'áéíóúñüÁÉÍÓÚÑÜ¿¡'
-        has_accents = any(c in spanish_chars for c in text)
+        has_accents = not SPANISH_CHARS.isdisjoint(text)
 
         # Calcular diversidad léxica (stems únicos / total palabras)
-        lexical_diversity = len(unique_stems) / len(words) if words else 0.0
+        lexical_diversity = len(unique_stems) / len(words)
 
         return {
             'total_words': len(words),
@@ -119,7 +171,7 @@ class SpanishTextUtils:
             'stopword_ratio': stopword_count / len(words),
             'unique_stems': len(unique_stems),
             'has_accents': has_accents,
-            'avg_word_length': sum(len(w) for w in words) / len(words),
+            'avg_word_length': sum(map(len, words)) / len(words),
             'lexical_diversity': lexical_diversity
         }
 
@@ -137,10 +189,14 @@ class SpanishTextUtils:
         Returns:
             True si probablemente es español
         """
-        features = self.extract_features(text)
+        # Criterios: presencia de acentos O ratio de stopwords alto (no
+        # necesita stems)
+        if not SPANISH_CHARS.isdisjoint(text):
+            return True
+
+        words = text.lower().split()
+        if not words:
+            return False
 
-        # Criterios: ratio de stopwords alto O presencia de acentos
-        return (
-            features['stopword_ratio'] > threshold or
-            features['has_accents']
-        )
+        stopword_count = sum(1 for w in words if w in self.stopwords)
+        return stopword_count / len(words) > threshold
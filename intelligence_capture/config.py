@@ -20,6 +20,8 @@ DB_PATH = PROJECT_ROOT / "data" / "full_intelligence.db"  # Main production data
 PILOT_DB_PATH = PROJECT_ROOT / "data" / "pilot_intelligence.db"  # Testing database (5-10 interviews)
 FAST_DB_PATH = PROJECT_ROOT / "data" / "fast_intelligence.db"  # Fast extraction (core entities only)
 TEST_DB_PATH = PROJECT_ROOT / "data" / "test_intelligence.db"  # Unit tests (temporary, auto-cleaned)
+EMBEDDING_STORE_PATH = PROJECT_ROOT / "data" / "embedding_store.db"  # Content-addressed embedding cache (shared)
+LLM_CACHE_PATH = PROJECT_ROOT / "data" / "llm_cache.db"  # Content-addressed LLM response cache (shared)
 
 # Output directories
 REPORTS_DIR = PROJECT_ROOT / "reports"
@@ -44,6 +46,20 @@ TEMPERATURE = 0.1  # Low temperature for consistent extraction
 # Extraction settings
 MAX_RETRIES = 3
 TIMEOUT_SECONDS = 60
+MAX_CONCURRENT_EXTRACTIONS = 8  # Entity-type LLM calls in flight per interview (1 = sequential)
+
+# Grouped extraction: related entity types share one multi-section LLM call
+# (opt-in via extraction_config.json "grouped_extraction.enabled"). These are
+# the only default groups; set "grouped_extraction.groups" there to override.
+DEFAULT_EXTRACTION_GROUPS = {
+    "operational": ["processes", "decision_points", "data_flows", "temporal_patterns"],
+    "problems": ["pain_points_v2", "failure_modes", "inefficiencies"],
+    "systems": ["systems_v2", "communication_channels", "automation_candidates_v2", "kpis"],
+    "organization": [
+        "team_structures", "knowledge_gaps", "success_patterns",
+        "budget_constraints", "external_dependencies"
+    ]
+}
 
 # Ensemble Validation Settings (Forensic-Grade Quality Review)
 # Set ENABLE_ENSEMBLE_REVIEW=true in .env to enable
@@ -94,7 +110,10 @@ def load_extraction_config(config_path: Path = None) -> dict:
             "temperature": TEMPERATURE,
             "max_retries": MAX_RETRIES,
             "timeout_seconds": TIMEOUT_SECONDS,
-            "max_tokens": 4000
+            "max_tokens": 4000,
+            "max_concurrent_extractions": MAX_CONCURRENT_EXTRACTIONS,
+            "incremental": False,
+            "streaming": False
         },
         "model_routing": {
             "round_robin": [
@@ -108,9 +127,9 @@ def load_extraction_config(config_path: Path = None) -> dict:
                 "o1-mini"
             ],
             "providers": {
-                "gpt-4o-mini": {"provider": "openai"},
-                "gpt-4o": {"provider": "openai"},
-                "o1-mini": {"provider": "openai"},
+                "gpt-4o-mini": {"provider": "openai", "requests_per_minute": 50, "tokens_per_minute": 200000},
+                "gpt-4o": {"provider": "openai", "requests_per_minute": 50, "tokens_per_minute": 30000},
+                "o1-mini": {"provider": "openai", "requests_per_minute": 50, "tokens_per_minute": 200000},
                 "gemini-1.5-pro": {"provider": "gemini"},
                 "deepseek-chat": {"provider": "deepseek"},
                 "k2-large": {"provider": "k2"}
@@ -126,6 +145,8 @@ def load_extraction_config(config_path: Path = None) -> dict:
         "ensemble": {
             "enable_ensemble_review": ENABLE_ENSEMBLE_REVIEW,
             "ensemble_mode": ENSEMBLE_MODE,
+            "max_concurrent_calls": 8,
+            "early_exit_agreement": 0.8,
             "models": {
                 "primary": "gpt-4o-mini",
                 "secondary": "gpt-4o",
@@ -167,6 +188,16 @@ def load_extraction_config(config_path: Path = None) -> dict:
             "parallel_processing": False,
             "max_workers": 4,
             "enable_caching": False
+        },
+        "grouped_extraction": {
+            "enabled": False,
+            "groups": DEFAULT_EXTRACTION_GROUPS
+        },
+        "llm_cache": {
+            "enabled": True,
+            "ttl_days": 30,
+            "max_entries": 50000,
+            "max_memory_entries": 2000
         }
     }
 
@@ -224,6 +255,9 @@ def validate_extraction_config(config: dict) -> bool:
     if config["extraction"]["max_retries"] < 1:
         raise ValueError("max_retries must be at least 1")
 
+    if config["extraction"].get("max_concurrent_extractions", 1) < 1:
+        raise ValueError("max_concurrent_extractions must be at least 1")
+
     # Validate ensemble mode
     valid_modes = ["basic", "full"]
     if config["ensemble"]["ensemble_mode"] not in valid_modes:
@@ -246,6 +280,19 @@ MODEL_ROUTING_CONFIG = (EXTRACTION_CONFIG or {}).get("model_routing", {})
 ROUND_ROBIN_CHAIN = MODEL_ROUTING_CONFIG.get("round_robin", ["gpt-4o-mini"])
 FALLBACK_CHAIN = MODEL_ROUTING_CONFIG.get("fallback", ROUND_ROBIN_CHAIN)
 MODEL_PROVIDER_MAP = MODEL_ROUTING_CONFIG.get("providers", {})
+EXTRACTION_CONCURRENCY = (EXTRACTION_CONFIG or {}).get("extraction", {}).get(
+    "max_concurrent_extractions", MAX_CONCURRENT_EXTRACTIONS
+)
+# Stream JSON-mode responses of the large-output extractors (opt-in)
+EXTRACTION_STREAMING = (EXTRACTION_CONFIG or {}).get("extraction", {}).get("streaming", False)
+GROUPED_EXTRACTION_CONFIG = (EXTRACTION_CONFIG or {}).get(
+    "grouped_extraction", {"enabled": False, "groups": DEFAULT_EXTRACTION_GROUPS}
+)
+
+# LLM response cache (set ENABLE_LLM_CACHE=false in .env to bypass it)
+LLM_CACHE_CONFIG = dict((EXTRACTION_CONFIG or {}).get("llm_cache", {"enabled": True}))
+if os.getenv("ENABLE_LLM_CACHE") is not None:
+    LLM_CACHE_CONFIG["enabled"] = os.getenv("ENABLE_LLM_CACHE", "true").lower() == "true"
 
 # Consolidation Configuration Loader
 def load_consolidation_config(config_path: Path = None) -> dict:
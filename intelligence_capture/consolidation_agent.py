@@ -11,12 +11,17 @@ Coordinates the consolidation process:
 Integrates with extraction pipeline to consolidate entities in real-time.
 """
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 from pathlib import Path
 
 from intelligence_capture.duplicate_detector import DuplicateDetector
 from intelligence_capture.entity_merger import EntityMerger
+from intelligence_capture.entity_cache import EntityWorkingSetCache
+from intelligence_capture.name_normalizer import name_profile, normalize_entity
+from intelligence_capture.consolidation_writer import ConsolidationWriter, WriterChannel
 from intelligence_capture.consensus_scorer import ConsensusScorer
 from intelligence_capture.relationship_discoverer import RelationshipDiscoverer
 from intelligence_capture.metrics import ConsolidationMetrics
@@ -37,6 +42,8 @@ class KnowledgeConsolidationAgent:
     - Source tracking across interviews
     - Audit trail for all operations
     - Incremental consolidation (new interviews merge with existing data)
+    - Optional parallel mode: entity types consolidated concurrently, all
+      SQLite writes through a single ordered writer (same result as sequential)
     """
     
     def __init__(
@@ -57,12 +64,22 @@ class KnowledgeConsolidationAgent:
         self.db = db
         self.config = config
         
+        # Serializes db.conn use between parallel workers and the writer thread
+        self.db_lock = threading.RLock()
+        
         # Initialize components
-        self.duplicate_detector = DuplicateDetector(config, openai_api_key, db)
+        self.duplicate_detector = DuplicateDetector(config, openai_api_key, db, db_lock=self.db_lock)
         self.entity_merger = EntityMerger()
         self.consensus_scorer = ConsensusScorer(config)
         self.relationship_discoverer = RelationshipDiscoverer(db)
         
+        # Existing entities per type, shared across entities and interviews
+        self.entity_cache = EntityWorkingSetCache(db, lock=self.db_lock)
+        
+        # Parallel consolidation across entity types (types never merge with each other)
+        self.parallel_entity_types = config.get("performance", {}).get("parallel_entity_types", False)
+        self.max_workers = config.get("performance", {}).get("max_workers", 4)
+        
         # Initialize metrics collection
         self.metrics = ConsolidationMetrics()
 
@@ -120,18 +137,23 @@ class KnowledgeConsolidationAgent:
             self.db.conn.execute("BEGIN TRANSACTION")
             
             # Process each entity type
-            for entity_type, entity_list in entities.items():
-                if not entity_list:
-                    consolidated[entity_type] = []
-                    continue
-                
-                logger.info(f"Consolidating {entity_type} ({len(entity_list)} entities)")
-                consolidated[entity_type] = self._consolidate_entity_type(
-                    entity_list,
-                    entity_type,
-                    interview_id
-                )
-                self._publish_entity_events(entity_type, consolidated[entity_type], interview_id)
+            if self.parallel_entity_types and sum(1 for entity_list in entities.values() if entity_list) > 1:
+                consolidated = self._consolidate_types_parallel(entities, interview_id)
+                for entity_type, entity_list in consolidated.items():
+                    self._publish_entity_events(entity_type, entity_list, interview_id)
+            else:
+                for entity_type, entity_list in entities.items():
+                    if not entity_list:
+                        consolidated[entity_type] = []
+                        continue
+                    
+                    logger.info(f"Consolidating {entity_type} ({len(entity_list)} entities)")
+                    consolidated[entity_type] = self._consolidate_entity_type(
+                        entity_list,
+                        entity_type,
+                        interview_id
+                    )
+                    self._publish_entity_events(entity_type, consolidated[entity_type], interview_id)
             
             # Discover relationships between consolidated entities
             logger.info("Discovering relationships between entities")
@@ -149,6 +171,7 @@ class KnowledgeConsolidationAgent:
             
             # Commit transaction if all operations succeeded
             self.db.conn.commit()
+            self.entity_cache.refresh_version()
             logger.info("Consolidation transaction committed successfully")
             
             # Update statistics
@@ -162,6 +185,7 @@ class KnowledgeConsolidationAgent:
         except Exception as e:
             # Rollback transaction on any error
             self.db.conn.rollback()
+            self.entity_cache.invalidate()
             logger.error(f"Consolidation failed, transaction rolled back: {e}", exc_info=True)
             
             # Log the error for debugging
@@ -198,11 +222,120 @@ class KnowledgeConsolidationAgent:
         for relationship in relationships:
             self.consolidation_sync.emit_relationship_event(relationship)
     
+    def _consolidate_types_parallel(
+        self,
+        entities: Dict[str, List[Dict]],
+        interview_id: int
+    ) -> Dict[str, List[Dict]]:
+        """
+        Consolidate entity types concurrently (one worker per type)
+        
+        Entity types never merge with each other, so each type is an
+        independent work unit. Embedding requests of different types overlap;
+        fuzzy scoring runs in rapidfuzz's C code. Workers do not write to
+        SQLite: audit rows go through a ConsolidationWriter, which applies them
+        in type order. Workers share the detector and the working-set cache
+        (both thread-safe); their reads of db.conn and the writer's commits
+        take turns on db_lock. Statistics and metrics are collected per worker and
+        combined in type order, so the result matches the sequential run.
+        
+        Args:
+            entities: Dict of entity_type -> list of entities
+            interview_id: Source interview ID
+            
+        Returns:
+            Dict of entity_type -> list of consolidated entities (input order)
+        """
+        entity_types = [entity_type for entity_type, entity_list in entities.items() if entity_list]
+        
+        # Load working sets before any queued write reaches the database
+        for entity_type in entity_types:
+            self._get_existing_entities(entity_type)
+        
+        writer = ConsolidationWriter(self.db, entity_types, lock=self.db_lock)
+        self.entity_cache.pin()
+        writer.start()
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(self.max_workers, len(entity_types))),
+                thread_name_prefix="consolidation"
+            ) as executor:
+                futures = {
+                    entity_type: executor.submit(
+                        self._consolidate_entity_type_worker,
+                        entities[entity_type],
+                        entity_type,
+                        interview_id,
+                        writer.channel(entity_type)
+                    )
+                    for entity_type in entity_types
+                }
+                results = {entity_type: future.result() for entity_type, future in futures.items()}
+        finally:
+            writer.join()
+            self.entity_cache.unpin()
+        
+        consolidated = {}
+        for entity_type in entities:
+            if entity_type not in results:
+                consolidated[entity_type] = []
+                continue
+            consolidated[entity_type], stats, metrics = results[entity_type]
+            for key in ("entities_processed", "duplicates_found", "entities_merged", "contradictions_detected"):
+                self.stats[key] += stats[key]
+            self.metrics.merge(metrics)
+        
+        return consolidated
+    
+    def _consolidate_entity_type_worker(
+        self,
+        entities: List[Dict],
+        entity_type: str,
+        interview_id: int,
+        channel: WriterChannel
+    ) -> Tuple[List[Dict], Dict, ConsolidationMetrics]:
+        """
+        Consolidate one entity type with worker-local statistics
+        
+        Args:
+            entities: List of entities to consolidate
+            entity_type: Type of entity
+            interview_id: Source interview ID
+            channel: Writer channel for this entity type
+            
+        Returns:
+            Tuple of (consolidated entities, stats, metrics)
+        """
+        logger.info(f"Consolidating {entity_type} ({len(entities)} entities)")
+        stats = {
+            "entities_processed": 0,
+            "duplicates_found": 0,
+            "entities_merged": 0,
+            "contradictions_detected": 0
+        }
+        metrics = ConsolidationMetrics()
+        try:
+            consolidated_entities = self._consolidate_entity_type(
+                entities,
+                entity_type,
+                interview_id,
+                stats=stats,
+                metrics=metrics,
+                channel=channel
+            )
+        finally:
+            # Let the writer move on to the next entity type
+            channel.close()
+        return consolidated_entities, stats, metrics
+    
     def _consolidate_entity_type(
         self,
         entities: List[Dict],
         entity_type: str,
-        interview_id: int
+        interview_id: int,
+        stats: Optional[Dict] = None,
+        metrics: Optional[ConsolidationMetrics] = None,
+        channel: Optional[WriterChannel] = None
     ) -> List[Dict]:
         """
         Consolidate entities of a specific type
@@ -211,26 +344,32 @@ class KnowledgeConsolidationAgent:
             entities: List of entities to consolidate
             entity_type: Type of entity
             interview_id: Source interview ID
+            stats: Statistics to update (default: self.stats)
+            metrics: Metrics to update (default: self.metrics)
+            channel: Writer channel for database writes (default: write directly)
             
         Returns:
             List of consolidated entities
         """
+        stats = self.stats if stats is None else stats
+        metrics = self.metrics if metrics is None else metrics
         consolidated_entities = []
         
         for entity in entities:
-            self.stats["entities_processed"] += 1
+            stats["entities_processed"] += 1
             
             # Find similar entities in database
             similar_entities = self.find_similar_entities(entity, entity_type)
             
             if similar_entities:
-                # Merge with most similar entity
+                # Merge with most similar entity (full row, not the detection projection)
                 best_match, similarity_score = similar_entities[0]
-                self.stats["duplicates_found"] += 1
+                best_match = self.entity_cache.get_full_entity(entity_type, best_match)
+                stats["duplicates_found"] += 1
                 
                 # Track metrics
-                self.metrics.track_duplicate_found(entity_type, similarity_score)
-                self.metrics.track_entity_merged()
+                metrics.track_duplicate_found(entity_type, similarity_score)
+                metrics.track_entity_merged()
                 
                 logger.debug(f"Duplicate found: '{entity.get('name', 'N/A')}' matches existing entity (similarity={similarity_score:.2f})")
                 
@@ -239,15 +378,29 @@ class KnowledgeConsolidationAgent:
                     entity,
                     best_match,
                     interview_id,
-                    similarity_score
+                    similarity_score,
+                    channel=channel
                 )
                 
-                self.stats["entities_merged"] += 1
+                stats["entities_merged"] += 1
+                
+                # Merged text may differ from the stored normalized name and profile
+                if "normalized_name" in merged_entity:
+                    merged_entity["normalized_name"] = normalize_entity(merged_entity, entity_type)
+                    if "name_profile" in merged_entity:
+                        merged_entity["name_profile"] = name_profile(merged_entity["normalized_name"])
+                
+                # Later entities in this run match against the merged state
+                # (the new revision makes the candidate index re-check the working set)
+                self.entity_cache.record_merge(entity_type, merged_entity)
+                
+                # Audit trail writes do not touch entity tables
+                self.entity_cache.refresh_version()
                 
                 # Check for contradictions
                 if merged_entity.get("has_contradictions", 0):
-                    self.stats["contradictions_detected"] += 1
-                    self.metrics.track_contradiction(entity_type)
+                    stats["contradictions_detected"] += 1
+                    metrics.track_contradiction(entity_type)
                     logger.warning(f"Contradictions detected in merged entity: '{merged_entity.get('name', 'N/A')}'")
                 
                 consolidated_entities.append(merged_entity)
@@ -255,7 +408,7 @@ class KnowledgeConsolidationAgent:
                 # No duplicates found, add as new entity
                 logger.debug(f"New entity added: '{entity.get('name', 'N/A')}'")
                 new_entity = self._prepare_new_entity(entity, interview_id)
-                self.metrics.track_entity_created()
+                metrics.track_entity_created()
                 consolidated_entities.append(new_entity)
         
         return consolidated_entities
@@ -273,9 +426,11 @@ class KnowledgeConsolidationAgent:
             entity_type: Type of entity
             
         Returns:
-            List of (existing_entity, similarity_score) tuples, sorted by score
+            List of (existing_entity, similarity_score) tuples, sorted by score.
+            Existing entities carry detection columns only (id, name, title,
+            type, description, normalized_name, name_profile).
         """
-        # Get existing entities from database
+        # Get existing entities from the working-set cache
         existing_entities = self._get_existing_entities(entity_type)
         
         if not existing_entities:
@@ -285,7 +440,8 @@ class KnowledgeConsolidationAgent:
         similar = self.duplicate_detector.find_duplicates(
             entity,
             entity_type,
-            existing_entities
+            existing_entities,
+            revision=self.entity_cache.revision(entity_type)
         )
         
         return similar
@@ -295,7 +451,8 @@ class KnowledgeConsolidationAgent:
         new_entity: Dict,
         existing_entity: Dict,
         interview_id: int,
-        similarity_score: float
+        similarity_score: float,
+        channel: Optional[WriterChannel] = None
     ) -> Dict:
         """
         Merge new entity into existing entity
@@ -305,6 +462,7 @@ class KnowledgeConsolidationAgent:
             existing_entity: Existing consolidated entity
             interview_id: Source interview ID
             similarity_score: Similarity between entities
+            channel: Optional writer channel for the audit row (parallel mode)
             
         Returns:
             Updated consolidated entity
@@ -326,7 +484,8 @@ class KnowledgeConsolidationAgent:
             entity_type=new_entity.get("entity_type", "unknown"),
             merged_entity_ids=[new_entity.get("id"), existing_entity.get("id")],
             resulting_entity_id=existing_entity.get("id"),
-            similarity_score=similarity_score
+            similarity_score=similarity_score,
+            channel=channel
         )
         
         return merged
@@ -345,7 +504,10 @@ class KnowledgeConsolidationAgent:
     
     def _get_existing_entities(self, entity_type: str) -> List[Dict]:
         """
-        Get existing entities from database
+        Get existing entities from the working-set cache
+        
+        Entities carry only the columns used for duplicate detection;
+        use entity_cache.get_full_entity() before merging.
         
         Args:
             entity_type: Type of entity
@@ -353,28 +515,7 @@ class KnowledgeConsolidationAgent:
         Returns:
             List of existing entities
         """
-        try:
-            cursor = self.db.conn.cursor()
-            
-            # Query database for entities of this type
-            cursor.execute(f"""
-                SELECT * FROM {entity_type}
-                WHERE is_consolidated = 1 OR is_consolidated IS NULL
-            """)
-            
-            rows = cursor.fetchall()
-            
-            # Convert to list of dicts
-            entities = []
-            for row in rows:
-                entity = dict(row)
-                entities.append(entity)
-            
-            return entities
-            
-        except Exception as e:
-            logger.warning(f"Error fetching existing entities for {entity_type}: {e}")
-            return []
+        return self.entity_cache.get(entity_type)
     
     def _prepare_new_entity(self, entity: Dict, interview_id: int) -> Dict:
         """
@@ -406,7 +547,8 @@ class KnowledgeConsolidationAgent:
         entity_type: str,
         merged_entity_ids: List[int],
         resulting_entity_id: int,
-        similarity_score: float
+        similarity_score: float,
+        channel: Optional[WriterChannel] = None
     ):
         """
         Log consolidation operation to audit trail
@@ -416,11 +558,9 @@ class KnowledgeConsolidationAgent:
             merged_entity_ids: IDs of entities that were merged
             resulting_entity_id: ID of resulting consolidated entity
             similarity_score: Similarity score
+            channel: Optional writer channel (queued instead of written directly)
         """
-        try:
-            cursor = self.db.conn.cursor()
-            
-            cursor.execute("""
+        sql = """
                 INSERT INTO consolidation_audit (
                     entity_type,
                     merged_entity_ids,
@@ -428,13 +568,23 @@ class KnowledgeConsolidationAgent:
                     similarity_score,
                     consolidation_timestamp
                 ) VALUES (?, ?, ?, ?, ?)
-            """, (
-                entity_type,
-                json.dumps(merged_entity_ids, ensure_ascii=False),
-                resulting_entity_id,
-                similarity_score,
-                datetime.now().isoformat()
-            ))
+            """
+        params = (
+            entity_type,
+            json.dumps(merged_entity_ids, ensure_ascii=False),
+            resulting_entity_id,
+            similarity_score,
+            datetime.now().isoformat()
+        )
+        
+        if channel is not None:
+            channel.execute(sql, params)
+            return
+        
+        try:
+            cursor = self.db.conn.cursor()
+            
+            cursor.execute(sql, params)
             
             self.db.conn.commit()
             
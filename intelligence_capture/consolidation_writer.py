@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Single-Writer Queue for Parallel Consolidation
+
+When entity types are consolidated concurrently, every SQLite write goes
+through one writer thread instead of being issued by the workers.
+
+Ordering:
+- Each entity type has its own channel (FIFO)
+- The writer drains channels in the order the types were registered, so
+  rows land in exactly the order a sequential run would write them, even
+  though later types may finish first (their writes wait in their channel)
+
+Workers still read through db.conn (full rows of merge targets, stored
+embeddings); pass the same lock they use so a write and its commit never
+interleave with a read on the shared connection.
+"""
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from intelligence_capture.logger import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+# Marks the end of a channel
+_CHANNEL_CLOSED = object()
+
+
+class WriterChannel:
+    """Ordered write channel for one entity type"""
+
+    def __init__(self, key: str, pending: "queue.Queue"):
+        self.key = key
+        self._pending = pending
+        self._closed = False
+
+    def execute(self, sql: str, params: Sequence[Any] = ()):
+        """
+        Queue a write statement (committed after execution, like the
+        sequential path)
+
+        Args:
+            sql: SQL statement
+            params: Statement parameters
+        """
+        self._pending.put((sql, tuple(params)))
+
+    def close(self):
+        """Signal that this entity type will not write anything else"""
+        if not self._closed:
+            self._closed = True
+            self._pending.put(_CHANNEL_CLOSED)
+
+
+class ConsolidationWriter:
+    """
+    Single writer thread for consolidation SQLite writes
+
+    Usage:
+        writer = ConsolidationWriter(db, ["systems", "pain_points"])
+        writer.start()
+        writer.channel("systems").execute("INSERT ...", (...))
+        writer.channel("systems").close()
+        ...
+        writer.join()
+    """
+
+    def __init__(self, db, keys: List[str], lock=None):
+        """
+        Initialize writer
+
+        Args:
+            db: Database instance (uses db.conn)
+            keys: Channel keys (entity types) in commit order
+            lock: Optional lock held around each write and commit (shared
+                with readers of db.conn)
+        """
+        self.db = db
+        self.lock = lock if lock is not None else threading.RLock()
+        self.keys = list(keys)
+        self._channels: Dict[str, WriterChannel] = {
+            key: WriterChannel(key, queue.Queue()) for key in self.keys
+        }
+        self._thread: Optional[threading.Thread] = None
+
+        # Statistics
+        self.writes = 0
+        self.failed_writes = 0
+
+    def channel(self, key: str) -> WriterChannel:
+        """
+        Get the write channel for an entity type
+
+        Args:
+            key: Channel key (entity type)
+
+        Returns:
+            WriterChannel
+        """
+        return self._channels[key]
+
+    def start(self):
+        """Start the writer thread"""
+        self._thread = threading.Thread(target=self._run, name="consolidation-writer", daemon=True)
+        self._thread.start()
+
+    def join(self):
+        """Close all channels and wait until every queued write is applied"""
+        for channel in self._channels.values():
+            channel.close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        """Drain channels one after another, in registration order"""
+        for key in self.keys:
+            pending = self._channels[key]._pending
+            while True:
+                item = pending.get()
+                if item is _CHANNEL_CLOSED:
+                    break
+                self._apply(*item)
+
+    def _apply(self, sql: str, params: tuple):
+        """Execute and commit one write (failures are logged, not raised)"""
+        try:
+            with self.lock:
+                cursor = self.db.conn.cursor()
+                cursor.execute(sql, params)
+                self.db.conn.commit()
+            self.writes += 1
+        except Exception as e:
+            self.failed_writes += 1
+            logger.warning(f"Error applying queued consolidation write: {e}")
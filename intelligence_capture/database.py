@@ -21,6 +21,9 @@ try:  # Python 3.11+
 except ModuleNotFoundError:  # pragma: no cover - fallback para entornos viejos
     import tomli as tomllib  # type: ignore
 
+from intelligence_capture.interview_source import interview_content_hash
+from intelligence_capture.name_normalizer import name_profile, normalize_entity
+
 
 def json_serialize(obj: Any) -> str:
     """
@@ -55,6 +58,35 @@ VALID_ENTITY_TYPES = {
     "external_dependencies"
 }
 
+# List columns of the systems table merged across mentions
+SYSTEM_LIST_FIELDS = ("pain_points", "integration_pain_points", "data_quality_issues")
+
+# Fields the stored normalized_name column is derived from
+NORMALIZED_NAME_SOURCE_FIELDS = {"name", "title", "type", "description"}
+
+# Per-interview tables written by each extraction entity type (legacy
+# projections share the table of their v2 source; systems rows are shared
+# across interviews, so re-extracting systems_v2 subtracts the interview's
+# recorded contribution instead of deleting rows)
+EXTRACTION_TABLES = {
+    "processes": ["processes"],
+    "kpis": ["kpis"],
+    "inefficiencies": ["inefficiencies"],
+    "pain_points_v2": ["pain_points"],
+    "automation_candidates_v2": ["automation_candidates"],
+    "systems_v2": [],
+    "communication_channels": ["communication_channels"],
+    "decision_points": ["decision_points"],
+    "data_flows": ["data_flows"],
+    "temporal_patterns": ["temporal_patterns"],
+    "failure_modes": ["failure_modes"],
+    "team_structures": ["team_structures"],
+    "knowledge_gaps": ["knowledge_gaps"],
+    "success_patterns": ["success_patterns"],
+    "budget_constraints": ["budget_constraints"],
+    "external_dependencies": ["external_dependencies"]
+}
+
 
 class IntelligenceDB:
     """Manages SQLite database for captured intelligence"""
@@ -62,6 +94,8 @@ class IntelligenceDB:
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self.conn = None
+        # Per-table column names (PRAGMA table_info), cleared when columns are added
+        self._columns_cache: Dict[str, set] = {}
         
     def connect(self):
         """Connect to database with WAL mode for parallel processing"""
@@ -83,6 +117,8 @@ class IntelligenceDB:
         # Enable foreign keys
         self.conn.execute("PRAGMA foreign_keys=ON")
         
+        self._columns_cache.clear()
+        
         print("✓ Database connected with WAL mode (parallel-safe)")
         
         return self.conn
@@ -91,6 +127,150 @@ class IntelligenceDB:
         """Close database connection"""
         if self.conn:
             self.conn.close()
+
+    def _table_columns(self, table: str) -> set:
+        """Get the column names of a table (cached per connection)"""
+        columns = self._columns_cache.get(table)
+        if columns is None:
+            cursor = self.conn.cursor()
+            cursor.execute(f"PRAGMA table_info({table})")
+            columns = {row[1] for row in cursor.fetchall()}
+            self._columns_cache[table] = columns
+        return columns
+
+    def _has_normalized_name(self, table: str) -> bool:
+        """Check whether a table has the normalized_name column"""
+        return "normalized_name" in self._table_columns(table)
+
+    def _normalized_columns(self, table: str) -> List[str]:
+        """Stored comparison columns of a table (normalized_name, name_profile)"""
+        if not self._has_normalized_name(table):
+            return []
+        if "name_profile" in self._table_columns(table):
+            return ["normalized_name", "name_profile"]
+        return ["normalized_name"]
+
+    @staticmethod
+    def _normalized_values(entity: Dict[str, Any], table: str, columns: List[str]) -> tuple:
+        """Values of the stored comparison columns for an entity"""
+        normalized = normalize_entity(entity, table)
+        if len(columns) > 1:
+            return (normalized, name_profile(normalized))
+        return (normalized,)
+
+    def _insert_entity_rows(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert entity rows with one prepared statement (no commit)
+
+        All rows must have the same columns (rows from one row builder).
+        normalized_name (and name_profile) are computed here when the table
+        has the columns.
+
+        Args:
+            table: Entity table name
+            rows: Column -> value dicts
+
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+
+        columns = list(rows[0])
+        values = [tuple(row[column] for column in columns) for row in rows]
+        normalized_columns = self._normalized_columns(table)
+        if normalized_columns:
+            columns.extend(normalized_columns)
+            values = [
+                row_values + self._normalized_values(row, table, normalized_columns)
+                for row_values, row in zip(values, rows)
+            ]
+
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})"
+        )
+        cursor = self.conn.cursor()
+        if len(values) == 1:
+            cursor.execute(sql, values[0])
+        else:
+            cursor.executemany(sql, values)
+        return len(values)
+
+    def _store_normalized_name(self, table: str, row_id: Optional[int]):
+        """
+        Compute and store normalized_name (and name_profile) for one row (no commit)
+
+        Used after updates; inserts compute the value in _insert_entity_rows.
+        Uses the same rules as DuplicateDetector, so candidate comparison can
+        read the stored value instead of re-normalizing existing entities.
+        Tables without the column (added by add_consolidation_schema) are skipped.
+
+        Args:
+            table: Entity table name
+            row_id: Row ID (None is ignored)
+        """
+        normalized_columns = self._normalized_columns(table) if row_id is not None else []
+        if not normalized_columns:
+            return
+
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return
+
+        entity = dict(zip([column[0] for column in cursor.description], row))
+        assignments = ", ".join(f"{column} = ?" for column in normalized_columns)
+        cursor.execute(
+            f"UPDATE {table} SET {assignments} WHERE id = ?",
+            self._normalized_values(entity, table, normalized_columns) + (row_id,)
+        )
+
+    def refresh_normalized_names(self, entity_type: Optional[str] = None) -> int:
+        """
+        Recompute the stored normalized_name and name_profile columns
+        (backfill after migration or after changing the normalization rules)
+
+        Args:
+            entity_type: Only refresh this entity type (None refreshes all)
+
+        Returns:
+            Number of rows updated
+        """
+        tables = [entity_type] if entity_type else sorted(VALID_ENTITY_TYPES)
+        cursor = self.conn.cursor()
+        updated = 0
+
+        for table in tables:
+            if table not in VALID_ENTITY_TYPES:
+                raise ValueError(
+                    f"Invalid entity type: '{table}'. "
+                    f"Must be one of: {', '.join(sorted(VALID_ENTITY_TYPES))}"
+                )
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+                (table,)
+            )
+            if not cursor.fetchone():
+                continue
+            normalized_columns = self._normalized_columns(table)
+            if not normalized_columns:
+                continue
+
+            cursor.execute(f"SELECT * FROM {table}")
+            columns = [column[0] for column in cursor.description]
+            entities = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            values = [
+                self._normalized_values(entity, table, normalized_columns) + (entity["id"],)
+                for entity in entities
+            ]
+            assignments = ", ".join(f"{column} = ?" for column in normalized_columns)
+            cursor.executemany(f"UPDATE {table} SET {assignments} WHERE id = ?", values)
+            updated += len(values)
+
+        self.conn.commit()
+        return updated
             
     def init_schema(self):
         """Create all tables based on ontology schema"""
@@ -109,12 +289,41 @@ class IntelligenceDB:
                 extraction_status TEXT DEFAULT 'pending',
                 extraction_attempts INTEGER DEFAULT 0,
                 last_extraction_error TEXT,
+                content_hash TEXT,
                 UNIQUE(respondent, company, date)
             )
         """)
 
         # Migrate existing interviews table if needed
         self._migrate_interviews_table(cursor)
+
+        # Extractor version and transcript hash per extracted entity type
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS interview_extractions (
+                interview_id INTEGER NOT NULL,
+                entity_type TEXT NOT NULL,
+                extractor_version TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                extracted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (interview_id, entity_type),
+                FOREIGN KEY (interview_id) REFERENCES interviews(id)
+            )
+        """)
+
+        # What each interview added to the shared systems rows (mentions,
+        # company, list items), subtracted before its systems are re-extracted
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS interview_system_contributions (
+                interview_id INTEGER NOT NULL,
+                system_id INTEGER NOT NULL,
+                company TEXT,
+                mentions INTEGER NOT NULL DEFAULT 0,
+                added_company INTEGER NOT NULL DEFAULT 0,
+                mentioned_items TEXT,
+                introduced_items TEXT,
+                PRIMARY KEY (interview_id, system_id)
+            )
+        """)
         
         # Pain Points table
         cursor.execute("""
@@ -260,6 +469,12 @@ class IntelligenceDB:
                 cursor.execute("ALTER TABLE interviews ADD COLUMN last_extraction_error TEXT")
                 print("  ✓ Added last_extraction_error column")
 
+            # Add content_hash if missing (backfilled on first lookup)
+            if "content_hash" not in columns:
+                cursor.execute("ALTER TABLE interviews ADD COLUMN content_hash TEXT")
+                self._columns_cache.pop("interviews", None)
+                print("  ✓ Added content_hash column")
+
             self.conn.commit()
 
         except Exception as e:
@@ -373,14 +588,15 @@ class IntelligenceDB:
         cursor = self.conn.cursor()
         
         cursor.execute("""
-            INSERT OR IGNORE INTO interviews (company, respondent, role, date, raw_data)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT OR IGNORE INTO interviews (company, respondent, role, date, raw_data, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?)
         """, (
             meta.get("company", "Unknown"),
             meta.get("respondent", "Unknown"),
             meta.get("role", "Unknown"),
             meta.get("date", "Unknown"),
-            json_serialize({"meta": meta, "qa_pairs": qa_pairs})
+            json_serialize({"meta": meta, "qa_pairs": qa_pairs}),
+            interview_content_hash(qa_pairs)
         ))
         
         self.conn.commit()
@@ -393,210 +609,617 @@ class IntelligenceDB:
         
         result = cursor.fetchone()
         return result[0] if result else None
-    
-    def insert_pain_point(self, interview_id: int, company: str, pain_point: Dict):
-        """Insert a pain point with optional review metrics"""
+
+    def get_extraction_state(self, meta: Dict) -> Optional[Dict]:
+        """
+        Get what was last extracted for an interview (for incremental runs)
+
+        Args:
+            meta: Interview metadata (respondent, company, date)
+
+        Returns:
+            None if the interview is not stored, else a dict with id,
+            extraction_status, content_hash (of the stored transcript) and
+            versions {entity_type: (extractor_version, content_hash)}
+        """
         cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT id, extraction_status, content_hash, raw_data FROM interviews
+            WHERE respondent = ? AND company = ? AND date = ?
+        """, (meta.get("respondent"), meta.get("company", "Unknown"), meta.get("date")))
+        row = cursor.fetchone()
+        if row is None:
+            return None
 
-        # Extract review metrics if available
-        review_metrics = pain_point.get("_review_metrics", {})
+        interview_id, status, content_hash, raw_data = row
+        if content_hash is None:
+            # Stored before content hashes existed: derive it once from raw_data
+            try:
+                content_hash = interview_content_hash(json.loads(raw_data).get("qa_pairs", {}))
+            except (TypeError, ValueError, AttributeError):
+                content_hash = ""
+            cursor.execute("UPDATE interviews SET content_hash = ? WHERE id = ?", (content_hash, interview_id))
+            self.conn.commit()
 
-        # Check if review fields exist in table
-        cursor.execute("PRAGMA table_info(pain_points)")
-        columns = [row[1] for row in cursor.fetchall()]
-        has_review_fields = "review_quality_score" in columns
+        cursor.execute("""
+            SELECT entity_type, extractor_version, content_hash FROM interview_extractions
+            WHERE interview_id = ?
+        """, (interview_id,))
+
+        return {
+            "id": interview_id,
+            "extraction_status": status,
+            "content_hash": content_hash,
+            "versions": {entity_type: (version, extracted_hash) for entity_type, version, extracted_hash in cursor.fetchall()}
+        }
 
-        if has_review_fields:
-            cursor.execute("""
-                INSERT INTO pain_points (
-                    interview_id, company, type, description, affected_roles,
-                    affected_processes, frequency, severity, impact_description,
-                    proposed_solutions,
-                    review_quality_score, review_accuracy_score, review_completeness_score,
-                    review_relevance_score, review_consistency_score, review_hallucination_score,
-                    review_consensus_level, review_needs_human, review_feedback,
-                    review_model_agreement
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                interview_id,
-                company,
-                pain_point.get("type", "Unknown"),
-                pain_point.get("description", ""),
-                json_serialize(pain_point.get("affected_roles", [])),
-                json_serialize(pain_point.get("affected_processes", [])),
-                pain_point.get("frequency", "Unknown"),
-                pain_point.get("severity", "Unknown"),
-                pain_point.get("impact_description", ""),
-                json_serialize(pain_point.get("proposed_solutions", [])),
-                review_metrics.get("overall_quality", 0.0),
-                review_metrics.get("accuracy_score", 0.0),
-                review_metrics.get("completeness_score", 0.0),
-                review_metrics.get("relevance_score", 0.0),
-                review_metrics.get("consistency_score", 0.0),
-                review_metrics.get("hallucination_score", 0.0),
-                review_metrics.get("consensus_level", 0.0),
-                1 if review_metrics.get("needs_human_review", False) else 0,
-                review_metrics.get("review_feedback", ""),
-                json_serialize(review_metrics.get("model_agreement", {}))
-            ))
-        else:
-            # Fallback to original insert without review fields
-            cursor.execute("""
-                INSERT INTO pain_points (
-                    interview_id, company, type, description, affected_roles,
-                    affected_processes, frequency, severity, impact_description,
-                    proposed_solutions
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                interview_id,
-                company,
-                pain_point.get("type", "Unknown"),
-                pain_point.get("description", ""),
-                json_serialize(pain_point.get("affected_roles", [])),
-                json_serialize(pain_point.get("affected_processes", [])),
-                pain_point.get("frequency", "Unknown"),
-                pain_point.get("severity", "Unknown"),
-                pain_point.get("impact_description", ""),
-                json_serialize(pain_point.get("proposed_solutions", []))
-            ))
+    def update_interview_content(self, interview_id: int, meta: Dict, qa_pairs: Dict):
+        """Replace the stored transcript (and its hash) of an edited interview"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            UPDATE interviews SET role = ?, raw_data = ?, content_hash = ? WHERE id = ?
+        """, (
+            meta.get("role", "Unknown"),
+            json_serialize({"meta": meta, "qa_pairs": qa_pairs}),
+            interview_content_hash(qa_pairs),
+            interview_id
+        ))
+        self.conn.commit()
 
+    def record_extractions(self, interview_id: int, content_hash: str, versions: Dict[str, str]):
+        """
+        Record which extractor versions produced an interview's entities
+
+        Args:
+            interview_id: ID of the interview
+            content_hash: Hash of the transcript that was extracted
+            versions: entity_type -> extractor version of the types just extracted
+        """
+        cursor = self.conn.cursor()
+        cursor.executemany("""
+            INSERT OR REPLACE INTO interview_extractions (interview_id, entity_type, extractor_version, content_hash)
+            VALUES (?, ?, ?, ?)
+        """, [(interview_id, entity_type, version, content_hash) for entity_type, version in versions.items()])
+        self.conn.commit()
+
+    def delete_interview_entities(self, interview_id: int, entity_types: Optional[List[str]] = None) -> int:
+        """
+        Delete an interview's stored entities before they are re-extracted
+
+        Args:
+            interview_id: ID of the interview
+            entity_types: Extraction entity types (EXTRACTION_TABLES keys);
+                None deletes all of them
+
+        Returns:
+            Number of rows deleted
+        """
+        if entity_types is None:
+            entity_types = list(EXTRACTION_TABLES)
+        tables = {table for entity_type in entity_types for table in EXTRACTION_TABLES.get(entity_type, [])}
+
+        cursor = self.conn.cursor()
+        deleted = 0
+        for table in sorted(tables):
+            if not self._table_columns(table):
+                continue  # Table not created (v1-only schema)
+            cursor.execute(f"DELETE FROM {table} WHERE interview_id = ?", (interview_id,))
+            deleted += cursor.rowcount
+        if "systems_v2" in entity_types:
+            deleted += self._remove_system_contributions(interview_id)
+        cursor.executemany(
+            "DELETE FROM interview_extractions WHERE interview_id = ? AND entity_type = ?",
+            [(interview_id, entity_type) for entity_type in entity_types]
+        )
         self.conn.commit()
+        return deleted
+    
+    def insert_pain_point(self, interview_id: int, company: str, pain_point: Dict):
+        """Insert a pain point with optional review metrics"""
+        self._insert_entity_rows("pain_points", [self._pain_point_row(interview_id, company, None, pain_point)])
+        self.conn.commit()
+
+    def _pain_point_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        pain_point: Dict
+    ) -> Dict[str, Any]:
+        """Build the pain_points row for a pain point (with review metrics if the table has them)"""
+        row = {
+            "interview_id": interview_id,
+            "company": company,
+            "type": pain_point.get("type", "Unknown"),
+            "description": pain_point.get("description", ""),
+            "affected_roles": json_serialize(pain_point.get("affected_roles", [])),
+            "affected_processes": json_serialize(pain_point.get("affected_processes", [])),
+            "frequency": pain_point.get("frequency", "Unknown"),
+            "severity": pain_point.get("severity", "Unknown"),
+            "impact_description": pain_point.get("impact_description", ""),
+            "proposed_solutions": json_serialize(pain_point.get("proposed_solutions", []))
+        }
+
+        # Review fields only exist after add_ensemble_review_fields()
+        if "review_quality_score" in self._table_columns("pain_points"):
+            # Extract review metrics if available
+            review_metrics = pain_point.get("_review_metrics", {})
+            row.update({
+                "review_quality_score": review_metrics.get("overall_quality", 0.0),
+                "review_accuracy_score": review_metrics.get("accuracy_score", 0.0),
+                "review_completeness_score": review_metrics.get("completeness_score", 0.0),
+                "review_relevance_score": review_metrics.get("relevance_score", 0.0),
+                "review_consistency_score": review_metrics.get("consistency_score", 0.0),
+                "review_hallucination_score": review_metrics.get("hallucination_score", 0.0),
+                "review_consensus_level": review_metrics.get("consensus_level", 0.0),
+                "review_needs_human": 1 if review_metrics.get("needs_human_review", False) else 0,
+                "review_feedback": review_metrics.get("review_feedback", ""),
+                "review_model_agreement": json_serialize(review_metrics.get("model_agreement", {}))
+            })
+
+        return row
     
     def insert_process(self, interview_id: int, company: str, process: Dict):
         """Insert a process"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO processes (
-                interview_id, company, name, owner, domain, description,
-                inputs, outputs, systems, frequency, dependencies
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            process.get("name", ""),
-            process.get("owner", ""),
-            process.get("domain", ""),
-            process.get("description", ""),
-            json_serialize(process.get("inputs", [])),
-            json_serialize(process.get("outputs", [])),
-            json_serialize(process.get("systems", [])),
-            process.get("frequency", ""),
-            json_serialize(process.get("dependencies", []))
-        ))
-        
+        self._insert_entity_rows("processes", [self._process_row(interview_id, company, None, process)])
         self.conn.commit()
+
+    def _process_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        process: Dict
+    ) -> Dict[str, Any]:
+        """Build the processes row for a process"""
+        return {
+            "interview_id": interview_id,
+            "company": company,
+            "name": process.get("name", ""),
+            "owner": process.get("owner", ""),
+            "domain": process.get("domain", ""),
+            "description": process.get("description", ""),
+            "inputs": json_serialize(process.get("inputs", [])),
+            "outputs": json_serialize(process.get("outputs", [])),
+            "systems": json_serialize(process.get("systems", [])),
+            "frequency": process.get("frequency", ""),
+            "dependencies": json_serialize(process.get("dependencies", []))
+        }
     
-    def insert_or_update_system(self, system: Dict, company: str):
-        """Insert or update a system"""
+    def insert_or_update_system(self, system: Dict, company: str, interview_id: Optional[int] = None):
+        """Insert or update a system (contribution recorded if interview_id is given)"""
+        self._upsert_systems([system], company, enhanced=False, interview_id=interview_id)
+        self.conn.commit()
+
+    def _system_row(self, system: Dict, company: str, enhanced: bool) -> Dict[str, Any]:
+        """Build the systems row for a new system (v2.0 fields if enhanced)"""
+        row = {
+            "name": system.get("name", ""),
+            "domain": system.get("domain", ""),
+            "vendor": system.get("vendor", ""),
+            "type": system.get("type", ""),
+            "companies_using": json_serialize([company]),
+            "pain_points": json_serialize(system.get("pain_points", []))
+        }
+        if enhanced:
+            row.update({
+                "integration_pain_points": json_serialize(system.get("integration_pain_points", [])),
+                "data_quality_issues": json_serialize(system.get("data_quality_issues", [])),
+                "user_satisfaction_score": system.get("user_satisfaction_score"),
+                "replacement_candidate": 1 if system.get("replacement_candidate") else 0,
+                "adoption_rate": system.get("adoption_rate")
+            })
+        return row
+
+    def _upsert_systems(
+        self,
+        systems: List[Dict],
+        company: str,
+        enhanced: bool,
+        interview_id: Optional[int] = None
+    ) -> int:
+        """
+        Insert new systems and update existing ones (matched by name), no commit
+
+        Equivalent to upserting the systems one after another: the first
+        mention of an unknown name is inserted, every later mention updates
+        that row. New rows go through one executemany, and each updated row
+        gets one UPDATE with its final state.
+
+        Args:
+            systems: System dicts, in mention order
+            company: Company using the systems
+            enhanced: Use the v2.0 columns (insert_or_update_enhanced_system)
+            interview_id: Interview the mentions come from; its contribution
+                is recorded so a re-extraction can subtract it
+
+        Returns:
+            Number of systems processed
+        """
+        names = [system.get("name") for system in systems if system.get("name") is not None]
+        states = self._fetch_system_states(names, enhanced)
+        fields = SYSTEM_LIST_FIELDS if enhanced else SYSTEM_LIST_FIELDS[:1]
+        contributions: Dict[str, Dict[str, Any]] = {}
+
+        new_rows = []
+        new_names = set()
+        updates = []
+        for system in systems:
+            name = system.get("name")
+            if name is not None and (name in states or name in new_names):
+                updates.append(system)
+            else:
+                new_rows.append(self._system_row(system, company, enhanced))
+                if name is not None:
+                    new_names.add(name)
+                    items = {field: list(system.get(field, [])) for field in fields}
+                    self._add_system_contribution(contributions, name, 1, True, items, items)
+
+        self._insert_entity_rows("systems", new_rows)
+        if not updates:
+            if interview_id is not None:
+                self._record_system_contributions(interview_id, company, contributions)
+            return len(systems)
+
+        # Rows inserted above that are mentioned again
+        states.update(self._fetch_system_states(
+            [name for name in new_names if name not in states], enhanced
+        ))
+
+        touched: Dict[int, Dict[str, Any]] = {}
+        for system in updates:
+            state = states[system.get("name")]
+            had_company = company in state["companies"]
+            before = {field: set(state[field]) for field in SYSTEM_LIST_FIELDS if field in state}
+            self._merge_system_mention(state, system, company, enhanced)
+            touched[state["id"]] = state
+            self._add_system_contribution(
+                contributions,
+                system.get("name"),
+                1,
+                not had_company,
+                {field: list(system.get(field, [])) for field in before},
+                {field: [item for item in state[field] if item not in before[field]] for field in before}
+            )
+
+        if interview_id is not None:
+            self._record_system_contributions(interview_id, company, contributions)
+
         cursor = self.conn.cursor()
-        
-        # Check if system exists
-        cursor.execute("SELECT id, companies_using, usage_count FROM systems WHERE name = ?", 
-                      (system.get("name"),))
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing system
-            system_id, companies_json, usage_count = existing
-            companies = json.loads(companies_json) if companies_json else []
-            if company not in companies:
-                companies.append(company)
-            
-            cursor.execute("""
+        if enhanced:
+            cursor.executemany("""
                 UPDATE systems 
-                SET companies_using = ?, usage_count = ?, updated_at = CURRENT_TIMESTAMP
+                SET companies_using = ?, 
+                    usage_count = ?,
+                    pain_points = ?,
+                    integration_pain_points = ?,
+                    data_quality_issues = ?,
+                    user_satisfaction_score = ?,
+                    replacement_candidate = ?,
+                    adoption_rate = ?,
+                    updated_at = CURRENT_TIMESTAMP
                 WHERE id = ?
-            """, (json_serialize(companies), usage_count + 1, system_id))
+            """, [
+                (
+                    json_serialize(state["companies"]),
+                    state["usage_count"],
+                    json_serialize(state["pain_points"]),
+                    json_serialize(state["integration_pain_points"]),
+                    json_serialize(state["data_quality_issues"]),
+                    state["user_satisfaction_score"],
+                    state["replacement_candidate"],
+                    state["adoption_rate"],
+                    system_id
+                )
+                for system_id, state in touched.items()
+            ])
         else:
-            # Insert new system
+            cursor.executemany("""
+                UPDATE systems 
+                SET companies_using = ?, usage_count = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, [
+                (json_serialize(state["companies"]), state["usage_count"], system_id)
+                for system_id, state in touched.items()
+            ])
+
+        return len(systems)
+
+    def _fetch_system_states(self, names: List[str], enhanced: bool) -> Dict[str, Dict[str, Any]]:
+        """Load the mergeable state of existing systems, keyed by name"""
+        columns = "id, name, companies_using, usage_count"
+        if enhanced:
+            columns += ", pain_points, integration_pain_points, data_quality_issues"
+
+        states = {}
+        unique_names = list(dict.fromkeys(names))
+        cursor = self.conn.cursor()
+        # SQLite limits bound parameters per statement (999 on older builds)
+        for start in range(0, len(unique_names), 500):
+            chunk = unique_names[start:start + 500]
+            cursor.execute(
+                f"SELECT {columns} FROM systems WHERE name IN ({', '.join('?' * len(chunk))})",
+                chunk
+            )
+            for row in cursor.fetchall():
+                state = {
+                    "id": row[0],
+                    "companies": json.loads(row[2]) if row[2] else [],
+                    "usage_count": row[3]
+                }
+                if enhanced:
+                    state["pain_points"] = json.loads(row[4]) if row[4] else []
+                    state["integration_pain_points"] = json.loads(row[5]) if row[5] else []
+                    state["data_quality_issues"] = json.loads(row[6]) if row[6] else []
+                states[row[1]] = state
+        return states
+
+    @staticmethod
+    def _add_system_contribution(
+        contributions: Dict[str, Dict[str, Any]],
+        name: str,
+        mentions: int,
+        added_company: bool,
+        mentioned: Dict[str, List],
+        introduced: Dict[str, List]
+    ):
+        """Add mentions of a system to an interview's contributions (keyed by name)"""
+        contribution = contributions.setdefault(
+            name, {"mentions": 0, "added_company": False, "mentioned": {}, "introduced": {}}
+        )
+        contribution["mentions"] += mentions
+        contribution["added_company"] = contribution["added_company"] or added_company
+        for key, items in (("mentioned", mentioned), ("introduced", introduced)):
+            for field, values in items.items():
+                merged = contribution[key].setdefault(field, [])
+                merged.extend(value for value in values if value not in merged)
+
+    def _record_system_contributions(self, interview_id: int, company: str, contributions: Dict[str, Dict[str, Any]]):
+        """Merge an interview's system contributions into the stored ones, no commit"""
+        if not contributions or not self._table_columns("interview_system_contributions"):
+            return
+
+        ids = {name: state["id"] for name, state in self._fetch_system_states(list(contributions), False).items()}
+        cursor = self.conn.cursor()
+        rows = []
+        for name, contribution in contributions.items():
+            system_id = ids.get(name)
+            if system_id is None:
+                continue
             cursor.execute("""
-                INSERT INTO systems (name, domain, vendor, type, companies_using, pain_points)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                system.get("name", ""),
-                system.get("domain", ""),
-                system.get("vendor", ""),
-                system.get("type", ""),
-                json_serialize([company]),
-                json_serialize(system.get("pain_points", []))
+                SELECT mentions, added_company, mentioned_items, introduced_items
+                FROM interview_system_contributions WHERE interview_id = ? AND system_id = ?
+            """, (interview_id, system_id))
+            stored = cursor.fetchone()
+            if stored is not None:
+                merged = {name: {
+                    "mentions": stored[0],
+                    "added_company": bool(stored[1]),
+                    "mentioned": json.loads(stored[2]) if stored[2] else {},
+                    "introduced": json.loads(stored[3]) if stored[3] else {}
+                }}
+                self._add_system_contribution(
+                    merged,
+                    name,
+                    contribution["mentions"],
+                    contribution["added_company"],
+                    contribution["mentioned"],
+                    contribution["introduced"]
+                )
+                contribution = merged[name]
+            rows.append((
+                interview_id,
+                system_id,
+                company,
+                contribution["mentions"],
+                1 if contribution["added_company"] else 0,
+                json_serialize(contribution["mentioned"]),
+                json_serialize(contribution["introduced"])
             ))
-        
-        self.conn.commit()
+
+        cursor.executemany("""
+            INSERT OR REPLACE INTO interview_system_contributions
+                (interview_id, system_id, company, mentions, added_company, mentioned_items, introduced_items)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    def _remove_system_contributions(self, interview_id: int) -> int:
+        """
+        Subtract an interview's recorded contribution from the systems rows, no commit
+
+        usage_count loses the interview's mentions (rows left with no
+        mentions are deleted). The company and the list items the interview
+        introduced are removed unless another interview's recorded
+        contribution still accounts for them.
+
+        Args:
+            interview_id: ID of the interview
+
+        Returns:
+            Number of systems rows deleted
+        """
+        if not self._table_columns("interview_system_contributions"):
+            return 0
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT system_id, company, mentions, added_company, introduced_items
+            FROM interview_system_contributions WHERE interview_id = ?
+        """, (interview_id,))
+        contributions = cursor.fetchall()
+
+        fields = [field for field in SYSTEM_LIST_FIELDS if field in self._table_columns("systems")]
+        deleted = 0
+        for system_id, company, mentions, added_company, introduced_items in contributions:
+            cursor.execute(
+                f"SELECT usage_count, companies_using, {', '.join(fields)} FROM systems WHERE id = ?",
+                (system_id,)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                continue
+
+            usage_count = (row[0] or 0) - mentions
+            if usage_count <= 0:
+                cursor.execute("DELETE FROM systems WHERE id = ?", (system_id,))
+                deleted += 1
+                continue
+
+            # What the other interviews' contributions still account for
+            cursor.execute("""
+                SELECT company, mentioned_items FROM interview_system_contributions
+                WHERE system_id = ? AND interview_id != ?
+            """, (system_id, interview_id))
+            other_companies = set()
+            other_items: Dict[str, set] = {field: set() for field in fields}
+            for other_company, mentioned_items in cursor.fetchall():
+                other_companies.add(other_company)
+                for field, items in (json.loads(mentioned_items) if mentioned_items else {}).items():
+                    other_items.setdefault(field, set()).update(items)
+
+            companies = json.loads(row[1]) if row[1] else []
+            if added_company and company not in other_companies:
+                companies = [name for name in companies if name != company]
+
+            introduced = json.loads(introduced_items) if introduced_items else {}
+            values = [usage_count, json_serialize(companies)]
+            for position, field in enumerate(fields, start=2):
+                removable = set(introduced.get(field, [])) - other_items[field]
+                current = json.loads(row[position]) if row[position] else []
+                values.append(json_serialize([item for item in current if item not in removable]))
+
+            assignments = ", ".join(f"{field} = ?" for field in fields)
+            cursor.execute(
+                f"UPDATE systems SET usage_count = ?, companies_using = ?, {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                values + [system_id]
+            )
+
+        cursor.execute("DELETE FROM interview_system_contributions WHERE interview_id = ?", (interview_id,))
+        return deleted
+
+    @staticmethod
+    def _merge_system_mention(state: Dict[str, Any], system: Dict, company: str, enhanced: bool):
+        """Apply one more mention of an existing system to its state"""
+        if company not in state["companies"]:
+            state["companies"].append(company)
+        state["usage_count"] = state["usage_count"] + 1
+
+        if enhanced:
+            # Merge pain points and integration issues
+            state["pain_points"] = list(set(state["pain_points"] + system.get("pain_points", [])))
+            state["integration_pain_points"] = list(set(
+                state["integration_pain_points"] + system.get("integration_pain_points", [])
+            ))
+            state["data_quality_issues"] = list(set(
+                state["data_quality_issues"] + system.get("data_quality_issues", [])
+            ))
+            state["user_satisfaction_score"] = system.get("user_satisfaction_score")
+            state["replacement_candidate"] = 1 if system.get("replacement_candidate") else 0
+            state["adoption_rate"] = system.get("adoption_rate")
     
     def insert_kpi(self, interview_id: int, company: str, kpi: Dict):
         """Insert a KPI"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO kpis (
-                interview_id, company, name, domain, definition, formula,
-                owner, data_source, baseline, target, cadence, related_processes
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            kpi.get("name", ""),
-            kpi.get("domain", ""),
-            kpi.get("definition", ""),
-            kpi.get("formula", ""),
-            kpi.get("owner", ""),
-            kpi.get("data_source", ""),
-            kpi.get("baseline", ""),
-            kpi.get("target", ""),
-            kpi.get("cadence", ""),
-            json_serialize(kpi.get("related_processes", []))
-        ))
-        
+        self._insert_entity_rows("kpis", [self._kpi_row(interview_id, company, None, kpi)])
         self.conn.commit()
+
+    def _kpi_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        kpi: Dict
+    ) -> Dict[str, Any]:
+        """Build the kpis row for a KPI"""
+        return {
+            "interview_id": interview_id,
+            "company": company,
+            "name": kpi.get("name", ""),
+            "domain": kpi.get("domain", ""),
+            "definition": kpi.get("definition", ""),
+            "formula": kpi.get("formula", ""),
+            "owner": kpi.get("owner", ""),
+            "data_source": kpi.get("data_source", ""),
+            "baseline": kpi.get("baseline", ""),
+            "target": kpi.get("target", ""),
+            "cadence": kpi.get("cadence", ""),
+            "related_processes": json_serialize(kpi.get("related_processes", []))
+        }
     
     def insert_automation_candidate(self, interview_id: int, company: str, automation: Dict):
         """Insert an automation candidate"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO automation_candidates (
-                interview_id, company, name, process, trigger_event, action,
-                output, owner, complexity, impact, effort_estimate, systems_involved
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            automation.get("name", ""),
-            automation.get("process", ""),
-            automation.get("trigger", ""),
-            automation.get("action", ""),
-            automation.get("output", ""),
-            automation.get("owner", ""),
-            automation.get("complexity", ""),
-            automation.get("impact", ""),
-            automation.get("effort_estimate", ""),
-            json_serialize(automation.get("systems_involved", []))
-        ))
-        
+        self._insert_entity_rows("automation_candidates", [self._automation_candidate_row(interview_id, company, None, automation)])
         self.conn.commit()
+
+    def _automation_candidate_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        automation: Dict
+    ) -> Dict[str, Any]:
+        """Build the automation_candidates row for an automation candidate"""
+        return {
+            "interview_id": interview_id,
+            "company": company,
+            "name": automation.get("name", ""),
+            "process": automation.get("process", ""),
+            "trigger_event": automation.get("trigger", ""),
+            "action": automation.get("action", ""),
+            "output": automation.get("output", ""),
+            "owner": automation.get("owner", ""),
+            "complexity": automation.get("complexity", ""),
+            "impact": automation.get("impact", ""),
+            "effort_estimate": automation.get("effort_estimate", ""),
+            "systems_involved": json_serialize(automation.get("systems_involved", []))
+        }
     
     def insert_inefficiency(self, interview_id: int, company: str, inefficiency: Dict):
         """Insert an inefficiency"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO inefficiencies (
-                interview_id, company, description, category, frequency,
-                time_wasted, related_process
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            inefficiency.get("description", ""),
-            inefficiency.get("category", ""),
-            inefficiency.get("frequency", ""),
-            inefficiency.get("time_wasted", ""),
-            inefficiency.get("related_process", "")
-        ))
-        
+        self._insert_entity_rows("inefficiencies", [self._inefficiency_row(interview_id, company, None, inefficiency)])
         self.conn.commit()
+
+    def _inefficiency_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        inefficiency: Dict
+    ) -> Dict[str, Any]:
+        """Build the inefficiencies row for an inefficiency"""
+        return {
+            "interview_id": interview_id,
+            "company": company,
+            "description": inefficiency.get("description", ""),
+            "category": inefficiency.get("category", ""),
+            "frequency": inefficiency.get("frequency", ""),
+            "time_wasted": inefficiency.get("time_wasted", ""),
+            "related_process": inefficiency.get("related_process", "")
+        }
     
+    # Target table and row builder per insert_entities_batch entity type
+    # (systems are upserted by name instead of built row by row)
+    BATCH_ENTITY_TYPES = {
+        "pain_points": ("pain_points", "_pain_point_row"),
+        "processes": ("processes", "_process_row"),
+        "systems": ("systems", None),
+        "kpis": ("kpis", "_kpi_row"),
+        "automation_candidates": ("automation_candidates", "_automation_candidate_row"),
+        "inefficiencies": ("inefficiencies", "_inefficiency_row"),
+        "communication_channels": ("communication_channels", "_communication_channel_row"),
+        "decision_points": ("decision_points", "_decision_point_row"),
+        "data_flows": ("data_flows", "_data_flow_row"),
+        "temporal_patterns": ("temporal_patterns", "_temporal_pattern_row"),
+        "failure_modes": ("failure_modes", "_failure_mode_row"),
+        "team_structures": ("team_structures", "_team_structure_row"),
+        "knowledge_gaps": ("knowledge_gaps", "_knowledge_gap_row"),
+        "success_patterns": ("success_patterns", "_success_pattern_row"),
+        "budget_constraints": ("budget_constraints", "_budget_constraint_row"),
+        "external_dependencies": ("external_dependencies", "_external_dependency_row"),
+        "pain_points_v2": ("pain_points", "_enhanced_pain_point_row"),
+        "systems_v2": ("systems", None),
+        "automation_candidates_v2": ("automation_candidates", "_enhanced_automation_candidate_row")
+    }
+
     def insert_entities_batch(
         self,
         entity_type: str,
@@ -606,7 +1229,13 @@ class IntelligenceDB:
         business_unit: str = None
     ) -> Dict[str, Any]:
         """
-        Batch insert multiple entities of the same type using transactions
+        Batch insert multiple entities of the same type in one transaction
+
+        Rows are built up front and written with a single executemany per
+        table (systems: one executemany for new rows plus one for updates).
+        If the bulk write fails, it is redone entity by entity inside the same
+        transaction so valid entities are kept and failures are reported.
+        The transaction is committed once, at the end.
 
         Args:
             entity_type: Type of entity (e.g., "pain_points", "processes")
@@ -622,61 +1251,32 @@ class IntelligenceDB:
             return {"success": True, "inserted": 0, "errors": []}
 
         cursor = self.conn.cursor()
-        inserted = 0
         errors = []
 
         try:
-            # Start transaction
-            cursor.execute("BEGIN TRANSACTION")
+            spec = self.BATCH_ENTITY_TYPES.get(entity_type)
+            if not spec:
+                raise ValueError(f"Unknown entity type: {entity_type}")
+            table, row_builder = spec
 
-            # Map entity type to insert method
-            insert_methods = {
-                "pain_points": self.insert_pain_point,
-                "processes": self.insert_process,
-                "systems": self.insert_or_update_system,
-                "kpis": self.insert_kpi,
-                "automation_candidates": self.insert_automation_candidate,
-                "inefficiencies": self.insert_inefficiency,
-                "communication_channels": self.insert_communication_channel,
-                "decision_points": self.insert_decision_point,
-                "data_flows": self.insert_data_flow,
-                "temporal_patterns": self.insert_temporal_pattern,
-                "failure_modes": self.insert_failure_mode,
-                "team_structures": self.insert_team_structure,
-                "knowledge_gaps": self.insert_knowledge_gap,
-                "success_patterns": self.insert_success_pattern,
-                "budget_constraints": self.insert_budget_constraint,
-                "external_dependencies": self.insert_external_dependency,
-                "pain_points_v2": self.insert_enhanced_pain_point,
-                "systems_v2": self.insert_or_update_enhanced_system,
-                "automation_candidates_v2": self.insert_enhanced_automation_candidate
-            }
+            if row_builder is None:
+                enhanced = entity_type == "systems_v2"
 
-            insert_method = insert_methods.get(entity_type)
-            if not insert_method:
-                raise ValueError(f"Unknown entity type: {entity_type}")
+                def write(batch: List[Dict]):
+                    self._upsert_systems(batch, company, enhanced, interview_id)
+            else:
+                build_row = getattr(self, row_builder)
+                unit = business_unit or "Unknown"
+
+                def write(batch: List[Dict]):
+                    rows = [build_row(interview_id, company, unit, entity) for entity in batch]
+                    self._insert_entity_rows(table, rows)
+
+            # Start transaction
+            if not self.conn.in_transaction:
+                cursor.execute("BEGIN TRANSACTION")
 
-            # Insert each entity
-            for entity in entities:
-                try:
-                    # Call appropriate insert method based on entity type
-                    if entity_type in ["systems", "systems_v2"]:
-                        # Systems don't need interview_id
-                        insert_method(entity, company)
-                    elif entity_type in ["communication_channels", "decision_points", "data_flows",
-                                       "temporal_patterns", "failure_modes", "team_structures",
-                                       "knowledge_gaps", "success_patterns", "budget_constraints",
-                                       "external_dependencies", "pain_points_v2", "automation_candidates_v2"]:
-                        # v2.0 entities need business_unit
-                        insert_method(interview_id, company, business_unit or "Unknown", entity)
-                    else:
-                        # v1.0 entities
-                        insert_method(interview_id, company, entity)
-
-                    inserted += 1
-
-                except Exception as e:
-                    errors.append(f"{entity.get('name', 'unknown')}: {str(e)[:100]}")
+            inserted = self._write_entity_batch(write, entities, errors)
 
             # Commit transaction
             self.conn.commit()
@@ -698,6 +1298,42 @@ class IntelligenceDB:
                 "errors": [f"Transaction failed: {str(e)}"]
             }
 
+    def _write_entity_batch(self, write, entities: List[Dict], errors: List[str]) -> int:
+        """
+        Run a bulk write, falling back to one entity at a time on failure
+
+        Args:
+            write: Callable writing a list of entities (no commit)
+            entities: Entities to write
+            errors: List that per-entity error messages are appended to
+
+        Returns:
+            Number of entities written
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SAVEPOINT entity_batch")
+        try:
+            write(entities)
+            cursor.execute("RELEASE SAVEPOINT entity_batch")
+            return len(entities)
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT entity_batch")
+            cursor.execute("RELEASE SAVEPOINT entity_batch")
+
+        # Isolate the failing entities
+        inserted = 0
+        for entity in entities:
+            cursor.execute("SAVEPOINT entity_row")
+            try:
+                write([entity])
+                cursor.execute("RELEASE SAVEPOINT entity_row")
+                inserted += 1
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT entity_row")
+                cursor.execute("RELEASE SAVEPOINT entity_row")
+                errors.append(f"{entity.get('name', 'unknown')}: {str(e)[:100]}")
+        return inserted
+
     # ========================================================================
     # Consolidation Methods (Task 19 - SQL Injection Protection)
     # ========================================================================
@@ -819,6 +1455,8 @@ class IntelligenceDB:
             """
             
             cursor.execute(query, values)
+            if NORMALIZED_NAME_SOURCE_FIELDS & updated_data.keys():
+                self._store_normalized_name(entity_type, entity_id)
             self.conn.commit()
             
             return True
@@ -1134,6 +1772,7 @@ class EnhancedIntelligenceDB(IntelligenceDB):
         if column not in columns:
             try:
                 cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                self._columns_cache.pop(table, None)
                 print(f"  Added column {table}.{column}")
             except sqlite3.OperationalError as e:
                 print(f"  Warning: Could not add {table}.{column}: {e}")
@@ -1267,6 +1906,11 @@ class EnhancedIntelligenceDB(IntelligenceDB):
             print(f"  Adding consolidation fields to {table}...")
             for field_name, field_type in consolidation_fields:
                 self._add_column_if_not_exists(table, field_name, field_type)
+            if table in VALID_ENTITY_TYPES:
+                # Normalized comparison text and its character-count profile
+                # (candidate index blocking), computed at insert time
+                self._add_column_if_not_exists(table, "normalized_name", "TEXT")
+                self._add_column_if_not_exists(table, "name_profile", "BLOB")
         
         # Create relationships table
         print("\n  Creating relationships table...")
@@ -1407,11 +2051,19 @@ class EnhancedIntelligenceDB(IntelligenceDB):
                 CREATE INDEX IF NOT EXISTS idx_{table}_consolidated_confidence 
                 ON {table}(is_consolidated, consensus_confidence)
             """)
+            
+            # normalized_name is only read in full by duplicate detection: no index,
+            # and drop the one earlier migrations created so inserts stop maintaining it
+            cursor.execute(f"DROP INDEX IF EXISTS idx_{table}_normalized_name")
         
         print("  ✓ Created all entity indexes")
         print("  ✓ Created all consolidation indexes")
         
         self.conn.commit()
+        
+        # Backfill normalized names for rows inserted before the column existed
+        backfilled = self.refresh_normalized_names()
+        print(f"  ✓ Computed normalized names for {backfilled} entities")
         print("\n✅ Knowledge Graph consolidation schema added successfully")
     
     def _create_communication_channels_table(self):
@@ -1886,499 +2538,415 @@ class EnhancedIntelligenceDB(IntelligenceDB):
     
     def insert_communication_channel(self, interview_id: int, company: str, business_unit: str, channel: Dict):
         """Insert a communication channel entity"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO communication_channels (
-                interview_id, company_name, business_unit, department,
-                channel_name, purpose, frequency, participants,
-                response_sla_minutes, pain_points, related_processes,
-                confidence_score, needs_review, extraction_source, extraction_reasoning
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            business_unit,
-            channel.get("department"),
-            channel.get("channel_name", ""),
-            channel.get("purpose", ""),
-            channel.get("frequency", ""),
-            json_serialize(channel.get("participants", [])),
-            channel.get("response_sla_minutes"),
-            json_serialize(channel.get("pain_points", [])),
-            json_serialize(channel.get("related_processes", [])),
-            channel.get("confidence_score", 0.0),
-            1 if channel.get("confidence_score", 1.0) < 0.7 else 0,
-            channel.get("extraction_source", ""),
-            channel.get("extraction_reasoning", "")
-        ))
-        
+        self._insert_entity_rows("communication_channels", [self._communication_channel_row(interview_id, company, business_unit, channel)])
         self.conn.commit()
 
+    def _communication_channel_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        channel: Dict
+    ) -> Dict[str, Any]:
+        """Build the communication_channels row for a communication channel"""
+        return {
+            "interview_id": interview_id,
+            "company_name": company,
+            "business_unit": business_unit,
+            "department": channel.get("department"),
+            "channel_name": channel.get("channel_name", ""),
+            "purpose": channel.get("purpose", ""),
+            "frequency": channel.get("frequency", ""),
+            "participants": json_serialize(channel.get("participants", [])),
+            "response_sla_minutes": channel.get("response_sla_minutes"),
+            "pain_points": json_serialize(channel.get("pain_points", [])),
+            "related_processes": json_serialize(channel.get("related_processes", [])),
+            "confidence_score": channel.get("confidence_score", 0.0),
+            "needs_review": 1 if channel.get("confidence_score", 1.0) < 0.7 else 0,
+            "extraction_source": channel.get("extraction_source", ""),
+            "extraction_reasoning": channel.get("extraction_reasoning", "")
+        }
+
     
     def insert_decision_point(self, interview_id: int, company: str, business_unit: str, decision: Dict):
         """Insert a decision point entity"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO decision_points (
-                interview_id, company_name, business_unit, department,
-                decision_type, decision_maker_role, decision_criteria,
-                approval_required, approval_threshold, authority_limit_usd,
-                escalation_trigger, escalation_to_role, related_process,
-                confidence_score, needs_review, extraction_source, extraction_reasoning
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            business_unit,
-            decision.get("department"),
-            decision.get("decision_type", ""),
-            decision.get("decision_maker_role", ""),
-            json_serialize(decision.get("decision_criteria", [])),
-            1 if decision.get("approval_required") else 0,
-            decision.get("approval_threshold"),
-            decision.get("authority_limit_usd"),
-            decision.get("escalation_trigger"),
-            decision.get("escalation_to_role"),
-            decision.get("related_process"),
-            decision.get("confidence_score", 0.0),
-            1 if decision.get("confidence_score", 1.0) < 0.7 else 0,
-            decision.get("extraction_source", ""),
-            decision.get("extraction_reasoning", "")
-        ))
-        
+        self._insert_entity_rows("decision_points", [self._decision_point_row(interview_id, company, business_unit, decision)])
         self.conn.commit()
 
+    def _decision_point_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        decision: Dict
+    ) -> Dict[str, Any]:
+        """Build the decision_points row for a decision point"""
+        return {
+            "interview_id": interview_id,
+            "company_name": company,
+            "business_unit": business_unit,
+            "department": decision.get("department"),
+            "decision_type": decision.get("decision_type", ""),
+            "decision_maker_role": decision.get("decision_maker_role", ""),
+            "decision_criteria": json_serialize(decision.get("decision_criteria", [])),
+            "approval_required": 1 if decision.get("approval_required") else 0,
+            "approval_threshold": decision.get("approval_threshold"),
+            "authority_limit_usd": decision.get("authority_limit_usd"),
+            "escalation_trigger": decision.get("escalation_trigger"),
+            "escalation_to_role": decision.get("escalation_to_role"),
+            "related_process": decision.get("related_process"),
+            "confidence_score": decision.get("confidence_score", 0.0),
+            "needs_review": 1 if decision.get("confidence_score", 1.0) < 0.7 else 0,
+            "extraction_source": decision.get("extraction_source", ""),
+            "extraction_reasoning": decision.get("extraction_reasoning", "")
+        }
+
 
     
     def insert_data_flow(self, interview_id: int, company: str, business_unit: str, flow: Dict):
         """Insert a data flow entity"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO data_flows (
-                interview_id, company_name, business_unit, department,
-                source_system, target_system, data_type, transfer_method,
-                transfer_frequency, data_quality_issues, pain_points,
-                related_process, confidence_score, needs_review,
-                extraction_source, extraction_reasoning
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            business_unit,
-            flow.get("department"),
-            flow.get("source_system", ""),
-            flow.get("target_system", ""),
-            flow.get("data_type", ""),
-            flow.get("transfer_method", ""),
-            flow.get("transfer_frequency", ""),
-            json_serialize(flow.get("data_quality_issues", [])),
-            json_serialize(flow.get("pain_points", [])),
-            flow.get("related_process"),
-            flow.get("confidence_score", 0.0),
-            1 if flow.get("confidence_score", 1.0) < 0.7 else 0,
-            flow.get("extraction_source", ""),
-            flow.get("extraction_reasoning", "")
-        ))
-        
+        self._insert_entity_rows("data_flows", [self._data_flow_row(interview_id, company, business_unit, flow)])
         self.conn.commit()
 
+    def _data_flow_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        flow: Dict
+    ) -> Dict[str, Any]:
+        """Build the data_flows row for a data flow"""
+        return {
+            "interview_id": interview_id,
+            "company_name": company,
+            "business_unit": business_unit,
+            "department": flow.get("department"),
+            "source_system": flow.get("source_system", ""),
+            "target_system": flow.get("target_system", ""),
+            "data_type": flow.get("data_type", ""),
+            "transfer_method": flow.get("transfer_method", ""),
+            "transfer_frequency": flow.get("transfer_frequency", ""),
+            "data_quality_issues": json_serialize(flow.get("data_quality_issues", [])),
+            "pain_points": json_serialize(flow.get("pain_points", [])),
+            "related_process": flow.get("related_process"),
+            "confidence_score": flow.get("confidence_score", 0.0),
+            "needs_review": 1 if flow.get("confidence_score", 1.0) < 0.7 else 0,
+            "extraction_source": flow.get("extraction_source", ""),
+            "extraction_reasoning": flow.get("extraction_reasoning", "")
+        }
+
 
     
     def insert_temporal_pattern(self, interview_id: int, company: str, business_unit: str, pattern: Dict):
         """Insert a temporal pattern entity"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO temporal_patterns (
-                interview_id, company_name, business_unit, department,
-                activity_name, frequency, time_of_day, duration_minutes,
-                participants, triggers_actions, related_process,
-                confidence_score, needs_review, extraction_source, extraction_reasoning
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            business_unit,
-            pattern.get("department"),
-            pattern.get("activity_name", ""),
-            pattern.get("frequency", ""),
-            pattern.get("time_of_day"),
-            pattern.get("duration_minutes"),
-            json_serialize(pattern.get("participants", [])),
-            json_serialize(pattern.get("triggers_actions", [])),
-            pattern.get("related_process"),
-            pattern.get("confidence_score", 0.0),
-            1 if pattern.get("confidence_score", 1.0) < 0.7 else 0,
-            pattern.get("extraction_source", ""),
-            pattern.get("extraction_reasoning", "")
-        ))
-        
+        self._insert_entity_rows("temporal_patterns", [self._temporal_pattern_row(interview_id, company, business_unit, pattern)])
         self.conn.commit()
 
+    def _temporal_pattern_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        pattern: Dict
+    ) -> Dict[str, Any]:
+        """Build the temporal_patterns row for a temporal pattern"""
+        return {
+            "interview_id": interview_id,
+            "company_name": company,
+            "business_unit": business_unit,
+            "department": pattern.get("department"),
+            "activity_name": pattern.get("activity_name", ""),
+            "frequency": pattern.get("frequency", ""),
+            "time_of_day": pattern.get("time_of_day"),
+            "duration_minutes": pattern.get("duration_minutes"),
+            "participants": json_serialize(pattern.get("participants", [])),
+            "triggers_actions": json_serialize(pattern.get("triggers_actions", [])),
+            "related_process": pattern.get("related_process"),
+            "confidence_score": pattern.get("confidence_score", 0.0),
+            "needs_review": 1 if pattern.get("confidence_score", 1.0) < 0.7 else 0,
+            "extraction_source": pattern.get("extraction_source", ""),
+            "extraction_reasoning": pattern.get("extraction_reasoning", "")
+        }
+
 
     
     def insert_failure_mode(self, interview_id: int, company: str, business_unit: str, failure: Dict):
         """Insert a failure mode entity"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO failure_modes (
-                interview_id, company_name, business_unit, department,
-                failure_description, frequency, impact_description,
-                root_cause, current_workaround, recovery_time_minutes,
-                proposed_prevention, related_process, related_automation_candidate_id,
-                confidence_score, needs_review, extraction_source, extraction_reasoning
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            business_unit,
-            failure.get("department"),
-            failure.get("failure_description", ""),
-            failure.get("frequency", ""),
-            failure.get("impact_description", ""),
-            failure.get("root_cause"),
-            failure.get("current_workaround"),
-            failure.get("recovery_time_minutes"),
-            failure.get("proposed_prevention"),
-            failure.get("related_process"),
-            failure.get("related_automation_candidate_id"),
-            failure.get("confidence_score", 0.0),
-            1 if failure.get("confidence_score", 1.0) < 0.7 else 0,
-            failure.get("extraction_source", ""),
-            failure.get("extraction_reasoning", "")
-        ))
-        
+        self._insert_entity_rows("failure_modes", [self._failure_mode_row(interview_id, company, business_unit, failure)])
         self.conn.commit()
 
+    def _failure_mode_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        failure: Dict
+    ) -> Dict[str, Any]:
+        """Build the failure_modes row for a failure mode"""
+        return {
+            "interview_id": interview_id,
+            "company_name": company,
+            "business_unit": business_unit,
+            "department": failure.get("department"),
+            "failure_description": failure.get("failure_description", ""),
+            "frequency": failure.get("frequency", ""),
+            "impact_description": failure.get("impact_description", ""),
+            "root_cause": failure.get("root_cause"),
+            "current_workaround": failure.get("current_workaround"),
+            "recovery_time_minutes": failure.get("recovery_time_minutes"),
+            "proposed_prevention": failure.get("proposed_prevention"),
+            "related_process": failure.get("related_process"),
+            "related_automation_candidate_id": failure.get("related_automation_candidate_id"),
+            "confidence_score": failure.get("confidence_score", 0.0),
+            "needs_review": 1 if failure.get("confidence_score", 1.0) < 0.7 else 0,
+            "extraction_source": failure.get("extraction_source", ""),
+            "extraction_reasoning": failure.get("extraction_reasoning", "")
+        }
+
 
     
     def insert_enhanced_pain_point(self, interview_id: int, company: str, business_unit: str, pain_point: Dict):
         """Insert an enhanced pain point entity with v2.0 fields"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO pain_points (
-                interview_id, company, business_unit, department,
-                type, description, affected_roles, affected_processes,
-                frequency, severity, impact_description, proposed_solutions,
-                intensity_score, hair_on_fire, time_wasted_per_occurrence_minutes,
-                cost_impact_monthly_usd, estimated_annual_cost_usd,
-                jtbd_who, jtbd_what, jtbd_where, jtbd_formatted,
-                root_cause, current_workaround,
-                confidence_score, needs_review, extraction_source, extraction_reasoning
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            business_unit,
-            pain_point.get("department"),
-            pain_point.get("type", "Process Inefficiency"),
-            pain_point.get("description", ""),
-            json_serialize(pain_point.get("affected_roles", [])),
-            json_serialize(pain_point.get("affected_processes", [])),
-            pain_point.get("frequency", "Ad-hoc"),
-            pain_point.get("severity", "Medium"),
-            pain_point.get("impact_description", ""),
-            json_serialize(pain_point.get("proposed_solutions", [])),
-            pain_point.get("intensity_score", 5),
-            1 if pain_point.get("hair_on_fire") else 0,
-            pain_point.get("time_wasted_per_occurrence_minutes"),
-            pain_point.get("cost_impact_monthly_usd"),
-            pain_point.get("estimated_annual_cost_usd"),
-            pain_point.get("jtbd_who"),
-            pain_point.get("jtbd_what"),
-            pain_point.get("jtbd_where"),
-            pain_point.get("jtbd_formatted"),
-            pain_point.get("root_cause"),
-            pain_point.get("current_workaround"),
-            pain_point.get("confidence_score", 0.0),
-            1 if pain_point.get("confidence_score", 1.0) < 0.7 else 0,
-            pain_point.get("extraction_source", ""),
-            pain_point.get("extraction_reasoning", "")
-        ))
-        
+        self._insert_entity_rows("pain_points", [self._enhanced_pain_point_row(interview_id, company, business_unit, pain_point)])
         self.conn.commit()
+
+    def _enhanced_pain_point_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        pain_point: Dict
+    ) -> Dict[str, Any]:
+        """Build the pain_points row for an enhanced pain point (v2.0 fields)"""
+        return {
+            "interview_id": interview_id,
+            "company": company,
+            "business_unit": business_unit,
+            "department": pain_point.get("department"),
+            "type": pain_point.get("type", "Process Inefficiency"),
+            "description": pain_point.get("description", ""),
+            "affected_roles": json_serialize(pain_point.get("affected_roles", [])),
+            "affected_processes": json_serialize(pain_point.get("affected_processes", [])),
+            "frequency": pain_point.get("frequency", "Ad-hoc"),
+            "severity": pain_point.get("severity", "Medium"),
+            "impact_description": pain_point.get("impact_description", ""),
+            "proposed_solutions": json_serialize(pain_point.get("proposed_solutions", [])),
+            "intensity_score": pain_point.get("intensity_score", 5),
+            "hair_on_fire": 1 if pain_point.get("hair_on_fire") else 0,
+            "time_wasted_per_occurrence_minutes": pain_point.get("time_wasted_per_occurrence_minutes"),
+            "cost_impact_monthly_usd": pain_point.get("cost_impact_monthly_usd"),
+            "estimated_annual_cost_usd": pain_point.get("estimated_annual_cost_usd"),
+            "jtbd_who": pain_point.get("jtbd_who"),
+            "jtbd_what": pain_point.get("jtbd_what"),
+            "jtbd_where": pain_point.get("jtbd_where"),
+            "jtbd_formatted": pain_point.get("jtbd_formatted"),
+            "root_cause": pain_point.get("root_cause"),
+            "current_workaround": pain_point.get("current_workaround"),
+            "confidence_score": pain_point.get("confidence_score", 0.0),
+            "needs_review": 1 if pain_point.get("confidence_score", 1.0) < 0.7 else 0,
+            "extraction_source": pain_point.get("extraction_source", ""),
+            "extraction_reasoning": pain_point.get("extraction_reasoning", "")
+        }
     
-    def insert_or_update_enhanced_system(self, system: Dict, company: str):
-        """Insert or update an enhanced system with v2.0 fields"""
-        cursor = self.conn.cursor()
-        
-        # Check if system exists
-        cursor.execute("SELECT id, companies_using, usage_count FROM systems WHERE name = ?", 
-                      (system.get("name"),))
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing system
-            system_id, companies_json, usage_count = existing
-            companies = json.loads(companies_json) if companies_json else []
-            if company not in companies:
-                companies.append(company)
-            
-            # Merge pain points and integration issues
-            cursor.execute("SELECT pain_points, integration_pain_points, data_quality_issues FROM systems WHERE id = ?", (system_id,))
-            row = cursor.fetchone()
-            existing_pain_points = json.loads(row[0]) if row[0] else []
-            existing_integration_pain_points = json.loads(row[1]) if row[1] else []
-            existing_data_quality_issues = json.loads(row[2]) if row[2] else []
-            
-            # Merge new pain points
-            new_pain_points = system.get("pain_points", [])
-            new_integration_pain_points = system.get("integration_pain_points", [])
-            new_data_quality_issues = system.get("data_quality_issues", [])
-            
-            merged_pain_points = list(set(existing_pain_points + new_pain_points))
-            merged_integration_pain_points = list(set(existing_integration_pain_points + new_integration_pain_points))
-            merged_data_quality_issues = list(set(existing_data_quality_issues + new_data_quality_issues))
-            
-            # Update with merged data
-            cursor.execute("""
-                UPDATE systems 
-                SET companies_using = ?, 
-                    usage_count = ?,
-                    pain_points = ?,
-                    integration_pain_points = ?,
-                    data_quality_issues = ?,
-                    user_satisfaction_score = ?,
-                    replacement_candidate = ?,
-                    adoption_rate = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (
-                json_serialize(companies), 
-                usage_count + 1,
-                json_serialize(merged_pain_points),
-                json_serialize(merged_integration_pain_points),
-                json_serialize(merged_data_quality_issues),
-                system.get("user_satisfaction_score"),
-                1 if system.get("replacement_candidate") else 0,
-                system.get("adoption_rate"),
-                system_id
-            ))
-        else:
-            # Insert new system
-            cursor.execute("""
-                INSERT INTO systems (
-                    name, domain, vendor, type, companies_using, pain_points,
-                    integration_pain_points, data_quality_issues,
-                    user_satisfaction_score, replacement_candidate, adoption_rate
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                system.get("name", ""),
-                system.get("domain", ""),
-                system.get("vendor", ""),
-                system.get("type", ""),
-                json_serialize([company]),
-                json_serialize(system.get("pain_points", [])),
-                json_serialize(system.get("integration_pain_points", [])),
-                json_serialize(system.get("data_quality_issues", [])),
-                system.get("user_satisfaction_score"),
-                1 if system.get("replacement_candidate") else 0,
-                system.get("adoption_rate")
-            ))
-        
+    def insert_or_update_enhanced_system(self, system: Dict, company: str, interview_id: Optional[int] = None):
+        """Insert or update an enhanced system with v2.0 fields (contribution recorded if interview_id is given)"""
+        self._upsert_systems([system], company, enhanced=True, interview_id=interview_id)
         self.conn.commit()
 
-    
     def insert_enhanced_automation_candidate(self, interview_id: int, company: str, business_unit: str, candidate: Dict):
         """Insert an enhanced automation candidate entity with v2.0 fields"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO automation_candidates (
-                interview_id, company, business_unit, department,
-                name, process, trigger_event, action, output, owner,
-                complexity, impact, effort_estimate, systems_involved,
-                current_manual_process_description, data_sources_needed,
-                approval_required, approval_threshold_usd, monitoring_metrics,
-                effort_score, impact_score, priority_quadrant, estimated_roi_months,
-                estimated_annual_savings_usd, ceo_priority, overlooked_opportunity,
-                data_support_score, confidence_score, needs_review,
-                extraction_source
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            business_unit,
-            candidate.get("department"),
-            candidate.get("name", ""),
-            candidate.get("process", ""),
-            candidate.get("trigger_event", ""),
-            candidate.get("action", ""),
-            candidate.get("output", ""),
-            candidate.get("owner", ""),
-            candidate.get("complexity", "Medium"),
-            candidate.get("impact", "Medium"),
-            candidate.get("effort_estimate"),
-            json_serialize(candidate.get("systems_involved", [])),
-            candidate.get("current_manual_process_description", ""),
-            json_serialize(candidate.get("data_sources_needed", [])),
-            1 if candidate.get("approval_required") else 0,
-            candidate.get("approval_threshold_usd"),
-            json_serialize(candidate.get("monitoring_metrics", [])),
-            candidate.get("effort_score", 3),
-            candidate.get("impact_score", 3),
-            candidate.get("priority_quadrant", "Incremental"),
-            candidate.get("estimated_roi_months"),
-            candidate.get("estimated_annual_savings_usd"),
-            1 if candidate.get("ceo_priority") else 0,
-            1 if candidate.get("overlooked_opportunity") else 0,
-            candidate.get("data_support_score"),
-            candidate.get("confidence_score", 0.0),
-            1 if candidate.get("confidence_score", 1.0) < 0.7 else 0,
-            candidate.get("extraction_source", "")
-        ))
-        
+        self._insert_entity_rows("automation_candidates", [self._enhanced_automation_candidate_row(interview_id, company, business_unit, candidate)])
         self.conn.commit()
 
+    def _enhanced_automation_candidate_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        candidate: Dict
+    ) -> Dict[str, Any]:
+        """Build the automation_candidates row for an enhanced automation candidate (v2.0 fields)"""
+        return {
+            "interview_id": interview_id,
+            "company": company,
+            "business_unit": business_unit,
+            "department": candidate.get("department"),
+            "name": candidate.get("name", ""),
+            "process": candidate.get("process", ""),
+            "trigger_event": candidate.get("trigger_event", ""),
+            "action": candidate.get("action", ""),
+            "output": candidate.get("output", ""),
+            "owner": candidate.get("owner", ""),
+            "complexity": candidate.get("complexity", "Medium"),
+            "impact": candidate.get("impact", "Medium"),
+            "effort_estimate": candidate.get("effort_estimate"),
+            "systems_involved": json_serialize(candidate.get("systems_involved", [])),
+            "current_manual_process_description": candidate.get("current_manual_process_description", ""),
+            "data_sources_needed": json_serialize(candidate.get("data_sources_needed", [])),
+            "approval_required": 1 if candidate.get("approval_required") else 0,
+            "approval_threshold_usd": candidate.get("approval_threshold_usd"),
+            "monitoring_metrics": json_serialize(candidate.get("monitoring_metrics", [])),
+            "effort_score": candidate.get("effort_score", 3),
+            "impact_score": candidate.get("impact_score", 3),
+            "priority_quadrant": candidate.get("priority_quadrant", "Incremental"),
+            "estimated_roi_months": candidate.get("estimated_roi_months"),
+            "estimated_annual_savings_usd": candidate.get("estimated_annual_savings_usd"),
+            "ceo_priority": 1 if candidate.get("ceo_priority") else 0,
+            "overlooked_opportunity": 1 if candidate.get("overlooked_opportunity") else 0,
+            "data_support_score": candidate.get("data_support_score"),
+            "confidence_score": candidate.get("confidence_score", 0.0),
+            "needs_review": 1 if candidate.get("confidence_score", 1.0) < 0.7 else 0,
+            "extraction_source": candidate.get("extraction_source", "")
+        }
+
     def insert_team_structure(self, interview_id: int, company: str, business_unit: str, team: Dict):
         """Insert a team structure entity"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO team_structures (
-                interview_id, company_name, business_unit, department,
-                role, team_size, reports_to, coordinates_with,
-                external_dependencies, confidence_score, needs_review, extraction_source
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            business_unit,
-            team.get("department", "Unknown"),
-            team.get("role", ""),
-            team.get("team_size"),
-            team.get("reports_to", ""),
-            team.get("coordinates_with", ""),
-            team.get("external_dependencies", ""),
-            team.get("confidence_score", 0.0),
-            1 if team.get("confidence_score", 1.0) < 0.7 else 0,
-            team.get("extraction_source", "")
-        ))
-        
+        self._insert_entity_rows("team_structures", [self._team_structure_row(interview_id, company, business_unit, team)])
         self.conn.commit()
 
+    def _team_structure_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        team: Dict
+    ) -> Dict[str, Any]:
+        """Build the team_structures row for a team structure"""
+        return {
+            "interview_id": interview_id,
+            "company_name": company,
+            "business_unit": business_unit,
+            "department": team.get("department", "Unknown"),
+            "role": team.get("role", ""),
+            "team_size": team.get("team_size"),
+            "reports_to": team.get("reports_to", ""),
+            "coordinates_with": team.get("coordinates_with", ""),
+            "external_dependencies": team.get("external_dependencies", ""),
+            "confidence_score": team.get("confidence_score", 0.0),
+            "needs_review": 1 if team.get("confidence_score", 1.0) < 0.7 else 0,
+            "extraction_source": team.get("extraction_source", "")
+        }
+
     def insert_knowledge_gap(self, interview_id: int, company: str, business_unit: str, gap: Dict):
         """Insert a knowledge gap entity"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO knowledge_gaps (
-                interview_id, company_name, business_unit, department,
-                area, affected_roles, impact, training_needed,
-                confidence_score, needs_review, extraction_source
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            business_unit,
-            gap.get("department", "Unknown"),
-            gap.get("area", ""),
-            gap.get("affected_roles", ""),
-            gap.get("impact", ""),
-            gap.get("training_needed", ""),
-            gap.get("confidence_score", 0.0),
-            1 if gap.get("confidence_score", 1.0) < 0.7 else 0,
-            gap.get("extraction_source", "")
-        ))
-        
+        self._insert_entity_rows("knowledge_gaps", [self._knowledge_gap_row(interview_id, company, business_unit, gap)])
         self.conn.commit()
 
+    def _knowledge_gap_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        gap: Dict
+    ) -> Dict[str, Any]:
+        """Build the knowledge_gaps row for a knowledge gap"""
+        return {
+            "interview_id": interview_id,
+            "company_name": company,
+            "business_unit": business_unit,
+            "department": gap.get("department", "Unknown"),
+            "area": gap.get("area", ""),
+            "affected_roles": gap.get("affected_roles", ""),
+            "impact": gap.get("impact", ""),
+            "training_needed": gap.get("training_needed", ""),
+            "confidence_score": gap.get("confidence_score", 0.0),
+            "needs_review": 1 if gap.get("confidence_score", 1.0) < 0.7 else 0,
+            "extraction_source": gap.get("extraction_source", "")
+        }
+
     def insert_success_pattern(self, interview_id: int, company: str, business_unit: str, pattern: Dict):
         """Insert a success pattern entity"""
-        cursor = self.conn.cursor()
-        
+        self._insert_entity_rows("success_patterns", [self._success_pattern_row(interview_id, company, business_unit, pattern)])
+        self.conn.commit()
+
+    def _success_pattern_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        pattern: Dict
+    ) -> Dict[str, Any]:
+        """Build the success_patterns row for a success pattern"""
         # Handle replicable_to - might be list or string
         replicable_to = pattern.get("replicable_to", "")
         if isinstance(replicable_to, list):
             replicable_to = ", ".join(replicable_to)
-        
-        cursor.execute("""
-            INSERT INTO success_patterns (
-                interview_id, company_name, business_unit, department,
-                pattern, role, benefit, replicable_to,
-                confidence_score, needs_review, extraction_source
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            business_unit,
-            pattern.get("department", "Unknown"),
-            pattern.get("pattern", ""),
-            pattern.get("role", ""),
-            pattern.get("benefit", ""),
-            str(replicable_to),
-            pattern.get("confidence_score", 0.0),
-            1 if pattern.get("confidence_score", 1.0) < 0.7 else 0,
-            pattern.get("extraction_source", "")
-        ))
-        
-        self.conn.commit()
+
+        return {
+            "interview_id": interview_id,
+            "company_name": company,
+            "business_unit": business_unit,
+            "department": pattern.get("department", "Unknown"),
+            "pattern": pattern.get("pattern", ""),
+            "role": pattern.get("role", ""),
+            "benefit": pattern.get("benefit", ""),
+            "replicable_to": str(replicable_to),
+            "confidence_score": pattern.get("confidence_score", 0.0),
+            "needs_review": 1 if pattern.get("confidence_score", 1.0) < 0.7 else 0,
+            "extraction_source": pattern.get("extraction_source", "")
+        }
 
     def insert_budget_constraint(self, interview_id: int, company: str, business_unit: str, constraint: Dict):
         """Insert a budget constraint entity"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO budget_constraints (
-                interview_id, company_name, business_unit, department,
-                area, budget_type, approval_required_above, approver, pain_point,
-                confidence_score, needs_review, extraction_source
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            business_unit,
-            constraint.get("department", "Unknown"),
-            constraint.get("area", ""),
-            constraint.get("budget_type", ""),
-            constraint.get("approval_required_above"),
-            constraint.get("approver", ""),
-            constraint.get("pain_point", ""),
-            constraint.get("confidence_score", 0.0),
-            1 if constraint.get("confidence_score", 1.0) < 0.7 else 0,
-            constraint.get("extraction_source", "")
-        ))
-        
+        self._insert_entity_rows("budget_constraints", [self._budget_constraint_row(interview_id, company, business_unit, constraint)])
         self.conn.commit()
 
+    def _budget_constraint_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        constraint: Dict
+    ) -> Dict[str, Any]:
+        """Build the budget_constraints row for a budget constraint"""
+        return {
+            "interview_id": interview_id,
+            "company_name": company,
+            "business_unit": business_unit,
+            "department": constraint.get("department", "Unknown"),
+            "area": constraint.get("area", ""),
+            "budget_type": constraint.get("budget_type", ""),
+            "approval_required_above": constraint.get("approval_required_above"),
+            "approver": constraint.get("approver", ""),
+            "pain_point": constraint.get("pain_point", ""),
+            "confidence_score": constraint.get("confidence_score", 0.0),
+            "needs_review": 1 if constraint.get("confidence_score", 1.0) < 0.7 else 0,
+            "extraction_source": constraint.get("extraction_source", "")
+        }
+
     def insert_external_dependency(self, interview_id: int, company: str, business_unit: str, dependency: Dict):
         """Insert an external dependency entity"""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO external_dependencies (
-                interview_id, company_name, business_unit, department,
-                vendor, service, frequency, coordinator, sla, payment_process,
-                confidence_score, needs_review, extraction_source
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            interview_id,
-            company,
-            business_unit,
-            dependency.get("department", "Unknown"),
-            dependency.get("vendor", ""),
-            dependency.get("service", ""),
-            dependency.get("frequency", ""),
-            dependency.get("coordinator", ""),
-            dependency.get("sla", ""),
-            dependency.get("payment_process", ""),
-            dependency.get("confidence_score", 0.0),
-            1 if dependency.get("confidence_score", 1.0) < 0.7 else 0,
-            dependency.get("extraction_source", "")
-        ))
-        
+        self._insert_entity_rows("external_dependencies", [self._external_dependency_row(interview_id, company, business_unit, dependency)])
         self.conn.commit()
 
+    def _external_dependency_row(
+        self,
+        interview_id: int,
+        company: str,
+        business_unit: Optional[str],
+        dependency: Dict
+    ) -> Dict[str, Any]:
+        """Build the external_dependencies row for an external dependency"""
+        return {
+            "interview_id": interview_id,
+            "company_name": company,
+            "business_unit": business_unit,
+            "department": dependency.get("department", "Unknown"),
+            "vendor": dependency.get("vendor", ""),
+            "service": dependency.get("service", ""),
+            "frequency": dependency.get("frequency", ""),
+            "coordinator": dependency.get("coordinator", ""),
+            "sla": dependency.get("sla", ""),
+            "payment_process": dependency.get("payment_process", ""),
+            "confidence_score": dependency.get("confidence_score", 0.0),
+            "needs_review": 1 if dependency.get("confidence_score", 1.0) < 0.7 else 0,
+            "extraction_source": dependency.get("extraction_source", "")
+        }
+
     def insert_enhanced_system(self, interview_id: int, company: str, business_unit: str, system: Dict):
         """Insert or update an enhanced system entity"""
         # For systems, we use insert_or_update_enhanced_system
-        self.insert_or_update_enhanced_system(system, company)
+        self.insert_or_update_enhanced_system(system, company, interview_id)
     
     # ========================================================================
     # Consolidation Methods (Task 8)
@@ -2501,6 +3069,8 @@ class EnhancedIntelligenceDB(IntelligenceDB):
             """
             
             cursor.execute(query, values)
+            if NORMALIZED_NAME_SOURCE_FIELDS & updated_data.keys():
+                self._store_normalized_name(entity_type, entity_id)
             self.conn.commit()
             
             return True
@@ -9,14 +9,21 @@ Identifies similar entities using:
 
 Supports configurable similarity thresholds per entity type.
 """
-import re
 import time
-from typing import Dict, List, Tuple, Optional
+import threading
+from typing import Any, Dict, List, Tuple, Optional
+from collections import OrderedDict
 from difflib import SequenceMatcher
 from datetime import datetime
 import json
+from pathlib import Path
 
 from intelligence_capture.logger import get_logger
+from intelligence_capture.candidate_index import CandidateIndex
+from intelligence_capture.name_normalizer import get_entity_text, normalize_entity_name
+from intelligence_capture.embedding_store import EmbeddingStore, get_embedding_store
+from intelligence_capture.single_flight import get_single_flight, request_key
+from intelligence_capture.embedding_batcher import EmbeddingBatcher
 
 # Initialize logger
 logger = get_logger(__name__)
@@ -26,6 +33,10 @@ class EmbeddingError(Exception):
     """Custom exception for embedding generation failures"""
     pass
 
+
+# Embedding cache entry whose unit vector has not been computed yet
+_NOT_NORMALIZED = object()
+
 # Optional: Use rapidfuzz for better performance (fallback to difflib)
 try:
     from rapidfuzz import fuzz
@@ -33,6 +44,13 @@ try:
 except ImportError:
     HAVE_RAPIDFUZZ = False
 
+# Optional: Use numpy for batched cosine similarity (fallback to pure Python)
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
 # Optional: Use OpenAI for semantic similarity
 try:
     from openai import OpenAI
@@ -49,10 +67,23 @@ class DuplicateDetector:
     - Entity-specific name normalization
     - Configurable similarity thresholds per entity type
     - Embedding cache to avoid redundant API calls
+    - Optional persistent content-addressed embedding store shared across runs
     - Combined fuzzy + semantic similarity scoring
+    - Safe to share between parallel consolidation workers (counters, caches
+      and circuit breaker behind a lock; a text being fetched by one worker
+      is waited for, not requested again, so counts match a sequential run)
     """
     
-    def __init__(self, config: Dict, openai_api_key: Optional[str] = None, db=None):
+    EMBEDDING_MODEL = "text-embedding-3-small"
+    
+    def __init__(
+        self,
+        config: Dict,
+        openai_api_key: Optional[str] = None,
+        db=None,
+        embedding_store: Optional[EmbeddingStore] = None,
+        db_lock=None
+    ):
         """
         Initialize duplicate detector
         
@@ -60,6 +91,10 @@ class DuplicateDetector:
             config: Configuration dict with similarity_thresholds and similarity_weights
             openai_api_key: Optional OpenAI API key for semantic similarity
             db: Optional database instance for persistent embedding storage
+            embedding_store: Optional shared embedding store (default: from
+                performance.embedding_store_path, if configured)
+            db_lock: Optional lock held around db.conn use (shared with the
+                consolidation writer thread)
         """
         self.config = config
         self.similarity_thresholds = config.get("similarity_thresholds", {})
@@ -72,6 +107,7 @@ class DuplicateDetector:
         self.max_candidates = config.get("performance", {}).get("max_candidates", 10)
         self.enable_caching = config.get("performance", {}).get("enable_caching", True)
         self.use_db_storage = config.get("performance", {}).get("use_db_storage", True)
+        self.use_candidate_index = config.get("performance", {}).get("use_candidate_index", True)
         
         # Retry and circuit breaker settings
         self.max_retries = config.get("retry", {}).get("max_retries", 3)
@@ -82,28 +118,70 @@ class DuplicateDetector:
         self.circuit_breaker_open = False
         self.circuit_breaker_opened_at = None
         
-        # Embedding cache (in-memory for current session)
-        self.embedding_cache = {} if self.enable_caching else None
+        # Embedding cache (in-memory for current session, least recently used first):
+        # text -> [embedding, unit-normalized float32 vector once batched scoring needs it]
+        self.max_cached_embeddings = max(1, config.get("performance", {}).get("max_cached_embeddings", 10_000))
+        self.embedding_cache: Optional["OrderedDict[str, List]"] = OrderedDict() if self.enable_caching else None
         
         # Database for persistent embedding storage
         self.db = db
+        self.db_lock = db_lock if db_lock is not None else threading.RLock()
+        
+        # Guards counters, caches and circuit breaker state
+        self._lock = threading.RLock()
+        
+        # Texts whose embedding a worker is fetching (text -> Event set when done)
+        self._pending: Dict[str, threading.Event] = {}
+        
+        # Content-addressed embedding store (shared with precompute/RAG scripts)
+        store_path = config.get("performance", {}).get("embedding_store_path")
+        if embedding_store is None and store_path:
+            store_path = Path(store_path)
+            if not store_path.is_absolute():
+                store_path = Path(__file__).parent.parent / store_path
+            embedding_store = get_embedding_store(store_path)
+        self.embedding_store = embedding_store
+        
+        # Blocking index over normalized names (avoids full fuzzy scans)
+        self.candidate_index = CandidateIndex(
+            self._get_entity_text,
+            self.normalize_name,
+            stored_key="normalized_name",
+            stored_profile_key="name_profile"
+        )
         
         # Statistics
         self.cache_hits = 0
         self.cache_misses = 0
         self.db_hits = 0
         self.db_misses = 0
+        self.store_hits = 0
+        self.coalesced_requests = 0  # API misses served by an identical call in flight
         
         # Initialize OpenAI client if available
         self.openai_client = None
         if HAVE_OPENAI and openai_api_key:
             self.openai_client = OpenAI(api_key=openai_api_key)
+        
+        # Micro-batching: single-text requests from concurrent workers share
+        # one batched request (retries and circuit breaker apply per batch)
+        batching = config.get("performance", {}).get("embedding_batching", {})
+        self.embedding_batcher = None
+        if batching.get("enabled", False):
+            self.embedding_batcher = EmbeddingBatcher(
+                lambda texts: self._request_embeddings(texts, text_preview=texts[0]),
+                max_batch_size=batching.get("max_batch_size", 2048),
+                max_wait_ms=batching.get("max_wait_ms", 5),
+                max_concurrent_batches=batching.get("max_concurrent_batches", 4),
+                name="duplicate_detector"
+            )
     
     def find_duplicates(
         self,
         entity: Dict,
         entity_type: str,
-        existing_entities: List[Dict]
+        existing_entities: List[Dict],
+        revision: Optional[Any] = None
     ) -> List[Tuple[Dict, float]]:
         """
         Find duplicate entities using fuzzy-first filtering + semantic matching
@@ -119,6 +197,10 @@ class DuplicateDetector:
             entity: Entity to match (must have 'name' or 'description' field)
             entity_type: Type of entity (systems, pain_points, etc.)
             existing_entities: List of existing entities to compare against
+            revision: Optional revision of existing_entities that changes when
+                its entities are modified in place (the candidate index only
+                re-checks existing entities when it changes; without it only
+                appended entities are picked up)
             
         Returns:
             List of (entity, similarity_score) tuples above threshold,
@@ -136,28 +218,16 @@ class DuplicateDetector:
         threshold = self._get_similarity_threshold(entity_type)
         
         # STAGE 1: Fuzzy matching to filter candidates (fast, no API calls)
-        fuzzy_candidates = []
-        for existing in existing_entities:
-            existing_text = self._get_entity_text(existing, entity_type)
-            if not existing_text:
-                continue
-            
-            # Calculate fuzzy similarity only
-            fuzzy_score = self.calculate_name_similarity(
-                entity_text,
-                existing_text,
-                entity_type
-            )
-            
-            # Keep candidates above a lower threshold for fuzzy filtering
-            # Use 70% of the target threshold to be more inclusive at this stage
-            fuzzy_threshold = threshold * 0.7
-            if fuzzy_score >= fuzzy_threshold:
-                fuzzy_candidates.append((existing, existing_text, fuzzy_score))
-        
-        # Sort by fuzzy score and take top candidates
-        fuzzy_candidates.sort(key=lambda x: x[2], reverse=True)
-        top_fuzzy_candidates = fuzzy_candidates[:self.max_candidates * 2]  # Take 2x for safety
+        # Use 70% of the target threshold to be more inclusive at this stage
+        fuzzy_threshold = threshold * 0.7
+        top_fuzzy_candidates = self._find_fuzzy_candidates(
+            entity_text,
+            entity_type,
+            existing_entities,
+            fuzzy_threshold,
+            self.max_candidates * 2,  # Take 2x for safety
+            revision
+        )
         
         logger.debug(f"Fuzzy filtering: {len(existing_entities)} → {len(top_fuzzy_candidates)} candidates")
         
@@ -165,6 +235,14 @@ class DuplicateDetector:
         final_candidates = []
         skip_semantic_threshold = self.config.get("performance", {}).get("skip_semantic_threshold", 0.95)
         
+        # Embed all remaining candidates in one batched request and score them together
+        semantic_texts = [
+            existing_text
+            for _, existing_text, fuzzy_score in top_fuzzy_candidates
+            if fuzzy_score < skip_semantic_threshold
+        ]
+        semantic_scores = iter(self.calculate_semantic_similarities(entity_text, semantic_texts))
+        
         for existing, existing_text, fuzzy_score in top_fuzzy_candidates:
             # If fuzzy score is very high (>= 0.95), skip semantic similarity
             if fuzzy_score >= skip_semantic_threshold:
@@ -172,12 +250,8 @@ class DuplicateDetector:
                 final_candidates.append((existing, fuzzy_score))
                 continue
             
-            # Calculate combined similarity (fuzzy + semantic)
-            combined_score = self._calculate_combined_similarity(
-                entity_text,
-                existing_text,
-                entity_type
-            )
+            # Combine fuzzy score with the batched semantic score
+            combined_score = self._combine_similarities(fuzzy_score, next(semantic_scores))
             
             # Only include if above threshold
             if combined_score >= threshold:
@@ -190,6 +264,63 @@ class DuplicateDetector:
         logger.debug(f"Final candidates: {len(result)} above threshold {threshold:.2f}")
         return result
     
+    def _find_fuzzy_candidates(
+        self,
+        entity_text: str,
+        entity_type: str,
+        existing_entities: List[Dict],
+        fuzzy_threshold: float,
+        limit: int,
+        revision: Optional[Any] = None
+    ) -> List[Tuple[Dict, str, float]]:
+        """
+        Get the top fuzzy candidates above fuzzy_threshold
+        
+        Uses the candidate index when enabled (same results, no full scan),
+        otherwise scores every existing entity.
+        
+        Args:
+            entity_text: Text of the new entity
+            entity_type: Type of entity
+            existing_entities: List of existing entities to compare against
+            fuzzy_threshold: Minimum fuzzy score to keep a candidate
+            limit: Maximum number of candidates to return
+            revision: Optional revision of existing_entities (see find_duplicates)
+            
+        Returns:
+            List of (existing_entity, existing_text, fuzzy_score) tuples,
+            sorted by fuzzy score (highest first)
+        """
+        if self.use_candidate_index and fuzzy_threshold > 0:
+            return self.candidate_index.query(
+                entity_type,
+                existing_entities,
+                entity_text,
+                fuzzy_threshold,
+                limit,
+                revision
+            )
+        
+        normalized_text = self.normalize_name(entity_text, entity_type)
+        fuzzy_candidates = []
+        for existing in existing_entities:
+            existing_text = self._get_entity_text(existing, entity_type)
+            if not existing_text:
+                continue
+            
+            # Calculate fuzzy similarity only (stored entities are pre-normalized)
+            fuzzy_score = self._score_normalized(
+                normalized_text,
+                self._get_normalized_text(existing, existing_text, entity_type)
+            )
+            
+            if fuzzy_score >= fuzzy_threshold:
+                fuzzy_candidates.append((existing, existing_text, fuzzy_score))
+        
+        # Sort by fuzzy score and take top candidates
+        fuzzy_candidates.sort(key=lambda x: x[2], reverse=True)
+        return fuzzy_candidates[:limit]
+    
     def calculate_name_similarity(
         self,
         name1: str,
@@ -211,6 +342,19 @@ class DuplicateDetector:
         norm1 = self.normalize_name(name1, entity_type)
         norm2 = self.normalize_name(name2, entity_type)
         
+        return self._score_normalized(norm1, norm2)
+    
+    def _score_normalized(self, norm1: str, norm2: str) -> float:
+        """
+        Calculate fuzzy similarity between two normalized names
+        
+        Args:
+            norm1: First normalized name
+            norm2: Second normalized name
+            
+        Returns:
+            Similarity score (0.0-1.0)
+        """
         if not norm1 or not norm2:
             return 0.0
         
@@ -226,6 +370,9 @@ class DuplicateDetector:
         """
         Normalize entity name with entity-specific rules
         
+        Uses the removal patterns precompiled per entity type in
+        name_normalizer (also used for the normalized_name column).
+        
         Args:
             name: Entity name to normalize
             entity_type: Type of entity
@@ -233,41 +380,27 @@ class DuplicateDetector:
         Returns:
             Normalized name (lowercase, common words removed)
         """
-        if not name:
-            return ""
-        
-        # Convert to lowercase
-        normalized = name.lower().strip()
-        
-        # Entity-specific normalization rules
-        if entity_type == "systems":
-            # Remove common system-related words
-            common_words = [
-                "sistema", "software", "herramienta", "aplicación",
-                "system", "tool", "application", "app", "plataforma", "platform"
-            ]
-            for word in common_words:
-                normalized = re.sub(rf'\b{word}\b', '', normalized, flags=re.IGNORECASE)
-        
-        elif entity_type == "pain_points":
-            # Remove common pain point prefixes
-            common_prefixes = [
-                "problema de", "problema con", "dificultad con", "issue with",
-                "problem with", "challenge with", "pain point:"
-            ]
-            for prefix in common_prefixes:
-                normalized = re.sub(rf'^{prefix}\s*', '', normalized, flags=re.IGNORECASE)
-        
-        elif entity_type == "processes":
-            # Remove common process words
-            common_words = ["proceso", "process", "procedimiento", "procedure"]
-            for word in common_words:
-                normalized = re.sub(rf'\b{word}\b', '', normalized, flags=re.IGNORECASE)
+        return normalize_entity_name(name, entity_type)
+    
+    def _get_normalized_text(self, entity: Dict, entity_text: str, entity_type: str) -> str:
+        """
+        Get the normalized text of an existing entity
         
-        # Remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        Prefers the normalized_name column computed at insert time, so stored
+        entities are not re-normalized for every comparison.
         
-        return normalized
+        Args:
+            entity: Existing entity
+            entity_text: Entity text (from _get_entity_text)
+            entity_type: Type of entity
+            
+        Returns:
+            Normalized entity text
+        """
+        stored = entity.get("normalized_name")
+        if stored is not None:
+            return stored
+        return self.normalize_name(entity_text, entity_type)
     
     def calculate_semantic_similarity(
         self,
@@ -320,6 +453,108 @@ class DuplicateDetector:
             logger.warning(f"Unexpected semantic similarity error: {e}")
             return 0.0
     
+    def calculate_semantic_similarities(
+        self,
+        text: str,
+        candidate_texts: List[str]
+    ) -> List[float]:
+        """
+        Calculate semantic similarity between a text and many candidates
+        
+        Missing embeddings are fetched in a single batched API request, and all
+        candidates are scored with one matrix-vector product over unit-normalized
+        float32 vectors (pure Python fallback if numpy is unavailable).
+        
+        Falls back to 0.0 per candidate under the same conditions as
+        calculate_semantic_similarity().
+        
+        Args:
+            text: Text to compare
+            candidate_texts: Candidate texts to compare against
+            
+        Returns:
+            List of similarity scores (0.0-1.0), one per candidate
+        """
+        scores = [0.0] * len(candidate_texts)
+        if not self.openai_client or not text or not candidate_texts:
+            return scores
+        
+        # Check circuit breaker
+        if self.circuit_breaker_open:
+            return scores
+        
+        try:
+            embeddings = self._get_embeddings_batch([text] + list(candidate_texts))
+        except EmbeddingError:
+            logger.warning("Falling back to fuzzy-only matching due to embedding error")
+            return scores
+        except Exception as e:
+            logger.warning(f"Unexpected semantic similarity error: {e}")
+            return scores
+        
+        query = embeddings.get(text)
+        if query is None:
+            return scores
+        
+        if not HAVE_NUMPY:
+            return [
+                self._cosine_similarity(query, embeddings[candidate])
+                if candidate and embeddings.get(candidate) is not None else 0.0
+                for candidate in candidate_texts
+            ]
+        
+        query_vector = self._get_unit_vector(text, query)
+        rows = []
+        positions = []
+        for position, candidate in enumerate(candidate_texts):
+            embedding = embeddings.get(candidate) if candidate else None
+            if embedding is None or len(embedding) != len(query):
+                continue
+            vector = self._get_unit_vector(candidate, embedding)
+            if vector is None:
+                continue
+            rows.append(vector)
+            positions.append(position)
+        
+        if query_vector is None or not rows:
+            return scores
+        
+        # Cosine similarity for all candidates at once, normalized to 0-1 range
+        similarities = np.clip((np.stack(rows) @ query_vector + 1.0) / 2.0, 0.0, 1.0)
+        for position, similarity in zip(positions, similarities.tolist()):
+            scores[position] = similarity
+        
+        return scores
+    
+    def _get_unit_vector(self, text: str, embedding: List[float]):
+        """
+        Get unit-normalized float32 vector for an embedding
+        
+        Kept next to the raw embedding in its embedding_cache entry, so it
+        is evicted with it.
+        
+        Args:
+            text: Text the embedding belongs to
+            embedding: Embedding vector
+            
+        Returns:
+            numpy float32 array with norm 1.0, or None for a zero vector
+        """
+        with self._lock:
+            entry = self._cached(text)
+            if entry is not None and entry[1] is not _NOT_NORMALIZED:
+                return entry[1]
+        
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        # Zero vectors score 0.0, as in _cosine_similarity
+        vector = vector / norm if norm > 0 else None
+        
+        with self._lock:
+            if entry is not None and entry[0] is embedding:
+                entry[1] = vector
+        return vector
+    
     def _calculate_combined_similarity(
         self,
         text1: str,
@@ -345,7 +580,19 @@ class DuplicateDetector:
         if self.openai_client:
             semantic_sim = self.calculate_semantic_similarity(text1, text2)
         
-        # Combine using configured weights
+        return self._combine_similarities(name_sim, semantic_sim)
+    
+    def _combine_similarities(self, name_sim: float, semantic_sim: float) -> float:
+        """
+        Combine name and semantic similarity using configured weights
+        
+        Args:
+            name_sim: Fuzzy name similarity (0.0-1.0)
+            semantic_sim: Semantic similarity (0.0-1.0), 0.0 if unavailable
+            
+        Returns:
+            Combined similarity score (0.0-1.0)
+        """
         name_weight = self.similarity_weights.get("name_weight", 0.7)
         semantic_weight = self.similarity_weights.get("semantic_weight", 0.3)
         
@@ -372,34 +619,7 @@ class DuplicateDetector:
         Returns:
             Text to use for similarity comparison (name + truncated description)
         """
-        # Extract name (try multiple field names)
-        name = ""
-        if "name" in entity and entity["name"]:
-            name = str(entity["name"]).strip()
-        elif "title" in entity and entity["title"]:
-            name = str(entity["title"]).strip()
-        elif entity_type == "pain_points" and "type" in entity and entity["type"]:
-            name = str(entity["type"]).strip()
-        
-        # Extract description
-        description = ""
-        if "description" in entity and entity["description"]:
-            description = str(entity["description"]).strip()
-        
-        # Combine name and description for better semantic matching
-        # Truncate description to 200 chars to avoid overwhelming name
-        if name and description:
-            # Combine: name is more important, description provides context
-            truncated_desc = description[:200]
-            return f"{name} {truncated_desc}"
-        elif name:
-            return name
-        elif description:
-            # If no name, use full description (up to 200 chars)
-            return description[:200]
-        else:
-            # No text available
-            return ""
+        return get_entity_text(entity, entity_type)
     
     def _get_similarity_threshold(self, entity_type: str) -> float:
         """
@@ -421,9 +641,13 @@ class DuplicateDetector:
         Get embedding for text with retry logic and circuit breaker
         
         Implements:
-        - Database lookup for pre-computed embeddings (fastest)
-        - In-memory cache for current session (fast)
-        - OpenAI API call with retry logic (slow)
+        - In-memory cache for current session (fastest)
+        - Embedding store lookup by content hash (fast)
+        - Database lookup for pre-computed embeddings (fast)
+        - OpenAI API call with retry logic (slow), shared with identical
+          requests already in flight (single-flight) and, when
+          performance.embedding_batching is enabled, batched with other
+          workers' texts
         - Exponential backoff retry (up to max_retries attempts)
         - Circuit breaker pattern (opens after consecutive_failures threshold)
         - Fallback to None (caller should use fuzzy-only matching)
@@ -440,70 +664,292 @@ class DuplicateDetector:
             EmbeddingError: If all retry attempts fail
         """
         # Check in-memory cache first (fastest)
-        if self.enable_caching and text in self.embedding_cache:
-            self.cache_hits += 1
-            return self.embedding_cache[text]
+        hit, embedding, pending = self._claim(text)
+        if hit:
+            return self._wait_pending(text, pending) if pending is not None else embedding
+        
+        try:
+            return self._load_embedding(text, entity_type, entity_id)
+        finally:
+            self._release([text])
+    
+    def _load_embedding(self, text: str, entity_type: str = None, entity_id: int = None) -> Optional[List[float]]:
+        """
+        Get an embedding missing from the in-memory cache (store, database or API)
+        
+        Args:
+            text: Text to embed (claimed by this caller)
+            entity_type: Optional entity type for database lookup
+            entity_id: Optional entity ID for database lookup
+            
+        Returns:
+            Embedding vector or None if error/circuit breaker open
+            
+        Raises:
+            EmbeddingError: If all retry attempts fail
+        """
+        # Check embedding store for the same text embedded by any run (fast)
+        if self.embedding_store is not None:
+            embedding = self.embedding_store.get(text, self.EMBEDDING_MODEL)
+            if embedding is not None:
+                with self._lock:
+                    self.store_hits += 1
+                    self._cache_embedding(text, embedding)
+                return embedding
         
         # Check database for pre-computed embedding (fast)
         if self.use_db_storage and self.db and entity_type and entity_id:
             try:
-                embedding = self.db.get_entity_embedding(entity_type, entity_id)
-                if embedding:
-                    self.db_hits += 1
-                    # Cache in memory for this session
-                    if self.enable_caching:
-                        self.embedding_cache[text] = embedding
-                    return embedding
-                else:
+                with self.db_lock:
+                    embedding = self.db.get_entity_embedding(entity_type, entity_id)
+                with self._lock:
+                    if embedding:
+                        self.db_hits += 1
+                        # Cache in memory for this session
+                        self._cache_embedding(text, embedding)
+                        return embedding
                     self.db_misses += 1
             except Exception as e:
                 logger.debug(f"Database embedding lookup error: {e}")
-                self.db_misses += 1
+                with self._lock:
+                    self.db_misses += 1
         
         # Not in cache or database, need to generate via API
-        self.cache_misses += 1
+        with self._lock:
+            self.cache_misses += 1
+            
+            # Check circuit breaker
+            if self.circuit_breaker_open:
+                logger.warning(f"Circuit breaker OPEN - skipping embedding API call (opened at: {self.circuit_breaker_opened_at}, failures: {self.consecutive_failures})")
+                return None
+        
+        embedding, shared = get_single_flight("embeddings").do(
+            request_key(self.EMBEDDING_MODEL, text), self._fetch_embedding, text
+        )
+        with self._lock:
+            if shared:
+                self.coalesced_requests += 1
+            if embedding is None:
+                return None
+            
+            # Cache in memory for this session
+            self._cache_embedding(text, embedding)
+        
+        # The caller that made the request already stored it
+        if self.embedding_store is not None and not shared:
+            self.embedding_store.put(text, embedding, self.EMBEDDING_MODEL)
+        
+        # Store in database for future sessions
+        if self.use_db_storage and self.db and entity_type and entity_id:
+            try:
+                with self.db_lock:
+                    self.db.store_entity_embedding(entity_type, entity_id, embedding)
+            except Exception as e:
+                logger.debug(f"Failed to store embedding in database: {e}")
+        
+        return embedding
+    
+    def _claim(self, text: str) -> Tuple[bool, Optional[List[float]], Optional[threading.Event]]:
+        """
+        Look up the in-memory cache, claiming the text on a miss
+        
+        A text another worker is fetching counts as a cache hit (a sequential
+        run would find it cached); the caller waits on the returned event.
+        A claimed text must be released with _release().
+        
+        Args:
+            text: Text to look up
+            
+        Returns:
+            Tuple of (hit, cached embedding, event to wait on)
+        """
+        if not self.enable_caching:
+            return False, None, None
+        
+        with self._lock:
+            entry = self._cached(text)
+            if entry is not None:
+                self.cache_hits += 1
+                return True, entry[0], None
+            
+            pending = self._pending.get(text)
+            if pending is not None:
+                self.cache_hits += 1
+                return True, None, pending
+            
+            self._pending[text] = threading.Event()
+            return False, None, None
+    
+    def _release(self, texts: List[str]):
+        """Release claimed texts and wake up workers waiting for them"""
+        with self._lock:
+            for text in texts:
+                pending = self._pending.pop(text, None)
+                if pending is not None:
+                    pending.set()
+    
+    def _wait_pending(self, text: str, pending: threading.Event) -> Optional[List[float]]:
+        """Wait for another worker's fetch and return its cached result"""
+        pending.wait()
+        with self._lock:
+            entry = self._cached(text)
+            return entry[0] if entry is not None else None
+    
+    def _cached(self, text: str) -> Optional[List]:
+        """Get the embedding_cache entry of a text, marking it recently used (caller holds _lock)"""
+        if self.embedding_cache is None:
+            return None
+        entry = self.embedding_cache.get(text)
+        if entry is not None:
+            self.embedding_cache.move_to_end(text)
+        return entry
+    
+    def _cache_embedding(self, text: str, embedding: List[float]):
+        """Cache an embedding, evicting the least recently used beyond max_cached_embeddings (caller holds _lock)"""
+        if self.embedding_cache is None:
+            return
+        self.embedding_cache[text] = [embedding, _NOT_NORMALIZED]
+        self.embedding_cache.move_to_end(text)
+        while len(self.embedding_cache) > self.max_cached_embeddings:
+            self.embedding_cache.popitem(last=False)
+    
+    def _fetch_embedding(self, text: str) -> Optional[List[float]]:
+        """
+        Request one embedding, through the micro-batcher when enabled
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Embedding vector, or None if the circuit breaker opened
+            
+        Raises:
+            EmbeddingError: If all retry attempts fail
+        """
+        if self.embedding_batcher is not None:
+            return self.embedding_batcher.embed(text)
+        embeddings = self._request_embeddings(text, text_preview=text)
+        return embeddings[0] if embeddings is not None else None
+    
+    def _get_embeddings_batch(self, texts: List[str]) -> Dict[str, Optional[List[float]]]:
+        """
+        Get embeddings for many texts, fetching all cache misses in one request
+        
+        Args:
+            texts: Texts to embed (duplicates and empty strings allowed)
+            
+        Returns:
+            Dict text -> embedding vector (None if unavailable)
+            
+        Raises:
+            EmbeddingError: If all retry attempts fail
+        """
+        embeddings: Dict[str, Optional[List[float]]] = {}
+        missing = []
+        waiting = {}
+        
+        for text in dict.fromkeys(t for t in texts if t):
+            hit, embedding, pending = self._claim(text)
+            if pending is not None:
+                waiting[text] = pending
+            elif not hit:
+                with self._lock:
+                    self.cache_misses += 1
+                missing.append(text)
+            embeddings[text] = embedding
+        
+        try:
+            self._fetch_missing(missing, embeddings)
+        finally:
+            self._release(missing)
+        
+        # Texts fetched by other workers meanwhile
+        for text, pending in waiting.items():
+            embeddings[text] = self._wait_pending(text, pending)
+        
+        return embeddings
+    
+    def _fetch_missing(self, missing: List[str], embeddings: Dict[str, Optional[List[float]]]):
+        """
+        Fill in embeddings missing from the in-memory cache (store, then one API request)
+        
+        Args:
+            missing: Texts to fetch (claimed by this caller)
+            embeddings: Dict text -> embedding vector, updated in place
+            
+        Raises:
+            EmbeddingError: If all retry attempts fail
+        """
+        if missing and self.embedding_store is not None:
+            stored = self.embedding_store.get_many(missing, self.EMBEDDING_MODEL)
+            with self._lock:
+                for text, embedding in zip(missing, stored):
+                    if embedding is not None:
+                        self.store_hits += 1
+                        embeddings[text] = embedding
+                        self._cache_embedding(text, embedding)
+            missing = [text for text in missing if embeddings[text] is None]
+        
+        if not missing:
+            return
         
         # Check circuit breaker
         if self.circuit_breaker_open:
             logger.warning(f"Circuit breaker OPEN - skipping embedding API call (opened at: {self.circuit_breaker_opened_at}, failures: {self.consecutive_failures})")
-            return None
+            return
+        
+        fetched = self._request_embeddings(missing, text_preview=missing[0])
+        if fetched is None:
+            return
+        
+        with self._lock:
+            for text, embedding in zip(missing, fetched):
+                embeddings[text] = embedding
+                self._cache_embedding(text, embedding)
+        
+        if self.embedding_store is not None:
+            self.embedding_store.put_many(missing[:len(fetched)], fetched, self.EMBEDDING_MODEL)
+    
+    def _request_embeddings(self, payload, text_preview: str) -> Optional[List[List[float]]]:
+        """
+        Call the embeddings API with retry logic and circuit breaker
         
+        Args:
+            payload: Single text or list of texts (one batched request)
+            text_preview: Text to include in failure logs
+            
+        Returns:
+            List of embedding vectors in input order, or None if the circuit
+            breaker opened
+            
+        Raises:
+            EmbeddingError: If all retry attempts fail
+        """
         # Retry loop with exponential backoff
-        last_error = None
         for attempt in range(self.max_retries):
             try:
                 response = self.openai_client.embeddings.create(
-                    model="text-embedding-3-small",
-                    input=text
+                    model=self.EMBEDDING_MODEL,
+                    input=payload
                 )
-                embedding = response.data[0].embedding
                 
                 # Success! Reset failure counter
-                self.consecutive_failures = 0
+                with self._lock:
+                    self.consecutive_failures = 0
                 
-                # Cache in memory for this session
-                if self.enable_caching:
-                    self.embedding_cache[text] = embedding
-                
-                # Store in database for future sessions
-                if self.use_db_storage and self.db and entity_type and entity_id:
-                    try:
-                        self.db.store_entity_embedding(entity_type, entity_id, embedding)
-                    except Exception as e:
-                        logger.debug(f"Failed to store embedding in database: {e}")
-                
-                return embedding
+                return [item.embedding for item in response.data]
                 
             except Exception as e:
-                last_error = e
-                self.consecutive_failures += 1
-                
-                # Check if we should open circuit breaker
-                if self.consecutive_failures >= self.circuit_breaker_threshold:
-                    self.circuit_breaker_open = True
-                    self.circuit_breaker_opened_at = datetime.now().isoformat()
-                    logger.error(f"Circuit breaker OPENED after {self.consecutive_failures} consecutive failures - semantic similarity disabled, falling back to fuzzy-only matching")
-                    return None
+                with self._lock:
+                    self.consecutive_failures += 1
+                    
+                    # Check if we should open circuit breaker
+                    if self.consecutive_failures >= self.circuit_breaker_threshold:
+                        if not self.circuit_breaker_open:
+                            self.circuit_breaker_open = True
+                            self.circuit_breaker_opened_at = datetime.now().isoformat()
+                            logger.error(f"Circuit breaker OPENED after {self.consecutive_failures} consecutive failures - semantic similarity disabled, falling back to fuzzy-only matching")
+                        return None
                 
                 # If this is not the last attempt, wait with exponential backoff
                 if attempt < self.max_retries - 1:
@@ -513,7 +959,7 @@ class DuplicateDetector:
                 else:
                     # Last attempt failed
                     logger.error(f"Embedding API failed after {self.max_retries} attempts: {e}")
-                    self._log_embedding_failure(text, str(e))
+                    self._log_embedding_failure(text_preview, str(e))
                     
                     # Raise exception on final failure
                     raise EmbeddingError(
@@ -581,10 +1027,16 @@ class DuplicateDetector:
             "memory_cache_hits": self.cache_hits,
             "memory_cache_misses": self.cache_misses,
             "memory_cache_hit_rate": f"{cache_hit_rate:.1f}%",
+            "memory_cache_entries": len(self.embedding_cache) if self.embedding_cache is not None else 0,
             "db_cache_hits": self.db_hits,
             "db_cache_misses": self.db_misses,
             "db_cache_hit_rate": f"{db_hit_rate:.1f}%",
-            "total_api_calls": self.cache_misses - self.db_hits,
+            "embedding_store_hits": self.store_hits,
+            "coalesced_requests": self.coalesced_requests,
+            "total_api_calls": self.cache_misses - self.db_hits - self.store_hits - self.coalesced_requests,
             "circuit_breaker_open": self.circuit_breaker_open,
-            "consecutive_failures": self.consecutive_failures
+            "consecutive_failures": self.consecutive_failures,
+            "candidate_index": self.candidate_index.get_statistics(),
+            "embedding_store": self.embedding_store.get_statistics() if self.embedding_store is not None else None,
+            "embedding_batching": self.embedding_batcher.get_statistics() if self.embedding_batcher is not None else None
         }
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Micro-batching Embedding Client
+
+Collects single-text embedding requests from concurrent callers for a few
+milliseconds (or until max_batch_size texts are waiting) and sends them as
+one batched embeddings request, then fans the vectors back out to the
+waiting callers. Used behind DuplicateDetector._get_embedding,
+EmbeddingGenerator.generate_embedding and VectorSearchTool's query
+embedding.
+
+Features:
+- EmbeddingBatcher for sync clients, with sync (embed, embed_many) and
+  async (embed_async) facades; a dispatcher thread forms batches and up to
+  max_concurrent_batches requests are in flight at once (texts keep
+  queueing while they are, so batches grow with load)
+- AsyncEmbeddingBatcher for async clients (AsyncOpenAI), batching the
+  coroutines of one event loop
+- Identical texts within a batch are sent once
+- Errors reach every caller of the failed batch
+- Named process-wide instances per (API key, base URL, model) with
+  request/batch counts (embedding_batcher_statistics): clients built
+  separately for the same account share one batcher and dispatcher
+
+Batching is per process, like single-flight coalescing.
+"""
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# The embeddings endpoint accepts up to 2048 inputs per request
+MAX_BATCH_SIZE = 2048
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_MAX_CONCURRENT_BATCHES = 4
+
+Vector = List[float]
+
+
+def _group_by_text(batch: List[Tuple[str, Any]]) -> Dict[str, List[Any]]:
+    """Waiting futures per distinct text, in first-arrival order"""
+    grouped: Dict[str, List[Any]] = {}
+    for text, future in batch:
+        grouped.setdefault(text, []).append(future)
+    return grouped
+
+
+def _check_vectors(texts: List[str], vectors: Optional[List[Vector]]):
+    """Raise if a request returned a different number of vectors than texts"""
+    if vectors is not None and len(vectors) != len(texts):
+        raise ValueError(f"Embedding request returned {len(vectors)} vectors for {len(texts)} texts")
+
+
+class _BatchStats:
+    """Request and batch counts shared by both batcher types"""
+
+    def __init__(self, name: str, max_batch_size: int, max_wait_ms: float):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.name = name
+        self.max_batch_size = min(max_batch_size, MAX_BATCH_SIZE)
+        self.max_wait = max(max_wait_ms, 0.0) / 1000
+        self.requests = 0  # Texts submitted by callers
+        self.batches = 0  # Embedding requests sent
+        self.deduplicated = 0  # Callers served by an identical text in the same batch
+        self.largest_batch = 0
+        self.failed_batches = 0
+
+    def _record_batch(self, callers: int, texts: int):
+        self.batches += 1
+        self.deduplicated += callers - texts
+        self.largest_batch = max(self.largest_batch, texts)
+
+    def get_statistics(self) -> Dict:
+        """
+        Get batching statistics
+
+        Returns:
+            Dict with requests, batches sent, average batch size and
+            texts deduplicated within batches
+        """
+        average = (self.requests / self.batches) if self.batches > 0 else 0.0
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": round(average, 1),
+            "largest_batch": self.largest_batch,
+            "deduplicated": self.deduplicated,
+            "failed_batches": self.failed_batches,
+            "pending": self.pending
+        }
+
+
+class EmbeddingBatcher(_BatchStats):
+    """
+    Thread-safe micro-batching embedding client
+
+    Usage:
+        batcher = get_embedding_batcher(client, "text-embedding-3-small")
+        vector = batcher.embed(text)               # threads
+        vector = await batcher.embed_async(text)   # coroutines
+    """
+
+    def __init__(
+        self,
+        request_fn: Callable[[List[str]], Optional[List[Vector]]],
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        max_concurrent_batches: int = DEFAULT_MAX_CONCURRENT_BATCHES,
+        name: str = "embeddings"
+    ):
+        """
+        Initialize batcher
+
+        Args:
+            request_fn: Embeds a list of texts, returning vectors in input
+                order (or None, which every caller of the batch receives)
+            max_batch_size: Texts per request (capped at 2048)
+            max_wait_ms: How long the first text of a batch waits for others
+            max_concurrent_batches: Batched requests in flight at once
+            name: Name reported in statistics
+        """
+        super().__init__(name, max_batch_size, max_wait_ms)
+        self.request_fn = request_fn
+        self._queue: "queue.SimpleQueue[Optional[Tuple[str, Future]]]" = queue.SimpleQueue()
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self._slots = threading.BoundedSemaphore(self.max_concurrent_batches)
+        self._lock = threading.Lock()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._closed = False
+
+    @classmethod
+    def for_client(cls, client, model: str, **options) -> "EmbeddingBatcher":
+        """
+        Batcher sending client.embeddings.create(model=model, input=[...])
+
+        Args:
+            client: Sync OpenAI-compatible client
+            model: Embedding model
+            options: EmbeddingBatcher options (max_wait_ms, max_batch_size, ...)
+        """
+        def request(texts: List[str]) -> List[Vector]:
+            response = client.embeddings.create(model=model, input=texts)
+            return [item.embedding for item in response.data]
+
+        options.setdefault("name", f"embeddings:{model}")
+        return cls(request, **options)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a text for the next batch
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Future resolving to the text's vector
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"Embedding batcher '{self.name}' is closed")
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch, name=f"embedding-batcher-{self.name}", daemon=True
+                )
+                self._dispatcher.start()
+            self.requests += 1
+            self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str, timeout: Optional[float] = None) -> Optional[Vector]:
+        """
+        Embed one text (blocks until its batch returns)
+
+        Args:
+            text: Text to embed
+            timeout: Optional seconds to wait
+
+        Returns:
+            Embedding vector
+
+        Raises:
+            Whatever the batch request raised
+        """
+        return self.submit(text).result(timeout)
+
+    def embed_many(self, texts: List[str], timeout: Optional[float] = None) -> List[Optional[Vector]]:
+        """
+        Embed several texts, batched together with other callers' texts
+
+        Args:
+            texts: Texts to embed
+            timeout: Optional seconds to wait for each vector
+
+        Returns:
+            Embedding vectors in input order
+        """
+        futures = [self.submit(text) for text in texts]
+        return [future.result(timeout) for future in futures]
+
+    async def embed_async(self, text: str) -> Optional[Vector]:
+        """
+        Embed one text from a coroutine (the event loop is not blocked)
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        return await asyncio.wrap_future(self.submit(text))
+
+    def close(self):
+        """Send the texts already queued and stop the dispatcher"""
+        with self._lock:
+            self._closed = True
+            dispatcher = self._dispatcher
+            if dispatcher is not None:
+                self._queue.put(None)
+        if dispatcher is not None:
+            dispatcher.join()
+
+    def _dispatch(self):
+        """Dispatcher thread: form batches and hand them to sender threads"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+
+            # Wait up to max_wait for more texts
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            # While every sender is busy, texts keep joining this batch
+            self._slots.acquire()
+            while not stop and len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            threading.Thread(target=self._send, args=(batch,), daemon=True).start()
+            if stop:
+                # Let the last batches finish before close() returns
+                for _ in range(self.max_concurrent_batches):
+                    self._slots.acquire()
+                return
+
+    def _send(self, batch: List[Tuple[str, Future]]):
+        """Sender thread: one request for the batch, results fanned out"""
+        try:
+            live = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            grouped = _group_by_text(live)
+            if not grouped:
+                return
+            texts = list(grouped)
+            with self._lock:
+                self._record_batch(len(live), len(texts))
+            try:
+                vectors = self.request_fn(texts)
+                _check_vectors(texts, vectors)
+            except BaseException as e:
+                with self._lock:
+                    self.failed_batches += 1
+                for futures in grouped.values():
+                    for future in futures:
+                        future.set_exception(e)
+                return
+            for position, futures in enumerate(grouped.values()):
+                vector = vectors[position] if vectors is not None else None
+                for future in futures:
+                    future.set_result(vector)
+        finally:
+            self._slots.release()
+
+
+class AsyncEmbeddingBatcher(_BatchStats):
+    """
+    Micro-batching for coroutines of one event loop
+
+    Usage:
+        batcher = get_async_embedding_batcher(async_client, "text-embedding-3-small")
+        vector = await batcher.embed(query)
+    """
+
+    def __init__(
+        self,
+        request_fn: Callable[[List[str]], Awaitable[Optional[List[Vector]]]],
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        name: str = "embeddings"
+    ):
+        """
+        Initialize batcher
+
+        Args:
+            request_fn: Coroutine function embedding a list of texts,
+                returning vectors in input order
+            max_batch_size: Texts per request (capped at 2048)
+            max_wait_ms: How long the first text of a batch waits for others
+            name: Name reported in statistics
+        """
+        super().__init__(name, max_batch_size, max_wait_ms)
+        self.request_fn = request_fn
+        # Keyed by event loop: futures cannot be resolved across loops
+        self._pending: Dict[int, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self._senders = set()  # Running send tasks (kept referenced)
+
+    @classmethod
+    def for_client(cls, client, model: str, **options) -> "AsyncEmbeddingBatcher":
+        """
+        Batcher awaiting client.embeddings.create(model=model, input=[...])
+
+        Args:
+            client: Async OpenAI-compatible client
+            model: Embedding model
+            options: AsyncEmbeddingBatcher options (max_wait_ms, max_batch_size)
+        """
+        async def request(texts: List[str]) -> List[Vector]:
+            response = await client.embeddings.create(model=model, input=texts)
+            return [item.embedding for item in response.data]
+
+        options.setdefault("name", f"async_embeddings:{model}")
+        return cls(request, **options)
+
+    @property
+    def pending(self) -> int:
+        return sum(len(batch) for batch in self._pending.values())
+
+    async def embed(self, text: str) -> Optional[Vector]:
+        """
+        Embed one text, batched with the texts of concurrent coroutines
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+
+        Raises:
+            Whatever the batch request raised
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = id(loop)
+        future = loop.create_future()
+        batch = self._pending.setdefault(loop_key, [])
+        batch.append((text, future))
+        self.requests += 1
+
+        if len(batch) >= self.max_batch_size:
+            self._flush(loop_key)
+        elif len(batch) == 1:
+            self._timers[loop_key] = loop.call_later(self.max_wait, self._flush, loop_key)
+        return await future
+
+    def _flush(self, loop_key: int):
+        """Send the loop's waiting texts as one batch"""
+        timer = self._timers.pop(loop_key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(loop_key, None)
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._senders.add(task)
+            task.add_done_callback(self._senders.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]):
+        """One request for the batch, results fanned out (cancelled callers skipped)"""
+        live = [(text, future) for text, future in batch if not future.done()]
+        grouped = _group_by_text(live)
+        if not grouped:
+            return
+        texts = list(grouped)
+        self._record_batch(len(live), len(texts))
+        try:
+            vectors = await self.request_fn(texts)
+            _check_vectors(texts, vectors)
+        except asyncio.CancelledError:
+            for _, future in live:
+                future.cancel()
+            raise
+        except Exception as e:
+            self.failed_batches += 1
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for position, futures in enumerate(grouped.values()):
+            vector = vectors[position] if vectors is not None else None
+            for future in futures:
+                if not future.done():
+                    future.set_result(vector)
+
+
+# Named process-wide instances, one per (kind, client endpoint, model)
+_batchers: Dict[Tuple[str, Any, str], Tuple[Any, _BatchStats]] = {}
+_batchers_lock = threading.Lock()
+
+
+def _client_key(client) -> Any:
+    """
+    Registry key of a client: its API key and base URL
+
+    Clients created separately for the same account (one per
+    EmbeddingGenerator, for instance) map to the same batcher, so the
+    registry holds one client and dispatcher per account and model.
+    Clients without a string api_key fall back to their identity.
+    """
+    api_key = getattr(client, "api_key", None)
+    if isinstance(api_key, str):
+        return (api_key, str(getattr(client, "base_url", None) or ""))
+    return id(client)
+
+
+def _shared(kind: str, cls, client, model: str, options: Dict) -> Any:
+    key = (kind, _client_key(client), model)
+    with _batchers_lock:
+        if key not in _batchers:
+            # The first client is kept referenced: it sends every batch (and its id is not reused)
+            _batchers[key] = (client, cls.for_client(client, model, **options))
+        return _batchers[key][1]
+
+
+def get_embedding_batcher(client, model: str, **options) -> EmbeddingBatcher:
+    """
+    Get the process-wide batcher for a sync client and model
+
+    Args:
+        client: Sync OpenAI-compatible client
+        model: Embedding model
+        options: Batcher options, used when the batcher is created
+
+    Returns:
+        EmbeddingBatcher shared by every caller using the model with a
+        client of the same API key and base URL
+    """
+    return _shared("sync", EmbeddingBatcher, client, model, options)
+
+
+def get_async_embedding_batcher(client, model: str, **options) -> AsyncEmbeddingBatcher:
+    """
+    Get the process-wide batcher for an async client and model
+
+    Args:
+        client: Async OpenAI-compatible client
+        model: Embedding model
+        options: Batcher options, used when the batcher is created
+
+    Returns:
+        AsyncEmbeddingBatcher shared by every caller using the model with a
+        client of the same API key and base URL
+    """
+    return _shared("async", AsyncEmbeddingBatcher, client, model, options)
+
+
+def embedding_batcher_statistics() -> Dict[str, Dict]:
+    """
+    Get batching statistics of every shared batcher
+
+    Returns:
+        Dict name -> statistics (requests, batches, avg_batch_size, ...)
+    """
+    with _batchers_lock:
+        batchers = [batcher for _, batcher in _batchers.values()]
+    return {batcher.name: batcher.get_statistics() for batcher in batchers}
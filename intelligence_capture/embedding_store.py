@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Persistent Content-Addressed Embedding Store
+
+One on-disk embedding cache shared by DuplicateDetector,
+scripts/precompute_embeddings.py and the RAG database generator, so the same
+text is never embedded twice across runs or subsystems.
+
+Features:
+- Keyed by sha256(model + text), independent of entity ids or chunk ids
+- SQLite table of packed float32 vectors (WAL mode, safe for several processes)
+- LRU-bounded in-memory residency for hot vectors
+- Bulk get_many/put_many so callers batch both lookups and API requests
+"""
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+from intelligence_capture.logger import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+
+# SQLite limits bound parameters per statement (999 on older builds)
+_LOOKUP_CHUNK_SIZE = 500
+
+
+class EmbeddingStore:
+    """
+    Content-addressed embedding store backed by SQLite
+
+    Vectors are stored as packed little-endian float32 BLOBs (4 bytes per
+    dimension). Returned vectors are plain lists of floats, like the OpenAI
+    client returns.
+    """
+
+    def __init__(self, db_path: Union[str, Path], max_memory_entries: int = 10_000):
+        """
+        Initialize embedding store
+
+        Args:
+            db_path: Path to the SQLite file (created if missing), or ":memory:"
+            max_memory_entries: Maximum number of vectors kept in RAM (0 disables)
+        """
+        self.db_path = str(db_path)
+        self.max_memory_entries = max_memory_entries
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0)
+        self._create_schema()
+
+        # Statistics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @staticmethod
+    def content_key(text: str, model: str = DEFAULT_EMBEDDING_MODEL) -> str:
+        """
+        Get the content address for a text embedded with a model
+
+        Args:
+            text: Embedded text
+            model: Embedding model name
+
+        Returns:
+            Hex sha256 digest of model and text
+        """
+        digest = hashlib.sha256()
+        digest.update(model.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, text: str, model: str = DEFAULT_EMBEDDING_MODEL) -> Optional[List[float]]:
+        """
+        Get the stored embedding for a text
+
+        Args:
+            text: Embedded text
+            model: Embedding model name
+
+        Returns:
+            Embedding vector, or None if not stored
+        """
+        return self.get_many([text], model)[0]
+
+    def put(self, text: str, vector: Sequence[float], model: str = DEFAULT_EMBEDDING_MODEL):
+        """
+        Store the embedding for a text
+
+        Args:
+            text: Embedded text
+            vector: Embedding vector
+            model: Embedding model name
+        """
+        self.put_many([text], [vector], model)
+
+    def get_many(
+        self,
+        texts: Sequence[str],
+        model: str = DEFAULT_EMBEDDING_MODEL
+    ) -> List[Optional[List[float]]]:
+        """
+        Get stored embeddings for many texts
+
+        Args:
+            texts: Embedded texts (duplicates allowed)
+            model: Embedding model name
+
+        Returns:
+            List of embedding vectors (None where not stored), in input order
+        """
+        keys = [self.content_key(text, model) for text in texts]
+        found: Dict[str, List[float]] = {}
+
+        with self._lock:
+            missing = []
+            for key in dict.fromkeys(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                    self.memory_hits += 1
+                else:
+                    missing.append(key)
+
+            for start in range(0, len(missing), _LOOKUP_CHUNK_SIZE):
+                chunk = missing[start:start + _LOOKUP_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                try:
+                    rows = self.conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        chunk
+                    ).fetchall()
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding store lookup failed: {e}")
+                    rows = []
+                for key, blob in rows:
+                    vector = self._unpack(blob)
+                    found[key] = vector
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+
+            self.misses += len(missing) - sum(1 for key in missing if key in found)
+
+        return [found.get(key) for key in keys]
+
+    def put_many(
+        self,
+        texts: Sequence[str],
+        vectors: Sequence[Optional[Sequence[float]]],
+        model: str = DEFAULT_EMBEDDING_MODEL
+    ) -> int:
+        """
+        Store embeddings for many texts in one transaction
+
+        Args:
+            texts: Embedded texts
+            vectors: Embedding vectors, parallel to texts (None entries are skipped)
+            model: Embedding model name
+
+        Returns:
+            Number of vectors written
+        """
+        timestamp = datetime.now().isoformat()
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                if vector is None:
+                    continue
+                key = self.content_key(text, model)
+                vector = list(vector)
+                rows.append((key, model, len(vector), self._pack(vector), timestamp))
+                self._remember(key, vector)
+
+            if not rows:
+                return 0
+
+            try:
+                with self.conn:
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, model, dimensions, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                        rows
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding store write failed: {e}")
+                return 0
+
+            self.writes += len(rows)
+        return len(rows)
+
+    def count(self, model: Optional[str] = None) -> int:
+        """
+        Count stored embeddings
+
+        Args:
+            model: Only count embeddings of this model (None counts all)
+
+        Returns:
+            Number of stored embeddings
+        """
+        with self._lock:
+            if model is None:
+                row = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            else:
+                row = self.conn.execute("SELECT COUNT(*) FROM embeddings WHERE model = ?", (model,)).fetchone()
+        return row[0]
+
+    def get_statistics(self) -> Dict:
+        """
+        Get store statistics
+
+        Returns:
+            Dict with hit/miss counts and memory residency
+        """
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hit_rate = ((self.memory_hits + self.disk_hits) / lookups * 100) if lookups > 0 else 0.0
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": f"{hit_rate:.1f}%",
+            "writes": self.writes,
+            "memory_entries": len(self._memory),
+            "max_memory_entries": self.max_memory_entries
+        }
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._memory.clear()
+            self.conn.close()
+
+    def _create_schema(self):
+        """Create the embeddings table if needed"""
+        if self.db_path != ":memory:":
+            # WAL lets readers in other processes proceed while one process writes
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                dimensions INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                created_at TEXT
+            )
+        """)
+        self.conn.commit()
+
+    def _remember(self, key: str, vector: List[float]):
+        """Add a vector to the LRU memory tier"""
+        if self.max_memory_entries <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _pack(vector: Sequence[float]) -> bytes:
+        """Pack a vector as little-endian float32 bytes"""
+        packed = array("f", vector)
+        if packed.itemsize != 4:  # pragma: no cover - exotic platforms
+            raise ValueError("float32 array type required")
+        if _BIG_ENDIAN:
+            packed.byteswap()
+        return packed.tobytes()
+
+    @staticmethod
+    def _unpack(blob: bytes) -> List[float]:
+        """Unpack little-endian float32 bytes into a list of floats"""
+        packed = array("f")
+        packed.frombytes(blob)
+        if _BIG_ENDIAN:
+            packed.byteswap()
+        return packed.tolist()
+
+
+_BIG_ENDIAN = array("H", [1]).tobytes() == b"\x00\x01"
+
+# Shared store instances (keyed by resolved path)
+_stores: Dict[str, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(db_path: Union[str, Path], max_memory_entries: int = 10_000) -> EmbeddingStore:
+    """
+    Get or create the shared embedding store for a path
+
+    Args:
+        db_path: Path to the SQLite file
+        max_memory_entries: Maximum number of vectors kept in RAM (first call wins)
+
+    Returns:
+        EmbeddingStore instance shared within this process
+    """
+    key = str(db_path) if str(db_path) == ":memory:" else str(Path(db_path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = EmbeddingStore(db_path, max_memory_entries)
+            _stores[key] = store
+        return store
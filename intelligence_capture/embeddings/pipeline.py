@@ -6,7 +6,6 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import logging
-import math
 import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
@@ -26,6 +25,8 @@ from intelligence_capture.persistence.models import (
     ChunkEmbeddingPayload,
     DocumentChunkPayload,
 )
+from intelligence_capture.embeddings.token_counter import count_embedding_tokens
+from intelligence_capture.single_flight import get_async_single_flight, request_key
 
 logger = logging.getLogger(__name__)
 
@@ -193,18 +194,24 @@ class EmbeddingPipeline:
         batch: Sequence[Tuple[DocumentChunkPayload, str]],
     ) -> List[ChunkEmbeddingPayload]:
         payload_chunks = [item[0] for item in batch]
+        contents = [chunk.content for chunk in payload_chunks]
 
         async def _execute_request():
             await self._limiter.acquire()
             return await asyncio.wait_for(
                 self._client.embeddings.create(
                     model=self._config.model,
-                    input=[chunk.content for chunk in payload_chunks],
+                    input=contents,
                 ),
                 timeout=self._config.request_timeout_seconds,
             )
 
-        response = await self._execute_with_retries(_execute_request)
+        # Un lote idéntico ya en vuelo (documento duplicado, re-ejecución) comparte
+        # su solicitud en lugar de pagar otra
+        response, shared = await get_async_single_flight("chunk_embeddings").do(
+            request_key(self._config.model, contents),
+            lambda: self._execute_with_retries(_execute_request),
+        )
         if response is None:  # pragma: no cover - solo si agotamos reintentos
             raise RuntimeError("No se pudo generar embeddings tras múltiples intentos.")
 
@@ -213,7 +220,8 @@ class EmbeddingPipeline:
             chunk = payload_chunks[idx]
             vector = data.embedding
             token_estimate = self._estimate_tokens(chunk.content)
-            cost_cents = (token_estimate / 1000.0) * self._config.cost_per_1k_tokens_cents
+            # La solicitud compartida ya se contabilizó en quien la hizo
+            cost_cents = 0.0 if shared else (token_estimate / 1000.0) * self._config.cost_per_1k_tokens_cents
 
             payload = ChunkEmbeddingPayload(
                 chunk_id=chunk.chunk_id,
@@ -225,6 +233,7 @@ class EmbeddingPipeline:
                 cost_cents=cost_cents,
                 metadata={
                     "cache_hit": False,
+                    "coalesced": shared,
                     "token_estimate": token_estimate,
                     "batch_size": len(payload_chunks),
                 },
@@ -259,11 +268,9 @@ class EmbeddingPipeline:
     @staticmethod
     def _estimate_tokens(text: str) -> int:
         """
-        Heurística simple: 4 caracteres ~ 1 token.
+        Tokens facturables: tiktoken si está instalado, si no 4 caracteres ~ 1 token.
         """
-        if not text:
-            return 0
-        return max(1, math.ceil(len(text) / 4))
+        return count_embedding_tokens(text)
 
     @staticmethod
     def _cache_key(document_id: UUID, chunk: DocumentChunkPayload) -> str:
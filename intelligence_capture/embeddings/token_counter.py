@@ -0,0 +1,58 @@
+"""
+Conteo de tokens facturables del modelo de embeddings.
+
+Usa tiktoken (codificación cl100k_base de text-embedding-3-small) si está
+instalado; si no, la heurística de 4 caracteres ~ 1 token.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from functools import lru_cache
+from typing import Any, Optional
+
+try:  # pragma: no cover - dependencia opcional
+    import tiktoken
+except ImportError:  # pragma: no cover
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Codificación de text-embedding-3-small / -large y ada-002
+EMBEDDING_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=4)
+def _get_encoding(name: str) -> Optional[Any]:
+    """Codificación de tiktoken (None si no está disponible)."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as exc:  # pragma: no cover - descarga del vocabulario fallida
+        logger.warning("Codificación %s no disponible, se estiman tokens: %s", name, exc)
+        return None
+
+
+def has_exact_counter(encoding: str = EMBEDDING_ENCODING) -> bool:
+    """True si los conteos vienen de tiktoken y no de la heurística."""
+    return _get_encoding(encoding) is not None
+
+
+def count_embedding_tokens(text: str, encoding: str = EMBEDDING_ENCODING) -> int:
+    """
+    Tokens que el modelo de embeddings factura por un texto.
+
+    Args:
+        text: Texto a embeber
+        encoding: Codificación de tiktoken del modelo
+
+    Returns:
+        Número de tokens (exacto con tiktoken, estimado sin él)
+    """
+    if not text:
+        return 0
+    enc = _get_encoding(encoding)
+    if enc is None:
+        return max(1, math.ceil(len(text) / 4))
+    return len(enc.encode(text, disallowed_special=()))
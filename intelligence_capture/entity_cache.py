@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Entity Working-Set Cache for Knowledge Graph Consolidation
+
+Keeps the existing entities of each type in memory while consolidating,
+instead of re-reading the whole table for every new entity.
+
+Features:
+- Loaded once per entity type, reused across entities and interviews
+- Only the columns DuplicateDetector reads are projected (id, name, title,
+  type, description, normalized_name, name_profile); full rows are fetched
+  by id only for merge targets
+- Merges are applied in place so later entities see the merged state
+- Version stamp (connection change counter + SQLite data_version): rows
+  inserted through this connection (the pipeline storing an interview) are
+  appended in place, a type whose loaded rows were deleted or replaced is
+  reloaded alone, and commits by other connections drop every working set
+- Can be pinned while parallel consolidation workers share it, so the
+  writer thread's audit writes do not drop working sets mid-run
+- Thread-safe: cache state and its db.conn reads share one lock with the
+  consolidation writer thread
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from intelligence_capture.logger import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+
+class EntityWorkingSetCache:
+    """
+    Caches existing consolidated entities per entity type
+
+    The cached list for a type is stable (same object) while only this
+    connection writes: inserted rows are appended, which lets
+    DuplicateDetector's candidate index update incrementally instead of
+    rebuilding. revision() changes whenever a merge replaces an entity of
+    the list, so the index knows when to look for changed entries.
+    """
+
+    # Columns read by DuplicateDetector (entity text + precomputed normalized name and profile)
+    DETECTION_COLUMNS = ("id", "name", "title", "type", "description", "normalized_name", "name_profile")
+
+    def __init__(self, db, lock=None):
+        """
+        Initialize working-set cache
+
+        Args:
+            db: Database instance (IntelligenceDB or EnhancedIntelligenceDB)
+            lock: Optional lock held around cache state and db.conn use
+                (shared with the consolidation writer thread)
+        """
+        self.db = db
+        self.lock = lock if lock is not None else threading.RLock()
+
+        self._working_sets: Dict[str, List[Dict]] = {}
+        self._positions: Dict[str, Dict[Any, int]] = {}
+        self._full_entities: Dict[str, Dict[Any, Dict]] = {}
+        self._columns: Dict[str, Optional[List[str]]] = {}
+        self._loaded: Dict[str, Tuple[int, int, int]] = {}  # type -> (count, id sum, max id) of its rows
+        self._version: Optional[Tuple] = None
+        self._revisions: Dict[str, int] = {}
+        self._pinned = False
+
+        # Statistics
+        self.loads = 0
+        self.hits = 0
+        self.invalidations = 0
+        self.appended = 0
+
+    def get(self, entity_type: str) -> List[Dict]:
+        """
+        Get the working set (existing entities) for an entity type
+
+        Args:
+            entity_type: Type of entity
+
+        Returns:
+            List of existing entities with detection columns only
+        """
+        with self.lock:
+            self._check_version()
+
+            if entity_type in self._working_sets:
+                self.hits += 1
+                return self._working_sets[entity_type]
+
+            entities = self._load(entity_type)
+            if entities is None:
+                # Load failed: do not cache, retry on next access
+                return []
+
+            self._working_sets[entity_type] = entities
+            self._positions[entity_type] = {
+                entity.get("id"): position
+                for position, entity in enumerate(entities)
+            }
+            self._full_entities[entity_type] = {}
+            self._loaded[entity_type] = self._row_stamp(entities)
+            self.loads += 1
+
+            return entities
+
+    def get_full_entity(self, entity_type: str, entity: Dict) -> Dict:
+        """
+        Get the complete row for a working-set entity (used for merging)
+
+        Args:
+            entity_type: Type of entity
+            entity: Entity from the working set
+
+        Returns:
+            Full entity dict (merged in-memory state if already merged)
+        """
+        with self.lock:
+            entity_id = entity.get("id")
+            merged = self._full_entities.get(entity_type, {}).get(entity_id)
+            if merged is not None:
+                return merged
+
+            if self._columns.get(entity_type) is None or entity_id is None:
+                # Working set already holds full rows
+                return entity
+
+            try:
+                cursor = self.db.conn.cursor()
+                cursor.execute(f"SELECT * FROM {entity_type} WHERE id = ?", (entity_id,))
+                row = cursor.fetchone()
+                return dict(row) if row else entity
+            except Exception as e:
+                logger.warning(f"Error fetching full {entity_type} entity {entity_id}: {e}")
+                return entity
+
+    def record_merge(self, entity_type: str, merged_entity: Dict) -> Optional[int]:
+        """
+        Replace a working-set entity with its merged state
+
+        Args:
+            entity_type: Type of entity
+            merged_entity: Merged entity (keeps the id of the existing entity)
+
+        Returns:
+            Position of the replaced entity in the working set, or None
+        """
+        with self.lock:
+            entity_id = merged_entity.get("id")
+            position = self._positions.get(entity_type, {}).get(entity_id)
+            if position is None:
+                return None
+
+            self._working_sets[entity_type][position] = merged_entity
+            self._full_entities[entity_type][entity_id] = merged_entity
+            self._revisions[entity_type] = self._revisions.get(entity_type, 0) + 1
+            return position
+
+    def revision(self, entity_type: str) -> int:
+        """
+        Get the in-memory revision of a working set
+
+        Args:
+            entity_type: Type of entity
+
+        Returns:
+            Counter bumped by every record_merge() of the type
+        """
+        with self.lock:
+            return self._revisions.get(entity_type, 0)
+
+    def refresh_version(self):
+        """
+        Accept the current database state as the cached version
+
+        Call after writes that do not touch entity tables (audit trail,
+        relationships) so they do not invalidate the working sets.
+        """
+        with self.lock:
+            if self._pinned:
+                return
+            self._version = self._read_version()
+
+    def pin(self):
+        """
+        Stop version checks until unpin()
+
+        Only writes that do not touch entity tables (audit trail) may happen
+        while pinned; they are accepted by unpin().
+        """
+        self._pinned = True
+
+    def unpin(self):
+        """Resume version checks, accepting the current database state"""
+        with self.lock:
+            self._pinned = False
+            self.refresh_version()
+
+    def invalidate(self, entity_type: Optional[str] = None):
+        """
+        Drop cached working sets
+
+        Args:
+            entity_type: Type of entity, or None to drop everything
+        """
+        with self.lock:
+            self.invalidations += 1
+            if entity_type is None:
+                self._working_sets.clear()
+                self._positions.clear()
+                self._full_entities.clear()
+                self._loaded.clear()
+                self._version = None
+            else:
+                self._working_sets.pop(entity_type, None)
+                self._positions.pop(entity_type, None)
+                self._full_entities.pop(entity_type, None)
+                self._loaded.pop(entity_type, None)
+
+    def get_statistics(self) -> Dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dict with load/hit counts and cached sizes
+        """
+        with self.lock:
+            return {
+                "loads": self.loads,
+                "hits": self.hits,
+                "invalidations": self.invalidations,
+                "appended": self.appended,
+                "cached_types": len(self._working_sets),
+                "cached_entities": sum(len(entities) for entities in self._working_sets.values())
+            }
+
+    def _check_version(self):
+        """Bring the working sets in line with database changes since the last sync"""
+        if self._pinned:
+            return
+        version = self._read_version()
+        if self._version is not None and version != self._version:
+            if None in version or version[1] != self._version[1]:
+                # Another connection committed: any table may have changed
+                logger.debug("Entity working sets invalidated (external write)")
+                self.invalidate()
+            else:
+                for entity_type in list(self._working_sets):
+                    if not self._append_inserted(entity_type):
+                        logger.debug(f"Working set for {entity_type} invalidated (rows changed)")
+                        self.invalidate(entity_type)
+        self._version = version
+
+    def _append_inserted(self, entity_type: str) -> bool:
+        """
+        Apply this connection's writes to one working set in place
+
+        Rows with ids above the loaded maximum are appended; the loaded rows
+        must be unchanged (same count and id sum), which holds for inserts
+        and for the merges already applied with record_merge().
+
+        Args:
+            entity_type: Type of entity
+
+        Returns:
+            False if the working set must be reloaded
+        """
+        columns = self._columns.get(entity_type)
+        count, id_sum, max_id = self._loaded[entity_type]
+        if columns is None or "id" not in columns:
+            return False
+
+        try:
+            cursor = self.db.conn.cursor()
+            cursor.execute(f"""
+                SELECT COUNT(*), COALESCE(SUM(id), 0) FROM {entity_type}
+                WHERE (is_consolidated = 1 OR is_consolidated IS NULL) AND id <= ?
+            """, (max_id,))
+            if tuple(cursor.fetchone()) != (count, id_sum):
+                return False
+
+            cursor.execute(f"""
+                SELECT {", ".join(columns)} FROM {entity_type}
+                WHERE (is_consolidated = 1 OR is_consolidated IS NULL) AND id > ?
+                ORDER BY id
+            """, (max_id,))
+            rows = [dict(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.debug(f"Could not sync working set for {entity_type}: {e}")
+            return False
+
+        if rows:
+            entities = self._working_sets[entity_type]
+            positions = self._positions[entity_type]
+            for entity in rows:
+                positions[entity["id"]] = len(entities)
+                entities.append(entity)
+            self._loaded[entity_type] = self._row_stamp(entities)
+            self.appended += len(rows)
+        return True
+
+    @staticmethod
+    def _row_stamp(entities: List[Dict]) -> Tuple[int, int, int]:
+        """(count, id sum, max id) of loaded rows"""
+        ids = [entity.get("id") or 0 for entity in entities]
+        return (len(ids), sum(ids), max(ids, default=0))
+
+    def _read_version(self) -> Tuple:
+        """
+        Read the database version stamp
+
+        Returns:
+            (total_changes on this connection, PRAGMA data_version)
+        """
+        try:
+            cursor = self.db.conn.cursor()
+            cursor.execute("PRAGMA data_version")
+            row = cursor.fetchone()
+            data_version = row[0] if row else None
+            return (self.db.conn.total_changes, data_version)
+        except Exception as e:
+            logger.debug(f"Could not read database version: {e}")
+            return (None, None)
+
+    def _load(self, entity_type: str) -> Optional[List[Dict]]:
+        """
+        Load existing entities of a type from the database
+
+        Args:
+            entity_type: Type of entity
+
+        Returns:
+            List of existing entities, or None if the query failed
+        """
+        columns = self._get_projection(entity_type)
+        select = ", ".join(columns) if columns else "*"
+
+        try:
+            cursor = self.db.conn.cursor()
+
+            # Query database for entities of this type
+            cursor.execute(f"""
+                SELECT {select} FROM {entity_type}
+                WHERE is_consolidated = 1 OR is_consolidated IS NULL
+            """)
+
+            rows = cursor.fetchall()
+
+            # Convert to list of dicts
+            return [dict(row) for row in rows]
+
+        except Exception as e:
+            logger.warning(f"Error fetching existing entities for {entity_type}: {e}")
+            return None
+
+    def _get_projection(self, entity_type: str) -> Optional[List[str]]:
+        """
+        Get the detection columns present in an entity table
+
+        Args:
+            entity_type: Type of entity
+
+        Returns:
+            List of column names, or None to select all columns
+        """
+        if entity_type in self._columns:
+            return self._columns[entity_type]
+
+        columns = None
+        try:
+            cursor = self.db.conn.cursor()
+            cursor.execute(f"PRAGMA table_info({entity_type})")
+            table_columns = {row[1] for row in cursor.fetchall()}
+            if "id" in table_columns:
+                columns = [c for c in self.DETECTION_COLUMNS if c in table_columns]
+        except Exception as e:
+            logger.debug(f"Could not read columns for {entity_type}: {e}")
+
+        self._columns[entity_type] = columns
+        return columns
@@ -3,11 +3,21 @@ AI-powered extraction of structured intelligence from interview responses
 Uses GPT-4 to extract entities based on PHASE1_ONTOLOGY_SCHEMA.json
 Orchestrates v1.0 and v2.0 extractors for all 17 entity types
 """
+import asyncio
+import contextvars
+import hashlib
 import json
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from openai import OpenAI
-from .config import OPENAI_API_KEY, MODEL, TEMPERATURE, MAX_RETRIES
-from .rate_limiter import get_rate_limiter
+from .config import (
+    OPENAI_API_KEY, MODEL, TEMPERATURE, MAX_RETRIES, EXTRACTION_CONCURRENCY,
+    GROUPED_EXTRACTION_CONFIG, DEFAULT_EXTRACTION_GROUPS
+)
+from .grouped_extraction import SECTION_SCHEMAS, GroupedExtractionStats, run_group_extraction
+from .llm_cache import get_llm_cache
+from .rate_limiter import estimate_request_tokens
 
 # Import all v2.0 extractors
 from .extractors import (
@@ -23,16 +33,61 @@ from .extractors import (
     KnowledgeGapExtractor,
     SuccessPatternExtractor,
     BudgetConstraintExtractor,
-    ExternalDependencyExtractor
+    ExternalDependencyExtractor,
+    JSON_RESPONSE_FORMAT,
+    capture_llm_requests,
+    capture_request,
+    create_chat_completion,
+    get_model_rate_limiter
 )
 
 
+# Placeholder interview rendered into the prompts to version the extractors
+VERSION_PROBE_INTERVIEW = {
+    "meta": {
+        "respondent": "{respondent}",
+        "role": "{role}",
+        "company": "{company}",
+        "date": "{date}",
+        "business_unit": "{business_unit}",
+        "department": "{department}"
+    },
+    "qa_pairs": {"{question}": "{answer}"}
+}
+
+
 class IntelligenceExtractor:
     """Extracts structured data from interview responses using GPT-4"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_concurrent_extractions: Optional[int] = None,
+        grouped_extraction: Optional[bool] = None,
+        extraction_groups: Optional[Dict[str, List[str]]] = None
+    ):
+        """
+        Initialize extractor
+
+        Args:
+            max_concurrent_extractions: Extraction calls in flight per
+                interview (default: extraction.max_concurrent_extractions;
+                1 runs them sequentially)
+            grouped_extraction: Batch related entity types into one LLM call
+                per group (default: grouped_extraction.enabled)
+            extraction_groups: Group name -> entity types (default:
+                grouped_extraction.groups)
+        """
         self.client = OpenAI(api_key=OPENAI_API_KEY)
-        self.rate_limiter = get_rate_limiter(max_calls_per_minute=50, key="legacy:gpt-4o-mini")
+        # Same key as call_llm_with_fallback so all calls to MODEL share one budget
+        self.rate_limiter = get_model_rate_limiter(MODEL)
+        self.max_concurrent_extractions = max(1, max_concurrent_extractions or EXTRACTION_CONCURRENCY)
+
+        if grouped_extraction is None:
+            grouped_extraction = GROUPED_EXTRACTION_CONFIG.get("enabled", False)
+        self.grouped_extraction = grouped_extraction
+        self.extraction_groups = extraction_groups or GROUPED_EXTRACTION_CONFIG.get("groups", DEFAULT_EXTRACTION_GROUPS)
+
+        self._extractor_versions: Optional[Dict[str, str]] = None
 
         # Initialize all v2.0 extractors
         print("🔧 Initializing extractors...")
@@ -53,10 +108,62 @@ class IntelligenceExtractor:
         }
         print(f"✓ Initialized {len(self.v2_extractors)} v2.0 extractors")
         
-    def extract_all(self, meta: Dict, qa_pairs: Dict) -> Dict[str, List[Dict]]:
+    def extractor_versions(self) -> Dict[str, str]:
+        """
+        Version of the extraction prompt and settings of each entity type
+
+        Each extractor runs once on a placeholder interview under
+        capture_llm_requests(), so nothing is sent; the version is a short
+        hash of the requests it would make (prompt text, models, temperature,
+        response format), plus its grouped request in grouped mode. Editing
+        a prompt, a section schema or the model chain changes only the
+        affected types; code changes that leave the requests alone do not.
+
+        Returns:
+            entity_type -> version (extractable types, as in extract_all)
+        """
+        if self._extractor_versions is None:
+            meta = VERSION_PROBE_INTERVIEW["meta"]
+            qa_pairs = VERSION_PROBE_INTERVIEW["qa_pairs"]
+            interview_text = self._format_interview(meta, qa_pairs)
+
+            renderers = self._type_extractions(meta, qa_pairs, interview_text)
+            # v2.0 extractors may skip the LLM without their keywords: render the prompt directly
+            probe_text = "\n\n".join(f"Q: {q}\nA: {a}" for q, a in qa_pairs.items())
+            for entity_type, extractor in self.v2_extractors.items():
+                renderers[entity_type] = partial(extractor._llm_extraction, probe_text, meta)
+
+            versions = {}
+            for entity_type, extract in renderers.items():
+                with capture_llm_requests() as requests:
+                    if self.grouped_extraction and entity_type in SECTION_SCHEMAS:
+                        run_group_extraction(self.client, [entity_type], interview_text)
+                    try:
+                        extract()
+                    except Exception as e:
+                        # The requests made before the failure still version the type
+                        print(f"  ⚠️  Could not render {entity_type} prompts for versioning: {e}")
+                payload = json.dumps({"entity_type": entity_type, "requests": requests}, sort_keys=True, ensure_ascii=False)
+                versions[entity_type] = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+            self._extractor_versions = versions
+        return dict(self._extractor_versions)
+
+    def extract_all(
+        self,
+        meta: Dict,
+        qa_pairs: Dict,
+        entity_types: Optional[List[str]] = None
+    ) -> Dict[str, List[Dict]]:
         """
         Extract all 17 entity types from an interview
 
+        Args:
+            meta: Interview metadata
+            qa_pairs: Interview Q&A pairs
+            entity_types: Only extract these types (extractor_versions()
+                keys); legacy projections are only added for their v2
+                source types. None extracts everything.
+
         Returns:
             {
                 # v1.0 entities (kept for backward compatibility)
@@ -81,37 +188,264 @@ class IntelligenceExtractor:
             }
         """
 
-        # Build context from interview
-        interview_text = self._format_interview(meta, qa_pairs)
-        interview_data = {"meta": meta, "qa_pairs": qa_pairs}
+        return self.extract_all_with_stats(meta, qa_pairs, entity_types)[0]
 
-        # Extract each entity type
-        results = {}
+    def extract_all_with_stats(
+        self,
+        meta: Dict,
+        qa_pairs: Dict,
+        entity_types: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, List[Dict]], Optional[GroupedExtractionStats]]:
+        """
+        extract_all() plus the token/latency accounting of this interview
+
+        The stats belong to this call only, so interviews extracted
+        concurrently on one extractor each get their own.
+
+        Args:
+            meta: Interview metadata
+            qa_pairs: Interview Q&A pairs
+            entity_types: Only extract these types (None: all)
 
+        Returns:
+            (same dict as extract_all(), GroupedExtractionStats in grouped
+            mode or None)
+        """
         print(f"\n🔍 Extracting from: {meta.get('respondent')} ({meta.get('role')})")
+        jobs, stats = self._extraction_jobs(meta, qa_pairs, entity_types)
+
+        if self.max_concurrent_extractions > 1:
+            results = self._run_coroutine(self._run_jobs_concurrently(jobs))
+        else:
+            print(f"  📦 Running {len(jobs)} extraction jobs sequentially...")
+            results = {}
+            for _, job in jobs:
+                results.update(job())
+
+        return self._finish_results(results), stats
+
+    async def extract_all_async(
+        self,
+        meta: Dict,
+        qa_pairs: Dict,
+        entity_types: Optional[List[str]] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Async variant of extract_all() for callers running an event loop
 
-        # v1.0 extractions (legacy, for backward compatibility)
-        print("  📦 Running legacy-only extractors...")
-        results["processes"] = self._extract_processes(interview_text, meta)
-        results["kpis"] = self._extract_kpis(interview_text, meta)
-        results["inefficiencies"] = self._extract_inefficiencies(interview_text, meta)
+        Args:
+            meta: Interview metadata
+            qa_pairs: Interview Q&A pairs
+            entity_types: Only extract these types (None: all)
 
-        # v2.0 extractions (new entity types)
-        print("  📦 Running v2.0 extractors...")
-        for entity_type, extractor in self.v2_extractors.items():
-            try:
-                entities = extractor.extract_from_interview(interview_data)
-                results[entity_type] = entities
-                print(f"    ✓ {entity_type}: {len(entities)}")
-            except Exception as e:
-                print(f"    ⚠️  {entity_type} failed: {str(e)}")
-                results[entity_type] = []
-                # Continue processing remaining entity types
+        Returns:
+            Same dict as extract_all()
+        """
+        return (await self.extract_all_async_with_stats(meta, qa_pairs, entity_types))[0]
+
+    async def extract_all_async_with_stats(
+        self,
+        meta: Dict,
+        qa_pairs: Dict,
+        entity_types: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, List[Dict]], Optional[GroupedExtractionStats]]:
+        """
+        Async variant of extract_all_with_stats()
+
+        Args:
+            meta: Interview metadata
+            qa_pairs: Interview Q&A pairs
+            entity_types: Only extract these types (None: all)
+
+        Returns:
+            Same tuple as extract_all_with_stats()
+        """
+        print(f"\n🔍 Extracting from: {meta.get('respondent')} ({meta.get('role')})")
+        jobs, stats = self._extraction_jobs(meta, qa_pairs, entity_types)
+        results = await self._run_jobs_concurrently(jobs)
+        return self._finish_results(results), stats
+
+    def _finish_results(self, results: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """Restore entity-type order and add the legacy projections"""
+        order = ["processes", "kpis", "inefficiencies", *self.v2_extractors]
+        results = {entity_type: results[entity_type] for entity_type in order if entity_type in results}
 
         # Project v2 entities into legacy schemas for backward compatibility
         self._project_v2_entities(results)
 
         return results
+
+    def _extraction_jobs(
+        self,
+        meta: Dict,
+        qa_pairs: Dict,
+        entity_types: Optional[List[str]] = None
+    ) -> Tuple[List[Tuple[str, Callable[[], Dict[str, List[Dict]]]]], Optional[GroupedExtractionStats]]:
+        """
+        Build the blocking extraction jobs for one interview
+
+        Per-type mode has one job per entity type. Grouped mode has one job
+        per group (one LLM call, then per-type post-processing) plus one job
+        per entity type not covered by a group.
+
+        Args:
+            meta: Interview metadata
+            qa_pairs: Interview Q&A pairs
+            entity_types: Only build jobs for these types (None: all)
+
+        Returns:
+            ((label, callable) pairs, each callable returning {entity_type:
+            entities}; GroupedExtractionStats the group jobs fill in grouped
+            mode, else None)
+        """
+        interview_text = self._format_interview(meta, qa_pairs)
+        extractions = self._type_extractions(meta, qa_pairs, interview_text)
+        if entity_types is not None:
+            extractions = {
+                entity_type: extract for entity_type, extract in extractions.items() if entity_type in entity_types
+            }
+
+        jobs = []
+        grouped = set()
+        stats = None
+        if self.grouped_extraction:
+            stats = GroupedExtractionStats()
+            for group_name, entity_types in self.extraction_groups.items():
+                entity_types = [
+                    entity_type for entity_type in entity_types
+                    if entity_type in extractions and entity_type in SECTION_SCHEMAS and entity_type not in grouped
+                ]
+                if len(entity_types) < 2:
+                    continue  # Nothing to share; extracted per type below
+                grouped.update(entity_types)
+                jobs.append((group_name, partial(self._run_group, group_name, entity_types, extractions, interview_text, stats)))
+
+        for entity_type, extract in extractions.items():
+            if entity_type not in grouped:
+                jobs.append((entity_type, partial(self._run_single, entity_type, extract)))
+
+        return jobs, stats
+
+    def _type_extractions(
+        self,
+        meta: Dict,
+        qa_pairs: Dict,
+        interview_text: str
+    ) -> Dict[str, Callable[..., List[Dict]]]:
+        """
+        Per-type extraction callables, optionally fed a pre-fetched LLM response
+
+        Args:
+            meta: Interview metadata
+            qa_pairs: Interview Q&A pairs
+            interview_text: Formatted interview
+
+        Returns:
+            entity_type -> callable(llm_response=None) returning the entities
+        """
+        interview_data = {"meta": meta, "qa_pairs": qa_pairs}
+        extractions = {
+            # v1.0 extractions (legacy, for backward compatibility)
+            "processes": lambda llm_response=None: self._extract_processes(interview_text, meta, llm_response),
+            "kpis": lambda llm_response=None: self._extract_kpis(interview_text, meta, llm_response),
+            "inefficiencies": lambda llm_response=None: self._extract_inefficiencies(interview_text, meta, llm_response)
+        }
+        # v2.0 extractions (new entity types)
+        for entity_type, extractor in self.v2_extractors.items():
+            extractions[entity_type] = (
+                lambda llm_response=None, extractor=extractor: extractor.extract_from_interview(interview_data, llm_response)
+            )
+        return extractions
+
+    def _run_single(self, entity_type: str, extract: Callable[..., List[Dict]]) -> Dict[str, List[Dict]]:
+        """Job for one entity type with its own LLM call"""
+        return {entity_type: self._run_job(entity_type, extract)}
+
+    def _run_group(
+        self,
+        group_name: str,
+        entity_types: List[str],
+        extractions: Dict[str, Callable[..., List[Dict]]],
+        interview_text: str,
+        stats: Optional[GroupedExtractionStats] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Job for a group: one grouped LLM call, then each type's own post-processing
+
+        Types whose section is missing from the response (or whose grouped
+        call failed) fall back to their own per-type call.
+        """
+        sections = run_group_extraction(self.client, entity_types, interview_text, stats)
+        print(f"    ✓ group {group_name}: {len(sections)}/{len(entity_types)} sections")
+
+        return {
+            entity_type: self._run_job(entity_type, partial(extractions[entity_type], sections.get(entity_type)))
+            for entity_type in entity_types
+        }
+
+    def _run_job(self, entity_type: str, job: Callable[[], List[Dict]]) -> List[Dict]:
+        """Run one extraction; a failure yields [] for that type only"""
+        try:
+            entities = job()
+            print(f"    ✓ {entity_type}: {len(entities)}")
+            return entities
+        except Exception as e:
+            print(f"    ⚠️  {entity_type} failed: {str(e)}")
+            # Continue processing remaining entity types
+            return []
+
+    async def _run_jobs_concurrently(
+        self,
+        jobs: List[Tuple[str, Callable[[], Dict[str, List[Dict]]]]]
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fan out extraction jobs, at most max_concurrent_extractions at a time
+
+        Calls stay blocking (OpenAI client + shared thread-safe rate limiter),
+        so each one runs on a worker thread while the event loop only
+        schedules and collects them. The pool is created for this call and
+        shut down when it returns.
+
+        Args:
+            jobs: (label, callable) pairs from _extraction_jobs()
+
+        Returns:
+            {entity_type: entities} of all jobs
+        """
+        print(f"  📦 Running {len(jobs)} extraction jobs concurrently (max {self.max_concurrent_extractions})...")
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_extractions,
+            thread_name_prefix="extractor"
+        )
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrent_extractions)
+
+        async def run(job: Callable[[], Dict[str, List[Dict]]]) -> Dict[str, List[Dict]]:
+            async with semaphore:
+                # Copy of the caller's context, so track_llm_usage() sees the worker's calls
+                return await loop.run_in_executor(executor, contextvars.copy_context().run, job)
+
+        results = {}
+        try:
+            for job_results in await asyncio.gather(*(run(job) for _, job in jobs)):
+                results.update(job_results)
+        finally:
+            # Without blocking the loop: idle workers exit, busy ones after their job
+            executor.shutdown(wait=False)
+        return results
+
+    @staticmethod
+    def _run_coroutine(coroutine) -> Any:
+        """Run a coroutine to completion from sync code, even inside a running loop"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+
+        # Called from async code: run on a separate thread with its own loop
+        with ThreadPoolExecutor(max_workers=1) as runner:
+            return runner.submit(contextvars.copy_context().run, asyncio.run, coroutine).result()
     
     def _format_interview(self, meta: Dict, qa_pairs: Dict) -> str:
         """Format interview for GPT-4 context"""
@@ -135,27 +469,48 @@ class IntelligenceExtractor:
         """Call GPT-4 with retry logic and rate limiting"""
         import time
         from openai import RateLimitError
-        
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        if capture_request([MODEL], messages, TEMPERATURE):
+            return {}
+
+        # Cached completion: no API call, no rate limit slot
+        cache = get_llm_cache()
+        if cache is not None:
+            cached = cache.get(MODEL, messages, TEMPERATURE, JSON_RESPONSE_FORMAT)
+            if cached is not None:
+                return json.loads(cached)
+
+        tokens = estimate_request_tokens(messages)
         for attempt in range(MAX_RETRIES):
             try:
                 # WAIT for rate limiter BEFORE making call
-                self.rate_limiter.wait_if_needed()
+                self.rate_limiter.wait_if_needed(tokens)
                 
-                response = self.client.chat.completions.create(
+                response = create_chat_completion(
+                    self.client,
+                    self.rate_limiter,
                     model=MODEL,
                     temperature=TEMPERATURE,
-                    response_format={"type": "json_object"},
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ]
+                    response_format=JSON_RESPONSE_FORMAT,
+                    messages=messages
                 )
+                total_tokens = getattr(response.usage, "total_tokens", None)
+                if isinstance(total_tokens, int):
+                    self.rate_limiter.record_usage(tokens, total_tokens)
                 
-                result = json.loads(response.choices[0].message.content)
+                content = response.choices[0].message.content
+                result = json.loads(content)
+                if cache is not None:
+                    cache.put(MODEL, messages, TEMPERATURE, content, JSON_RESPONSE_FORMAT, response.usage)
                 return result
                 
             except RateLimitError as e:
                 # Should rarely happen now with rate limiter
+                self.rate_limiter.update_from_headers(getattr(e.response, "headers", None))
                 wait_time = min(2 ** attempt, 60)  # Exponential backoff, max 60s
                 print(f"  ⚠️  Rate limit hit (unexpected), waiting {wait_time}s...")
                 time.sleep(wait_time)
@@ -172,7 +527,7 @@ class IntelligenceExtractor:
         
         return {}
     
-    def _extract_processes(self, interview_text: str, meta: Dict) -> List[Dict]:
+    def _extract_processes(self, interview_text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Extract processes from interview"""
         
         system_prompt = """Eres un analista de procesos empresariales.
@@ -200,12 +555,15 @@ Responde en JSON:
   ]
 }"""
         
-        result = self._call_gpt4(system_prompt, interview_text)
+        if llm_response is not None:
+            result = json.loads(llm_response)
+        else:
+            result = self._call_gpt4(system_prompt, interview_text)
         processes = result.get("processes", [])
         print(f"  ✓ Processes: {len(processes)}")
         return processes
     
-    def _extract_kpis(self, interview_text: str, meta: Dict) -> List[Dict]:
+    def _extract_kpis(self, interview_text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Extract KPIs from interview"""
         
         system_prompt = """Eres un analista de métricas empresariales.
@@ -234,12 +592,15 @@ Responde en JSON:
   ]
 }"""
         
-        result = self._call_gpt4(system_prompt, interview_text)
+        if llm_response is not None:
+            result = json.loads(llm_response)
+        else:
+            result = self._call_gpt4(system_prompt, interview_text)
         kpis = result.get("kpis", [])
         print(f"  ✓ KPIs: {len(kpis)}")
         return kpis
     
-    def _extract_inefficiencies(self, interview_text: str, meta: Dict) -> List[Dict]:
+    def _extract_inefficiencies(self, interview_text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Extract inefficiencies from interview"""
         
         system_prompt = """Eres un analista de eficiencia operacional.
@@ -264,7 +625,10 @@ Responde en JSON:
   ]
 }"""
         
-        result = self._call_gpt4(system_prompt, interview_text)
+        if llm_response is not None:
+            result = json.loads(llm_response)
+        else:
+            result = self._call_gpt4(system_prompt, interview_text)
         inefficiencies = result.get("inefficiencies", [])
         print(f"  ✓ Inefficiencies: {len(inefficiencies)}")
         return inefficiencies
@@ -277,16 +641,14 @@ Responde en JSON:
         """
         Populate legacy entity keys using richer v2.0 structures so callers
         depending on v1 schemas continue to work during the migration.
+        Only types whose v2 source was extracted are projected.
         """
-        results["pain_points"] = self._project_pain_points_from_v2(
-            results.get("pain_points_v2", [])
-        )
-        results["systems"] = self._project_systems_from_v2(
-            results.get("systems_v2", [])
-        )
-        results["automation_candidates"] = self._project_automation_from_v2(
-            results.get("automation_candidates_v2", [])
-        )
+        if "pain_points_v2" in results:
+            results["pain_points"] = self._project_pain_points_from_v2(results["pain_points_v2"])
+        if "systems_v2" in results:
+            results["systems"] = self._project_systems_from_v2(results["systems_v2"])
+        if "automation_candidates_v2" in results:
+            results["automation_candidates"] = self._project_automation_from_v2(results["automation_candidates_v2"])
 
     def _project_pain_points_from_v2(self, pain_points_v2: List[Dict]) -> List[Dict]:
         """Map enhanced pain points into the legacy schema."""
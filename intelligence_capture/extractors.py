@@ -5,32 +5,311 @@ Extracts structured entities from interview transcripts
 import re
 import json
 import time
-from typing import Dict, List, Optional, Tuple
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
 from openai import OpenAI, RateLimitError
 import os
 
-from .config import MODEL_PROVIDER_MAP
-from .model_router import MODEL_ROUTER
-from .rate_limiter import get_rate_limiter
+from .config import MODEL_PROVIDER_MAP, EXTRACTION_STREAMING
+from .json_stream import JsonArrayStream
+from .llm_cache import estimate_cost, get_llm_cache
+from .model_router import MODEL_ROUTER, get_model_rate_limiter
+from .rate_limiter import estimate_request_tokens
+from .rule_engine import register_keywords, scan_text
+from .single_flight import get_single_flight, request_key
+
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Requests recorded instead of sent while capture_llm_requests() is active
+_captured_requests: ContextVar[Optional[List[Dict]]] = ContextVar("captured_llm_requests", default=None)
+
+# Usage of the completions made while track_llm_usage() is active
+_usage_tracker: ContextVar[Optional["LLMUsage"]] = ContextVar("llm_usage_tracker", default=None)
+
+
+class LLMUsage:
+    """Tokens and estimated cost of the completions sent inside a track_llm_usage() block"""
+
+    def __init__(self):
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, model: str, usage) -> None:
+        """Add one completion (OpenAI usage object; calls without usage count 0 tokens)"""
+        prompt_tokens = getattr(usage, "prompt_tokens", 0)
+        completion_tokens = getattr(usage, "completion_tokens", 0)
+        prompt_tokens = prompt_tokens if isinstance(prompt_tokens, int) else 0
+        completion_tokens = completion_tokens if isinstance(completion_tokens, int) else 0
+        with self._lock:
+            self.llm_calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cost += estimate_cost(model, prompt_tokens, completion_tokens)
+
+    @property
+    def tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary"""
+        return {
+            "llm_calls": self.llm_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "tokens": self.tokens,
+            "cost": self.cost
+        }
+
+
+def _is_valid_json(content: Optional[str]) -> bool:
+    """Only parseable completions are cached (truncated output must be retried)"""
+    try:
+        json.loads(content)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _total_tokens(usage) -> Optional[int]:
+    """Total tokens of an OpenAI usage object (None if unavailable)"""
+    total = getattr(usage, "total_tokens", None)
+    return total if isinstance(total, int) else None
+
+
+def _retry_after(error_msg: str, headers) -> Optional[float]:
+    """Seconds a 429 asks to wait (retry-after header or "try again in Ns"), if reported"""
+    try:
+        retry_after = float(headers.get("retry-after")) if headers is not None else None
+    except (TypeError, ValueError):
+        retry_after = None
+    if retry_after is None:
+        wait_match = re.search(r'try again in (\d+(?:\.\d+)?)s', error_msg)
+        if wait_match:
+            retry_after = float(wait_match.group(1))
+    return retry_after
+
+
+def create_chat_completion(client: OpenAI, limiter, **params):
+    """
+    chat.completions.create through with_raw_response, so the x-ratelimit-*
+    headers of every response (not only 429s) reach the rate limiter
+
+    Args:
+        client: OpenAI client
+        limiter: Rate limiter of the model
+        **params: chat.completions.create parameters
+
+    Returns:
+        Parsed response (ChatCompletion, or the chunk stream if stream=True)
+    """
+    raw = client.chat.completions.with_raw_response.create(**params)
+    limiter.update_from_headers(raw.headers)
+    response = raw.parse()
+    if not params.get("stream"):
+        _record_usage(params.get("model", ""), response.usage)
+    return response
+
+
+def _record_usage(model: str, usage) -> None:
+    """Add a sent completion to the active track_llm_usage() block, if any"""
+    tracker = _usage_tracker.get()
+    if tracker is not None:
+        tracker.record(model, usage)
 
 
-def call_llm_with_fallback(client: OpenAI, messages: List[Dict], temperature: float = 0.1, max_retries: int = 3) -> Optional[str]:
+@contextmanager
+def capture_llm_requests():
+    """
+    Record the LLM requests made in this context instead of sending them
+
+    Every completion helper answers "{}" (no API call, cache lookup or
+    rate-limit slot), so an extractor run inside the block only builds its
+    prompts. Used to version extractors by the requests they send.
+
+    Yields:
+        List of captured requests (models, messages, temperature, response_format)
+    """
+    requests: List[Dict] = []
+    token = _captured_requests.set(requests)
+    try:
+        yield requests
+    finally:
+        _captured_requests.reset(token)
+
+
+@contextmanager
+def track_llm_usage() -> Iterator[LLMUsage]:
+    """
+    Account the tokens and cost of every completion sent in this context
+
+    Covers create_json_completion, call_llm_with_fallback (including the
+    grouped calls), stream_llm_entities and IntelligenceExtractor._call_gpt4,
+    since all of them send through create_chat_completion. Cache hits and
+    calls coalesced into another caller's request cost nothing and are not
+    counted. Worker threads only see the block if they run in a copy of
+    this context (contextvars.copy_context()).
+
+    Yields:
+        LLMUsage filled as the calls complete
+    """
+    tracker = LLMUsage()
+    token = _usage_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _usage_tracker.reset(token)
+
+
+def capture_request(models: List[str], messages: List[Dict], temperature: float) -> bool:
+    """
+    Record a request if capture_llm_requests() is active
+
+    Args:
+        models: Models the request may be sent to (in fallback order)
+        messages: List of message dicts
+        temperature: Temperature for generation
+
+    Returns:
+        True if the request was captured (the caller must not send it)
+    """
+    requests = _captured_requests.get()
+    if requests is None:
+        return False
+    requests.append({
+        "models": list(models),
+        "messages": messages,
+        "temperature": temperature,
+        "response_format": JSON_RESPONSE_FORMAT
+    })
+    return True
+
+
+def _router_models() -> List[str]:
+    """Configured models of call_llm_with_fallback (independent of router health)"""
+    return list(dict.fromkeys(MODEL_ROUTER.round_robin_chain + MODEL_ROUTER.fallback_chain))
+
+
+def create_json_completion(client: OpenAI, model: str, messages: List[Dict], temperature: float = 0.1) -> str:
+    """
+    Single-model JSON-mode completion through the response cache and rate limiter
+
+    Args:
+        client: OpenAI client
+        model: Model name
+        messages: List of message dicts
+        temperature: Temperature for generation
+
+    Returns:
+        Response content (errors propagate to the caller)
+    """
+    if capture_request([model], messages, temperature):
+        return "{}"
+
+    cache = get_llm_cache()
+    if cache is not None:
+        cached = cache.get(model, messages, temperature, JSON_RESPONSE_FORMAT)
+        if cached is not None:
+            return cached
+
+    limiter = get_model_rate_limiter(model)
+    tokens = estimate_request_tokens(messages)
+    limiter.wait_if_needed(tokens)
+    started = time.perf_counter()
+    try:
+        response = create_chat_completion(
+            client,
+            limiter,
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            response_format=JSON_RESPONSE_FORMAT
+        )
+    except RateLimitError as e:
+        headers = getattr(e.response, "headers", None)
+        limiter.update_from_headers(headers)
+        MODEL_ROUTER.record_failure(model, rate_limited=True, retry_after=_retry_after(str(e), headers))
+        raise
+    except Exception:
+        MODEL_ROUTER.record_failure(model)
+        raise
+    MODEL_ROUTER.record_success(model, time.perf_counter() - started)
+    if _total_tokens(response.usage) is not None:
+        limiter.record_usage(tokens, _total_tokens(response.usage))
+    content = response.choices[0].message.content
+    if cache is not None and _is_valid_json(content):
+        cache.put(model, messages, temperature, content, JSON_RESPONSE_FORMAT, response.usage)
+    return content
+
+
+def call_llm_with_fallback(
+    client: OpenAI,
+    messages: List[Dict],
+    temperature: float = 0.1,
+    max_retries: int = 3,
+    usage: Optional[Dict] = None
+) -> Optional[str]:
     """
     Call LLM with automatic model fallback on rate limits
     
+    Identical requests made concurrently (same messages and temperature)
+    share one call: later callers wait for the one in flight.
+    
     Args:
         client: OpenAI client
         messages: List of message dicts
         temperature: Temperature for generation
         max_retries: Max retries per model
+        usage: Optional dict filled with model, prompt_tokens and
+            completion_tokens of the successful call (0 tokens and
+            coalesced=True when another caller's call was shared)
         
     Returns:
         Response content or None if all models fail
     """
+    if capture_request(_router_models(), messages, temperature):
+        return "{}"
+
+    def call():
+        call_usage = {}
+        return _call_llm_with_fallback(client, messages, temperature, max_retries, call_usage), call_usage
+
+    key = request_key(messages, temperature, JSON_RESPONSE_FORMAT)
+    (content, call_usage), shared = get_single_flight("llm_completions").do(key, call)
+    if usage is not None:
+        usage.update(call_usage)
+        if shared and call_usage:
+            usage.update(prompt_tokens=0, completion_tokens=0, coalesced=True)
+    return content
+
+
+def _call_llm_with_fallback(
+    client: OpenAI,
+    messages: List[Dict],
+    temperature: float,
+    max_retries: int,
+    usage: Optional[Dict]
+) -> Optional[str]:
+    """Make the call_llm_with_fallback request (cache, router, retries)"""
     last_error = None
     model_sequence = MODEL_ROUTER.build_sequence()
-    
-    for model in model_sequence:
+    tokens = estimate_request_tokens(messages)
+
+    # Cached completion from any model of the chain: no API call, no rate limit slot
+    cache = get_llm_cache()
+    if cache is not None:
+        cached_model, cached_content = cache.get_any(model_sequence, messages, temperature, JSON_RESPONSE_FORMAT)
+        if cached_content is not None:
+            if usage is not None:
+                usage.update(model=cached_model, prompt_tokens=0, completion_tokens=0, cached=True)
+            return cached_content
+    
+    for index, model in enumerate(model_sequence):
         provider = MODEL_PROVIDER_MAP.get(model, {}).get("provider", "openai")
         if provider != "openai":
             print(f"  ⚠️  Provider '{provider}' for model '{model}' not implemented yet, skipping.")
@@ -40,48 +319,59 @@ def call_llm_with_fallback(client: OpenAI, messages: List[Dict], temperature: fl
             try:
                 print(f"  Attempting with model: {model} (attempt {attempt + 1}/{max_retries})")
 
-                limiter = get_rate_limiter(max_calls_per_minute=50, key=f"{provider}:{model}")
-                limiter.wait_if_needed()
+                limiter = get_model_rate_limiter(model)
+                limiter.wait_if_needed(tokens)
                 
-                response = client.chat.completions.create(
+                started = time.perf_counter()
+                response = create_chat_completion(
+                    client,
+                    limiter,
                     model=model,
                     messages=messages,
                     temperature=temperature,
-                    response_format={"type": "json_object"}
+                    response_format=JSON_RESPONSE_FORMAT
                 )
+                MODEL_ROUTER.record_success(model, time.perf_counter() - started)
                 
                 print(f"  ✓ Success with {model}")
-                return response.choices[0].message.content
+                if _total_tokens(response.usage) is not None:
+                    limiter.record_usage(tokens, _total_tokens(response.usage))
+                content = response.choices[0].message.content
+                if cache is not None and _is_valid_json(content):
+                    cache.put(model, messages, temperature, content, JSON_RESPONSE_FORMAT, response.usage)
+                if usage is not None:
+                    usage["model"] = model
+                    usage["prompt_tokens"] = getattr(response.usage, "prompt_tokens", 0) or 0
+                    usage["completion_tokens"] = getattr(response.usage, "completion_tokens", 0) or 0
+                return content
                 
             except RateLimitError as e:
                 last_error = e
                 error_msg = str(e)
+                headers = getattr(e.response, "headers", None)
+                limiter.update_from_headers(headers)
+                wait_seconds = _retry_after(error_msg, headers)
+                MODEL_ROUTER.record_failure(model, rate_limited=True, retry_after=wait_seconds)
                 
-                # Check if it's a temporary rate limit (wait and retry same model)
-                if "Please try again in" in error_msg and "s." in error_msg:
-                    # Extract wait time if it's short (< 60 seconds)
-                    try:
-                        wait_match = re.search(r'try again in (\d+)s', error_msg)
-                        if wait_match:
-                            wait_seconds = int(wait_match.group(1))
-                            if wait_seconds <= 60:
-                                print(f"  ⏳ Rate limit hit, waiting {wait_seconds}s before retry...")
-                                time.sleep(wait_seconds + 1)
-                                continue
-                    except:
-                        pass
+                # Short temporary limit and no healthy model left: wait and retry same model
+                fallback_available = any(MODEL_ROUTER.is_available(other) for other in model_sequence[index + 1:])
+                if not fallback_available and wait_seconds is not None and wait_seconds <= 60:
+                    print(f"  ⏳ Rate limit hit, waiting {wait_seconds:.0f}s before retry...")
+                    time.sleep(wait_seconds + 1)
+                    continue
                 
-                # If it's a longer wait or different rate limit, try next model
+                # Otherwise the router has ejected this model: try the next one
                 print(f"  ⚠️  Rate limit on {model}: {error_msg[:100]}...")
                 print(f"  → Switching to next model in fallback chain")
                 break  # Move to next model
                 
             except Exception as e:
                 last_error = e
+                MODEL_ROUTER.record_failure(model)
                 print(f"  ⚠️  Error with {model}: {str(e)[:100]}...")
                 
-                # For non-rate-limit errors, retry same model
-                if attempt < max_retries - 1:
+                # For non-rate-limit errors, retry same model (unless the router ejected it)
+                if attempt < max_retries - 1 and MODEL_ROUTER.is_available(model):
                     wait_time = 2 ** attempt  # Exponential backoff
                     print(f"  ⏳ Waiting {wait_time}s before retry...")
                     time.sleep(wait_time)
@@ -97,6 +387,127 @@ def call_llm_with_fallback(client: OpenAI, messages: List[Dict], temperature: fl
     return None
 
 
+def stream_llm_entities(
+    client: OpenAI,
+    messages: List[Dict],
+    array_key: str,
+    temperature: float = 0.1,
+    max_retries: int = 3
+) -> Iterator[Dict]:
+    """
+    Stream a JSON-mode completion, yielding each entity as soon as it is complete
+
+    Same cache, rate limiting, router stats and model fallback as
+    call_llm_with_fallback(). Models are only switched before the first
+    entity is yielded; a stream that fails after that ends early, keeping
+    the entities already handed on.
+
+    Args:
+        client: OpenAI client
+        messages: List of message dicts
+        array_key: Top-level key of the entity array in the response
+        temperature: Temperature for generation
+        max_retries: Max retries per model
+
+    Yields:
+        Entity dicts of response[array_key], in response order
+    """
+    if capture_request(_router_models(), messages, temperature):
+        return
+
+    last_error = None
+    model_sequence = MODEL_ROUTER.build_sequence()
+    tokens = estimate_request_tokens(messages)
+
+    cache = get_llm_cache()
+    if cache is not None:
+        _, cached_content = cache.get_any(model_sequence, messages, temperature, JSON_RESPONSE_FORMAT)
+        if cached_content is not None:
+            yield from JsonArrayStream(array_key).feed(cached_content)
+            return
+
+    for index, model in enumerate(model_sequence):
+        provider = MODEL_PROVIDER_MAP.get(model, {}).get("provider", "openai")
+        if provider != "openai":
+            print(f"  ⚠️  Provider '{provider}' for model '{model}' not implemented yet, skipping.")
+            continue
+
+        for attempt in range(max_retries):
+            stream = JsonArrayStream(array_key)
+            try:
+                print(f"  Streaming with model: {model} (attempt {attempt + 1}/{max_retries})")
+
+                limiter = get_model_rate_limiter(model)
+                limiter.wait_if_needed(tokens)
+
+                started = time.perf_counter()
+                response_usage = None
+                chunks = create_chat_completion(
+                    client,
+                    limiter,
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    response_format=JSON_RESPONSE_FORMAT,
+                    stream=True,
+                    stream_options={"include_usage": True}
+                )
+                for chunk in chunks:
+                    if getattr(chunk, "usage", None) is not None:
+                        response_usage = chunk.usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield from stream.feed(chunk.choices[0].delta.content)
+                MODEL_ROUTER.record_success(model, time.perf_counter() - started)
+
+                print(f"  ✓ Streamed {stream.emitted} entities with {model}")
+                _record_usage(model, response_usage)
+                if _total_tokens(response_usage) is not None:
+                    limiter.record_usage(tokens, _total_tokens(response_usage))
+                if cache is not None and _is_valid_json(stream.text):
+                    cache.put(model, messages, temperature, stream.text, JSON_RESPONSE_FORMAT, response_usage)
+                return
+
+            except RateLimitError as e:
+                last_error = e
+                headers = getattr(e.response, "headers", None)
+                limiter.update_from_headers(headers)
+                wait_seconds = _retry_after(str(e), headers)
+                MODEL_ROUTER.record_failure(model, rate_limited=True, retry_after=wait_seconds)
+                if stream.emitted:
+                    print(f"  ⚠️  Stream from {model} rate limited after {stream.emitted} entities")
+                    return
+
+                fallback_available = any(MODEL_ROUTER.is_available(other) for other in model_sequence[index + 1:])
+                if not fallback_available and wait_seconds is not None and wait_seconds <= 60:
+                    print(f"  ⏳ Rate limit hit, waiting {wait_seconds:.0f}s before retry...")
+                    time.sleep(wait_seconds + 1)
+                    continue
+
+                print(f"  ⚠️  Rate limit on {model}: {str(e)[:100]}...")
+                print(f"  → Switching to next model in fallback chain")
+                break
+
+            except Exception as e:
+                last_error = e
+                MODEL_ROUTER.record_failure(model)
+                if stream.emitted:
+                    print(f"  ⚠️  Stream from {model} failed after {stream.emitted} entities: {str(e)[:100]}")
+                    return
+
+                print(f"  ⚠️  Error with {model}: {str(e)[:100]}...")
+                if attempt < max_retries - 1 and MODEL_ROUTER.is_available(model):
+                    wait_time = 2 ** attempt  # Exponential backoff
+                    print(f"  ⏳ Waiting {wait_time}s before retry...")
+                    time.sleep(wait_time)
+                else:
+                    print(f"  → Max retries reached for {model}, trying next model")
+                    break
+
+    print(f"  ❌ All models in fallback chain failed")
+    if last_error:
+        print(f"  Last error: {str(last_error)[:200]}")
+
+
 class CommunicationChannelExtractor:
     """Extracts communication channel entities from interview text"""
     
@@ -118,18 +529,45 @@ class CommunicationChannelExtractor:
         "rápido": 60,
         "continuo": 0,  # Always on
     }
+
+    # Rule keywords (compiled into the shared rule engine at import)
+    register_keywords(channel.lower() for channel in KNOWN_CHANNELS)
+    register_keywords(SLA_MAPPINGS)
+    FREQUENCY_RULES = [
+        ("Continuous", register_keywords(["continuo", "todo el tiempo", "siempre"])),
+        ("Daily", register_keywords(["diario", "cada día", "todos los días"])),
+        ("Weekly", register_keywords(["semanal", "cada semana"])),
+        ("Monthly", register_keywords(["mensual", "cada mes"])),
+    ]
+    PAIN_PATTERNS = register_keywords([
+        "pérdida de trazabilidad",
+        "información dispersa",
+        "difícil hacer seguimiento",
+        "no hay registro",
+        "se pierde información",
+        "falta de control",
+        "desorganizado"
+    ])
+
+    # Purpose context per channel: mention ... para/por/de/en ... "."
+    PURPOSE_PATTERNS = {
+        channel.lower(): re.compile(rf"{channel.lower()}[^.]*?(?:para|por|de|en)[^.]*?\.", re.IGNORECASE)
+        for channel in KNOWN_CHANNELS
+    }
     
     def __init__(self, openai_api_key: Optional[str] = None):
         """Initialize extractor with OpenAI client"""
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract communication channels from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of communication channel entities
@@ -144,7 +582,7 @@ class CommunicationChannelExtractor:
         rule_based_channels = self._rule_based_extraction(full_text, meta)
         
         # Then, use LLM for deeper extraction
-        llm_channels = self._llm_extraction(full_text, meta)
+        llm_channels = self._llm_extraction(full_text, meta, llm_response)
         
         # Merge and deduplicate
         all_channels = self._merge_channels(rule_based_channels, llm_channels)
@@ -154,10 +592,10 @@ class CommunicationChannelExtractor:
     def _rule_based_extraction(self, text: str, meta: Dict) -> List[Dict]:
         """Extract channels using pattern matching"""
         channels = []
-        text_lower = text.lower()
+        scan = scan_text(text)
         
         for channel in self.KNOWN_CHANNELS:
-            if channel.lower() in text_lower:
+            if scan.has(channel.lower()):
                 # Found a channel mention
                 channel_data = {
                     "channel_name": channel,
@@ -177,16 +615,18 @@ class CommunicationChannelExtractor:
     
     def _infer_purpose(self, text: str, channel: str) -> str:
         """Infer the purpose of using this channel"""
-        text_lower = text.lower()
+        text_lower = scan_text(text).lower
         channel_lower = channel.lower()
         
         # Look for context around channel mention
-        pattern = rf"{channel_lower}[^.]*?(?:para|por|de|en)[^.]*?\."
-        matches = re.findall(pattern, text_lower, re.IGNORECASE)
+        pattern = self.PURPOSE_PATTERNS.get(channel_lower)
+        if pattern is None:
+            pattern = re.compile(rf"{channel_lower}[^.]*?(?:para|por|de|en)[^.]*?\.", re.IGNORECASE)
+        match = pattern.search(text_lower)
         
-        if matches:
-            # Extract the most informative match
-            return matches[0].strip()
+        if match:
+            # Extract the most informative (first) match
+            return match.group(0).strip()
         
         # Default purposes based on channel type
         purpose_defaults = {
@@ -203,25 +643,19 @@ class CommunicationChannelExtractor:
     
     def _infer_frequency(self, text: str, channel: str) -> str:
         """Infer how frequently the channel is used"""
-        text_lower = text.lower()
+        scan = scan_text(text)
         
-        if any(word in text_lower for word in ["continuo", "todo el tiempo", "siempre"]):
-            return "Continuous"
-        elif any(word in text_lower for word in ["diario", "cada día", "todos los días"]):
-            return "Daily"
-        elif any(word in text_lower for word in ["semanal", "cada semana"]):
-            return "Weekly"
-        elif any(word in text_lower for word in ["mensual", "cada mes"]):
-            return "Monthly"
-        else:
-            return "As needed"
+        for frequency, keywords in self.FREQUENCY_RULES:
+            if scan.has_any(keywords):
+                return frequency
+        return "As needed"
     
     def _extract_sla(self, text: str, channel: str) -> Optional[int]:
         """Extract response SLA in minutes"""
-        text_lower = text.lower()
+        scan = scan_text(text)
         
         for keyword, minutes in self.SLA_MAPPINGS.items():
-            if keyword in text_lower:
+            if scan.has(keyword):
                 return minutes
         
         return None
@@ -229,26 +663,16 @@ class CommunicationChannelExtractor:
     def _extract_pain_points(self, text: str, channel: str) -> List[str]:
         """Extract pain points related to this channel"""
         pain_points = []
-        text_lower = text.lower()
+        scan = scan_text(text)
         
         # Common pain point patterns
-        pain_patterns = [
-            "pérdida de trazabilidad",
-            "información dispersa",
-            "difícil hacer seguimiento",
-            "no hay registro",
-            "se pierde información",
-            "falta de control",
-            "desorganizado"
-        ]
-        
-        for pattern in pain_patterns:
-            if pattern in text_lower:
+        for pattern in self.PAIN_PATTERNS:
+            if scan.has(pattern):
                 pain_points.append(pattern.capitalize())
         
         return pain_points
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Use LLM to extract communication channels with deeper understanding"""
         
         if not self.client:
@@ -346,7 +770,10 @@ If no communication channels are found, return {{"channels": []}}.
                 {"role": "user", "content": prompt}
             ]
             
-            response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
+            if llm_response is not None:
+                response_content = llm_response
+            else:
+                response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
             
             if not response_content:
                 print("Warning: All LLM models failed for communication channel extraction")
@@ -405,6 +832,20 @@ If no communication channels are found, return {{"channels": []}}.
         return list(merged.values())
 
 
+_SLA_TEXT_MINUTES = {
+    "inmediato": 15,
+    "urgente": 30,
+    "mismo día": 480,
+    "24 horas": 1440,
+    "48 horas": 2880,
+    "1 semana": 10080,
+    "continuo": 0,
+}
+_SLA_MINUTES_PATTERN = re.compile(r'(\d+)\s*min')
+_SLA_HOURS_PATTERN = re.compile(r'(\d+)\s*hora')
+_SLA_DAYS_PATTERN = re.compile(r'(\d+)\s*d[ií]a')
+
+
 def normalize_sla_to_minutes(sla_text: str) -> Optional[int]:
     """
     Normalize SLA text to minutes
@@ -421,38 +862,34 @@ def normalize_sla_to_minutes(sla_text: str) -> Optional[int]:
     text_lower = sla_text.lower().strip()
     
     # Direct mappings
-    mappings = {
-        "inmediato": 15,
-        "urgente": 30,
-        "mismo día": 480,
-        "24 horas": 1440,
-        "48 horas": 2880,
-        "1 semana": 10080,
-        "continuo": 0,
-    }
-    
-    if text_lower in mappings:
-        return mappings[text_lower]
+    if text_lower in _SLA_TEXT_MINUTES:
+        return _SLA_TEXT_MINUTES[text_lower]
     
     # Extract numbers
     # "15 minutos" -> 15
-    minutes_match = re.search(r'(\d+)\s*min', text_lower)
+    minutes_match = _SLA_MINUTES_PATTERN.search(text_lower)
     if minutes_match:
         return int(minutes_match.group(1))
     
     # "2 horas" -> 120
-    hours_match = re.search(r'(\d+)\s*hora', text_lower)
+    hours_match = _SLA_HOURS_PATTERN.search(text_lower)
     if hours_match:
         return int(hours_match.group(1)) * 60
     
     # "3 días" -> 4320
-    days_match = re.search(r'(\d+)\s*d[ií]a', text_lower)
+    days_match = _SLA_DAYS_PATTERN.search(text_lower)
     if days_match:
         return int(days_match.group(1)) * 1440
     
     return None
 
 
+@lru_cache(maxsize=256)
+def _mention_pattern(system_lower: str) -> re.Pattern:
+    """Compiled context pattern for a system name (mention + up to 100 chars)"""
+    return re.compile(rf"{re.escape(system_lower)}.{{0,100}}", re.IGNORECASE)
+
+
 class SystemExtractor:
     """Extracts enhanced system entities with integration pain points and user satisfaction"""
     
@@ -500,12 +937,14 @@ class SystemExtractor:
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract enhanced system entities from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of enhanced system entities
@@ -517,7 +956,7 @@ class SystemExtractor:
         full_text = "\n\n".join([f"Q: {q}\nA: {a}" for q, a in qa_pairs.items()])
         
         # Extract systems using LLM
-        systems = self._llm_extraction(full_text, meta)
+        systems = self._llm_extraction(full_text, meta, llm_response)
         
         # Enhance each system with sentiment analysis
         for system in systems:
@@ -533,12 +972,11 @@ class SystemExtractor:
         Returns:
             Satisfaction score from 1-10
         """
-        text_lower = text.lower()
+        text_lower = scan_text(text).lower
         system_lower = system_name.lower()
         
         # Find context around system mentions (broader context - up to 100 chars after mention)
-        pattern = rf"{re.escape(system_lower)}.{{0,100}}"
-        mentions = re.findall(pattern, text_lower, re.IGNORECASE)
+        mentions = _mention_pattern(system_lower).findall(text_lower)
         
         if not mentions:
             # Try finding system in broader context
@@ -571,7 +1009,7 @@ class SystemExtractor:
         # Return average score
         return sum(scores) / len(scores) if scores else 5.0
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Use LLM to extract systems with integration pain points and satisfaction"""
         
         if not self.client:
@@ -666,7 +1104,10 @@ If no systems are found, return {{"systems": []}}.
                 {"role": "user", "content": prompt}
             ]
             
-            response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
+            if llm_response is not None:
+                response_content = llm_response
+            else:
+                response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
             
             if not response_content:
                 print("Warning: All LLM models failed for system extraction")
@@ -705,11 +1146,11 @@ class DecisionPointExtractor:
     """Extracts decision points and escalation logic from interview text"""
     
     # Decision-making keywords
-    DECISION_KEYWORDS = [
+    DECISION_KEYWORDS = register_keywords([
         "decido", "decidir", "decisión", "apruebo", "aprobar", "aprobación",
         "autorizo", "autorizar", "autorización", "evalúo", "evaluar",
         "priorizo", "priorizar", "clasifico", "clasificar"
-    ]
+    ])
     
     # Escalation keywords
     ESCALATION_KEYWORDS = [
@@ -725,18 +1166,55 @@ class DecisionPointExtractor:
         r"puedo\s+aprobar\s+hasta\s+\$?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)",
         r"autoridad\s+de\s+\$?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)"
     ]
+    AUTHORITY_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in AUTHORITY_PATTERNS]
+
+    # Decision criteria and their keywords
+    CRITERIA_PATTERNS = {
+        "criticidad": register_keywords(["criticidad", "crítico", "urgente", "urgencia"]),
+        "impacto": register_keywords(["impacto", "afecta", "afectación"]),
+        "costo": register_keywords(["costo", "precio", "monto", "presupuesto"]),
+        "seguridad": register_keywords(["seguridad", "riesgo", "peligro"]),
+        "calidad": register_keywords(["calidad", "estándar", "especificación"]),
+        "tiempo": register_keywords(["tiempo", "plazo", "fecha límite"]),
+        "disponibilidad": register_keywords(["disponibilidad", "stock", "inventario"])
+    }
+
+    APPROVAL_PHRASES = register_keywords([
+        "requiere aprobación",
+        "necesita aprobación",
+        "debe ser aprobado",
+        "solicito aprobación",
+        "pido autorización"
+    ])
+
+    # Escalation trigger ("escalo cuando ...") and target ("escalo al ...") patterns
+    ESCALATION_TRIGGER_PATTERNS = [
+        re.compile(r"escalo\s+(?:cuando|si|en caso de)\s+([^.]+)"),
+        re.compile(r"elevo\s+(?:cuando|si|en caso de)\s+([^.]+)"),
+        re.compile(r"consulto\s+(?:cuando|si|en caso de)\s+([^.]+)"),
+        re.compile(r"requiere\s+aprobación\s+(?:cuando|si|en caso de)\s+([^.]+)")
+    ]
+    ESCALATION_TARGET_PATTERNS = [
+        re.compile(r"escalo\s+a(?:l)?\s+([^.,]+)"),
+        re.compile(r"elevo\s+a(?:l)?\s+([^.,]+)"),
+        re.compile(r"consulto\s+(?:con|a(?:l)?)\s+([^.,]+)"),
+        re.compile(r"reporto\s+a(?:l)?\s+([^.,]+)"),
+        re.compile(r"informo\s+a(?:l)?\s+([^.,]+)")
+    ]
     
     def __init__(self, openai_api_key: Optional[str] = None):
         """Initialize extractor with OpenAI client"""
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract decision points from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of decision point entities
@@ -751,7 +1229,7 @@ class DecisionPointExtractor:
         rule_based_decisions = self._rule_based_extraction(full_text, meta)
         
         # LLM extraction (if available)
-        llm_decisions = self._llm_extraction(full_text, meta)
+        llm_decisions = self._llm_extraction(full_text, meta, llm_response)
         
         # Merge results
         all_decisions = self._merge_decisions(rule_based_decisions, llm_decisions)
@@ -761,10 +1239,9 @@ class DecisionPointExtractor:
     def _rule_based_extraction(self, text: str, meta: Dict) -> List[Dict]:
         """Extract decision points using pattern matching"""
         decisions = []
-        text_lower = text.lower()
         
         # Check if this person makes decisions
-        has_decision_authority = any(keyword in text_lower for keyword in self.DECISION_KEYWORDS)
+        has_decision_authority = scan_text(text).has_any(self.DECISION_KEYWORDS)
         
         if not has_decision_authority:
             return decisions
@@ -794,7 +1271,7 @@ class DecisionPointExtractor:
     
     def _infer_decision_type(self, text: str, role: str) -> Optional[str]:
         """Infer what type of decisions this person makes"""
-        text_lower = text.lower()
+        text_lower = scan_text(text).lower
         role_lower = role.lower()
         
         # Role-based decision types
@@ -832,43 +1309,22 @@ class DecisionPointExtractor:
     def _extract_criteria(self, text: str) -> List[str]:
         """Extract decision criteria from text"""
         criteria = []
-        text_lower = text.lower()
-        
-        # Common criteria patterns
-        criteria_patterns = {
-            "criticidad": ["criticidad", "crítico", "urgente", "urgencia"],
-            "impacto": ["impacto", "afecta", "afectación"],
-            "costo": ["costo", "precio", "monto", "presupuesto"],
-            "seguridad": ["seguridad", "riesgo", "peligro"],
-            "calidad": ["calidad", "estándar", "especificación"],
-            "tiempo": ["tiempo", "plazo", "fecha límite"],
-            "disponibilidad": ["disponibilidad", "stock", "inventario"]
-        }
+        scan = scan_text(text)
         
-        for criterion, keywords in criteria_patterns.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for criterion, keywords in self.CRITERIA_PATTERNS.items():
+            if scan.has_any(keywords):
                 criteria.append(criterion.capitalize())
         
         return criteria
     
     def _check_approval_required(self, text: str) -> bool:
         """Check if approval is required for decisions"""
-        text_lower = text.lower()
-        
-        approval_phrases = [
-            "requiere aprobación",
-            "necesita aprobación",
-            "debe ser aprobado",
-            "solicito aprobación",
-            "pido autorización"
-        ]
-        
-        return any(phrase in text_lower for phrase in approval_phrases)
+        return scan_text(text).has_any(self.APPROVAL_PHRASES)
     
     def _extract_authority_limit(self, text: str) -> Optional[float]:
         """Extract monetary authority limit"""
-        for pattern in self.AUTHORITY_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in self.AUTHORITY_REGEXES:
+            match = pattern.search(text)
             if match:
                 amount_str = match.group(1).replace(",", "")
                 try:
@@ -880,18 +1336,11 @@ class DecisionPointExtractor:
     
     def _extract_escalation_trigger(self, text: str) -> Optional[str]:
         """Extract what triggers escalation"""
-        text_lower = text.lower()
+        text_lower = scan_text(text).lower
         
         # Look for escalation patterns
-        escalation_patterns = [
-            r"escalo\s+(?:cuando|si|en caso de)\s+([^.]+)",
-            r"elevo\s+(?:cuando|si|en caso de)\s+([^.]+)",
-            r"consulto\s+(?:cuando|si|en caso de)\s+([^.]+)",
-            r"requiere\s+aprobación\s+(?:cuando|si|en caso de)\s+([^.]+)"
-        ]
-        
-        for pattern in escalation_patterns:
-            match = re.search(pattern, text_lower)
+        for pattern in self.ESCALATION_TRIGGER_PATTERNS:
+            match = pattern.search(text_lower)
             if match:
                 return match.group(1).strip()
         
@@ -907,19 +1356,11 @@ class DecisionPointExtractor:
     
     def _extract_escalation_target(self, text: str) -> Optional[str]:
         """Extract who to escalate to"""
-        text_lower = text.lower()
+        text_lower = scan_text(text).lower
         
         # Look for escalation target patterns
-        target_patterns = [
-            r"escalo\s+a(?:l)?\s+([^.,]+)",
-            r"elevo\s+a(?:l)?\s+([^.,]+)",
-            r"consulto\s+(?:con|a(?:l)?)\s+([^.,]+)",
-            r"reporto\s+a(?:l)?\s+([^.,]+)",
-            r"informo\s+a(?:l)?\s+([^.,]+)"
-        ]
-        
-        for pattern in target_patterns:
-            match = re.search(pattern, text_lower)
+        for pattern in self.ESCALATION_TARGET_PATTERNS:
+            match = pattern.search(text_lower)
             if match:
                 target = match.group(1).strip()
                 # Clean up and capitalize
@@ -939,7 +1380,7 @@ class DecisionPointExtractor:
     
     def _infer_related_process(self, text: str, role: str) -> Optional[str]:
         """Infer which process this decision relates to"""
-        text_lower = text.lower()
+        text_lower = scan_text(text).lower
         role_lower = role.lower()
         
         # Context-based process inference (check text first for more specific matches)
@@ -964,7 +1405,7 @@ class DecisionPointExtractor:
         
         return None
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Use LLM to extract decision points with deeper understanding"""
         
         if not self.client:
@@ -1058,7 +1499,10 @@ If no decision points are found, return {{"decisions": []}}.
                 {"role": "user", "content": prompt}
             ]
             
-            response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
+            if llm_response is not None:
+                response_content = llm_response
+            else:
+                response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
             
             if not response_content:
                 print("Warning: All LLM models failed for decision point extraction")
@@ -1122,18 +1566,18 @@ class DataFlowExtractor:
     """Extracts data flow entities from interview text"""
     
     # Data movement keywords
-    DATA_MOVEMENT_KEYWORDS = [
+    DATA_MOVEMENT_KEYWORDS = register_keywords([
         "paso datos", "transferir", "exportar", "importar",
         "conciliar", "conciliación", "integrar", "integración",
         "sincronizar", "copiar", "migrar", "cargar"
-    ]
+    ])
     
     # Transfer methods
     TRANSFER_METHODS = {
-        "manual": ["manual", "manualmente", "a mano", "copio", "escribo"],
-        "api": ["api", "automático", "integración", "conectado"],
-        "export_import": ["exporto", "exportar", "importo", "importar", "archivo", "excel", "csv"],
-        "database": ["base de datos", "query", "consulta sql"]
+        "manual": register_keywords(["manual", "manualmente", "a mano", "copio", "escribo"]),
+        "api": register_keywords(["api", "automático", "integración", "conectado"]),
+        "export_import": register_keywords(["exporto", "exportar", "importo", "importar", "archivo", "excel", "csv"]),
+        "database": register_keywords(["base de datos", "query", "consulta sql"])
     }
     
     # Data quality issue patterns
@@ -1141,18 +1585,95 @@ class DataFlowExtractor:
         "error", "inconsistencia", "no coincide", "diferencia",
         "falta", "duplicado", "incorrecto", "desactualizado"
     ]
+
+    # Source/target system patterns: (pattern, bidirectional)
+    SYSTEM_PAIR_PATTERNS = [
+        # "de X a Y" (flexible - allows words between)
+        (re.compile(r"de\s+(?:\w+\s+)?([A-Za-z0-9]+)\s+a\s+([A-Za-z0-9]+)", re.IGNORECASE), False),
+        # "desde X hacia Y"
+        (re.compile(r"desde\s+(?:\w+\s+)?([A-Za-z0-9]+)\s+(?:hacia|a)\s+([A-Za-z0-9]+)", re.IGNORECASE), False),
+        # "exporto [data type] de X e importo a Y"
+        (re.compile(
+            r"(?:exporto|exportar)(?:\s+\w+)?\s+de\s+([A-Za-z0-9]+)\s+(?:e|y)\s+(?:importo|importar)\s+a\s+([A-Za-z0-9]+)",
+            re.IGNORECASE
+        ), False),
+        # "paso [data type] de X a Y"
+        (re.compile(r"(?:paso|pasar|transferir)(?:\s+\w+)?\s+de\s+([A-Za-z0-9]+)\s+a\s+([A-Za-z0-9]+)", re.IGNORECASE), False),
+        # "entre X y Y" (bidirectional)
+        (re.compile(r"entre\s+([A-Za-z0-9]+)\s+y\s+([A-Za-z0-9]+)", re.IGNORECASE), True),
+        # "concilio X con Y"
+        (re.compile(r"concilio\s+([A-Za-z0-9]+)\s+con\s+([A-Za-z0-9]+)", re.IGNORECASE), False)
+    ]
+
+    # Words captured by the pair patterns that are never systems
+    NON_SYSTEM_WORDS = frozenset([
+        "el", "la", "los", "las", "un", "una", "este", "esta",
+        "ese", "esa", "aquel", "aquella", "mi", "tu", "su",
+        "datos", "información", "archivo", "documento", "de", "a",
+        "y", "e", "o", "u", "con", "sin", "para", "por"
+    ])
+
+    # Common system name fragments
+    KNOWN_SYSTEM_FRAGMENTS = [
+        "sap", "opera", "simphony", "excel", "outlook", "teams",
+        "whatsapp", "jira", "trello", "pos", "erp", "crm",
+        "sistema", "plataforma", "software", "micros", "satcom"
+    ]
+    ACRONYM_PATTERN = re.compile(r'^[A-Z]{2,}$')
+    CAMEL_CASE_PATTERN = re.compile(r'^[A-Z][a-z]+(?:[A-Z][a-z]+)+$')
+
+    # Data types and their keywords
+    DATA_TYPES = {
+        "ventas": register_keywords(["venta", "ventas", "factura", "ticket"]),
+        "inventario": register_keywords(["inventario", "stock", "existencia", "producto"]),
+        "financiero": register_keywords(["pago", "cobro", "factura", "contable", "financiero"]),
+        "cliente": register_keywords(["cliente", "huésped", "reserva", "contacto"]),
+        "empleado": register_keywords(["empleado", "personal", "nómina", "rrhh"]),
+        "producción": register_keywords(["producción", "manufactura", "orden de trabajo"]),
+        "compras": register_keywords(["compra", "orden de compra", "proveedor", "adquisición"])
+    }
+
+    TRANSFER_FREQUENCY_PATTERNS = {
+        "Hourly": register_keywords(["cada hora", "por hora", "horario"]),
+        "Daily": register_keywords(["diario", "cada día", "todos los días", "diariamente"]),
+        "Weekly": register_keywords(["semanal", "cada semana", "semanalmente"]),
+        "Monthly": register_keywords(["mensual", "cada mes", "mensualmente", "cierre mensual"]),
+        "Real-time": register_keywords(["tiempo real", "inmediato", "continuo", "automático"]),
+        "On-demand": register_keywords(["cuando se necesita", "bajo demanda", "ocasional"])
+    }
+
+    QUALITY_ISSUE_PATTERNS = {
+        "Errores de conciliación": register_keywords(["conciliación", "concilia"]),
+        "Datos inconsistentes": register_keywords(["inconsistente", "no coincide", "discrepancia"]),
+        "Datos faltantes": register_keywords(["falta", "incompleto", "no está"]),
+        "Datos duplicados": register_keywords(["duplicado", "repetido"]),
+        "Datos incorrectos": register_keywords(["incorrecto", "erróneo", "mal"]),
+        "Datos desactualizados": register_keywords(["desactualizado", "viejo", "antiguo"]),
+        "Falta de validación": register_keywords(["sin validar", "no se valida", "no hay control"])
+    }
+
+    PAIN_PATTERNS = {
+        "Doble entrada manual": register_keywords(["doble entrada", "entrar dos veces", "duplicar entrada"]),
+        "Propenso a errores": register_keywords(["propenso a error", "equivocación", "falla"]),
+        "Consume mucho tiempo": register_keywords(["toma tiempo", "toma mucho tiempo", "demora", "lento", "horas"]),
+        "Falta de trazabilidad": register_keywords(["no hay trazabilidad", "no se puede rastrear"]),
+        "Pérdida de información": register_keywords(["se pierde", "pérdida de información"]),
+        "Requiere conciliación manual": register_keywords(["conciliar manualmente", "revisar manualmente"])
+    }
     
     def __init__(self, openai_api_key: Optional[str] = None):
         """Initialize extractor with OpenAI client"""
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract data flows from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of data flow entities
@@ -1167,7 +1688,7 @@ class DataFlowExtractor:
         rule_based_flows = self._rule_based_extraction(full_text, meta)
         
         # LLM extraction (if available)
-        llm_flows = self._llm_extraction(full_text, meta)
+        llm_flows = self._llm_extraction(full_text, meta, llm_response)
         
         # Merge results
         all_flows = self._merge_flows(rule_based_flows, llm_flows)
@@ -1177,10 +1698,9 @@ class DataFlowExtractor:
     def _rule_based_extraction(self, text: str, meta: Dict) -> List[Dict]:
         """Extract data flows using pattern matching"""
         flows = []
-        text_lower = text.lower()
         
         # Check if data movement is mentioned
-        has_data_movement = any(keyword in text_lower for keyword in self.DATA_MOVEMENT_KEYWORDS)
+        has_data_movement = scan_text(text).has_any(self.DATA_MOVEMENT_KEYWORDS)
         
         if not has_data_movement:
             return flows
@@ -1209,64 +1729,16 @@ class DataFlowExtractor:
     def _extract_system_pairs(self, text: str) -> List[Tuple[str, str]]:
         """Extract source-target system pairs from text"""
         pairs = []
-        text_lower = text.lower()
-        
-        # Pattern 1: "de X a Y" (flexible - allows words between)
-        pattern1 = r"de\s+(?:\w+\s+)?([A-Za-z0-9]+)\s+a\s+([A-Za-z0-9]+)"
-        matches = re.findall(pattern1, text, re.IGNORECASE)
-        for source, target in matches:
-            source = source.strip().title()
-            target = target.strip().title()
-            if self._is_likely_system(source) and self._is_likely_system(target):
-                pairs.append((source, target))
-        
-        # Pattern 2: "desde X hacia Y"
-        pattern2 = r"desde\s+(?:\w+\s+)?([A-Za-z0-9]+)\s+(?:hacia|a)\s+([A-Za-z0-9]+)"
-        matches = re.findall(pattern2, text, re.IGNORECASE)
-        for source, target in matches:
-            source = source.strip().title()
-            target = target.strip().title()
-            if self._is_likely_system(source) and self._is_likely_system(target):
-                pairs.append((source, target))
-        
-        # Pattern 3: "exporto [data type] de X e importo a Y"
-        # More flexible - allows "ventas de", "datos de", etc.
-        pattern3 = r"(?:exporto|exportar)(?:\s+\w+)?\s+de\s+([A-Za-z0-9]+)\s+(?:e|y)\s+(?:importo|importar)\s+a\s+([A-Za-z0-9]+)"
-        matches = re.findall(pattern3, text, re.IGNORECASE)
-        for source, target in matches:
-            source = source.strip().title()
-            target = target.strip().title()
-            if self._is_likely_system(source) and self._is_likely_system(target):
-                pairs.append((source, target))
-        
-        # Pattern 4: "paso [data type] de X a Y"
-        pattern4 = r"(?:paso|pasar|transferir)(?:\s+\w+)?\s+de\s+([A-Za-z0-9]+)\s+a\s+([A-Za-z0-9]+)"
-        matches = re.findall(pattern4, text, re.IGNORECASE)
-        for source, target in matches:
-            source = source.strip().title()
-            target = target.strip().title()
-            if self._is_likely_system(source) and self._is_likely_system(target):
-                pairs.append((source, target))
-        
-        # Pattern 5: "entre X y Y" (bidirectional)
-        pattern5 = r"entre\s+([A-Za-z0-9]+)\s+y\s+([A-Za-z0-9]+)"
-        matches = re.findall(pattern5, text, re.IGNORECASE)
-        for sys1, sys2 in matches:
-            sys1 = sys1.strip().title()
-            sys2 = sys2.strip().title()
-            if self._is_likely_system(sys1) and self._is_likely_system(sys2):
-                # Add both directions for bidirectional flow
-                pairs.append((sys1, sys2))
-                pairs.append((sys2, sys1))
-        
-        # Pattern 6: "concilio X con Y"
-        pattern6 = r"concilio\s+([A-Za-z0-9]+)\s+con\s+([A-Za-z0-9]+)"
-        matches = re.findall(pattern6, text, re.IGNORECASE)
-        for sys1, sys2 in matches:
-            sys1 = sys1.strip().title()
-            sys2 = sys2.strip().title()
-            if self._is_likely_system(sys1) and self._is_likely_system(sys2):
-                pairs.append((sys1, sys2))
+        
+        for pattern, bidirectional in self.SYSTEM_PAIR_PATTERNS:
+            for sys1, sys2 in pattern.findall(text):
+                sys1 = sys1.strip().title()
+                sys2 = sys2.strip().title()
+                if self._is_likely_system(sys1) and self._is_likely_system(sys2):
+                    pairs.append((sys1, sys2))
+                    if bidirectional:
+                        # Add both directions for bidirectional flow
+                        pairs.append((sys2, sys1))
         
         return list(set(pairs))  # Remove duplicates
     
@@ -1275,14 +1747,7 @@ class DataFlowExtractor:
         name_lower = name.lower().strip()
         
         # Avoid common non-system words first
-        non_systems = [
-            "el", "la", "los", "las", "un", "una", "este", "esta",
-            "ese", "esa", "aquel", "aquella", "mi", "tu", "su",
-            "datos", "información", "archivo", "documento", "de", "a",
-            "y", "e", "o", "u", "con", "sin", "para", "por"
-        ]
-        
-        if name_lower in non_systems:
+        if name_lower in self.NON_SYSTEM_WORDS:
             return False
         
         # Too short or too long
@@ -1290,63 +1755,47 @@ class DataFlowExtractor:
             return False
         
         # Common system names
-        known_systems = [
-            "sap", "opera", "simphony", "excel", "outlook", "teams",
-            "whatsapp", "jira", "trello", "pos", "erp", "crm",
-            "sistema", "plataforma", "software", "micros", "satcom"
-        ]
-        
-        if any(sys in name_lower for sys in known_systems):
+        if any(sys in name_lower for sys in self.KNOWN_SYSTEM_FRAGMENTS):
             return True
         
         # Has typical system name patterns (CamelCase, acronyms, etc.)
-        if re.match(r'^[A-Z]{2,}$', name.strip()):  # Acronym like SAP, ERP
+        if self.ACRONYM_PATTERN.match(name.strip()):  # Acronym like SAP, ERP
             return True
         
-        if re.match(r'^[A-Z][a-z]+(?:[A-Z][a-z]+)+$', name.strip()):  # CamelCase
+        if self.CAMEL_CASE_PATTERN.match(name.strip()):  # CamelCase
             return True
         
         return False
     
     def _infer_data_type(self, text: str, source: str, target: str) -> str:
         """Infer what type of data is being transferred"""
-        text_lower = text.lower()
+        scan = scan_text(text)
         
         # Look for data type mentions near the system names
-        data_types = {
-            "ventas": ["venta", "ventas", "factura", "ticket"],
-            "inventario": ["inventario", "stock", "existencia", "producto"],
-            "financiero": ["pago", "cobro", "factura", "contable", "financiero"],
-            "cliente": ["cliente", "huésped", "reserva", "contacto"],
-            "empleado": ["empleado", "personal", "nómina", "rrhh"],
-            "producción": ["producción", "manufactura", "orden de trabajo"],
-            "compras": ["compra", "orden de compra", "proveedor", "adquisición"]
-        }
-        
-        for data_type, keywords in data_types.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for data_type, keywords in self.DATA_TYPES.items():
+            if scan.has_any(keywords):
                 return data_type.capitalize()
         
         return "Datos operacionales"
     
     def _classify_transfer_method(self, text: str) -> str:
         """Classify how data is transferred"""
-        text_lower = text.lower()
+        scan = scan_text(text)
         
         # Check for export/import first (more specific)
-        if any(keyword in text_lower for keyword in self.TRANSFER_METHODS["export_import"]):
+        if scan.has_any(self.TRANSFER_METHODS["export_import"]):
             return "Export/Import"
         
         # Check for API
-        if any(keyword in text_lower for keyword in self.TRANSFER_METHODS["api"]):
+        if scan.has_any(self.TRANSFER_METHODS["api"]):
             return "API"
         
         # Check for database
-        if any(keyword in text_lower for keyword in self.TRANSFER_METHODS["database"]):
+        if scan.has_any(self.TRANSFER_METHODS["database"]):
             return "Database Query"
         
         # Check for manual
-        if any(keyword in text_lower for keyword in self.TRANSFER_METHODS["manual"]):
+        if scan.has_any(self.TRANSFER_METHODS["manual"]):
             return "Manual"
         
         # Default to manual if data movement is mentioned but method is unclear
@@ -1354,19 +1803,10 @@ class DataFlowExtractor:
     
     def _infer_transfer_frequency(self, text: str) -> str:
         """Infer how often data is transferred"""
-        text_lower = text.lower()
-        
-        frequency_patterns = {
-            "Hourly": ["cada hora", "por hora", "horario"],
-            "Daily": ["diario", "cada día", "todos los días", "diariamente"],
-            "Weekly": ["semanal", "cada semana", "semanalmente"],
-            "Monthly": ["mensual", "cada mes", "mensualmente", "cierre mensual"],
-            "Real-time": ["tiempo real", "inmediato", "continuo", "automático"],
-            "On-demand": ["cuando se necesita", "bajo demanda", "ocasional"]
-        }
+        scan = scan_text(text)
         
-        for frequency, keywords in frequency_patterns.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for frequency, keywords in self.TRANSFER_FREQUENCY_PATTERNS.items():
+            if scan.has_any(keywords):
                 return frequency
         
         return "Daily"  # Default assumption
@@ -1374,21 +1814,11 @@ class DataFlowExtractor:
     def _extract_data_quality_issues(self, text: str) -> List[str]:
         """Extract data quality issues mentioned"""
         issues = []
-        text_lower = text.lower()
-        
-        issue_patterns = {
-            "Errores de conciliación": ["conciliación", "concilia"],
-            "Datos inconsistentes": ["inconsistente", "no coincide", "discrepancia"],
-            "Datos faltantes": ["falta", "incompleto", "no está"],
-            "Datos duplicados": ["duplicado", "repetido"],
-            "Datos incorrectos": ["incorrecto", "erróneo", "mal"],
-            "Datos desactualizados": ["desactualizado", "viejo", "antiguo"],
-            "Falta de validación": ["sin validar", "no se valida", "no hay control"]
-        }
+        scan = scan_text(text)
         
-        for issue, keywords in issue_patterns.items():
+        for issue, keywords in self.QUALITY_ISSUE_PATTERNS.items():
             # Check if ANY keyword is present
-            if any(keyword in text_lower for keyword in keywords):
+            if scan.has_any(keywords):
                 issues.append(issue)
         
         return issues
@@ -1396,26 +1826,17 @@ class DataFlowExtractor:
     def _extract_pain_points(self, text: str, source: str, target: str) -> List[str]:
         """Extract pain points related to this data flow"""
         pain_points = []
-        text_lower = text.lower()
-        
-        pain_patterns = {
-            "Doble entrada manual": ["doble entrada", "entrar dos veces", "duplicar entrada"],
-            "Propenso a errores": ["propenso a error", "equivocación", "falla"],
-            "Consume mucho tiempo": ["toma tiempo", "toma mucho tiempo", "demora", "lento", "horas"],
-            "Falta de trazabilidad": ["no hay trazabilidad", "no se puede rastrear"],
-            "Pérdida de información": ["se pierde", "pérdida de información"],
-            "Requiere conciliación manual": ["conciliar manualmente", "revisar manualmente"]
-        }
+        scan = scan_text(text)
         
-        for pain, keywords in pain_patterns.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for pain, keywords in self.PAIN_PATTERNS.items():
+            if scan.has_any(keywords):
                 pain_points.append(pain)
         
         return pain_points
     
     def _infer_related_process(self, text: str, role: str) -> Optional[str]:
         """Infer which process this data flow relates to"""
-        text_lower = text.lower()
+        text_lower = scan_text(text).lower
         role_lower = role.lower()
         
         # Process patterns
@@ -1451,7 +1872,7 @@ class DataFlowExtractor:
         
         return None
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Use LLM to extract data flows with deeper understanding"""
         
         if not self.client:
@@ -1535,7 +1956,10 @@ If no data flows are found, return {{"data_flows": []}}.
                 {"role": "user", "content": prompt}
             ]
             
-            response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
+            if llm_response is not None:
+                response_content = llm_response
+            else:
+                response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
             
             if not response_content:
                 print("Warning: All LLM models failed for data flow extraction")
@@ -1604,12 +2028,12 @@ class TemporalPatternExtractor:
     
     # Frequency keywords
     FREQUENCY_KEYWORDS = {
-        "Hourly": ["cada hora", "por hora", "horario", "hourly"],
-        "Daily": ["diario", "diaria", "cada día", "todos los días", "diariamente", "daily"],
-        "Weekly": ["semanal", "cada semana", "semanalmente", "weekly", "cada lunes", "cada martes"],
-        "Monthly": ["mensual", "cada mes", "mensualmente", "monthly", "cierre mensual"],
-        "Quarterly": ["trimestral", "cada trimestre", "quarterly"],
-        "Annually": ["anual", "cada año", "anualmente", "annually"]
+        "Hourly": register_keywords(["cada hora", "por hora", "horario", "hourly"]),
+        "Daily": register_keywords(["diario", "diaria", "cada día", "todos los días", "diariamente", "daily"]),
+        "Weekly": register_keywords(["semanal", "cada semana", "semanalmente", "weekly", "cada lunes", "cada martes"]),
+        "Monthly": register_keywords(["mensual", "cada mes", "mensualmente", "monthly", "cierre mensual"]),
+        "Quarterly": register_keywords(["trimestral", "cada trimestre", "quarterly"]),
+        "Annually": register_keywords(["anual", "cada año", "anualmente", "annually"])
     }
     
     # Time patterns
@@ -1618,18 +2042,28 @@ class TemporalPatternExtractor:
         r"(\d{1,2})\s*(?:am|pm|AM|PM)",  # 9am, 2pm
         r"a las (\d{1,2})",  # a las 9
     ]
+    TIME_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in TIME_PATTERNS]
+
+    # Activity name after a frequency keyword: "<keyword> [de] <up to 4 words>"
+    ACTIVITY_PATTERNS = {
+        keyword: re.compile(rf"{keyword}\s+(?:de\s+)?(\w+(?:\s+\w+){{0,3}})", re.IGNORECASE)
+        for keywords in FREQUENCY_KEYWORDS.values()
+        for keyword in keywords
+    }
     
     def __init__(self, openai_api_key: Optional[str] = None):
         """Initialize extractor with OpenAI client"""
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract temporal patterns from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of temporal pattern entities
@@ -1644,7 +2078,7 @@ class TemporalPatternExtractor:
         rule_based_patterns = self._rule_based_extraction(full_text, meta)
         
         # LLM extraction (if available)
-        llm_patterns = self._llm_extraction(full_text, meta)
+        llm_patterns = self._llm_extraction(full_text, meta, llm_response)
         
         # Merge results
         all_patterns = self._merge_patterns(rule_based_patterns, llm_patterns)
@@ -1654,13 +2088,12 @@ class TemporalPatternExtractor:
     def _rule_based_extraction(self, text: str, meta: Dict) -> List[Dict]:
         """Extract temporal patterns using pattern matching"""
         patterns = []
-        text_lower = text.lower()
+        scan = scan_text(text)
         
         # Check if temporal language is mentioned
         has_temporal = any(
-            keyword in text_lower 
-            for freq_list in self.FREQUENCY_KEYWORDS.values() 
-            for keyword in freq_list
+            scan.has_any(freq_list)
+            for freq_list in self.FREQUENCY_KEYWORDS.values()
         )
         
         if not has_temporal:
@@ -1715,16 +2148,15 @@ class TemporalPatternExtractor:
     def _extract_temporal_activities(self, text: str) -> List[Dict]:
         """Extract activities with temporal markers"""
         activities = []
-        text_lower = text.lower()
+        scan = scan_text(text)
         
         # Look for frequency + activity patterns
         for frequency, keywords in self.FREQUENCY_KEYWORDS.items():
             for keyword in keywords:
-                if keyword in text_lower:
+                if scan.has(keyword):
                     # Try to extract the activity name
                     # Pattern: "frequency + activity" or "activity + frequency"
-                    pattern = rf"{keyword}\s+(?:de\s+)?(\w+(?:\s+\w+){{0,3}})"
-                    matches = re.findall(pattern, text, re.IGNORECASE)
+                    matches = self.ACTIVITY_PATTERNS[keyword].findall(text)
                     
                     for match in matches:
                         activity_name = match.strip()
@@ -1744,15 +2176,15 @@ class TemporalPatternExtractor:
     def _extract_time_near_activity(self, text: str, activity: str) -> Optional[str]:
         """Extract time mentioned near an activity"""
         # Look for time patterns near the activity mention
-        activity_pos = text.lower().find(activity.lower())
+        activity_pos = scan_text(text).lower.find(activity.lower())
         if activity_pos == -1:
             return None
         
         # Check text around the activity (±100 characters)
         context = text[max(0, activity_pos-100):min(len(text), activity_pos+100)]
         
-        for pattern in self.TIME_PATTERNS:
-            match = re.search(pattern, context, re.IGNORECASE)
+        for pattern in self.TIME_REGEXES:
+            match = pattern.search(context)
             if match:
                 return self._normalize_time(match.group(0))
         
@@ -1790,7 +2222,7 @@ class TemporalPatternExtractor:
     
     def _infer_related_process(self, text: str, role: str) -> Optional[str]:
         """Infer which process this temporal pattern relates to"""
-        text_lower = text.lower()
+        text_lower = scan_text(text).lower
         role_lower = role.lower()
         
         # Process patterns
@@ -1821,7 +2253,7 @@ class TemporalPatternExtractor:
         
         return None
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Use LLM to extract temporal patterns with deeper understanding"""
         
         if not self.client:
@@ -1944,7 +2376,10 @@ If no temporal patterns are found, return {{"temporal_patterns": []}}.
                 {"role": "user", "content": prompt}
             ]
             
-            response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
+            if llm_response is not None:
+                response_content = llm_response
+            else:
+                response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
             
             if not response_content:
                 print("Warning: All LLM models failed for temporal pattern extraction")
@@ -2038,32 +2473,59 @@ class FailureModeExtractor:
     """Extracts failure mode entities from interview text"""
     
     # Failure keywords
-    FAILURE_KEYWORDS = [
+    FAILURE_KEYWORDS = register_keywords([
         "falla", "fallo", "se cae", "no funciona", "problema", "error",
         "defecto", "avería", "daño", "roto", "descompuesto",
         "no sirve", "mal estado", "fuera de servicio"
-    ]
+    ])
     
     # Frequency patterns
     FREQUENCY_PATTERNS = {
-        "Daily": ["diario", "cada día", "todos los días"],
-        "Weekly": ["semanal", "cada semana", "semanalmente"],
-        "Monthly": ["mensual", "cada mes", "mensualmente"],
-        "Occasionally": ["ocasional", "a veces", "de vez en cuando"],
-        "Rarely": ["rara vez", "pocas veces", "casi nunca"]
+        "Daily": register_keywords(["diario", "cada día", "todos los días"]),
+        "Weekly": register_keywords(["semanal", "cada semana", "semanalmente"]),
+        "Monthly": register_keywords(["mensual", "cada mes", "mensualmente"]),
+        "Occasionally": register_keywords(["ocasional", "a veces", "de vez en cuando"]),
+        "Rarely": register_keywords(["rara vez", "pocas veces", "casi nunca"])
+    }
+    FREQUENT_INDICATORS = register_keywords(["frecuente", "seguido", "constantemente"])
+    RARE_INDICATORS = register_keywords(["rara vez", "pocas veces"])
+
+    IMPACT_KEYWORDS = {
+        "retraso": "Retraso en operaciones",
+        "pérdida": "Pérdida de productividad",
+        "queja": "Quejas de clientes",
+        "costo": "Incremento de costos",
+        "tiempo": "Pérdida de tiempo",
+        "parada": "Parada de operaciones"
     }
+    register_keywords(IMPACT_KEYWORDS)
+
+    WORKAROUND_PATTERNS = [
+        re.compile(r"(?:solución temporal|workaround|mientras tanto|por ahora)[:\s]+([^.]+)"),
+        re.compile(r"(?:hacemos|hago|usamos)[:\s]+([^.]+)(?:mientras|hasta)"),
+        re.compile(r"(?:alternativa|opción)[:\s]+([^.]+)")
+    ]
+
+    # Recovery time patterns and their minute multipliers
+    RECOVERY_TIME_PATTERNS = [
+        (re.compile(r"(\d+)\s*horas?"), 60),  # hours to minutes
+        (re.compile(r"(\d+)\s*minutos?"), 1),  # minutes
+        (re.compile(r"(\d+)\s*días?"), 1440),  # days to minutes
+    ]
     
     def __init__(self, openai_api_key: Optional[str] = None):
         """Initialize extractor with OpenAI client"""
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract failure modes from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of failure mode entities
@@ -2078,7 +2540,7 @@ class FailureModeExtractor:
         rule_based_failures = self._rule_based_extraction(full_text, meta)
         
         # LLM extraction (if available)
-        llm_failures = self._llm_extraction(full_text, meta)
+        llm_failures = self._llm_extraction(full_text, meta, llm_response)
         
         # Merge results
         all_failures = self._merge_failures(rule_based_failures, llm_failures)
@@ -2088,10 +2550,9 @@ class FailureModeExtractor:
     def _rule_based_extraction(self, text: str, meta: Dict) -> List[Dict]:
         """Extract failure modes using pattern matching"""
         failures = []
-        text_lower = text.lower()
         
         # Check if failure language is mentioned
-        has_failure = any(keyword in text_lower for keyword in self.FAILURE_KEYWORDS)
+        has_failure = scan_text(text).has_any(self.FAILURE_KEYWORDS)
         
         if not has_failure:
             return failures
@@ -2120,67 +2581,51 @@ class FailureModeExtractor:
     def _extract_failure_descriptions(self, text: str) -> List[str]:
         """Extract failure descriptions from text"""
         descriptions = []
-        text_lower = text.lower()
+        scan = scan_text(text)
         
         # Look for failure patterns
         for keyword in self.FAILURE_KEYWORDS:
-            if keyword in text_lower:
-                # Try to extract context around the failure keyword
-                pattern = rf"([^.]*{keyword}[^.]*\.)"
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    if len(match) > 10:  # Filter out too short matches
-                        descriptions.append(match.strip())
+            if scan.has(keyword):
+                # Context around the failure keyword: each "."-terminated
+                # sentence containing it
+                for sentence, sentence_lower in scan.sentences():
+                    if keyword in sentence_lower and len(sentence) > 10:  # Filter out too short matches
+                        descriptions.append(sentence.strip())
         
         return list(set(descriptions))[:3]  # Limit to 3 most relevant
     
     def _infer_frequency(self, text: str) -> str:
         """Infer how often failures occur"""
-        text_lower = text.lower()
+        scan = scan_text(text)
         
         for frequency, keywords in self.FREQUENCY_PATTERNS.items():
-            if any(keyword in text_lower for keyword in keywords):
+            if scan.has_any(keywords):
                 return frequency
         
         # Check for frequency indicators
-        if any(word in text_lower for word in ["frecuente", "seguido", "constantemente"]):
+        if scan.has_any(self.FREQUENT_INDICATORS):
             return "Weekly"
-        elif any(word in text_lower for word in ["rara vez", "pocas veces"]):
+        elif scan.has_any(self.RARE_INDICATORS):
             return "Rarely"
         
         return "Occasionally"
     
     def _extract_impact(self, text: str) -> str:
         """Extract impact description"""
-        text_lower = text.lower()
-        
-        impact_keywords = {
-            "retraso": "Retraso en operaciones",
-            "pérdida": "Pérdida de productividad",
-            "queja": "Quejas de clientes",
-            "costo": "Incremento de costos",
-            "tiempo": "Pérdida de tiempo",
-            "parada": "Parada de operaciones"
-        }
+        scan = scan_text(text)
         
-        for keyword, impact in impact_keywords.items():
-            if keyword in text_lower:
+        for keyword, impact in self.IMPACT_KEYWORDS.items():
+            if scan.has(keyword):
                 return impact
         
         return "Impacto en operaciones"
     
     def _extract_workaround(self, text: str) -> Optional[str]:
         """Extract current workaround"""
-        text_lower = text.lower()
-        
-        workaround_patterns = [
-            r"(?:solución temporal|workaround|mientras tanto|por ahora)[:\s]+([^.]+)",
-            r"(?:hacemos|hago|usamos)[:\s]+([^.]+)(?:mientras|hasta)",
-            r"(?:alternativa|opción)[:\s]+([^.]+)"
-        ]
+        text_lower = scan_text(text).lower
         
-        for pattern in workaround_patterns:
-            match = re.search(pattern, text_lower)
+        for pattern in self.WORKAROUND_PATTERNS:
+            match = pattern.search(text_lower)
             if match:
                 return match.group(1).strip().capitalize()
         
@@ -2188,17 +2633,11 @@ class FailureModeExtractor:
     
     def _extract_recovery_time(self, text: str) -> Optional[int]:
         """Extract recovery time in minutes"""
-        text_lower = text.lower()
+        text_lower = scan_text(text).lower
         
         # Look for time patterns
-        time_patterns = [
-            (r"(\d+)\s*horas?", 60),  # hours to minutes
-            (r"(\d+)\s*minutos?", 1),  # minutes
-            (r"(\d+)\s*días?", 1440),  # days to minutes
-        ]
-        
-        for pattern, multiplier in time_patterns:
-            match = re.search(pattern, text_lower)
+        for pattern, multiplier in self.RECOVERY_TIME_PATTERNS:
+            match = pattern.search(text_lower)
             if match:
                 return int(match.group(1)) * multiplier
         
@@ -2206,7 +2645,7 @@ class FailureModeExtractor:
     
     def _infer_related_process(self, text: str, role: str) -> Optional[str]:
         """Infer which process this failure relates to"""
-        text_lower = text.lower()
+        text_lower = scan_text(text).lower
         role_lower = role.lower()
         
         # Process patterns
@@ -2227,7 +2666,7 @@ class FailureModeExtractor:
         
         return None
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Use LLM to extract failure modes with deeper understanding"""
         
         if not self.client:
@@ -2325,7 +2764,10 @@ If no failure modes are found, return {{"failure_modes": []}}.
                 {"role": "user", "content": prompt}
             ]
             
-            response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
+            if llm_response is not None:
+                response_content = llm_response
+            else:
+                response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
             
             if not response_content:
                 print("Warning: All LLM models failed for failure mode extraction")
@@ -2415,21 +2857,34 @@ class EnhancedPainPointExtractor:
         "Ad-hoc": ["ocasional", "a veces", "cuando se necesita"]
     }
     
-    def __init__(self, openai_api_key: Optional[str] = None):
-        """Initialize extractor with OpenAI client"""
+    def __init__(self, openai_api_key: Optional[str] = None, streaming: Optional[bool] = None):
+        """
+        Initialize extractor with OpenAI client
+
+        Args:
+            openai_api_key: OpenAI API key (default: OPENAI_API_KEY)
+            streaming: Stream the LLM response and post-process each pain
+                point as it arrives (default: extraction.streaming)
+        """
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
+        self.streaming = EXTRACTION_STREAMING if streaming is None else streaming
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract enhanced pain points from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of enhanced pain point entities
         """
+        if self.streaming and llm_response is None:
+            return list(self.iter_from_interview(interview_data))
+
         meta = interview_data.get("meta", {})
         qa_pairs = interview_data.get("qa_pairs", {})
         
@@ -2437,7 +2892,7 @@ class EnhancedPainPointExtractor:
         full_text = "\n\n".join([f"Q: {q}\nA: {a}" for q, a in qa_pairs.items()])
         
         # Use LLM extraction (rule-based is too limited for this complex task)
-        pain_points = self._llm_extraction(full_text, meta)
+        pain_points = self._llm_extraction(full_text, meta, llm_response)
         
         # Post-process: calculate hair_on_fire flag and annual cost
         for pain in pain_points:
@@ -2445,6 +2900,32 @@ class EnhancedPainPointExtractor:
             self._calculate_annual_cost(pain)
         
         return pain_points
+
+    def iter_from_interview(self, interview_data: Dict) -> Iterator[Dict]:
+        """
+        Stream enhanced pain points while the LLM is still generating
+
+        Each pain point is completed and scored as soon as its JSON object
+        arrives, so callers can store it before the response finishes.
+
+        Args:
+            interview_data: Dict with 'meta' and 'qa_pairs'
+
+        Yields:
+            Enhanced pain point entities, in response order
+        """
+        if not self.client:
+            return
+
+        meta = interview_data.get("meta", {})
+        qa_pairs = interview_data.get("qa_pairs", {})
+        full_text = "\n\n".join([f"Q: {q}\nA: {a}" for q, a in qa_pairs.items()])
+
+        for pain in stream_llm_entities(self.client, self._messages(full_text, meta), "pain_points"):
+            self._complete_pain_point(pain, meta)
+            self._calculate_hair_on_fire(pain)
+            self._calculate_annual_cost(pain)
+            yield pain
     
     def _calculate_hair_on_fire(self, pain_point: Dict):
         """Calculate if this is a hair-on-fire problem"""
@@ -2483,12 +2964,8 @@ class EnhancedPainPointExtractor:
         # Total annual cost
         pain_point["estimated_annual_cost_usd"] = time_cost_annual + direct_cost_annual
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
-        """Use LLM to extract enhanced pain points"""
-        
-        if not self.client:
-            return []
-        
+    def _messages(self, text: str, meta: Dict) -> List[Dict]:
+        """Build the pain point extraction messages"""
         prompt = f"""You are analyzing an interview to extract pain points with detailed context. Focus on identifying problems, their severity, frequency, who's affected, and the business impact.
 
 **Interview Context:**
@@ -2601,17 +3078,28 @@ Extract ALL pain points - problems, frustrations, inefficiencies, or obstacles m
 
 If no pain points found, return {{"pain_points": []}}.
 """
+
+        return [
+            {
+                "role": "system", 
+                "content": "You are an expert business analyst specializing in identifying operational pain points, quantifying their impact, and understanding the jobs-to-be-done context. Always return valid JSON."
+            },
+            {"role": "user", "content": prompt}
+        ]
+
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
+        """Use LLM to extract enhanced pain points"""
+        
+        if not self.client:
+            return []
         
         try:
-            messages = [
-                {
-                    "role": "system", 
-                    "content": "You are an expert business analyst specializing in identifying operational pain points, quantifying their impact, and understanding the jobs-to-be-done context. Always return valid JSON."
-                },
-                {"role": "user", "content": prompt}
-            ]
+            messages = self._messages(text, meta)
             
-            response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
+            if llm_response is not None:
+                response_content = llm_response
+            else:
+                response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
             
             if not response_content:
                 print("Warning: All LLM models failed for pain point extraction")
@@ -2622,33 +3110,7 @@ If no pain points found, return {{"pain_points": []}}.
             
             # Add extraction source and validate
             for pain in pain_points:
-                pain["extraction_source"] = "llm_extraction"
-                
-                # Ensure required fields exist
-                if not pain.get("description"):
-                    continue
-                
-                # Set defaults for missing fields
-                pain.setdefault("intensity_score", 5)
-                pain.setdefault("frequency", "Ad-hoc")
-                pain.setdefault("jtbd_who", meta.get("role", "Unknown"))
-                pain.setdefault("jtbd_what", "Realizar trabajo")
-                pain.setdefault("jtbd_where", "Durante proceso")
-                pain.setdefault("jtbd_formatted", f"When working, I want to be efficient, but {pain['description']}")
-                pain.setdefault("time_wasted_per_occurrence_minutes", None)
-                pain.setdefault("cost_impact_monthly_usd", None)
-                pain.setdefault("root_cause", None)
-                pain.setdefault("current_workaround", None)
-                pain.setdefault("affected_roles", [meta.get("role", "Unknown")])
-                pain.setdefault("affected_processes", [])
-                pain.setdefault("severity", "Medium")
-                pain.setdefault("impact_description", "Afecta operaciones")
-                pain.setdefault("proposed_solutions", [])
-                pain.setdefault("confidence_score", 0.8)
-                pain.setdefault("extraction_reasoning", "Extracted by LLM")
-                
-                # Ensure type is set
-                pain.setdefault("type", "Process Inefficiency")
+                self._complete_pain_point(pain, meta)
             
             return pain_points
             
@@ -2656,6 +3118,36 @@ If no pain points found, return {{"pain_points": []}}.
             print(f"Warning: LLM extraction failed: {e}")
             return []
 
+    def _complete_pain_point(self, pain: Dict, meta: Dict):
+        """Tag an LLM pain point and set defaults for missing fields"""
+        pain["extraction_source"] = "llm_extraction"
+        
+        # Ensure required fields exist
+        if not pain.get("description"):
+            return
+        
+        # Set defaults for missing fields
+        pain.setdefault("intensity_score", 5)
+        pain.setdefault("frequency", "Ad-hoc")
+        pain.setdefault("jtbd_who", meta.get("role", "Unknown"))
+        pain.setdefault("jtbd_what", "Realizar trabajo")
+        pain.setdefault("jtbd_where", "Durante proceso")
+        pain.setdefault("jtbd_formatted", f"When working, I want to be efficient, but {pain['description']}")
+        pain.setdefault("time_wasted_per_occurrence_minutes", None)
+        pain.setdefault("cost_impact_monthly_usd", None)
+        pain.setdefault("root_cause", None)
+        pain.setdefault("current_workaround", None)
+        pain.setdefault("affected_roles", [meta.get("role", "Unknown")])
+        pain.setdefault("affected_processes", [])
+        pain.setdefault("severity", "Medium")
+        pain.setdefault("impact_description", "Afecta operaciones")
+        pain.setdefault("proposed_solutions", [])
+        pain.setdefault("confidence_score", 0.8)
+        pain.setdefault("extraction_reasoning", "Extracted by LLM")
+        
+        # Ensure type is set
+        pain.setdefault("type", "Process Inefficiency")
+
 
 
 class AutomationCandidateExtractor:
@@ -2669,21 +3161,34 @@ class AutomationCandidateExtractor:
         "Reconsider": "High effort (4-5), Low impact (1-3)"
     }
     
-    def __init__(self, openai_api_key: Optional[str] = None):
-        """Initialize extractor with OpenAI client"""
+    def __init__(self, openai_api_key: Optional[str] = None, streaming: Optional[bool] = None):
+        """
+        Initialize extractor with OpenAI client
+
+        Args:
+            openai_api_key: OpenAI API key (default: OPENAI_API_KEY)
+            streaming: Stream the LLM response and score each candidate as
+                it arrives (default: extraction.streaming)
+        """
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
+        self.streaming = EXTRACTION_STREAMING if streaming is None else streaming
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract enhanced automation candidate entities from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of enhanced automation candidate entities
         """
+        if self.streaming and llm_response is None:
+            return list(self.iter_from_interview(interview_data))
+
         meta = interview_data.get("meta", {})
         qa_pairs = interview_data.get("qa_pairs", {})
         
@@ -2691,25 +3196,54 @@ class AutomationCandidateExtractor:
         full_text = "\n\n".join([f"Q: {q}\nA: {a}" for q, a in qa_pairs.items()])
         
         # Extract automation candidates using LLM
-        candidates = self._llm_extraction(full_text, meta)
+        candidates = self._llm_extraction(full_text, meta, llm_response)
         
         # Enhance each candidate with effort/impact scoring and priority classification
         for candidate in candidates:
-            candidate["effort_score"] = self._calculate_effort_score(candidate)
-            candidate["impact_score"] = self._calculate_impact_score(candidate)
-            candidate["priority_quadrant"] = self._classify_priority_quadrant(
-                candidate["effort_score"], 
-                candidate["impact_score"]
-            )
-            
-            # Calculate ROI if cost savings available
-            if candidate.get("estimated_annual_savings_usd") and candidate.get("implementation_cost_usd"):
-                candidate["estimated_roi_months"] = self._calculate_roi_months(
-                    candidate["estimated_annual_savings_usd"],
-                    candidate["implementation_cost_usd"]
-                )
+            self._score_candidate(candidate)
         
         return candidates
+
+    def iter_from_interview(self, interview_data: Dict) -> Iterator[Dict]:
+        """
+        Stream automation candidates while the LLM is still generating
+
+        Each candidate is completed and scored as soon as its JSON object
+        arrives, so callers can store it before the response finishes.
+
+        Args:
+            interview_data: Dict with 'meta' and 'qa_pairs'
+
+        Yields:
+            Enhanced automation candidate entities, in response order
+        """
+        if not self.client:
+            return
+
+        meta = interview_data.get("meta", {})
+        qa_pairs = interview_data.get("qa_pairs", {})
+        full_text = "\n\n".join([f"Q: {q}\nA: {a}" for q, a in qa_pairs.items()])
+
+        for candidate in stream_llm_entities(self.client, self._messages(full_text, meta), "automation_candidates"):
+            self._complete_candidate(candidate, meta)
+            self._score_candidate(candidate)
+            yield candidate
+
+    def _score_candidate(self, candidate: Dict):
+        """Add effort/impact scores, priority quadrant and ROI to a candidate"""
+        candidate["effort_score"] = self._calculate_effort_score(candidate)
+        candidate["impact_score"] = self._calculate_impact_score(candidate)
+        candidate["priority_quadrant"] = self._classify_priority_quadrant(
+            candidate["effort_score"], 
+            candidate["impact_score"]
+        )
+        
+        # Calculate ROI if cost savings available
+        if candidate.get("estimated_annual_savings_usd") and candidate.get("implementation_cost_usd"):
+            candidate["estimated_roi_months"] = self._calculate_roi_months(
+                candidate["estimated_annual_savings_usd"],
+                candidate["implementation_cost_usd"]
+            )
     
     def _calculate_effort_score(self, candidate: Dict) -> int:
         """
@@ -2852,12 +3386,8 @@ class AutomationCandidateExtractor:
         
         return round((implementation_cost / annual_savings) * 12, 1)
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
-        """Use LLM to extract automation candidates with monitoring and approval requirements"""
-        
-        if not self.client:
-            return []
-        
+    def _messages(self, text: str, meta: Dict) -> List[Dict]:
+        """Build the automation candidate extraction messages"""
         prompt = f"""You are analyzing an interview to extract automation opportunities. Focus on identifying manual processes that could be automated, along with their current workarounds, data requirements, and approval needs.
 
 **Interview Context:**
@@ -2945,17 +3475,28 @@ Extract ALL automation opportunities mentioned or implied. An automation candida
 
 If no automation candidates are found, return {{"automation_candidates": []}}.
 """
+
+        return [
+            {
+                "role": "system", 
+                "content": "You are an expert in business process automation, RPA, and digital transformation. You identify automation opportunities, assess their complexity and impact, and design monitoring strategies. Always return valid JSON."
+            },
+            {"role": "user", "content": prompt}
+        ]
+
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
+        """Use LLM to extract automation candidates with monitoring and approval requirements"""
+        
+        if not self.client:
+            return []
         
         try:
-            messages = [
-                {
-                    "role": "system", 
-                    "content": "You are an expert in business process automation, RPA, and digital transformation. You identify automation opportunities, assess their complexity and impact, and design monitoring strategies. Always return valid JSON."
-                },
-                {"role": "user", "content": prompt}
-            ]
+            messages = self._messages(text, meta)
             
-            response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
+            if llm_response is not None:
+                response_content = llm_response
+            else:
+                response_content = call_llm_with_fallback(self.client, messages, temperature=0.1)
             
             if not response_content:
                 print("Warning: All LLM models failed for automation candidate extraction")
@@ -2966,31 +3507,7 @@ If no automation candidates are found, return {{"automation_candidates": []}}.
             
             # Validate and set defaults
             for candidate in candidates:
-                if not candidate.get("name"):
-                    continue
-                
-                # Set defaults for missing fields
-                candidate.setdefault("process", "Unknown")
-                candidate.setdefault("trigger_event", "Manual trigger")
-                candidate.setdefault("action", "Automate manual process")
-                candidate.setdefault("output", "Automated result")
-                candidate.setdefault("owner", meta.get("role", "Unknown"))
-                candidate.setdefault("complexity", "Medium")
-                candidate.setdefault("impact", "Medium")
-                candidate.setdefault("effort_estimate", None)
-                candidate.setdefault("systems_involved", [])
-                candidate.setdefault("current_manual_process_description", "")
-                candidate.setdefault("data_sources_needed", [])
-                candidate.setdefault("approval_required", False)
-                candidate.setdefault("approval_threshold_usd", None)
-                candidate.setdefault("monitoring_metrics", [])
-                candidate.setdefault("time_wasted_per_occurrence_minutes", None)
-                candidate.setdefault("frequency", "Ad-hoc")
-                candidate.setdefault("estimated_annual_savings_usd", None)
-                candidate.setdefault("affected_roles", [meta.get("role", "Unknown")])
-                candidate.setdefault("confidence_score", 0.8)
-                candidate.setdefault("extraction_reasoning", "Extracted by LLM")
-                candidate["extraction_source"] = "llm_extraction"
+                self._complete_candidate(candidate, meta)
             
             return candidates
             
@@ -2998,6 +3515,34 @@ If no automation candidates are found, return {{"automation_candidates": []}}.
             print(f"Warning: LLM extraction failed: {e}")
             return []
 
+    def _complete_candidate(self, candidate: Dict, meta: Dict):
+        """Set defaults for missing fields of a named LLM candidate"""
+        if not candidate.get("name"):
+            return
+        
+        # Set defaults for missing fields
+        candidate.setdefault("process", "Unknown")
+        candidate.setdefault("trigger_event", "Manual trigger")
+        candidate.setdefault("action", "Automate manual process")
+        candidate.setdefault("output", "Automated result")
+        candidate.setdefault("owner", meta.get("role", "Unknown"))
+        candidate.setdefault("complexity", "Medium")
+        candidate.setdefault("impact", "Medium")
+        candidate.setdefault("effort_estimate", None)
+        candidate.setdefault("systems_involved", [])
+        candidate.setdefault("current_manual_process_description", "")
+        candidate.setdefault("data_sources_needed", [])
+        candidate.setdefault("approval_required", False)
+        candidate.setdefault("approval_threshold_usd", None)
+        candidate.setdefault("monitoring_metrics", [])
+        candidate.setdefault("time_wasted_per_occurrence_minutes", None)
+        candidate.setdefault("frequency", "Ad-hoc")
+        candidate.setdefault("estimated_annual_savings_usd", None)
+        candidate.setdefault("affected_roles", [meta.get("role", "Unknown")])
+        candidate.setdefault("confidence_score", 0.8)
+        candidate.setdefault("extraction_reasoning", "Extracted by LLM")
+        candidate["extraction_source"] = "llm_extraction"
+
 
 
 class TeamStructureExtractor:
@@ -3008,12 +3553,14 @@ class TeamStructureExtractor:
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract team structure from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of team structure entities
@@ -3025,11 +3572,11 @@ class TeamStructureExtractor:
         full_text = "\n\n".join([f"Q: {q}\nA: {a}" for q, a in qa_pairs.items()])
         
         # Use LLM to extract team structure
-        team_structures = self._llm_extraction(full_text, meta)
+        team_structures = self._llm_extraction(full_text, meta, llm_response)
         
         return team_structures
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Extract team structure using LLM"""
         if not self.client:
             return []
@@ -3062,14 +3609,12 @@ Return as JSON array with this structure:
 If no team structure info found, return empty array []."""
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
+            if llm_response is None:
+                llm_response = create_json_completion(
+                    self.client, "gpt-4o-mini", [{"role": "user", "content": prompt}], temperature=0.1
+                )
             
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(llm_response)
             team_structures = result.get("team_structures", [])
             
             # Add metadata
@@ -3101,12 +3646,14 @@ class KnowledgeGapExtractor:
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract knowledge gaps from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of knowledge gap entities
@@ -3125,11 +3672,11 @@ class KnowledgeGapExtractor:
             return []
         
         # Use LLM to extract knowledge gaps
-        knowledge_gaps = self._llm_extraction(full_text, meta)
+        knowledge_gaps = self._llm_extraction(full_text, meta, llm_response)
         
         return knowledge_gaps
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Extract knowledge gaps using LLM"""
         if not self.client:
             return []
@@ -3161,14 +3708,12 @@ Return as JSON array:
 If no knowledge gaps found, return empty array []."""
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
+            if llm_response is None:
+                llm_response = create_json_completion(
+                    self.client, "gpt-4o-mini", [{"role": "user", "content": prompt}], temperature=0.1
+                )
             
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(llm_response)
             gaps = result.get("knowledge_gaps", [])
             
             # Add metadata
@@ -3201,12 +3746,14 @@ class SuccessPatternExtractor:
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract success patterns from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of success pattern entities
@@ -3225,11 +3772,11 @@ class SuccessPatternExtractor:
             return []
         
         # Use LLM to extract success patterns
-        success_patterns = self._llm_extraction(full_text, meta)
+        success_patterns = self._llm_extraction(full_text, meta, llm_response)
         
         return success_patterns
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Extract success patterns using LLM"""
         if not self.client:
             return []
@@ -3261,14 +3808,12 @@ Return as JSON array:
 If no success patterns found, return empty array []."""
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
+            if llm_response is None:
+                llm_response = create_json_completion(
+                    self.client, "gpt-4o-mini", [{"role": "user", "content": prompt}], temperature=0.1
+                )
             
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(llm_response)
             patterns = result.get("success_patterns", [])
             
             # Add metadata
@@ -3300,12 +3845,14 @@ class BudgetConstraintExtractor:
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract budget constraints from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of budget constraint entities
@@ -3324,11 +3871,11 @@ class BudgetConstraintExtractor:
             return []
         
         # Use LLM to extract budget constraints
-        budget_constraints = self._llm_extraction(full_text, meta)
+        budget_constraints = self._llm_extraction(full_text, meta, llm_response)
         
         return budget_constraints
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Extract budget constraints using LLM"""
         if not self.client:
             return []
@@ -3361,14 +3908,12 @@ Return as JSON array:
 If no budget constraints found, return empty array []."""
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
+            if llm_response is None:
+                llm_response = create_json_completion(
+                    self.client, "gpt-4o-mini", [{"role": "user", "content": prompt}], temperature=0.1
+                )
             
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(llm_response)
             constraints = result.get("budget_constraints", [])
             
             # Add metadata
@@ -3399,12 +3944,14 @@ class ExternalDependencyExtractor:
         api_key = openai_api_key or os.getenv("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key) if api_key else None
     
-    def extract_from_interview(self, interview_data: Dict) -> List[Dict]:
+    def extract_from_interview(self, interview_data: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """
         Extract external dependencies from interview data
         
         Args:
             interview_data: Dict with 'meta' and 'qa_pairs'
+            llm_response: Pre-fetched JSON response for this type (grouped
+                extraction); None calls the LLM
             
         Returns:
             List of external dependency entities
@@ -3423,11 +3970,11 @@ class ExternalDependencyExtractor:
             return []
         
         # Use LLM to extract external dependencies
-        external_deps = self._llm_extraction(full_text, meta)
+        external_deps = self._llm_extraction(full_text, meta, llm_response)
         
         return external_deps
     
-    def _llm_extraction(self, text: str, meta: Dict) -> List[Dict]:
+    def _llm_extraction(self, text: str, meta: Dict, llm_response: Optional[str] = None) -> List[Dict]:
         """Extract external dependencies using LLM"""
         if not self.client:
             return []
@@ -3463,14 +4010,12 @@ Return as JSON array:
 If no external dependencies found, return empty array []."""
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
+            if llm_response is None:
+                llm_response = create_json_completion(
+                    self.client, "gpt-4o-mini", [{"role": "user", "content": prompt}], temperature=0.1
+                )
             
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(llm_response)
             deps = result.get("external_dependencies", [])
             
             # Add metadata
@@ -0,0 +1,299 @@
+"""
+Grouped Multi-Entity Extraction
+Batches related entity types into one JSON-mode call per group, so the
+interview text is sent once per group instead of once per entity type
+
+- Each group prompt asks for one response section per entity type
+- Sections are handed back to the existing extractors as pre-fetched
+  responses, so per-type post-processing (merges, scores) is unchanged
+- Token usage and call latency are recorded for cost/savings reporting
+"""
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+
+from openai import OpenAI
+
+from .extractors import call_llm_with_fallback
+from .llm_cache import estimate_cost
+
+# Response section, definition and item fields per entity type.
+# Section names are the keys each extractor already parses.
+SECTION_SCHEMAS = {
+    "processes": (
+        "processes",
+        "Recurring sequences of steps with inputs and outputs",
+        ["name", "owner", "domain", "description", "inputs", "outputs", "systems", "frequency", "dependencies"]
+    ),
+    "kpis": (
+        "kpis",
+        "Metrics measured regularly or quantified targets",
+        ["name", "domain", "definition", "formula", "owner", "data_source", "baseline", "target",
+         "cadence (hourly|daily|weekly|monthly|quarterly|annual)", "related_processes"]
+    ),
+    "inefficiencies": (
+        "inefficiencies",
+        "Redundant work, unnecessary steps, waiting time or missing information",
+        ["description", "category (Manual work|Waiting time|Rework|Communication|Approval delays)",
+         "frequency", "time_wasted", "related_process"]
+    ),
+    "communication_channels": (
+        "channels",
+        "Tools, meetings and informal means used to communicate or coordinate",
+        ["channel_name", "purpose", "frequency (Continuous|Daily|Weekly|Monthly|As needed)", "participants",
+         "response_sla_minutes", "pain_points", "related_processes", "confidence_score", "extraction_reasoning"]
+    ),
+    "systems_v2": (
+        "systems",
+        "Software, platforms and tools used for work (including Excel and paper forms)",
+        ["name", "domain", "vendor", "type (ERP|PMS|POS|CRM|CMMS|BI|Productivity|Communication|Other)",
+         "integration_pain_points", "data_quality_issues", "user_satisfaction_score (1-10)",
+         "replacement_candidate", "adoption_rate", "confidence_score", "extraction_reasoning"]
+    ),
+    "decision_points": (
+        "decisions",
+        "Decisions the respondent makes or escalates, with criteria and authority",
+        ["decision_type", "decision_maker_role", "decision_criteria", "approval_required", "approval_threshold",
+         "authority_limit_usd", "escalation_trigger", "escalation_to_role", "related_process",
+         "confidence_score", "extraction_reasoning"]
+    ),
+    "data_flows": (
+        "data_flows",
+        "Data moved between systems or people",
+        ["source_system", "target_system", "data_type", "transfer_method (Manual|Export/Import|API|Database Query)",
+         "transfer_frequency", "data_quality_issues", "pain_points", "related_process",
+         "confidence_score", "extraction_reasoning"]
+    ),
+    "temporal_patterns": (
+        "temporal_patterns",
+        "Activities that happen at a given time or frequency",
+        ["activity_name", "frequency", "time_of_day (HH:MM or null)", "duration_minutes (estimate if missing)",
+         "participants", "triggers_actions", "related_process", "confidence_score", "extraction_reasoning"]
+    ),
+    "failure_modes": (
+        "failure_modes",
+        "Things that go wrong repeatedly, their impact and workarounds",
+        ["failure_description", "frequency", "impact_description", "root_cause", "current_workaround",
+         "recovery_time_minutes", "proposed_prevention", "related_process", "confidence_score",
+         "extraction_reasoning"]
+    ),
+    "pain_points_v2": (
+        "pain_points",
+        "Problems the respondent suffers, with intensity and jobs-to-be-done",
+        ["description", "intensity_score (1-10)", "frequency", "jtbd_who", "jtbd_what", "jtbd_where",
+         "jtbd_formatted", "time_wasted_per_occurrence_minutes", "cost_impact_monthly_usd", "root_cause",
+         "current_workaround", "affected_roles", "affected_processes", "severity (High|Medium|Low)",
+         "impact_description", "proposed_solutions", "confidence_score", "extraction_reasoning"]
+    ),
+    "automation_candidates_v2": (
+        "automation_candidates",
+        "Manual work that could be automated",
+        ["name", "process", "trigger_event", "action", "output", "owner", "complexity (Low|Medium|High)",
+         "impact (Low|Medium|High)", "effort_estimate", "systems_involved", "current_manual_process_description",
+         "data_sources_needed", "approval_required", "approval_threshold_usd", "monitoring_metrics",
+         "time_wasted_per_occurrence_minutes", "frequency", "estimated_annual_savings_usd", "affected_roles",
+         "confidence_score", "extraction_reasoning"]
+    ),
+    "team_structures": (
+        "team_structures",
+        "Role, team size, reporting line and coordination of the respondent",
+        ["role", "team_size", "reports_to", "coordinates_with", "external_dependencies",
+         "confidence_score", "extraction_reasoning"]
+    ),
+    "knowledge_gaps": (
+        "knowledge_gaps",
+        "Things people do not know or understand that affect their work",
+        ["area", "affected_roles", "impact", "training_needed", "confidence_score", "extraction_reasoning"]
+    ),
+    "success_patterns": (
+        "success_patterns",
+        "Practices that work well and could be replicated",
+        ["pattern", "role", "benefit", "replicable_to", "confidence_score", "extraction_reasoning"]
+    ),
+    "budget_constraints": (
+        "budget_constraints",
+        "Budgets, approval limits and budget-related problems",
+        ["area", "budget_type", "approval_required_above", "approver", "pain_point",
+         "confidence_score", "extraction_reasoning"]
+    ),
+    "external_dependencies": (
+        "external_dependencies",
+        "Vendors and partners the work depends on",
+        ["vendor", "service", "frequency", "coordinator", "sla", "payment_process",
+         "confidence_score", "extraction_reasoning"]
+    )
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+class GroupedExtractionStats:
+    """
+    Token, cost and latency accounting for the grouped calls of one interview
+
+    Savings are estimates against the per-type mode:
+    - tokens_saved: interview text tokens not re-sent (one copy per
+      entity type served by a grouped call, minus one per call)
+    - latency_saved: calls avoided x mean observed grouped-call latency
+    """
+
+    def __init__(self):
+        self.llm_calls = 0
+        self.entity_types = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.llm_seconds = 0.0
+        self.tokens_saved = 0
+        self._lock = threading.Lock()
+
+    def record_call(self, usage: Dict, seconds: float, sections: int, interview_tokens: int):
+        """Record one grouped call that returned `sections` entity-type sections"""
+        with self._lock:
+            self.llm_calls += 1
+            self.entity_types += sections
+            self.prompt_tokens += usage.get("prompt_tokens", 0)
+            self.completion_tokens += usage.get("completion_tokens", 0)
+            self.cost += estimate_cost(
+                usage.get("model", ""), usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+            )
+            self.llm_seconds += seconds
+            self.tokens_saved += max(0, sections - 1) * interview_tokens
+
+    @property
+    def tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def calls_saved(self) -> int:
+        return max(0, self.entity_types - self.llm_calls)
+
+    @property
+    def latency_saved(self) -> float:
+        if not self.llm_calls:
+            return 0.0
+        return self.calls_saved * self.llm_seconds / self.llm_calls
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary"""
+        return {
+            "llm_calls": self.llm_calls,
+            "entity_types": self.entity_types,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "tokens": self.tokens,
+            "cost": self.cost,
+            "llm_seconds": self.llm_seconds,
+            "calls_saved": self.calls_saved,
+            "tokens_saved": self.tokens_saved,
+            "latency_saved": self.latency_saved
+        }
+
+
+def build_group_messages(entity_types: List[str], interview_text: str) -> List[Dict]:
+    """
+    Build one multi-section JSON-mode prompt for a group of entity types
+
+    Args:
+        entity_types: Entity types in the group (keys of SECTION_SCHEMAS)
+        interview_text: Formatted interview (sent once)
+
+    Returns:
+        Chat messages
+    """
+    sections = []
+    response_format = {}
+    for entity_type in entity_types:
+        key, definition, fields = SECTION_SCHEMAS[entity_type]
+        sections.append(f'- "{key}": {definition}. Fields: {", ".join(fields)}')
+        response_format[key] = [{field.split(" ")[0]: "..." for field in fields}]
+
+    prompt = f"""Extract the following entity types from the interview below. Each one goes in its own section of the response.
+
+**Sections:**
+{chr(10).join(sections)}
+
+**Guidelines:**
+- Only extract what the interview states or clearly implies
+- Keep names and descriptions in the language of the interview
+- Use null for unknown values and [] for empty lists
+- confidence_score is 0.0-1.0 based on how explicit the mention is
+- Always include every section; use [] when nothing is found
+
+**Interview:**
+{interview_text}
+
+**Return Format:**
+{json.dumps(response_format, ensure_ascii=False)}
+"""
+    return [
+        {
+            "role": "system",
+            "content": "You are an expert business analyst. You extract several types of structured information from interviews in one pass. Always return valid JSON."
+        },
+        {"role": "user", "content": prompt}
+    ]
+
+
+def split_group_response(content: str, entity_types: List[str]) -> Dict[str, str]:
+    """
+    Split a grouped response into one JSON response per entity type
+
+    Args:
+        content: Raw JSON response of the grouped call
+        entity_types: Entity types requested in the call
+
+    Returns:
+        {entity_type: '{"<section>": [...]}'} for sections present as lists;
+        missing or malformed sections are left out
+    """
+    try:
+        result = json.loads(content)
+    except (TypeError, ValueError):
+        return {}
+    if not isinstance(result, dict):
+        return {}
+
+    sections = {}
+    for entity_type in entity_types:
+        key = SECTION_SCHEMAS[entity_type][0]
+        if isinstance(result.get(key), list):
+            sections[entity_type] = json.dumps({key: result[key]}, ensure_ascii=False)
+    return sections
+
+
+def run_group_extraction(
+    client: OpenAI,
+    entity_types: List[str],
+    interview_text: str,
+    stats: Optional[GroupedExtractionStats] = None
+) -> Dict[str, str]:
+    """
+    Run one grouped extraction call
+
+    Args:
+        client: OpenAI client
+        entity_types: Entity types in the group
+        interview_text: Formatted interview
+        stats: Accounting for this interview (optional)
+
+    Returns:
+        Per-type JSON responses (see split_group_response); empty if the
+        call failed, so callers fall back to per-type extraction
+    """
+    usage = {}
+    start = time.perf_counter()
+    content = call_llm_with_fallback(client, build_group_messages(entity_types, interview_text), temperature=0.1, usage=usage)
+    seconds = time.perf_counter() - start
+
+    if not content:
+        return {}
+
+    sections = split_group_response(content, entity_types)
+    if stats is not None:
+        stats.record_call(usage, seconds, len(sections), estimate_tokens(interview_text))
+    return sections
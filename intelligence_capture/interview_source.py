@@ -0,0 +1,321 @@
+"""
+Streaming Interview Source
+Iterates interviews from a JSON array or JSONL file without loading the
+whole corpus into memory
+
+- Records are decoded one at a time; only the current record is held
+- Each record is addressed by its byte offset and length, so parallel
+  workers receive (offset, length) and read their own record
+- Resume filtering is a set lookup on (respondent, company, date) while
+  streaming
+- interview_content_hash() fingerprints qa_pairs for incremental
+  re-extraction
+"""
+import codecs
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Tuple, Union
+
+# Bytes read per chunk while scanning a JSON array
+_READ_SIZE = 1 << 16
+
+# Record scanning: string contents up to the closing quote, and the
+# characters that matter outside strings
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+
+InterviewKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def interview_key(interview: Dict) -> InterviewKey:
+    """
+    Get the resume key of an interview
+
+    Args:
+        interview: Interview dict with "meta"
+
+    Returns:
+        (respondent, company, date) tuple, as stored in the interviews table
+    """
+    meta = interview.get("meta", {})
+    return (meta.get("respondent"), meta.get("company"), meta.get("date"))
+
+
+def interview_content_hash(qa_pairs: Dict) -> str:
+    """
+    Fingerprint the transcript of an interview
+
+    Args:
+        qa_pairs: Question -> answer dict
+
+    Returns:
+        SHA-256 hex digest of the canonical JSON (key order does not matter)
+    """
+    canonical = json.dumps(qa_pairs or {}, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class InterviewRef:
+    """Location of one interview record in the source file (no content)"""
+    index: int
+    offset: int
+    length: int
+    key: InterviewKey
+
+    @property
+    def respondent(self) -> str:
+        return self.key[0] or "Unknown"
+
+    @property
+    def company(self) -> str:
+        return self.key[1] or "Unknown"
+
+
+def read_interview(path: Union[str, Path], offset: int, length: int) -> Dict:
+    """
+    Read one interview record by byte offset (used by parallel workers)
+
+    Args:
+        path: Interviews file (JSON array or JSONL)
+        offset: Byte offset of the record
+        length: Byte length of the record
+
+    Returns:
+        Interview dict
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.read(length).decode("utf-8"))
+
+
+class InterviewSource:
+    """
+    Streaming reader for interview corpora
+
+    Supports a top-level JSON array (all_interviews.json) and JSON Lines
+    (one interview per line, *.jsonl).
+
+    Usage:
+        source = InterviewSource(INTERVIEWS_FILE)
+        for ref, interview in source.iter_interviews(skip_keys=completed):
+            ...
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Initialize source
+
+        Args:
+            path: Path to the interviews file
+        """
+        self.path = Path(path)
+        self.is_jsonl = self._detect_jsonl()
+
+        # Records seen by the last iteration (including skipped ones)
+        self.scanned = 0
+
+    def iter_interviews(
+        self,
+        skip_keys: Optional[Set[InterviewKey]] = None
+    ) -> Iterator[Tuple[InterviewRef, Dict]]:
+        """
+        Stream interviews with their locations
+
+        Args:
+            skip_keys: Resume keys to skip (e.g. interviews already complete)
+
+        Yields:
+            (InterviewRef, interview dict) tuples, in file order
+        """
+        records = self._iter_jsonl() if self.is_jsonl else self._iter_json_array()
+        self.scanned = 0
+        for index, (offset, length, interview) in enumerate(records):
+            self.scanned += 1
+            key = interview_key(interview)
+            if skip_keys and key in skip_keys:
+                continue
+            yield InterviewRef(index, offset, length, key), interview
+
+    def iter_refs(self, skip_keys: Optional[Set[InterviewKey]] = None) -> Iterator[InterviewRef]:
+        """
+        Stream interview locations only (records are decoded and dropped)
+
+        Args:
+            skip_keys: Resume keys to skip
+
+        Yields:
+            InterviewRef per interview, in file order
+        """
+        for ref, _ in self.iter_interviews(skip_keys):
+            yield ref
+
+    def read(self, ref: InterviewRef) -> Dict:
+        """
+        Read one interview by reference
+
+        Args:
+            ref: Location from iter_refs()/iter_interviews()
+
+        Returns:
+            Interview dict
+        """
+        return read_interview(self.path, ref.offset, ref.length)
+
+    def _detect_jsonl(self) -> bool:
+        """JSONL unless the first non-whitespace byte opens a JSON array"""
+        if self.path.suffix.lower() in (".jsonl", ".ndjson"):
+            return True
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(_READ_SIZE)
+                if not chunk:
+                    return True
+                stripped = chunk.lstrip(b" \t\r\n\xef\xbb\xbf")
+                if stripped:
+                    return not stripped.startswith(b"[")
+
+    def _iter_jsonl(self) -> Iterator[Tuple[int, int, Dict]]:
+        """Yield (offset, length, record) per non-empty line"""
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                stripped = line.strip()
+                if offset == 0 and stripped.startswith(codecs.BOM_UTF8):
+                    stripped = stripped[len(codecs.BOM_UTF8):].lstrip()
+                if stripped:
+                    start = offset + line.index(stripped[:1])
+                    yield start, len(stripped), json.loads(stripped.decode("utf-8"))
+                offset += len(line)
+
+    def _iter_json_array(self) -> Iterator[Tuple[int, int, Dict]]:
+        """
+        Yield (offset, length, record) per element of a top-level JSON array
+
+        Reads into a sliding text buffer that holds at most the current
+        record plus one read chunk. Object/array records are scanned
+        incrementally for their closing bracket (each character once, even
+        when a record spans many chunks) and decoded once with json's
+        raw_decode; other values are decoded directly.
+        """
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder("utf-8")()
+        buffer = ""
+        buffer_offset = 0  # Byte offset of buffer[0] in the file
+        position = 0  # Parse position in buffer
+        opened = False
+        need_separator = False
+        eof = False
+        scan = None  # Resume position of the bracket scan of the current record
+        depth = 0
+        in_string = False
+
+        with open(self.path, "rb") as f:
+            if f.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8:
+                buffer_offset = len(codecs.BOM_UTF8)
+            else:
+                f.seek(0)
+
+            while True:
+                # Skip whitespace, the opening bracket and one separator
+                while position < len(buffer):
+                    char = buffer[position]
+                    if char == "[" and not opened:
+                        opened = True
+                    elif char == "," and need_separator:
+                        need_separator = False
+                    elif char not in " \t\r\n":
+                        break
+                    position += 1
+
+                if position < len(buffer):
+                    if not opened:
+                        raise ValueError(f"Expected a JSON array or JSON Lines in {self.path}")
+                    if buffer[position] == "]":
+                        return
+                    if need_separator:
+                        raise ValueError(f"Expected ',' between interviews in {self.path}")
+
+                    end = None
+                    if buffer[position] in "{[":
+                        if scan is None:
+                            scan, depth, in_string = position, 0, False
+                        closed, scan, depth, in_string = _scan_container(buffer, scan, depth, in_string)
+                        if closed or eof:
+                            # Raises the syntax error of an unterminated record at EOF
+                            record, end = decoder.raw_decode(buffer, position)
+                    else:
+                        try:
+                            record, end = decoder.raw_decode(buffer, position)
+                        except json.JSONDecodeError:
+                            # Incomplete value: read more (a real syntax error at EOF)
+                            if eof:
+                                raise
+
+                    if end is not None:
+                        start = buffer_offset + len(buffer[:position].encode("utf-8"))
+                        length = len(buffer[position:end].encode("utf-8"))
+                        yield start, length, record
+
+                        # Drop everything up to the end of this record
+                        buffer_offset = start + length
+                        buffer = buffer[end:]
+                        position = 0
+                        scan = None
+                        need_separator = True
+                        continue
+                elif eof:
+                    if opened:
+                        raise ValueError(f"Unterminated JSON array in {self.path}")
+                    return
+
+                chunk = f.read(_READ_SIZE)
+                eof = not chunk
+                buffer += utf8.decode(chunk, final=eof)
+
+
+def _scan_container(buffer: str, scan: int, depth: int, in_string: bool) -> Tuple[bool, int, int, bool]:
+    """
+    Scan a JSON object/array record for its closing bracket
+
+    Resumable: call again with the returned state after more text was
+    appended to buffer.
+
+    Args:
+        buffer: Text holding the record from its opening bracket
+        scan: Position to resume scanning at
+        depth: Bracket depth at scan
+        in_string: Whether scan is inside a string
+
+    Returns:
+        (closed, scan, depth, in_string); when closed, scan is the position
+        right after the closing bracket
+    """
+    while True:
+        if in_string:
+            scan = _STRING_BODY.match(buffer, scan).end()
+            if scan >= len(buffer) or buffer[scan] != '"':
+                # String not closed yet (or a backslash whose escaped character
+                # was not read yet): resume here
+                return False, scan, depth, in_string
+            scan += 1
+            in_string = False
+            continue
+
+        match = _STRUCTURAL.search(buffer, scan)
+        if match is None:
+            return False, len(buffer), depth, in_string
+
+        char = match.group()
+        scan = match.end()
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return True, scan, depth, in_string
@@ -0,0 +1,109 @@
+"""
+Incremental Parsing of Streamed JSON-mode Responses
+Yields the entities of a response's top-level array while the completion
+is still streaming, so per-entity post-processing starts at the first
+entity instead of after the last token
+
+- Responses have the extractor shape {"<array_key>": [{...}, {...}]}
+- A character scanner tracks strings, escapes and nesting depth; each
+  element is decoded with json.loads as soon as its closing brace arrives
+- Chunks may split tokens anywhere (inside strings, escapes or numbers)
+"""
+import json
+from typing import Dict, List, Optional
+
+
+class JsonArrayStream:
+    """
+    Incremental parser for one streamed JSON-mode response
+
+    Usage:
+        stream = JsonArrayStream("automation_candidates")
+        for chunk in completion:
+            for entity in stream.feed(chunk_text):
+                ...
+        full_response = stream.text
+    """
+
+    def __init__(self, array_key: str):
+        """
+        Initialize parser
+
+        Args:
+            array_key: Top-level key of the entity array
+        """
+        self.array_key = array_key
+        self.text = ""  # Response received so far
+        self.emitted = 0  # Entities returned by feed()
+
+        self._pos = 0  # Next character to scan
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: Optional[str] = None  # Last string closed at depth 1
+        self._array_depth: Optional[int] = None  # Depth inside the entity array
+        self._array_done = False
+        self._element_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        Add streamed text and return the entities it completed
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            Entity dicts completed by this chunk, in response order
+        """
+        self.text += chunk
+        text = self.text
+        entities = []
+
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = self._decode(self._string_start, pos)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char in "{[":
+                self._depth += 1
+                if (
+                    char == "[" and self._depth == 2 and not self._array_done
+                    and self._array_depth is None and self._last_key == self.array_key
+                ):
+                    self._array_depth = self._depth
+                elif char == "{" and self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self._element_start = pos
+            elif char in "}]":
+                if char == "}" and self._element_start is not None and self._depth == self._array_depth + 1:
+                    entity = self._decode(self._element_start, pos)
+                    self._element_start = None
+                    if isinstance(entity, dict):
+                        entities.append(entity)
+                elif self._array_depth is not None and self._depth == self._array_depth:
+                    self._array_depth = None  # End of the entity array
+                    self._array_done = True
+                self._depth -= 1
+
+        self._pos = len(text)
+        self.emitted += len(entities)
+        return entities
+
+    def _decode(self, start: int, end: int):
+        """Decode text[start:end + 1] (None if it is not valid JSON)"""
+        try:
+            return json.loads(self.text[start:end + 1])
+        except ValueError:
+            return None
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed LLM Response Cache
+
+Durable cache of chat completions shared by call_llm_with_fallback,
+IntelligenceExtractor._call_gpt4, EnsembleExtractor.extract_with_model and
+SynthesisAgent, so re-running an extraction (after a crash, a storage
+change or during validation) does not pay again for identical prompts.
+
+Features:
+- Keyed by sha256(model, messages, temperature, response_format)
+- SQLite table (WAL mode, safe for several processes) plus an LRU
+  in-memory tier, so repeated hits never touch disk
+- TTL expiry and size-bounded eviction (least recently used first)
+- Hit/miss counts with tokens and cost saved
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from intelligence_capture.logger import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+# USD per 1M tokens (input, output)
+MODEL_PRICING = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "o1-mini": (3.00, 12.00),
+    "claude-sonnet-4-5-20250929": (3.00, 15.00)
+}
+
+# Evict down to this fraction of max_entries, so eviction runs rarely
+_EVICT_TARGET = 0.9
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of one call (gpt-4o-mini pricing for unknown models)"""
+    input_price, output_price = MODEL_PRICING.get(model, MODEL_PRICING["gpt-4o-mini"])
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+class LLMResponseCache:
+    """
+    Content-addressed chat completion cache backed by SQLite
+
+    Entries: (content, model, prompt_tokens, completion_tokens, created_at).
+    Only successful completions are stored; callers keep their own error
+    handling and retries for misses.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        ttl_seconds: Optional[float] = 30 * 24 * 3600,
+        max_entries: int = 50_000,
+        max_memory_entries: int = 2_000
+    ):
+        """
+        Initialize response cache
+
+        Args:
+            db_path: Path to the SQLite file (created if missing), or ":memory:"
+            ttl_seconds: Entry lifetime (None never expires)
+            max_entries: Maximum entries kept on disk (0 for unbounded)
+            max_memory_entries: Maximum entries kept in RAM (0 disables)
+        """
+        self.db_path = str(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_memory_entries = max_memory_entries
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, Tuple[str, str, int, int, float]]" = OrderedDict()
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0)
+        self._create_schema()
+        self._entry_count = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+        # Statistics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.tokens_saved = 0
+        self.cost_saved = 0.0
+
+    @staticmethod
+    def cache_key(
+        model: str,
+        messages: List[Dict],
+        temperature: float,
+        response_format: Optional[Dict] = None
+    ) -> str:
+        """
+        Get the content address of a chat completion request
+
+        Args:
+            model: Model name
+            messages: Chat messages
+            temperature: Sampling temperature
+            response_format: Response format (e.g. {"type": "json_object"})
+
+        Returns:
+            Hex sha256 digest of the canonical request
+        """
+        return LLMResponseCache._model_key(model, LLMResponseCache._request_digest(messages, temperature, response_format))
+
+    @staticmethod
+    def _request_digest(messages: List[Dict], temperature: float, response_format: Optional[Dict]) -> bytes:
+        """Digest of the model-independent part of a request (serialized once per lookup)"""
+        payload = json.dumps(
+            [messages, temperature, response_format],
+            sort_keys=True, ensure_ascii=False, separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode("utf-8")).digest()
+
+    @staticmethod
+    def _model_key(model: str, request_digest: bytes) -> str:
+        return hashlib.sha256(model.encode("utf-8") + b"\x00" + request_digest).hexdigest()
+
+    def get(
+        self,
+        model: str,
+        messages: List[Dict],
+        temperature: float,
+        response_format: Optional[Dict] = None
+    ) -> Optional[str]:
+        """
+        Get the cached completion for a request
+
+        Args:
+            model: Model name
+            messages: Chat messages
+            temperature: Sampling temperature
+            response_format: Response format
+
+        Returns:
+            Completion content, or None on a miss (or expired entry)
+        """
+        return self.get_any([model], messages, temperature, response_format)[1]
+
+    def get_any(
+        self,
+        models: Sequence[str],
+        messages: List[Dict],
+        temperature: float,
+        response_format: Optional[Dict] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get a cached completion from the first model that has one
+
+        Used with fallback chains: a completion cached for any model of the
+        chain answers the request (one hit or one miss is counted).
+
+        Args:
+            models: Candidate models, in preference order
+            messages: Chat messages
+            temperature: Sampling temperature
+            response_format: Response format
+
+        Returns:
+            (model, content), or (None, None) on a miss
+        """
+        request_digest = self._request_digest(messages, temperature, response_format)
+        now = time.time()
+        with self._lock:
+            for model in dict.fromkeys(models):
+                entry = self._lookup(self._model_key(model, request_digest), now)
+                if entry is not None:
+                    return model, self._record_hit(entry)
+            self.misses += 1
+            return None, None
+
+    def put(
+        self,
+        model: str,
+        messages: List[Dict],
+        temperature: float,
+        content: str,
+        response_format: Optional[Dict] = None,
+        usage: Optional[Any] = None
+    ):
+        """
+        Store a completion
+
+        Args:
+            model: Model name
+            messages: Chat messages
+            temperature: Sampling temperature
+            content: Completion content
+            response_format: Response format
+            usage: Token usage (OpenAI/Anthropic usage object or dict), used
+                to report tokens and cost saved by later hits
+        """
+        if not content:
+            return
+
+        key = self.cache_key(model, messages, temperature, response_format)
+        prompt_tokens, completion_tokens = self._usage_tokens(usage)
+        now = time.time()
+        entry = (content, model, prompt_tokens, completion_tokens, now)
+
+        with self._lock:
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        """
+                        INSERT OR REPLACE INTO responses
+                            (key, model, content, prompt_tokens, completion_tokens, created_at, last_used)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (key, model, content, prompt_tokens, completion_tokens, now, now)
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed: {e}")
+                return
+
+            self._remember(key, entry)
+            self.writes += 1
+            self._entry_count += 1
+            if self.max_entries and self._entry_count > self.max_entries:
+                self._evict()
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries
+
+        Returns:
+            Number of entries deleted
+        """
+        if self.ttl_seconds is None:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            with self.conn:
+                deleted = self.conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,)).rowcount
+            for key in [key for key, entry in self._memory.items() if entry[4] < cutoff]:
+                del self._memory[key]
+            self._entry_count = self.count()
+        return deleted
+
+    def count(self) -> int:
+        """Number of entries on disk"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get_statistics(self) -> Dict:
+        """
+        Get cache statistics
+
+        Returns:
+            Dict with hit/miss counts, tokens and cost saved
+        """
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        hit_rate = (hits / lookups * 100) if lookups > 0 else 0.0
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": f"{hit_rate:.1f}%",
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "tokens_saved": self.tokens_saved,
+            "cost_saved": self.cost_saved,
+            "memory_entries": len(self._memory)
+        }
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._memory.clear()
+            self.conn.close()
+
+    def _create_schema(self):
+        """Create the responses table if needed"""
+        if self.db_path != ":memory:":
+            # WAL lets readers in other processes proceed while one process writes
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                content TEXT NOT NULL,
+                prompt_tokens INTEGER DEFAULT 0,
+                completion_tokens INTEGER DEFAULT 0,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+        self.conn.commit()
+
+    def _lookup(self, key: str, now: float) -> Optional[Tuple[str, str, int, int, float]]:
+        """Find a live entry in memory, then on disk (caller holds the lock)"""
+        entry = self._memory.get(key)
+        if entry is not None and not self._expired(entry[4], now):
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return entry
+
+        try:
+            row = self.conn.execute(
+                "SELECT content, model, prompt_tokens, completion_tokens, created_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            row = None
+
+        if row is None or self._expired(row[4], now):
+            if row is not None:
+                self._delete(key)
+            self._memory.pop(key, None)
+            return None
+
+        try:
+            with self.conn:
+                self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache update failed: {e}")
+
+        entry = tuple(row)
+        self._remember(key, entry)
+        self.disk_hits += 1
+        return entry
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and created_at < now - self.ttl_seconds
+
+    def _record_hit(self, entry: Tuple[str, str, int, int, float]) -> str:
+        """Count tokens and cost a hit saved; returns the content"""
+        content, model, prompt_tokens, completion_tokens, _ = entry
+        self.tokens_saved += prompt_tokens + completion_tokens
+        self.cost_saved += estimate_cost(model, prompt_tokens, completion_tokens)
+        return content
+
+    def _remember(self, key: str, entry: Tuple[str, str, int, int, float]):
+        """Add an entry to the LRU memory tier"""
+        if self.max_memory_entries <= 0:
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _delete(self, key: str):
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache delete failed: {e}")
+
+    def _evict(self):
+        """Delete least recently used entries down to _EVICT_TARGET of max_entries"""
+        self._entry_count = self.count()  # INSERT OR REPLACE may not have added a row
+        excess = self._entry_count - int(self.max_entries * _EVICT_TARGET)
+        if self._entry_count <= self.max_entries or excess <= 0:
+            return
+
+        try:
+            with self.conn:
+                keys = [row[0] for row in self.conn.execute(
+                    "SELECT key FROM responses ORDER BY last_used LIMIT ?", (excess,)
+                )]
+                self.conn.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in keys])
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache eviction failed: {e}")
+            return
+
+        for key in keys:
+            self._memory.pop(key, None)
+        self.evictions += len(keys)
+        self._entry_count -= len(keys)
+
+    @staticmethod
+    def _usage_tokens(usage: Optional[Any]) -> Tuple[int, int]:
+        """(prompt, completion) tokens from an OpenAI/Anthropic usage object or dict"""
+        if usage is None:
+            return 0, 0
+        if isinstance(usage, dict):
+            get = usage.get
+        else:
+            get = lambda name, default=None: getattr(usage, name, default)
+        prompt_tokens = get("prompt_tokens") or get("input_tokens") or 0
+        completion_tokens = get("completion_tokens") or get("output_tokens") or 0
+        return int(prompt_tokens), int(completion_tokens)
+
+
+# Shared cache instance (None when disabled)
+_shared_cache: Optional[LLMResponseCache] = None
+_shared_cache_ready = False
+_shared_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide response cache configured in extraction_config.json
+
+    Returns:
+        LLMResponseCache, or None if llm_cache.enabled is false
+    """
+    global _shared_cache, _shared_cache_ready
+    if _shared_cache_ready:
+        return _shared_cache
+
+    with _shared_cache_lock:
+        if not _shared_cache_ready:
+            from intelligence_capture.config import LLM_CACHE_CONFIG, LLM_CACHE_PATH
+
+            if LLM_CACHE_CONFIG.get("enabled", False):
+                ttl_days = LLM_CACHE_CONFIG.get("ttl_days")
+                try:
+                    _shared_cache = LLMResponseCache(
+                        LLM_CACHE_CONFIG.get("path") or LLM_CACHE_PATH,
+                        ttl_seconds=ttl_days * 24 * 3600 if ttl_days else None,
+                        max_entries=LLM_CACHE_CONFIG.get("max_entries", 50_000),
+                        max_memory_entries=LLM_CACHE_CONFIG.get("max_memory_entries", 2_000)
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"LLM cache unavailable, continuing without it: {e}")
+                    _shared_cache = None
+            _shared_cache_ready = True
+    return _shared_cache
+
+
+def set_llm_cache(cache: Optional[LLMResponseCache]):
+    """
+    Replace the process-wide response cache (None disables caching)
+
+    Args:
+        cache: Cache instance to share, or None
+    """
+    global _shared_cache, _shared_cache_ready
+    with _shared_cache_lock:
+        _shared_cache = cache
+        _shared_cache_ready = True
@@ -6,6 +6,8 @@ import time
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+from .extractors import track_llm_usage
+
 
 @dataclass
 class ProcessingResult:
@@ -23,6 +25,7 @@ class ProcessingResult:
     error: Optional[str] = None
     processing_time: float = 0.0
     api_cost: float = 0.0
+    review_time: float = 0.0
 
 
 class MetaOrchestrator:
@@ -132,24 +135,28 @@ class MetaOrchestrator:
             iteration += 1
             print(f"\n  📥 Extraction iteration {iteration}/{self.max_iterations}")
 
-            try:
-                # Extract entities (focused on missing types if iteration > 1)
-                if iteration == 1 or not self.enable_focused_reextraction:
-                    # Full extraction
-                    entities = self.extractor.extract_all(meta, qa_pairs)
-                else:
-                    # Focused re-extraction for missing entity types
-                    print(f"     🎯 Focused re-extraction for: {', '.join(missing_entities)}")
-                    new_entities = self._reextract_missing(meta, qa_pairs, missing_entities)
-                    # Merge with existing entities
-                    for entity_type, entity_list in new_entities.items():
-                        entities[entity_type] = entities.get(entity_type, []) + entity_list
-
-            except Exception as e:
-                result.error = f"Extraction failed: {str(e)[:200]}"
-                self.db.update_extraction_status(interview_id, "failed", result.error)
-                result.processing_time = time.time() - start_time
-                return result
+            # Cost of every completion this iteration sends (all extraction paths)
+            with track_llm_usage() as usage:
+                try:
+                    # Extract entities (focused on missing types if iteration > 1)
+                    if iteration == 1 or not self.enable_focused_reextraction:
+                        # Full extraction
+                        entities = self.extractor.extract_all(meta, qa_pairs)
+                    else:
+                        # Focused re-extraction for missing entity types
+                        print(f"     🎯 Focused re-extraction for: {', '.join(missing_entities)}")
+                        new_entities = self._reextract_missing(meta, qa_pairs, missing_entities)
+                        # Merge with existing entities
+                        for entity_type, entity_list in new_entities.items():
+                            entities[entity_type] = entities.get(entity_type, []) + entity_list
+
+                except Exception as e:
+                    result.api_cost += usage.cost
+                    result.error = f"Extraction failed: {str(e)[:200]}"
+                    self.db.update_extraction_status(interview_id, "failed", result.error)
+                    result.processing_time = time.time() - start_time
+                    return result
+            result.api_cost += usage.cost
 
             # Stage 3: Validation (if agent enabled)
             if self.validation_agent:
@@ -192,8 +199,10 @@ class MetaOrchestrator:
         # Stage 4: Ensemble review (if enabled)
         if self.reviewer:
             print(f"  ✨ Running ensemble review...")
+            review_start = time.time()
             try:
                 review_results = self.reviewer.review_all_entities(entities, qa_pairs, meta)
+                result.api_cost += sum(review.total_cost_usd for review in review_results.values())
 
                 # Replace with synthesized results
                 for entity_type, review in review_results.items():
@@ -205,6 +214,7 @@ class MetaOrchestrator:
 
             except Exception as e:
                 print(f"     ⚠️  Ensemble review failed: {str(e)}")
+            result.review_time = time.time() - review_start
 
         # Stage 5: Store entities
         print(f"  💾 Storing entities...")
@@ -262,7 +272,9 @@ class MetaOrchestrator:
         print(f"     Entities: {result.entity_count}")
         print(f"     Quality: {result.quality_score:.2%}")
         print(f"     Iterations: {result.iterations}")
-        print(f"     Time: {result.processing_time:.1f}s")
+        review_note = f" (ensemble review {result.review_time:.1f}s)" if self.reviewer else ""
+        print(f"     Time: {result.processing_time:.1f}s{review_note}")
+        print(f"     Cost: ${result.api_cost:.4f}")
 
         return result
 
@@ -334,7 +346,7 @@ class MetaOrchestrator:
 
         for system in entities.get("systems", []):
             try:
-                self.db.insert_or_update_system(system, company)
+                self.db.insert_or_update_system(system, company, interview_id)
             except Exception as e:
                 storage_errors.append(f"system: {str(e)[:50]}")
 
@@ -161,6 +161,29 @@ class ConsolidationMetrics:
         """Track a new entity created"""
         self.entity_counts["created"] += 1
     
+    def merge(self, other: "ConsolidationMetrics"):
+        """
+        Add the counts and scores tracked by another metrics object
+        
+        Used to combine per-worker metrics after parallel consolidation;
+        merging in a fixed order gives the same result as sequential tracking.
+        
+        Args:
+            other: Metrics collected by a worker
+        """
+        for entity_type, count in other.duplicates_by_type.items():
+            self.duplicates_by_type[entity_type] = self.duplicates_by_type.get(entity_type, 0) + count
+        for entity_type, scores in other.similarity_scores_by_type.items():
+            self.similarity_scores_by_type.setdefault(entity_type, []).extend(scores)
+        for entity_type, count in other.contradictions_by_type.items():
+            self.contradictions_by_type[entity_type] = self.contradictions_by_type.get(entity_type, 0) + count
+        for entity_type, duration in other.processing_time_by_type.items():
+            self.track_processing_time(entity_type, duration)
+        for key, value in other.api_metrics.items():
+            self.api_metrics[key] += value
+        for key, value in other.entity_counts.items():
+            self.entity_counts[key] += value
+    
     def set_quality_metrics(
         self,
         entities_before: int,
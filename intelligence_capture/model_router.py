@@ -2,25 +2,113 @@
 from __future__ import annotations
 
 import threading
-from itertools import cycle
-from typing import Iterable, List, Optional
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
 
-from .config import FALLBACK_CHAIN, ROUND_ROBIN_CHAIN
+from .config import FALLBACK_CHAIN, MODEL_PROVIDER_MAP, ROUND_ROBIN_CHAIN
+from .rate_limiter import RateLimiter, get_rate_limiter
+
+# Latency samples and call outcomes kept per model
+STATS_WINDOW = 50
+# Consecutive failures that open the circuit (eject the model)
+FAILURE_THRESHOLD = 3
+# Cooldown of an ejected model; doubles per consecutive ejection up to the max
+BASE_COOLDOWN_SECONDS = 30.0
+MAX_COOLDOWN_SECONDS = 300.0
+# Models within this fraction of the best expected time share the load
+LATENCY_TOLERANCE = 0.2
+
+
+def get_model_rate_limiter(model: str) -> RateLimiter:
+    """
+    Get the shared rate limiter of a model
+
+    Limits come from model_routing.providers (requests_per_minute, default
+    50; tokens_per_minute, default unlimited).
+
+    Args:
+        model: Model name
+
+    Returns:
+        RateLimiter keyed "<provider>:<model>"
+    """
+    info = MODEL_PROVIDER_MAP.get(model, {})
+    return get_rate_limiter(
+        max_calls_per_minute=info.get("requests_per_minute", 50),
+        key=f"{info.get('provider', 'openai')}:{model}",
+        max_tokens_per_minute=info.get("tokens_per_minute")
+    )
+
+
+def rate_limit_wait(model: str) -> float:
+    """Seconds the next call to `model` would wait for its rate limiter"""
+    return get_model_rate_limiter(model).estimate_wait()
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (None for no values)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class _ModelStats:
+    """Recent latencies, outcomes and circuit state of one model"""
+
+    def __init__(self):
+        self.latencies = deque(maxlen=STATS_WINDOW)
+        self.outcomes = deque(maxlen=STATS_WINDOW)  # True = 429/5xx/error
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.consecutive_failures = 0
+        self.ejections = 0  # Consecutive ejections (reset by a success)
+        self.cooldown_until = 0.0
+
+    def error_rate(self) -> float:
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def p50(self) -> Optional[float]:
+        return _percentile(list(self.latencies), 50)
+
+    def p95(self) -> Optional[float]:
+        return _percentile(list(self.latencies), 95)
 
 
 class ModelRouter:
     """
-    Keeps a rotating pointer over configured models.
+    Picks models by expected completion time, with fallback chains.
 
-    Thread-safe: a shared lock protects the underlying cycle iterator so
-    multiple workers can call `next_model` concurrently.
+    Each model's expected time is its rate-limit wait plus its p50 latency,
+    scaled up by its recent error rate (errors cost a retry). The next
+    model is the best one in round-robin order, so models within
+    LATENCY_TOLERANCE of each other (e.g. before any calls) still rotate.
+    Models that fail FAILURE_THRESHOLD times in a row, or return a 429, are
+    ejected for a cooldown (circuit breaker); they are only picked when
+    every model is cooling down.
+
+    Thread-safe: one lock guards the rotation pointer and all stats, so
+    multiple workers can call `next_model` and `record_*` concurrently.
     """
 
     def __init__(
         self,
         round_robin_chain: Optional[Iterable[str]] = None,
         fallback_chain: Optional[Iterable[str]] = None,
+        wait_estimator: Optional[Callable[[str], float]] = None,
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
+        """
+        Args:
+            round_robin_chain: Models to spread calls over
+            fallback_chain: Models to try after the chosen one
+            wait_estimator: Seconds a call to a model would wait for its
+                rate limiter (default: no rate-limit awareness)
+            clock: Time source for cooldowns
+        """
         if round_robin_chain is None:
             self.round_robin_chain = list(ROUND_ROBIN_CHAIN or ["gpt-4o-mini"])
         else:
@@ -35,16 +123,36 @@ class ModelRouter:
             fallback_source = fallback_chain or self.round_robin_chain
 
         self.fallback_chain = list(fallback_source)
+        self.wait_estimator = wait_estimator
+        self._clock = clock
         self._lock = threading.Lock()
-        self._cycle = cycle(self.round_robin_chain)
+        self._position = 0
+        self._stats: Dict[str, _ModelStats] = {}
 
     def next_model(self) -> str:
-        """Return the next model in the round-robin chain."""
+        """Return the round-robin model with the best expected completion time."""
+        waits = self._rate_limit_waits(self.round_robin_chain)
         with self._lock:
-            return next(self._cycle)
+            now = self._clock()
+            count = len(self.round_robin_chain)
+            rotation = [self.round_robin_chain[(self._position + i) % count] for i in range(count)]
+            self._position = (self._position + 1) % count
+
+            candidates = [model for model in rotation if not self._cooling_down(model, now)]
+            if not candidates:
+                # Everything is ejected: the model that recovers first
+                return min(rotation, key=lambda model: self._stats[model].cooldown_until)
+
+            prior = self._latency_prior()
+            scores = {model: self._expected_seconds(model, waits.get(model, 0.0), prior) for model in candidates}
+            best = min(scores.values())
+            for model in candidates:
+                if scores[model] <= best * (1 + LATENCY_TOLERANCE):
+                    return model
+            return candidates[0]
 
     def build_sequence(self, initial: Optional[str] = None) -> List[str]:
-        """Build the ordered sequence of models to attempt."""
+        """Build the ordered sequence of models to attempt (cooling-down models last)."""
         sequence: List[str] = []
         seen = set()
 
@@ -60,7 +168,120 @@ class ModelRouter:
             seen.add(model_name)
             sequence.append(model_name)
 
-        return sequence
+        with self._lock:
+            now = self._clock()
+            return sorted(sequence, key=lambda model: self._cooling_down(model, now))
+
+    def is_available(self, model: str) -> bool:
+        """Whether the model is not ejected (cooling down)."""
+        with self._lock:
+            return not self._cooling_down(model, self._clock())
+
+    def record_success(self, model: str, latency: float) -> None:
+        """
+        Record a completed call (closes the model's circuit).
+
+        Args:
+            model: Model name
+            latency: Seconds the API call took (excluding rate-limit waits)
+        """
+        with self._lock:
+            stats = self._model_stats(model)
+            stats.calls += 1
+            stats.latencies.append(latency)
+            stats.outcomes.append(False)
+            stats.consecutive_failures = 0
+            stats.ejections = 0
+            stats.cooldown_until = 0.0
+
+    def record_failure(self, model: str, rate_limited: bool = False, retry_after: Optional[float] = None) -> None:
+        """
+        Record a failed call (429, 5xx or other API error).
+
+        A 429 ejects the model right away (for `retry_after` if known);
+        other errors eject it after FAILURE_THRESHOLD in a row.
+
+        Args:
+            model: Model name
+            rate_limited: The call failed with a 429
+            retry_after: Seconds the API asked to wait, if reported
+        """
+        with self._lock:
+            now = self._clock()
+            stats = self._model_stats(model)
+            stats.calls += 1
+            stats.errors += 1
+            stats.outcomes.append(True)
+            stats.consecutive_failures += 1
+            if rate_limited:
+                stats.rate_limited += 1
+
+            if rate_limited or stats.consecutive_failures >= FAILURE_THRESHOLD:
+                cooldown = min(MAX_COOLDOWN_SECONDS, BASE_COOLDOWN_SECONDS * 2 ** stats.ejections)
+                if rate_limited and retry_after is not None:
+                    cooldown = retry_after
+                stats.ejections += 1
+                stats.consecutive_failures = 0
+                stats.cooldown_until = max(stats.cooldown_until, now + cooldown)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Live per-model stats (for the monitor).
+
+        Returns:
+            Dict model -> calls, errors, rate_limited, error_rate,
+            p50_latency, p95_latency, rate_limit_wait, available and
+            cooldown_remaining
+        """
+        models = list(dict.fromkeys(self.round_robin_chain + self.fallback_chain))
+        waits = self._rate_limit_waits(models)
+        with self._lock:
+            now = self._clock()
+            result = {}
+            for model in models:
+                stats = self._stats.get(model) or _ModelStats()
+                result[model] = {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "rate_limited": stats.rate_limited,
+                    "error_rate": stats.error_rate(),
+                    "p50_latency": stats.p50(),
+                    "p95_latency": stats.p95(),
+                    "rate_limit_wait": waits.get(model),
+                    "available": not self._cooling_down(model, now),
+                    "cooldown_remaining": max(0.0, stats.cooldown_until - now)
+                }
+            return result
+
+    def _rate_limit_waits(self, models: List[str]) -> Dict[str, float]:
+        """Current rate-limit wait per model (queried outside the router lock)"""
+        if self.wait_estimator is None:
+            return {}
+        return {model: self.wait_estimator(model) for model in models}
+
+    def _model_stats(self, model: str) -> _ModelStats:
+        """Stats of a model, created on first use (caller holds the lock)"""
+        stats = self._stats.get(model)
+        if stats is None:
+            stats = self._stats[model] = _ModelStats()
+        return stats
+
+    def _cooling_down(self, model: str, now: float) -> bool:
+        """Whether the model is ejected (caller holds the lock)"""
+        stats = self._stats.get(model)
+        return stats is not None and stats.cooldown_until > now
+
+    def _latency_prior(self) -> float:
+        """Latency assumed for models without samples: the mean p50 of the others"""
+        medians = [stats.p50() for stats in self._stats.values() if stats.latencies]
+        return sum(medians) / len(medians) if medians else 0.0
+
+    def _expected_seconds(self, model: str, wait: float, prior: float) -> float:
+        """Expected seconds until a call to the model completes (caller holds the lock)"""
+        stats = self._stats.get(model)
+        latency = stats.p50() if stats is not None and stats.latencies else prior
+        error_rate = min(stats.error_rate(), 0.9) if stats is not None else 0.0
+        return (wait + latency) / (1 - error_rate)
 
 
-MODEL_ROUTER = ModelRouter()
+MODEL_ROUTER = ModelRouter(wait_estimator=rate_limit_wait)
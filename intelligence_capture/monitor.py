@@ -31,6 +31,18 @@ class ExtractionMetrics:
         # Cost metrics (if available)
         self.tokens_used = 0
         self.estimated_cost = 0.0
+        self.llm_calls = 0
+
+        # Savings from grouped extraction (estimated vs. one call per entity type)
+        self.calls_saved = 0
+        self.tokens_saved = 0
+        self.latency_saved = 0.0
+
+        # LLM response cache (hits cost nothing and skip the rate limiter)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_cost_saved = 0.0
+        self.coalesced_calls = 0  # Shared an identical completion already in flight
 
     def finish(self, success: bool = True, error: str = None):
         """Mark extraction as finished"""
@@ -49,10 +61,47 @@ class ExtractionMetrics:
         self.validation_warnings = warnings
         self.missing_entity_types = missing_types
 
-    def set_cost_metrics(self, tokens: int, cost: float):
-        """Set cost metrics"""
+    def set_cost_metrics(
+        self,
+        tokens: int,
+        cost: float,
+        llm_calls: int = 0,
+        calls_saved: int = 0,
+        tokens_saved: int = 0,
+        latency_saved: float = 0.0
+    ):
+        """
+        Set cost metrics
+
+        Args:
+            tokens: Tokens used
+            cost: Estimated cost in dollars
+            llm_calls: LLM calls made
+            calls_saved: LLM calls avoided by grouped extraction
+            tokens_saved: Prompt tokens avoided by grouped extraction
+            latency_saved: Seconds of LLM time avoided by grouped extraction
+        """
         self.tokens_used = tokens
         self.estimated_cost = cost
+        self.llm_calls = llm_calls
+        self.calls_saved = calls_saved
+        self.tokens_saved = tokens_saved
+        self.latency_saved = latency_saved
+
+    def set_cache_metrics(self, hits: int, misses: int, cost_saved: float, coalesced: int = 0):
+        """
+        Set LLM response cache metrics
+
+        Args:
+            hits: Completions served from the cache
+            misses: Completions that had to call the API
+            cost_saved: Estimated dollars not spent thanks to hits
+            coalesced: Completions shared with an identical call in flight
+        """
+        self.cache_hits = hits
+        self.cache_misses = misses
+        self.cache_cost_saved = cost_saved
+        self.coalesced_calls = coalesced
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -69,7 +118,15 @@ class ExtractionMetrics:
             "validation_warnings": self.validation_warnings,
             "missing_entity_types": self.missing_entity_types,
             "tokens_used": self.tokens_used,
-            "estimated_cost": self.estimated_cost
+            "estimated_cost": self.estimated_cost,
+            "llm_calls": self.llm_calls,
+            "calls_saved": self.calls_saved,
+            "tokens_saved": self.tokens_saved,
+            "latency_saved": self.latency_saved,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_cost_saved": self.cache_cost_saved,
+            "coalesced_calls": self.coalesced_calls
         }
 
 
@@ -79,14 +136,16 @@ class ExtractionMonitor:
     Tracks metrics for all interviews and provides summaries
     """
 
-    def __init__(self, total_interviews: int = 0):
+    def __init__(self, total_interviews: int = 0, model_router=None):
         """
         Initialize monitor
 
         Args:
             total_interviews: Total number of interviews to process (for progress tracking)
+            model_router: ModelRouter whose live per-model stats are reported (optional)
         """
         self.total_interviews = total_interviews
+        self.model_router = model_router
         self.metrics = []  # List of ExtractionMetrics
         self.start_time = time.time()
         self.current_metric = None
@@ -201,7 +260,17 @@ class ExtractionMonitor:
                 "entity_counts": {},
                 "avg_cost": 0,
                 "total_cost": 0,
-                "quality_issues": 0
+                "total_tokens": 0,
+                "calls_saved": 0,
+                "tokens_saved": 0,
+                "latency_saved": 0,
+                "cache_hits": 0,
+                "cache_misses": 0,
+                "cache_hit_rate": 0,
+                "cache_cost_saved": 0,
+                "coalesced_calls": 0,
+                "quality_issues": 0,
+                "model_stats": self._model_stats()
             }
 
         successful_metrics = [m for m in self.metrics if m.success]
@@ -228,6 +297,20 @@ class ExtractionMonitor:
         # Cost metrics
         total_cost = sum(m.estimated_cost for m in successful_metrics)
         avg_cost = total_cost / success_count if success_count > 0 else 0
+        total_tokens = sum(m.tokens_used for m in successful_metrics)
+
+        # Grouped extraction savings
+        calls_saved = sum(m.calls_saved for m in successful_metrics)
+        tokens_saved = sum(m.tokens_saved for m in successful_metrics)
+        latency_saved = sum(m.latency_saved for m in successful_metrics)
+
+        # LLM response cache (all interviews: failed ones also make calls)
+        cache_hits = sum(m.cache_hits for m in self.metrics)
+        cache_misses = sum(m.cache_misses for m in self.metrics)
+        cache_lookups = cache_hits + cache_misses
+        cache_hit_rate = (cache_hits / cache_lookups * 100) if cache_lookups > 0 else 0
+        cache_cost_saved = sum(m.cache_cost_saved for m in self.metrics)
+        coalesced_calls = sum(m.coalesced_calls for m in self.metrics)
 
         # Quality metrics
         quality_issues = sum(m.validation_errors for m in successful_metrics)
@@ -256,9 +339,35 @@ class ExtractionMonitor:
             "entity_counts": entity_totals,
             "avg_cost": avg_cost,
             "total_cost": total_cost,
-            "quality_issues": quality_issues
+            "total_tokens": total_tokens,
+            "calls_saved": calls_saved,
+            "tokens_saved": tokens_saved,
+            "latency_saved": latency_saved,
+            "cache_hits": cache_hits,
+            "cache_misses": cache_misses,
+            "cache_hit_rate": cache_hit_rate,
+            "cache_cost_saved": cache_cost_saved,
+            "coalesced_calls": coalesced_calls,
+            "quality_issues": quality_issues,
+            "model_stats": self._model_stats()
         }
 
+    def _model_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Live router stats of the models that have been called"""
+        if self.model_router is None:
+            return {}
+        return {model: stats for model, stats in self.model_router.get_stats().items() if stats["calls"] > 0}
+
+    def _print_model_stats(self, model_stats: Dict[str, Dict[str, Any]]):
+        """Print one line of router stats per model"""
+        print(f"\n🔀 Models:")
+        for model, stats in model_stats.items():
+            p50 = f"{stats['p50_latency']:.1f}s" if stats['p50_latency'] is not None else "-"
+            p95 = f"{stats['p95_latency']:.1f}s" if stats['p95_latency'] is not None else "-"
+            status = "ok" if stats['available'] else f"cooling down {stats['cooldown_remaining']:.0f}s"
+            print(f"  {model:20s}: {stats['calls']} calls, p50 {p50}, p95 {p95}, "
+                  f"{stats['error_rate']*100:.0f}% errors ({stats['rate_limited']} rate limited), {status}")
+
     def print_summary(self, detailed: bool = False):
         """
         Print real-time summary of extraction progress
@@ -308,6 +417,9 @@ class ExtractionMonitor:
             print(f"\n⚠️  Quality:")
             print(f"  Validation errors: {summary['quality_issues']}")
 
+        if summary['model_stats']:
+            self._print_model_stats(summary['model_stats'])
+
         print(f"\n{'='*70}")
 
     def print_final_report(self):
@@ -343,10 +455,28 @@ class ExtractionMonitor:
             print(f"  Total estimated cost: ${summary['total_cost']:.4f}")
             print(f"  Avg cost per interview: ${summary['avg_cost']:.4f}")
 
+        if summary['calls_saved'] > 0:
+            print(f"\n📉 Grouped Extraction Savings (estimated):")
+            print(f"  LLM calls avoided: {summary['calls_saved']}")
+            print(f"  Prompt tokens avoided: {summary['tokens_saved']:,}")
+            print(f"  LLM time avoided: {summary['latency_saved']:.1f}s")
+
+        if summary['cache_hits'] + summary['cache_misses'] > 0:
+            print(f"\n🗄️  LLM Response Cache:")
+            print(f"  Hits: {summary['cache_hits']} / Misses: {summary['cache_misses']} ({summary['cache_hit_rate']:.1f}% hit rate)")
+            print(f"  Estimated cost saved: ${summary['cache_cost_saved']:.4f}")
+
+        if summary['coalesced_calls'] > 0:
+            print(f"\n🔀 Coalesced LLM Calls:")
+            print(f"  Shared with an identical call in flight: {summary['coalesced_calls']}")
+
         if summary['quality_issues'] > 0:
             print(f"\n⚠️  Quality Issues:")
             print(f"  Total validation errors: {summary['quality_issues']}")
 
+        if summary['model_stats']:
+            self._print_model_stats(summary['model_stats'])
+
         # Show failed interviews if any
         failed_metrics = [m for m in self.metrics if not m.success]
         if failed_metrics:
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Entity Name Normalization for Duplicate Detection
+
+Shared by DuplicateDetector (comparison) and IntelligenceDB (the
+normalized_name and name_profile columns computed at insert time), so stored
+and computed values always agree.
+
+Patterns are compiled once per entity type at import:
+- Word rules (systems, processes): one alternation pattern; removing whole
+  words never creates new word boundaries, so this equals removing each word
+  one after another
+- Prefix rules (pain_points): one anchored chain of optional prefixes in rule
+  order, which equals stripping each prefix one after another
+"""
+import re
+import sys
+from array import array
+from collections import Counter
+from typing import Dict, Optional, Pattern
+
+# Common words removed from entity names, per entity type
+COMMON_WORDS: Dict[str, list] = {
+    "systems": [
+        "sistema", "software", "herramienta", "aplicación",
+        "system", "tool", "application", "app", "plataforma", "platform"
+    ],
+    "processes": ["proceso", "process", "procedimiento", "procedure"]
+}
+
+# Common prefixes stripped from the start of entity names, per entity type
+COMMON_PREFIXES: Dict[str, list] = {
+    "pain_points": [
+        "problema de", "problema con", "dificultad con", "issue with",
+        "problem with", "challenge with", "pain point:"
+    ]
+}
+
+
+def _compile_patterns() -> Dict[str, Pattern]:
+    """Compile one removal pattern per entity type"""
+    patterns = {}
+    for entity_type, words in COMMON_WORDS.items():
+        alternation = "|".join(re.escape(word) for word in words)
+        patterns[entity_type] = re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+    for entity_type, prefixes in COMMON_PREFIXES.items():
+        chain = "".join(rf"(?:{re.escape(prefix)}\s*)?" for prefix in prefixes)
+        patterns[entity_type] = re.compile(rf"^{chain}", re.IGNORECASE)
+    return patterns
+
+
+_REMOVAL_PATTERNS = _compile_patterns()
+_WHITESPACE = re.compile(r"\s+")
+
+# Character buckets of a name profile (little-endian uint16 count per bucket)
+PROFILE_BUCKETS = 32
+PROFILE_SIZE = 2 * PROFILE_BUCKETS
+
+
+def normalize_entity_name(name: Optional[str], entity_type: str) -> str:
+    """
+    Normalize entity name with entity-specific rules
+
+    Args:
+        name: Entity name to normalize
+        entity_type: Type of entity
+
+    Returns:
+        Normalized name (lowercase, common words removed)
+    """
+    if not name:
+        return ""
+
+    # Convert to lowercase
+    normalized = name.lower().strip()
+
+    # Entity-specific normalization rules
+    pattern = _REMOVAL_PATTERNS.get(entity_type)
+    if pattern is not None:
+        normalized = pattern.sub("", normalized)
+
+    # Remove extra whitespace
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def get_entity_text(entity: Dict, entity_type: str) -> str:
+    """
+    Extract text from entity for comparison
+
+    Combines name AND description (truncated to 200 chars so it does not
+    overwhelm the name) and handles missing fields gracefully.
+
+    Args:
+        entity: Entity dict
+        entity_type: Type of entity
+
+    Returns:
+        Text to use for similarity comparison (name + truncated description)
+    """
+    # Extract name (try multiple field names)
+    name = ""
+    if "name" in entity and entity["name"]:
+        name = str(entity["name"]).strip()
+    elif "title" in entity and entity["title"]:
+        name = str(entity["title"]).strip()
+    elif entity_type == "pain_points" and "type" in entity and entity["type"]:
+        name = str(entity["type"]).strip()
+
+    # Extract description
+    description = ""
+    if "description" in entity and entity["description"]:
+        description = str(entity["description"]).strip()
+
+    # Combine name and description for better semantic matching
+    if name and description:
+        return f"{name} {description[:200]}"
+    elif name:
+        return name
+    elif description:
+        # If no name, use description (up to 200 chars)
+        return description[:200]
+    else:
+        # No text available
+        return ""
+
+
+def normalize_entity(entity: Dict, entity_type: str) -> str:
+    """
+    Get the normalized comparison text of an entity
+
+    This is the value stored in the normalized_name column.
+
+    Args:
+        entity: Entity dict (or row with name/title/type/description)
+        entity_type: Type of entity
+
+    Returns:
+        Normalized entity text ("" if the entity has no text)
+    """
+    return normalize_entity_name(get_entity_text(entity, entity_type), entity_type)
+
+
+def name_profile(normalized: str) -> bytes:
+    """
+    Get the character-count profile of a normalized name
+
+    Counts the characters of the name per bucket (code point modulo
+    PROFILE_BUCKETS). Two names share at most sum(min(count1, count2))
+    characters in any alignment, which bounds their fuzzy ratio without
+    scoring them (see CandidateIndex); bucketing only loosens the bound.
+
+    This is the value stored in the name_profile column.
+
+    Args:
+        normalized: Normalized name (from normalize_entity_name)
+
+    Returns:
+        PROFILE_SIZE bytes
+    """
+    counts = [0] * PROFILE_BUCKETS
+    for char, count in Counter(normalized).items():
+        counts[ord(char) % PROFILE_BUCKETS] += count
+    profile = array("H", [min(count, 0xFFFF) for count in counts])
+    if sys.byteorder != "little":
+        profile.byteswap()
+    return profile.tobytes()
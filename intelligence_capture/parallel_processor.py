@@ -3,15 +3,20 @@ Parallel Interview Processor
 Processes multiple interviews concurrently for faster extraction
 """
 import json
+import os
 import time
+import tempfile
 import multiprocessing as mp
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, List, Any, Optional
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 import queue
 
 from .processor import IntelligenceProcessor
+from .interview_source import InterviewSource, read_interview
 from .config import DB_PATH, INTERVIEWS_FILE
+from .rate_limiter import SHARED_RATE_LIMIT_ENV, shared_rate_limits
 
 
 class ParallelProcessor:
@@ -26,7 +31,9 @@ class ParallelProcessor:
         self,
         db_path: Path = DB_PATH,
         max_workers: int = 4,
-        enable_monitoring: bool = True
+        enable_monitoring: bool = True,
+        rate_limit_path: Optional[Path] = None,
+        incremental: Optional[bool] = None
     ):
         """
         Initialize parallel processor
@@ -35,10 +42,16 @@ class ParallelProcessor:
             db_path: Path to SQLite database
             max_workers: Maximum number of parallel workers (default: 4)
             enable_monitoring: Enable real-time monitoring (default: True)
+            rate_limit_path: SQLite file for the rate limits shared by all
+                workers (default: a temporary file per run)
+            incremental: Only extract changed interviews and entity types
+                (reads extraction.incremental from config if None)
         """
         self.db_path = db_path
         self.max_workers = max_workers
         self.enable_monitoring = enable_monitoring
+        self.rate_limit_path = rate_limit_path
+        self.incremental = incremental
 
         # Validate max_workers
         if max_workers < 1:
@@ -57,8 +70,9 @@ class ParallelProcessor:
         Process all interviews using parallel workers
 
         Args:
-            interviews_file: Path to interviews JSON file
-            resume: If True, skip already completed interviews
+            interviews_file: Path to interviews JSON/JSONL file (streamed)
+            resume: If True, skip already completed interviews (incremental
+                mode always skips unchanged ones)
 
         Returns:
             Dictionary with processing statistics
@@ -70,36 +84,29 @@ class ParallelProcessor:
         print(f"Database: {self.db_path}")
         print(f"{'='*70}\n")
 
-        # Load interviews
+        # Stream the file once in the main process, keeping only locations of
+        # interviews to extract (workers re-check the plan before extracting)
         print(f"📂 Loading interviews from: {interviews_file}")
-        with open(interviews_file, 'r', encoding='utf-8') as f:
-            all_interviews = json.load(f)
-        print(f"✓ Found {len(all_interviews)} interviews")
-
-        # Filter for resume mode
-        interviews_to_process = all_interviews
-        if resume:
-            # Check which are already complete
-            processor = IntelligenceProcessor(db_path=self.db_path)
-            processor.initialize()
-            completed_interviews = processor.db.get_interviews_by_status("complete")
-            completed_ids = {(i["respondent"], i["company"], i["date"]) for i in completed_interviews}
+        source = InterviewSource(interviews_file)
+        processor = IntelligenceProcessor(db_path=self.db_path, incremental=self.incremental)
+        processor.initialize()
+        try:
+            interviews_to_process = processor.select_interviews(source, resume)
+            incremental = processor.incremental
+        finally:
             processor.close()
+        print(f"✓ Found {source.scanned} interviews")
 
-            # Filter
-            interviews_to_process = []
-            for interview in all_interviews:
-                meta = interview.get("meta", {})
-                key = (meta.get("respondent"), meta.get("company"), meta.get("date"))
-                if key not in completed_ids:
-                    interviews_to_process.append(interview)
-
-            print(f"📋 Resume mode: {len(interviews_to_process)} pending, {len(completed_interviews)} already complete")
+        skipped = source.scanned - len(interviews_to_process)
+        if incremental:
+            print(f"📋 Incremental mode: {len(interviews_to_process)} to extract, {skipped} unchanged")
+        elif resume:
+            print(f"📋 Resume mode: {len(interviews_to_process)} pending, {skipped} already complete")
 
         if not interviews_to_process:
             print("✓ All interviews already processed")
             return {
-                "total": len(all_interviews),
+                "total": source.scanned,
                 "processed": 0,
                 "success": 0,
                 "errors": 0,
@@ -111,56 +118,81 @@ class ParallelProcessor:
         start_time = time.time()
 
         results = []
-        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all interviews for processing
-            future_to_interview = {
-                executor.submit(
-                    _process_single_interview,
-                    interview,
-                    self.db_path
-                ): interview
-                for interview in interviews_to_process
-            }
+        completed_count = 0
+        success_count = 0
+        error_count = 0
+        # Workers get (offset, length) and read their own record; a bounded
+        # number of tasks is in flight at once
+        max_in_flight = self.max_workers * 2
+        pending_refs = iter(interviews_to_process)
+
+        # Workers share one rate limit budget per model (an already active
+        # shared budget, e.g. from an outer run, is kept)
+        if os.environ.get(SHARED_RATE_LIMIT_ENV):
+            shared_limits = nullcontext()
+        else:
+            shared_limits = shared_rate_limits(
+                self.rate_limit_path or Path(tempfile.gettempdir()) / f"rate_limits_{os.getpid()}.db"
+            )
+
+        with shared_limits, ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_interview = {}
+
+            def submit_next() -> bool:
+                interview_ref = next(pending_refs, None)
+                if interview_ref is None:
+                    return False
+                future = executor.submit(
+                    _process_interview_at,
+                    str(source.path),
+                    interview_ref.offset,
+                    interview_ref.length,
+                    self.db_path,
+                    incremental
+                )
+                future_to_interview[future] = interview_ref
+                return True
+
+            while len(future_to_interview) < max_in_flight and submit_next():
+                pass
 
             # Collect results as they complete
-            completed_count = 0
-            success_count = 0
-            error_count = 0
-
-            for future in as_completed(future_to_interview):
-                interview = future_to_interview[future]
-                meta = interview.get("meta", {})
-                company = meta.get("company", "Unknown")
-                respondent = meta.get("respondent", "Unknown")
-
-                try:
-                    result = future.result()
-                    results.append(result)
-                    completed_count += 1
-
-                    if result["success"]:
-                        success_count += 1
-                        status = "✓"
-                    else:
+            while future_to_interview:
+                done, _ = wait(future_to_interview, return_when=FIRST_COMPLETED)
+                for future in done:
+                    interview_ref = future_to_interview.pop(future)
+                    submit_next()
+                    company = interview_ref.company
+                    respondent = interview_ref.respondent
+
+                    try:
+                        result = future.result()
+                        results.append(result)
+                        completed_count += 1
+
+                        if result["success"]:
+                            success_count += 1
+                            status = "✓"
+                        else:
+                            error_count += 1
+                            status = "✗"
+
+                        # Progress update
+                        print(f"  [{completed_count}/{len(interviews_to_process)}] {status} {company} / {respondent}")
+
+                        # Periodic summary (every 5 interviews)
+                        if self.enable_monitoring and completed_count % 5 == 0:
+                            elapsed = time.time() - start_time
+                            avg_time = elapsed / completed_count
+                            remaining = len(interviews_to_process) - completed_count
+                            eta = avg_time * remaining
+                            print(f"      ⏱️  Progress: {completed_count}/{len(interviews_to_process)} | "
+                                  f"Success: {success_count} | Errors: {error_count} | "
+                                  f"ETA: {eta:.0f}s")
+
+                    except Exception as e:
                         error_count += 1
-                        status = "✗"
-
-                    # Progress update
-                    print(f"  [{completed_count}/{len(interviews_to_process)}] {status} {company} / {respondent}")
-
-                    # Periodic summary (every 5 interviews)
-                    if self.enable_monitoring and completed_count % 5 == 0:
-                        elapsed = time.time() - start_time
-                        avg_time = elapsed / completed_count
-                        remaining = len(interviews_to_process) - completed_count
-                        eta = avg_time * remaining
-                        print(f"      ⏱️  Progress: {completed_count}/{len(interviews_to_process)} | "
-                              f"Success: {success_count} | Errors: {error_count} | "
-                              f"ETA: {eta:.0f}s")
-
-                except Exception as e:
-                    error_count += 1
-                    print(f"  [{completed_count + 1}/{len(interviews_to_process)}] ✗ {company} / {respondent}: {str(e)[:50]}")
+                        print(f"  [{completed_count + 1}/{len(interviews_to_process)}] ✗ {company} / {respondent}: {str(e)[:50]}")
 
         elapsed_time = time.time() - start_time
 
@@ -187,7 +219,7 @@ class ParallelProcessor:
         }
 
 
-def _process_single_interview(interview: Dict, db_path: Path) -> Dict[str, Any]:
+def _process_single_interview(interview: Dict, db_path: Path, incremental: Optional[bool] = None) -> Dict[str, Any]:
     """
     Worker function to process a single interview
 
@@ -197,6 +229,7 @@ def _process_single_interview(interview: Dict, db_path: Path) -> Dict[str, Any]:
     Args:
         interview: Interview dictionary
         db_path: Path to database
+        incremental: Incremental mode of the run (None reads the config)
 
     Returns:
         Dictionary with result information
@@ -210,7 +243,7 @@ def _process_single_interview(interview: Dict, db_path: Path) -> Dict[str, Any]:
 
     try:
         # Create processor for this worker
-        processor = IntelligenceProcessor(db_path=db_path)
+        processor = IntelligenceProcessor(db_path=db_path, incremental=incremental)
         processor.initialize()
 
         # Process interview
@@ -240,6 +273,32 @@ def _process_single_interview(interview: Dict, db_path: Path) -> Dict[str, Any]:
         }
 
 
+def _process_interview_at(
+    interviews_file: str,
+    offset: int,
+    length: int,
+    db_path: Path,
+    incremental: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Worker function: read one interview by byte offset, then process it
+
+    Only the record location crosses the process boundary, not the
+    interview itself.
+
+    Args:
+        interviews_file: Path to interviews JSON/JSONL file
+        offset: Byte offset of the interview record
+        length: Byte length of the interview record
+        db_path: Path to database
+        incremental: Incremental mode of the run (None reads the config)
+
+    Returns:
+        Dictionary with result information
+    """
+    return _process_single_interview(read_interview(interviews_file, offset, length), db_path, incremental)
+
+
 def compare_sequential_vs_parallel(
     interviews_file: Path = INTERVIEWS_FILE,
     batch_size: int = 10,
@@ -260,9 +319,12 @@ def compare_sequential_vs_parallel(
     print(f"Parallel workers: {max_workers}")
     print(f"{'='*70}\n")
 
-    # Load interviews
-    with open(interviews_file, 'r', encoding='utf-8') as f:
-        interviews = json.load(f)[:batch_size]
+    # Load the first batch_size interviews
+    interviews = []
+    for _, interview in InterviewSource(interviews_file).iter_interviews():
+        if len(interviews) == batch_size:
+            break
+        interviews.append(interview)
 
     # Test sequential
     print("🐌 Running sequential processing...")
@@ -324,6 +386,11 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Parallel interview processor")
     parser.add_argument("--workers", type=int, default=4, help="Number of parallel workers")
     parser.add_argument("--resume", action="store_true", help="Resume from previous run")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only extract interviews and entity types that changed since the last run"
+    )
     parser.add_argument("--compare", action="store_true", help="Compare sequential vs parallel")
     parser.add_argument("--batch-size", type=int, default=10, help="Batch size for comparison")
     args = parser.parse_args()
@@ -331,5 +398,5 @@ if __name__ == "__main__":
     if args.compare:
         compare_sequential_vs_parallel(batch_size=args.batch_size, max_workers=args.workers)
     else:
-        processor = ParallelProcessor(max_workers=args.workers)
+        processor = ParallelProcessor(max_workers=args.workers, incremental=True if args.incremental else None)
         processor.process_all_interviews_parallel(resume=args.resume)
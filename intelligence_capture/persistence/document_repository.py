@@ -1,10 +1,18 @@
 """
 Repositorio asincrónico para persistir documentos, chunks y embeddings en Postgres.
+
+Los lotes grandes de chunks y embeddings se cargan con COPY binario
+(copy_records_to_table) a una tabla temporal y se aplican con un único
+upsert; los vectores viajan como float32 empaquetados con el codec binario
+de pgvector.
 """
 from __future__ import annotations
 
 import json
-from typing import List, Optional, Sequence
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 from uuid import UUID, uuid4
 
 import asyncpg
@@ -17,17 +25,126 @@ from intelligence_capture.persistence.models import (
 )
 
 
+# Filas a partir de las cuales chunks y embeddings se cargan con COPY
+BULK_COPY_THRESHOLD = 256
+
+CHUNK_COLUMNS = (
+    "id",
+    "document_id",
+    "chunk_index",
+    "content",
+    "token_count",
+    "page_number",
+    "section_title",
+    "language",
+    "span_offsets",
+    "spanish_features",
+)
+
+EMBEDDING_COLUMNS = (
+    "id",
+    "chunk_id",
+    "document_id",
+    "provider",
+    "model",
+    "dimensions",
+    "embedding",
+    "cost_cents",
+    "metadata",
+)
+
+_CHUNK_CONFLICT_SQL = """
+        ON CONFLICT (id)
+        DO UPDATE SET
+            chunk_index = EXCLUDED.chunk_index,
+            content = EXCLUDED.content,
+            token_count = EXCLUDED.token_count,
+            page_number = EXCLUDED.page_number,
+            section_title = EXCLUDED.section_title,
+            language = EXCLUDED.language,
+            span_offsets = EXCLUDED.span_offsets,
+            spanish_features = EXCLUDED.spanish_features
+"""
+
+_EMBEDDING_CONFLICT_SQL = """
+        ON CONFLICT (chunk_id)
+        DO UPDATE SET
+            provider = EXCLUDED.provider,
+            model = EXCLUDED.model,
+            dimensions = EXCLUDED.dimensions,
+            embedding = EXCLUDED.embedding,
+            cost_cents = EXCLUDED.cost_cents,
+            metadata = EXCLUDED.metadata
+"""
+
+# Cabecera del formato binario de pgvector: dimensiones y campo sin uso (int16)
+_VECTOR_HEADER = struct.Struct(">HH")
+
+
 class DocumentRepositoryError(RuntimeError):
     """Excepción base para errores del repositorio."""
 
 
+def encode_vector(values: Sequence[float]) -> bytes:
+    """
+    Serializa un vector al formato binario de pgvector (float32 big-endian).
+    """
+    packed = array("f", values)
+    if sys.byteorder == "little":
+        packed.byteswap()
+    return _VECTOR_HEADER.pack(len(packed), 0) + packed.tobytes()
+
+
+def decode_vector(data: bytes) -> List[float]:
+    """
+    Deserializa un vector desde el formato binario de pgvector.
+    """
+    dimensions, _ = _VECTOR_HEADER.unpack_from(data)
+    values = array("f")
+    values.frombytes(data[_VECTOR_HEADER.size:_VECTOR_HEADER.size + 4 * dimensions])
+    if sys.byteorder == "little":
+        values.byteswap()
+    return values.tolist()
+
+
+async def register_vector_codec(conn: asyncpg.Connection) -> None:
+    """
+    Registra el codec binario de pgvector en una conexión (usable como
+    ``init`` de ``asyncpg.create_pool``).
+    """
+    await conn.set_type_codec(
+        "vector",
+        schema="public",
+        encoder=encode_vector,
+        decoder=decode_vector,
+        format="binary",
+    )
+
+
 class DocumentRepository:
     """
     Administra inserciones atomicas para documentos y chunks en Postgres.
     """
 
-    def __init__(self, pool: asyncpg.Pool):
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        *,
+        vector_codec: bool = False,
+        bulk_copy_threshold: int = BULK_COPY_THRESHOLD,
+    ):
+        """
+        Args:
+            pool: Pool de conexiones de asyncpg.
+            vector_codec: True si las conexiones del pool tienen el codec
+                binario de pgvector (ver ``register_vector_codec``); sin él
+                los vectores se envían como literales de texto.
+            bulk_copy_threshold: Filas a partir de las cuales chunks y
+                embeddings se cargan con COPY en vez de ``executemany``.
+        """
         self._pool = pool
+        self._vector_codec = vector_codec
+        self._bulk_copy_threshold = bulk_copy_threshold
 
     @classmethod
     async def create(
@@ -37,9 +154,11 @@ class DocumentRepository:
         min_size: int = 1,
         max_size: int = 10,
         timeout: int = 60,
+        bulk_copy_threshold: int = BULK_COPY_THRESHOLD,
     ) -> "DocumentRepository":
         """
-        Crea un repositorio con su propio pool de conexiones.
+        Crea un repositorio con su propio pool de conexiones (con el codec
+        binario de pgvector registrado en cada conexión).
         """
         try:
             pool = await asyncpg.create_pool(
@@ -48,8 +167,9 @@ class DocumentRepository:
                 max_size=max_size,
                 timeout=timeout,
                 command_timeout=timeout,
+                init=register_vector_codec,
             )
-            return cls(pool)
+            return cls(pool, vector_codec=True, bulk_copy_threshold=bulk_copy_threshold)
         except Exception as exc:  # pragma: no cover - depende del entorno
             raise DocumentRepositoryError(
                 f"No se pudo crear el pool de Postgres: {exc}"
@@ -68,6 +188,10 @@ class DocumentRepository:
     ) -> DocumentPersistenceResult:
         """
         Inserta documento, chunks y embeddings dentro de una única transacción.
+
+        Los lotes de ``bulk_copy_threshold`` filas o más se cargan con COPY
+        a tablas temporales de la misma transacción, así que un error en
+        cualquier paso revierte todo igual que con ``executemany``.
         """
         document_id = payload.resolve_document_id()
         chunk_ids = [chunk.chunk_id for chunk in payload.chunks]
@@ -214,17 +338,7 @@ class DocumentRepository:
             ) VALUES (
                 $1, $2, $3, $4, $5, $6, $7, $8, $9::jsonb, $10::jsonb
             )
-            ON CONFLICT (id)
-            DO UPDATE SET
-                chunk_index = EXCLUDED.chunk_index,
-                content = EXCLUDED.content,
-                token_count = EXCLUDED.token_count,
-                page_number = EXCLUDED.page_number,
-                section_title = EXCLUDED.section_title,
-                language = EXCLUDED.language,
-                span_offsets = EXCLUDED.span_offsets,
-                spanish_features = EXCLUDED.spanish_features
-        """
+        """ + _CHUNK_CONFLICT_SQL
         params = [
             (
                 str(chunk.chunk_id),
@@ -241,6 +355,16 @@ class DocumentRepository:
             for chunk in chunks
         ]
 
+        if len(params) >= self._bulk_copy_threshold:
+            await self._copy_upsert(
+                conn,
+                "document_chunks",
+                CHUNK_COLUMNS,
+                self._last_by_key(params, key_index=0),
+                _CHUNK_CONFLICT_SQL,
+            )
+            return
+
         await conn.executemany(chunk_sql, params)
 
     async def _insert_embeddings(
@@ -262,15 +386,7 @@ class DocumentRepository:
             ) VALUES (
                 $1, $2, $3, $4, $5, $6, $7::vector, $8, $9::jsonb
             )
-            ON CONFLICT (chunk_id)
-            DO UPDATE SET
-                provider = EXCLUDED.provider,
-                model = EXCLUDED.model,
-                dimensions = EXCLUDED.dimensions,
-                embedding = EXCLUDED.embedding,
-                cost_cents = EXCLUDED.cost_cents,
-                metadata = EXCLUDED.metadata
-        """
+        """ + _EMBEDDING_CONFLICT_SQL
 
         params = [
             (
@@ -280,7 +396,7 @@ class DocumentRepository:
                 embedding.provider,
                 embedding.model,
                 embedding.resolved_dimensions(),
-                self._vector_literal(embedding.vector),
+                self._vector_param(embedding.vector),
                 float(embedding.cost_cents),
                 json.dumps(embedding.metadata or {}, ensure_ascii=False),
             )
@@ -290,9 +406,72 @@ class DocumentRepository:
         if not params:
             return 0
 
+        # COPY binario necesita el codec de pgvector para la columna embedding
+        if self._vector_codec and len(params) >= self._bulk_copy_threshold:
+            await self._copy_upsert(
+                conn,
+                "embeddings",
+                EMBEDDING_COLUMNS,
+                self._last_by_key(params, key_index=1),
+                _EMBEDDING_CONFLICT_SQL,
+            )
+            return len(params)
+
         await conn.executemany(embedding_sql, params)
         return len(params)
 
+    async def _copy_upsert(
+        self,
+        conn: asyncpg.Connection,
+        table: str,
+        columns: Sequence[str],
+        records: Iterable[Tuple[Any, ...]],
+        conflict_sql: str,
+    ) -> None:
+        """
+        Carga filas con COPY binario a una tabla temporal y las aplica a
+        ``table`` con un único INSERT ... SELECT ... ON CONFLICT.
+
+        Debe ejecutarse dentro de una transacción: la tabla temporal se
+        descarta al terminar (o al revertir) la transacción.
+        """
+        staging = f"_staging_{table}"
+        column_list = ", ".join(columns)
+        await conn.execute(
+            f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        await conn.copy_records_to_table(staging, records=records, columns=list(columns))
+        await conn.execute(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging}"
+            + conflict_sql
+        )
+        await conn.execute(f"DROP TABLE {staging}")
+
+    @staticmethod
+    def _last_by_key(
+        records: Sequence[Tuple[Any, ...]],
+        *,
+        key_index: int,
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Conserva la última fila por clave de conflicto: un mismo upsert no
+        puede tocar dos veces la misma fila (``executemany`` aplicaba la
+        última).
+        """
+        latest: Dict[Any, Tuple[Any, ...]] = {}
+        for record in records:
+            latest[record[key_index]] = record
+        return list(latest.values())
+
+    def _vector_param(self, values: Sequence[float]) -> Any:
+        """
+        Vector como parámetro: la secuencia misma con el codec binario, o el
+        literal de texto de pgvector sin él.
+        """
+        if self._vector_codec:
+            return values
+        return self._vector_literal(values)
+
     @staticmethod
     def _vector_literal(values: Sequence[float]) -> str:
         """
@@ -3,15 +3,18 @@ Main processor for Intelligence Capture System
 Reads interviews, extracts entities, stores in database
 Enhanced with ensemble validation for forensic-grade quality
 """
-import json
 import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from .database import IntelligenceDB, EnhancedIntelligenceDB
 from .extractor import IntelligenceExtractor
 from .validation import validate_extraction_results, print_validation_summary
 from .validation_agent import ValidationAgent
 from .monitor import ExtractionMonitor
+from .model_router import MODEL_ROUTER
+from .interview_source import InterviewRef, InterviewSource, interview_content_hash
+from .llm_cache import get_llm_cache
+from .single_flight import get_single_flight
 from .config import DB_PATH, INTERVIEWS_FILE, EXTRACTION_CONFIG, load_extraction_config
 
 # Import ensemble reviewer if available
@@ -36,7 +39,8 @@ class IntelligenceProcessor:
         ensemble_mode: str = None,
         enable_validation_agent: bool = None,
         enable_llm_validation: bool = None,
-        config: dict = None
+        config: dict = None,
+        incremental: bool = None
     ):
         """
         Initialize processor with optional configuration
@@ -48,6 +52,9 @@ class IntelligenceProcessor:
             enable_validation_agent: Enable ValidationAgent for completeness checking (reads from config if None)
             enable_llm_validation: Enable LLM-based validation in ValidationAgent (reads from config if None)
             config: Configuration dictionary (loads from file if None)
+            incremental: Only extract interviews whose transcript changed and
+                entity types whose extractor changed (reads from config if
+                None; off unless enabled)
         """
         # Load configuration
         if config is None:
@@ -58,6 +65,10 @@ class IntelligenceProcessor:
         self.db = EnhancedIntelligenceDB(db_path)
         self.extractor = IntelligenceExtractor()
 
+        if incremental is None:
+            incremental = config.get("extraction", {}).get("incremental", False)
+        self.incremental = incremental
+
         # Read ensemble settings from config if not specified
         if enable_ensemble is None:
             enable_ensemble = (
@@ -77,7 +88,9 @@ class IntelligenceProcessor:
             self.reviewer = EnsembleReviewer(
                 openai_api_key=os.getenv("OPENAI_API_KEY"),
                 anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
-                enable_ensemble=full_ensemble
+                enable_ensemble=full_ensemble,
+                max_concurrent_calls=config.get("ensemble", {}).get("max_concurrent_calls", 8),
+                early_exit_agreement=config.get("ensemble", {}).get("early_exit_agreement", 0.8)
             )
             mode_str = "FULL (multi-model)" if full_ensemble else "BASIC (single-model + review)"
             print(f"✨ Ensemble validation enabled: {mode_str}")
@@ -133,6 +146,75 @@ class IntelligenceProcessor:
         self.db.connect()
         self.db.init_v2_schema()
         print("✓ Database ready")
+
+    def plan_extraction(self, meta: Dict, qa_pairs: Dict) -> List[str]:
+        """
+        Entity types of an interview that need (re-)extraction
+
+        Incremental mode compares the stored transcript hash and extractor
+        version of each type with the current ones; a complete interview
+        with nothing changed needs no LLM calls. Outside incremental mode
+        every type is extracted.
+
+        Args:
+            meta: Interview metadata
+            qa_pairs: Interview Q&A pairs
+
+        Returns:
+            Entity types to extract (empty if the interview is up to date)
+        """
+        return self._plan_extraction(meta, qa_pairs)[1]
+
+    def _plan_extraction(self, meta: Dict, qa_pairs: Dict) -> Tuple[Optional[Dict], List[str]]:
+        """plan_extraction() plus the stored extraction state it was based on"""
+        versions = self.extractor.extractor_versions()
+        if not self.incremental:
+            return None, list(versions)
+
+        state = self.db.get_extraction_state(meta)
+        if state is None or state["extraction_status"] != "complete":
+            return state, list(versions)
+
+        content_hash = interview_content_hash(qa_pairs)
+        if not state["versions"]:
+            if state["content_hash"] != content_hash:
+                return state, list(versions)
+            # Extracted before versions were tracked: adopt the current ones
+            self.db.record_extractions(state["id"], content_hash, versions)
+            state["versions"] = {entity_type: (version, content_hash) for entity_type, version in versions.items()}
+            return state, []
+
+        return state, [
+            entity_type for entity_type, version in versions.items()
+            if state["versions"].get(entity_type) != (version, content_hash)
+        ]
+
+    def select_interviews(self, source: InterviewSource, resume: bool = False) -> List[InterviewRef]:
+        """
+        Stream the source once, keeping the interviews that need extraction
+
+        Incremental mode reads each interview and keeps those with a
+        non-empty plan_extraction(). Otherwise resume skips interviews whose
+        (respondent, company, date) is complete, and no resume keeps all.
+
+        Args:
+            source: Interview source to scan
+            resume: Skip completed interviews (non-incremental mode)
+
+        Returns:
+            References of the interviews to process, in file order
+        """
+        if self.incremental:
+            return [
+                ref for ref, interview in source.iter_interviews()
+                if self.plan_extraction(interview.get("meta", {}), interview.get("qa_pairs", {}))
+            ]
+
+        completed_ids = None
+        if resume:
+            completed_interviews = self.db.get_interviews_by_status("complete")
+            completed_ids = {(i["respondent"], i["company"], i["date"]) for i in completed_interviews}
+        return list(source.iter_refs(skip_keys=completed_ids))
         
     def process_interview(self, interview: Dict) -> bool:
         """
@@ -151,6 +233,12 @@ class IntelligenceProcessor:
         # Start timing if monitor is active
         start_time = time.time()
 
+        # Only entity types whose transcript or extractor changed
+        state, entity_types = self._plan_extraction(meta, qa_pairs)
+        if not entity_types:
+            print(f"  ⊘ Interview unchanged since last extraction, skipping")
+            return False
+
         # Insert interview record
         interview_id = self.db.insert_interview(meta, qa_pairs)
 
@@ -158,16 +246,26 @@ class IntelligenceProcessor:
             print(f"  ⚠️  Interview already processed, skipping")
             return False
 
+        content_hash = interview_content_hash(qa_pairs)
+        if state is not None:
+            if state["content_hash"] != content_hash:
+                self.db.update_interview_content(interview_id, meta, qa_pairs)
+            # Re-extraction replaces the stale entities instead of duplicating them
+            self.db.delete_interview_entities(interview_id, entity_types)
+
         # Start monitoring if enabled
         if self.monitor:
             current_metric = self.monitor.start_interview(interview_id, company, respondent)
+            cache = get_llm_cache()
+            cache_start = cache.get_statistics() if cache is not None else None
+            coalesced_start = get_single_flight("llm_completions").coalesced
 
         # Update status to in_progress
         self.db.update_extraction_status(interview_id, "in_progress")
 
         # Extract entities using AI
         try:
-            entities = self.extractor.extract_all(meta, qa_pairs)
+            entities, extraction_stats = self.extractor.extract_all_with_stats(meta, qa_pairs, entity_types)
         except Exception as e:
             error_msg = str(e)[:200]  # Truncate error message
             print(f"  ❌ Extraction failed: {error_msg}")
@@ -290,7 +388,7 @@ class IntelligenceProcessor:
 
             for system in entities.get("systems", []):
                 try:
-                    self.db.insert_or_update_system(system, company)
+                    self.db.insert_or_update_system(system, company, interview_id)
                 except Exception as e:
                     storage_errors.append(f"system: {str(e)[:50]}")
 
@@ -388,7 +486,7 @@ class IntelligenceProcessor:
 
             for system in entities.get("systems_v2", []):
                 try:
-                    self.db.insert_or_update_enhanced_system(system, company)
+                    self.db.insert_or_update_enhanced_system(system, company, interview_id)
                 except Exception as e:
                     storage_errors.append(f"enhanced_system: {str(e)[:50]}")
 
@@ -415,6 +513,12 @@ class IntelligenceProcessor:
 
         # Update status to complete
         self.db.update_extraction_status(interview_id, "complete")
+        versions = self.extractor.extractor_versions()
+        self.db.record_extractions(
+            interview_id,
+            content_hash,
+            {entity_type: versions[entity_type] for entity_type in entity_types}
+        )
 
         # Record monitoring metrics if enabled
         if self.monitor:
@@ -436,6 +540,29 @@ class IntelligenceProcessor:
             current_metric.set_entity_counts(entity_counts)
             current_metric.set_quality_metrics(validation_errors, validation_warnings, missing_types)
 
+            # Grouped extraction reports its token usage and savings
+            if extraction_stats:
+                current_metric.set_cost_metrics(
+                    extraction_stats.tokens,
+                    extraction_stats.cost,
+                    llm_calls=extraction_stats.llm_calls,
+                    calls_saved=extraction_stats.calls_saved,
+                    tokens_saved=extraction_stats.tokens_saved,
+                    latency_saved=extraction_stats.latency_saved
+                )
+
+            coalesced = get_single_flight("llm_completions").coalesced - coalesced_start
+            if cache_start is not None:
+                cache_end = cache.get_statistics()
+                current_metric.set_cache_metrics(
+                    cache_end["hits"] - cache_start["hits"],
+                    cache_end["misses"] - cache_start["misses"],
+                    cache_end["cost_saved"] - cache_start["cost_saved"],
+                    coalesced
+                )
+            else:
+                current_metric.coalesced_calls = coalesced
+
             self.monitor.finish_interview(current_metric, success=True)
 
         return True
@@ -467,22 +594,31 @@ class IntelligenceProcessor:
     
     def process_all_interviews(self, interviews_file: Path = INTERVIEWS_FILE, resume: bool = False):
         """
-        Process all interviews from JSON file
+        Process all interviews from a JSON array or JSONL file
+
+        Interviews are streamed: only record locations are kept, and each
+        interview is read when it is processed.
 
         Args:
-            interviews_file: Path to interviews JSON file
-            resume: If True, only process pending/failed interviews (skips completed)
+            interviews_file: Path to interviews JSON/JSONL file
+            resume: If True, only process pending/failed interviews (skips
+                completed; incremental mode always skips unchanged ones)
         """
 
         print(f"\n📂 Loading interviews from: {interviews_file}")
 
-        with open(interviews_file, 'r', encoding='utf-8') as f:
-            interviews = json.load(f)
+        # Stream the file once, keeping only locations of interviews to extract
+        source = InterviewSource(interviews_file)
+        interview_refs = self.select_interviews(source, resume)
 
-        print(f"✓ Found {len(interviews)} interviews")
+        print(f"✓ Found {source.scanned} interviews")
+        if self.incremental:
+            print(f"📋 Incremental mode: {len(interview_refs)} to extract, {source.scanned - len(interview_refs)} unchanged")
+        elif resume:
+            print(f"📋 Resume mode: {len(interview_refs)} pending/failed, {source.scanned - len(interview_refs)} already complete")
         
         # Estimate cost and get confirmation
-        estimated_cost = self._estimate_extraction_cost(len(interviews))
+        estimated_cost = self._estimate_extraction_cost(len(interview_refs))
         print(f"\n💰 Estimated cost: ${estimated_cost:.2f}")
         print(f"   (Based on ~17 API calls per interview at $0.001-0.002 per call)")
         
@@ -498,27 +634,11 @@ class IntelligenceProcessor:
         
         print(f"✓ Starting extraction...")
 
-        # If resuming, check which interviews are already complete
-        if resume:
-            completed_interviews = self.db.get_interviews_by_status("complete")
-            completed_ids = {(i["respondent"], i["company"], i["date"]) for i in completed_interviews}
-
-            # Filter out completed interviews
-            interviews_to_process = []
-            for interview in interviews:
-                meta = interview.get("meta", {})
-                key = (meta.get("respondent"), meta.get("company"), meta.get("date"))
-                if key not in completed_ids:
-                    interviews_to_process.append(interview)
-
-            print(f"📋 Resume mode: {len(interviews_to_process)} pending/failed, {len(completed_interviews)} already complete")
-            interviews = interviews_to_process
-
         # Initialize monitor for real-time tracking
         enable_monitor = self.config.get("monitoring", {}).get("enable_monitor", True)
         if enable_monitor:
-            self.monitor = ExtractionMonitor(total_interviews=len(interviews))
-            print(f"📊 Monitoring enabled for {len(interviews)} interviews")
+            self.monitor = ExtractionMonitor(total_interviews=len(interview_refs), model_router=MODEL_ROUTER)
+            print(f"📊 Monitoring enabled for {len(interview_refs)} interviews")
         else:
             self.monitor = None
 
@@ -529,10 +649,11 @@ class IntelligenceProcessor:
         skip_count = 0
         error_count = 0
 
-        for i, interview in enumerate(interviews, 1):
-            print(f"\n[{i}/{len(interviews)}] Processing...")
+        for i, interview_ref in enumerate(interview_refs, 1):
+            print(f"\n[{i}/{len(interview_refs)}] Processing...")
 
-            result = self.process_interview(interview)
+            # Read one record at a time
+            result = self.process_interview(source.read(interview_ref))
 
             if result is True:
                 success_count += 1
@@ -542,7 +663,7 @@ class IntelligenceProcessor:
                 error_count += 1
 
             # Print periodic summary based on config
-            if self.monitor and (i % summary_frequency == 0 or i == len(interviews)):
+            if self.monitor and (i % summary_frequency == 0 or i == len(interview_refs)):
                 self.monitor.print_summary(detailed=False)
         
         # Print final report
@@ -14,7 +14,9 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 import openai
 from intelligence_capture.database import EnhancedIntelligenceDB
-from intelligence_capture.config import OPENAI_API_KEY, MODEL
+from intelligence_capture.config import OPENAI_API_KEY, MODEL, EMBEDDING_STORE_PATH
+from intelligence_capture.embedding_store import EmbeddingStore, get_embedding_store
+from intelligence_capture.embedding_batcher import get_embedding_batcher
 
 
 @dataclass
@@ -673,13 +675,30 @@ class EmbeddingGenerator:
     """
     Generates vector embeddings for entity contexts using OpenAI's embedding model
     
-    Uses text-embedding-3-small for cost-effective, high-quality embeddings
+    Uses text-embedding-3-small for cost-effective, high-quality embeddings.
+    Texts already embedded by any run (consolidation, precompute script) are
+    served from the shared content-addressed embedding store. Single-text
+    requests from concurrent callers are micro-batched into one request.
     """
     
-    def __init__(self, api_key: str, model: str = "text-embedding-3-small"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "text-embedding-3-small",
+        embedding_store: Optional[EmbeddingStore] = None,
+        use_embedding_store: bool = True,
+        use_batcher: bool = True
+    ):
         self.api_key = api_key
         self.model = model
         self.client = openai.OpenAI(api_key=api_key)
+        # Keyed by API key and model: every generator of the account shares one batcher
+        self.batcher = get_embedding_batcher(self.client, model) if use_batcher else None
+        
+        # Shared embedding store (default: data/embedding_store.db)
+        if embedding_store is None and use_embedding_store:
+            embedding_store = get_embedding_store(EMBEDDING_STORE_PATH)
+        self.embedding_store = embedding_store
         
         # Embedding dimensions for text-embedding-3-small
         self.embedding_dimensions = 1536
@@ -694,12 +713,23 @@ class EmbeddingGenerator:
         Returns:
             List of floats representing the embedding vector
         """
+        if self.embedding_store is not None:
+            embedding = self.embedding_store.get(text, self.model)
+            if embedding is not None:
+                return embedding
+        
         try:
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=text
-            )
-            return response.data[0].embedding
+            if self.batcher is not None:
+                embedding = self.batcher.embed(text)
+            else:
+                response = self.client.embeddings.create(
+                    model=self.model,
+                    input=text
+                )
+                embedding = response.data[0].embedding
+            if self.embedding_store is not None:
+                self.embedding_store.put(text, embedding, self.model)
+            return embedding
         except Exception as e:
             print(f"Error generating embedding: {e}")
             raise
@@ -715,10 +745,16 @@ class EmbeddingGenerator:
         Returns:
             List of embedding vectors
         """
-        embeddings = []
+        # Only texts not already in the embedding store go to the API
+        if self.embedding_store is not None:
+            embeddings = self.embedding_store.get_many(texts, self.model)
+        else:
+            embeddings = [None] * len(texts)
+        missing = [position for position, embedding in enumerate(embeddings) if embedding is None]
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
+        for i in range(0, len(missing), batch_size):
+            positions = missing[i:i + batch_size]
+            batch = [texts[position] for position in positions]
             
             try:
                 response = self.client.embeddings.create(
@@ -728,7 +764,11 @@ class EmbeddingGenerator:
                 
                 # Extract embeddings in order
                 batch_embeddings = [item.embedding for item in response.data]
-                embeddings.extend(batch_embeddings)
+                for position, embedding in zip(positions, batch_embeddings):
+                    embeddings[position] = embedding
+                
+                if self.embedding_store is not None:
+                    self.embedding_store.put_many(batch, batch_embeddings, self.model)
                 
                 print(f"  Generated embeddings for batch {i//batch_size + 1} ({len(batch)} texts)")
                 
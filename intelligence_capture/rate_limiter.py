@@ -1,11 +1,117 @@
 """
 Shared rate limiter for parallel processing
 Ensures all workers respect OpenAI rate limits
+
+Token-bucket limiter for requests/minute and (optionally) tokens/minute:
+- Each call reserves its slot under the lock and sleeps outside it, so
+  waiting callers never block each other or other keys
+- Reservations are first come, first served (the bucket can go negative)
+- wait_if_needed() for threads, acquire() for asyncio
+- x-ratelimit-* headers of every response (successes and 429s) sync the
+  buckets with what the API reports, never above the configured limits
+- SharedRateLimiter keeps the buckets in a SQLite file so several processes
+  (ParallelProcessor workers) share one budget; get_rate_limiter() returns
+  it while shared_rate_limits() is active
 """
-import time
+import asyncio
+import os
+import re
+import sqlite3
 import threading
+import time
 from collections import deque
-from datetime import datetime, timedelta
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Union
+
+# Completion tokens reserved per request until actual usage is known
+DEFAULT_COMPLETION_TOKENS = 1000
+
+# Set (by shared_rate_limits) to the SQLite file of the cross-process buckets;
+# inherited by worker processes
+SHARED_RATE_LIMIT_ENV = "RATE_LIMIT_STATE_PATH"
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def estimate_request_tokens(messages: List[Dict], completion_tokens: int = DEFAULT_COMPLETION_TOKENS) -> int:
+    """
+    Estimate the tokens a chat request counts against tokens/minute
+
+    Args:
+        messages: Chat messages
+        completion_tokens: Completion tokens to reserve
+
+    Returns:
+        Prompt tokens (~4 characters per token) plus completion_tokens
+    """
+    characters = sum(len(message.get("content") or "") for message in messages)
+    return characters // 4 + completion_tokens
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an x-ratelimit-reset-* header ("20ms", "1s", "6m0s", "1h2m3.5s")
+
+    Returns:
+        Seconds, or None if the value cannot be parsed
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        return None
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+
+class _Bucket:
+    """One token bucket: capacity per minute, refilled continuously"""
+
+    def __init__(self, per_minute: float):
+        self.limit = float(per_minute)  # Configured ceiling
+        self.capacity = self.limit
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+
+    def refill(self, elapsed: float):
+        self.level = min(self.capacity, self.level + elapsed * self.rate)
+
+    def wait_for(self, amount: float) -> float:
+        """Take `amount` (may go negative) and return the seconds until it is covered"""
+        self.level -= amount
+        return -self.level / self.rate if self.level < 0 else 0.0
+
+    def apply_headers(self, limit: Optional[float], remaining: Optional[float], reset: Optional[float]):
+        """
+        Sync the bucket with the limit/remaining/reset the API reported
+
+        Capacity follows the API's limit up and down, capped at the configured
+        limit. The level is only ever lowered: the server has seen every call,
+        including other clients', but a key with a larger quota than ours must
+        not hand back budget the configured limit has already spent. When the
+        server's limit is above ours, remaining is scaled to our capacity.
+        """
+        if limit:
+            capacity = min(float(limit), self.limit)
+            if capacity != self.capacity:
+                self.capacity = capacity
+                self.rate = self.capacity / 60.0
+                self.level = min(self.level, self.capacity)
+        if remaining is not None:
+            remaining = float(remaining)
+            if limit and float(limit) > self.capacity:
+                remaining = remaining * self.capacity / float(limit)
+            self.level = min(self.level, remaining)
+            if remaining < 1 and reset:
+                # Nothing left until the reset: the next unit is available then
+                self.level = min(self.level, 1 - self.rate * reset)
 
 
 class RateLimiter:
@@ -13,71 +119,395 @@ class RateLimiter:
     Thread-safe rate limiter for API calls
     Tracks calls across all workers and enforces limits
     """
-    
-    def __init__(self, max_calls_per_minute=50):
+
+    # Bucket timestamps (monotonic within one process)
+    _clock = staticmethod(time.monotonic)
+
+    def __init__(self, max_calls_per_minute=50, max_tokens_per_minute=None):
         """
         Initialize rate limiter
-        
+
         Args:
             max_calls_per_minute: Maximum API calls per minute (default: 50)
                                  Set below OpenAI limit (60) for safety margin
+            max_tokens_per_minute: Maximum tokens per minute (None: requests only)
         """
         self.max_calls = max_calls_per_minute
-        self.calls = deque()  # Track timestamps of recent calls
-        self.lock = threading.Lock()  # Thread-safe access
-        
-    def wait_if_needed(self):
+        self.max_tokens = max_tokens_per_minute
+        self.calls = deque()  # Start times of calls in the last minute
+        self.lock = threading.Lock()  # Guards bucket state only, never held while sleeping
+
+        self._requests = _Bucket(max_calls_per_minute)
+        self._tokens = _Bucket(max_tokens_per_minute) if max_tokens_per_minute else None
+        self._updated = self._clock()
+
+        # Statistics
+        self.total_calls = 0
+        self.total_tokens = 0
+        self.total_wait = 0.0
+
+    def wait_if_needed(self, tokens: int = 0) -> float:
         """
         Wait if rate limit would be exceeded
         Call this BEFORE making an API call
+
+        Args:
+            tokens: Estimated tokens of the call (see estimate_request_tokens)
+
+        Returns:
+            Seconds waited
         """
-        with self.lock:
-            now = datetime.now()
-            one_minute_ago = now - timedelta(minutes=1)
-            
-            # Remove calls older than 1 minute
-            while self.calls and self.calls[0] < one_minute_ago:
-                self.calls.popleft()
-            
-            # Check if we're at the limit
-            if len(self.calls) >= self.max_calls:
-                # Calculate how long to wait
-                oldest_call = self.calls[0]
-                wait_until = oldest_call + timedelta(minutes=1)
-                wait_seconds = (wait_until - now).total_seconds()
-                
-                if wait_seconds > 0:
-                    print(f"  ⏳ Rate limit: waiting {wait_seconds:.1f}s...")
-                    time.sleep(wait_seconds + 0.1)  # Add small buffer
-                    
-                    # Clean up old calls after waiting
-                    now = datetime.now()
-                    one_minute_ago = now - timedelta(minutes=1)
-                    while self.calls and self.calls[0] < one_minute_ago:
-                        self.calls.popleft()
-            
-            # Record this call
-            self.calls.append(now)
-    
+        wait_seconds = self._reserve(tokens)
+        if wait_seconds > 0:
+            if wait_seconds >= 1:
+                print(f"  ⏳ Rate limit: waiting {wait_seconds:.1f}s...")
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        Async version of wait_if_needed (sleeps without blocking the event loop)
+
+        Args:
+            tokens: Estimated tokens of the call
+
+        Returns:
+            Seconds waited
+        """
+        wait_seconds = self._reserve(tokens)
+        if wait_seconds > 0:
+            await asyncio.sleep(wait_seconds)
+        return wait_seconds
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """
+        Correct a reservation once the response reports its token usage
+
+        Args:
+            estimated_tokens: Tokens passed to wait_if_needed/acquire
+            actual_tokens: Tokens the response reported
+        """
+        if self._tokens is None:
+            return
+        with self._state():
+            self._refill(self._clock())
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level + estimated_tokens - actual_tokens)
+            self.total_tokens += actual_tokens - estimated_tokens
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]):
+        """
+        Adapt the buckets to x-ratelimit-* response headers
+
+        Uses x-ratelimit-{limit,remaining,reset}-{requests,tokens}, sent on
+        successful responses as well as on 429s. Remaining counts only ever
+        lower the local levels; limits never exceed the configured ones.
+
+        Args:
+            headers: Response headers (raw response or RateLimitError.response)
+        """
+        if not headers or not isinstance(headers, Mapping):
+            return
+
+        def header(name: str) -> Optional[str]:
+            value = headers.get(name)
+            return value if value is not None else headers.get(name.title())
+
+        def number(name: str) -> Optional[float]:
+            try:
+                value = header(name)
+                return float(value) if value is not None else None
+            except ValueError:
+                return None
+
+        with self._state():
+            self._refill(self._clock())
+            self._requests.apply_headers(
+                number("x-ratelimit-limit-requests"),
+                number("x-ratelimit-remaining-requests"),
+                parse_reset_duration(header("x-ratelimit-reset-requests"))
+            )
+            if self._tokens is not None:
+                self._tokens.apply_headers(
+                    number("x-ratelimit-limit-tokens"),
+                    number("x-ratelimit-remaining-tokens"),
+                    parse_reset_duration(header("x-ratelimit-reset-tokens"))
+                )
+            self.max_calls = self._requests.capacity
+            if self._tokens is not None:
+                self.max_tokens = self._tokens.capacity
+
+    def estimate_wait(self, tokens: int = 0) -> float:
+        """
+        Seconds a call would wait right now, without reserving anything
+
+        Args:
+            tokens: Estimated tokens of the call
+
+        Returns:
+            Seconds until the request slot (and tokens) would be available
+        """
+        with self._snapshot():
+            self._refill(self._clock())
+            wait_seconds = max(0.0, (1 - self._requests.level) / self._requests.rate)
+            if self._tokens is not None and tokens:
+                needed = min(tokens, self._tokens.capacity)
+                wait_seconds = max(wait_seconds, (needed - self._tokens.level) / self._tokens.rate)
+            return wait_seconds
+
     def get_current_rate(self):
         """Get current calls per minute"""
+        with self._snapshot():
+            self._prune(self._clock())
+            return len(self.calls)
+
+    def get_statistics(self) -> Dict:
+        """
+        Get limiter statistics
+
+        Returns:
+            Dict with limits, totals and available capacity
+        """
+        with self._snapshot():
+            self._refill(self._clock())
+            return {
+                "max_calls_per_minute": self.max_calls,
+                "max_tokens_per_minute": self.max_tokens,
+                "total_calls": self.total_calls,
+                "total_tokens": self.total_tokens,
+                "total_wait_seconds": self.total_wait,
+                "available_requests": self._requests.level,
+                "available_tokens": self._tokens.level if self._tokens is not None else None
+            }
+
+    @contextmanager
+    def _state(self) -> Iterator[None]:
+        """Exclusive access to the bucket state"""
+        with self.lock:
+            yield
+
+    @contextmanager
+    def _snapshot(self) -> Iterator[None]:
+        """Read access to the bucket state (changes are not kept)"""
+        with self._state():
+            yield
+
+    def _reserve(self, tokens: int) -> float:
+        """Take a request slot (and tokens); returns the seconds to sleep before calling"""
+        with self._state():
+            now = self._clock()
+            self._refill(now)
+            wait_seconds = self._requests.wait_for(1)
+            if self._tokens is not None and tokens:
+                # A single call larger than the bucket waits for a full bucket
+                wait_seconds = max(wait_seconds, self._tokens.wait_for(min(tokens, self._tokens.capacity)))
+
+            self._prune(now)
+            self.calls.append(now + wait_seconds)
+            self.total_calls += 1
+            self.total_tokens += tokens
+            self.total_wait += wait_seconds
+            return wait_seconds
+
+    def _refill(self, now: float):
+        """Refill both buckets for the time since the last update (caller holds the lock)"""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._requests.refill(elapsed)
+            if self._tokens is not None:
+                self._tokens.refill(elapsed)
+            self._updated = now
+
+    def _prune(self, now: float):
+        """Drop call times older than one minute (caller holds the lock)"""
+        while self.calls and self.calls[0] < now - 60:
+            self.calls.popleft()
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    Rate limiter whose buckets live in a SQLite file shared by processes
+
+    Every reservation is a short BEGIN IMMEDIATE transaction (load the
+    bucket row, take the slot, store it), so all processes using the same
+    file and key draw from one budget. Sleeping still happens outside any
+    lock. Bucket timestamps use wall-clock time, which processes share.
+    Response headers are applied inside the same transaction and can only
+    lower the shared level, so no worker's response resets the budget.
+    `calls`/get_current_rate() only cover this process.
+    """
+
+    _clock = staticmethod(time.time)
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        key: str,
+        max_calls_per_minute=50,
+        max_tokens_per_minute=None
+    ):
+        """
+        Initialize shared rate limiter
+
+        Args:
+            db_path: SQLite file holding the buckets (created if missing)
+            key: Bucket key (e.g. "openai:gpt-4o-mini")
+            max_calls_per_minute: Maximum API calls per minute, all processes
+            max_tokens_per_minute: Maximum tokens per minute, all processes
+        """
+        super().__init__(max_calls_per_minute, max_tokens_per_minute)
+        self.db_path = str(db_path)
+        self.key = key
+        self._conn = None
+        self._pid = None
+
+        with self._state():
+            pass  # Creates the bucket row (first process wins)
+
+    def close(self):
+        """Close this process's connection to the state file"""
         with self.lock:
-            now = datetime.now()
-            one_minute_ago = now - timedelta(minutes=1)
-            
-            # Count calls in last minute
-            recent_calls = sum(1 for call_time in self.calls if call_time > one_minute_ago)
-            return recent_calls
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection of the current process (not shared across fork)"""
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.db_path, timeout=60.0, isolation_level=None, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    key TEXT PRIMARY KEY,
+                    request_capacity REAL NOT NULL,
+                    request_level REAL NOT NULL,
+                    token_capacity REAL,
+                    token_level REAL,
+                    updated REAL NOT NULL
+                )
+            """)
+            self._pid = os.getpid()
+        return self._conn
+
+    @contextmanager
+    def _state(self) -> Iterator[None]:
+        """Load the bucket row under a write lock and store it afterwards"""
+        with self.lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._fetch_row(conn)
+                if row is not None:
+                    self._load(row)
+                yield
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_limit_buckets VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        self.key,
+                        self._requests.capacity,
+                        self._requests.level,
+                        self._tokens.capacity if self._tokens is not None else None,
+                        self._tokens.level if self._tokens is not None else None,
+                        self._updated
+                    )
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    @contextmanager
+    def _snapshot(self) -> Iterator[None]:
+        """
+        Load the bucket row with a plain SELECT (no write lock, nothing stored)
+
+        Used for headroom reads (estimate_wait, statistics) that model routing
+        does for every model on every call; the refill is computed in memory
+        and the next _state() reloads the row anyway.
+        """
+        with self.lock:
+            row = self._fetch_row(self._connection())
+            if row is not None:
+                self._load(row)
+            yield
+
+    def _fetch_row(self, conn: sqlite3.Connection):
+        """Stored bucket row for this key (None before the first write)"""
+        return conn.execute(
+            "SELECT request_capacity, request_level, token_capacity, token_level, updated "
+            "FROM rate_limit_buckets WHERE key = ?",
+            (self.key,)
+        ).fetchone()
+
+    def _load(self, row):
+        """Apply a stored bucket row"""
+        request_capacity, request_level, token_capacity, token_level, updated = row
+        self._requests.capacity = request_capacity
+        self._requests.rate = request_capacity / 60.0
+        self._requests.level = request_level
+        self.max_calls = request_capacity
+        if self._tokens is not None and token_capacity is not None:
+            self._tokens.capacity = token_capacity
+            self._tokens.rate = token_capacity / 60.0
+            self._tokens.level = token_level
+            self.max_tokens = token_capacity
+        self._updated = updated
 
 
 # Global rate limiter instances (keyed by model/provider)
 _rate_limiters = {}
+_shared_rate_limiters = {}  # (state file, key) -> SharedRateLimiter
+_rate_limiters_lock = threading.Lock()
 
 
-def get_rate_limiter(max_calls_per_minute=50, key: str = "default"):
-    """Get or create a rate limiter keyed by model/provider."""
-    limiter = _rate_limiters.get(key)
+def get_rate_limiter(max_calls_per_minute=50, key: str = "default", max_tokens_per_minute=None):
+    """
+    Get or create a rate limiter keyed by model/provider.
+
+    Returns a SharedRateLimiter when shared_rate_limits() is active in this
+    process or its parent (RATE_LIMIT_STATE_PATH is set), so every worker
+    process draws from the same budget.
+    """
+    shared_path = os.environ.get(SHARED_RATE_LIMIT_ENV)
+    registry, registry_key = (_shared_rate_limiters, (shared_path, key)) if shared_path else (_rate_limiters, key)
+    limiter = registry.get(registry_key)
     if limiter is None:
-        limiter = RateLimiter(max_calls_per_minute)
-        _rate_limiters[key] = limiter
+        with _rate_limiters_lock:
+            limiter = registry.get(registry_key)
+            if limiter is None:
+                if shared_path:
+                    limiter = SharedRateLimiter(shared_path, key, max_calls_per_minute, max_tokens_per_minute)
+                else:
+                    limiter = RateLimiter(max_calls_per_minute, max_tokens_per_minute)
+                registry[registry_key] = limiter
     return limiter
+
+
+@contextmanager
+def shared_rate_limits(db_path: Union[str, Path]) -> Iterator[Path]:
+    """
+    Share rate limits with worker processes started inside the block
+
+    Sets RATE_LIMIT_STATE_PATH (inherited by child processes) so
+    get_rate_limiter() returns SharedRateLimiter instances backed by
+    db_path. The file is removed afterwards.
+
+    Args:
+        db_path: SQLite file for the buckets
+
+    Yields:
+        db_path
+    """
+    db_path = Path(db_path)
+    previous = os.environ.get(SHARED_RATE_LIMIT_ENV)
+    os.environ[SHARED_RATE_LIMIT_ENV] = str(db_path)
+    try:
+        yield db_path
+    finally:
+        if previous is None:
+            os.environ.pop(SHARED_RATE_LIMIT_ENV, None)
+        else:
+            os.environ[SHARED_RATE_LIMIT_ENV] = previous
+        with _rate_limiters_lock:
+            for registry_key in [k for k in _shared_rate_limiters if k[0] == str(db_path)]:
+                _shared_rate_limiters.pop(registry_key).close()
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
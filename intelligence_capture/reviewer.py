@@ -4,12 +4,17 @@ Extracts with multiple models independently and synthesizes best results
 """
 import json
 import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from difflib import SequenceMatcher
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
 from openai import OpenAI
 from anthropic import Anthropic
 import statistics
 
+from .extractors import create_json_completion
+from .llm_cache import get_llm_cache
+
 
 @dataclass
 class ReviewMetrics:
@@ -182,14 +187,8 @@ Return valid JSON: {"inefficiencies": [...]}"""
         ]
 
         try:
-            response = self.openai_client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=0.1,  # Low temperature for consistency
-                response_format={"type": "json_object"}
-            )
-
-            content = response.choices[0].message.content
+            # Response cache + the model's shared rate limiter; low temperature for consistency
+            content = create_json_completion(self.openai_client, model, messages, temperature=0.1)
             result = json.loads(content)
 
             # Extract the specific entity type from response
@@ -435,15 +434,23 @@ Provide your synthesis now:
 
     def _synthesize_with_claude(self, prompt: str) -> Optional[str]:
         """Synthesize using Claude Sonnet 4.5"""
+        model = "claude-sonnet-4-5-20250929"
+        messages = [{
+            "role": "user",
+            "content": prompt
+        }]
+        cache = get_llm_cache()
+        if cache is not None:
+            cached = cache.get(model, messages, 0.1)
+            if cached is not None:
+                return cached
+
         try:
             response = self.anthropic_client.messages.create(
-                model="claude-sonnet-4-5-20250929",
+                model=model,
                 max_tokens=4000,
                 temperature=0.1,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
+                messages=messages
             )
 
             # Extract text content from response
@@ -455,6 +462,8 @@ Provide your synthesis now:
             elif "```" in content:
                 content = content.split("```")[1].split("```")[0].strip()
 
+            if cache is not None:
+                cache.put(model, messages, 0.1, content, usage=response.usage)
             return content
 
         except Exception as e:
@@ -463,24 +472,18 @@ Provide your synthesis now:
 
     def _synthesize_with_gpt4(self, prompt: str) -> Optional[str]:
         """Synthesize using GPT-4o (fallback)"""
+        messages = [
+            {
+                "role": "system",
+                "content": "You are a forensic quality analyst. Provide responses in valid JSON format."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a forensic quality analyst. Provide responses in valid JSON format."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
-
-            return response.choices[0].message.content
+            return create_json_completion(self.openai_client, "gpt-4o", messages, temperature=0.1)
 
         except Exception as e:
             print(f"  ⚠️  GPT-4o synthesis failed: {str(e)[:100]}")
@@ -541,7 +544,9 @@ class EnsembleReviewer:
         self,
         openai_api_key: Optional[str] = None,
         anthropic_api_key: Optional[str] = None,
-        enable_ensemble: bool = True
+        enable_ensemble: bool = True,
+        max_concurrent_calls: int = 8,
+        early_exit_agreement: Optional[float] = 0.8
     ):
         """
         Initialize ensemble reviewer
@@ -550,8 +555,14 @@ class EnsembleReviewer:
             openai_api_key: OpenAI API key
             anthropic_api_key: Anthropic API key (optional, will use GPT-4o fallback)
             enable_ensemble: If False, skip ensemble and just add basic review
+            max_concurrent_calls: Extraction + synthesis calls in flight per
+                interview, across all entity types and models
+            early_exit_agreement: Skip synthesis for an entity type when all
+                models agree at least this much (0.0-1.0; None always synthesizes)
         """
         self.enable_ensemble = enable_ensemble
+        self.max_concurrent_calls = max(1, max_concurrent_calls)
+        self.early_exit_agreement = early_exit_agreement
         self.extractor = EnsembleExtractor(openai_api_key)
         self.synthesizer = SynthesisAgent(anthropic_api_key)
 
@@ -578,41 +589,7 @@ class EnsembleReviewer:
             # Quick mode: just add basic quality scores without re-extraction
             return self._basic_review(entity_type, entities, interview_text, meta)
 
-        print(f"\n🔬 ENSEMBLE REVIEW: {entity_type}")
-        print(f"  Original extraction: {len(entities)} entities")
-
-        # Step 1: Extract with ensemble of models
-        ensemble_extractions = self.extractor.extract_ensemble(
-            entity_type,
-            interview_text,
-            meta
-        )
-
-        # Add original extraction to ensemble for comparison
-        ensemble_extractions["original"] = entities
-
-        # Step 2: Synthesize best results
-        synthesized, metrics = self.synthesizer.synthesize_extractions(
-            entity_type,
-            ensemble_extractions,
-            interview_text,
-            meta
-        )
-
-        # Step 3: Build final result
-        result = EnsembleExtraction(
-            entity_type=entity_type,
-            extractions=ensemble_extractions,
-            synthesized_result=synthesized,
-            metrics=metrics,
-            iteration_count=1,
-            total_cost_usd=self._estimate_cost(ensemble_extractions)
-        )
-
-        print(f"\n  ✅ Ensemble review complete")
-        print(f"     Original: {len(entities)} | Synthesized: {len(synthesized)} | Quality: {metrics.overall_quality:.2f}")
-
-        return result
+        return self._review_concurrently({entity_type: entities}, interview_text, meta)[entity_type]
 
     def _basic_review(
         self,
@@ -649,8 +626,8 @@ class EnsembleReviewer:
 
         return result
 
-    def _estimate_cost(self, ensemble_extractions: Dict[str, List[Dict]]) -> float:
-        """Estimate API costs for ensemble extraction"""
+    def _estimate_cost(self, ensemble_extractions: Dict[str, List[Dict]], synthesized: bool = True) -> float:
+        """Estimate API costs for ensemble extraction (plus synthesis if it ran)"""
         # Rough estimates (adjust based on actual usage)
         cost_per_model = {
             "gpt-4o-mini": 0.01,
@@ -665,7 +642,8 @@ class EnsembleReviewer:
                 total += cost_per_model.get(model, 0.02)
 
         # Add synthesis cost
-        total += 0.05
+        if synthesized:
+            total += 0.05
 
         return total
 
@@ -693,16 +671,16 @@ class EnsembleReviewer:
         print(f"Entity types: {len(all_entities)}")
         print(f"Ensemble mode: {'ENABLED' if self.enable_ensemble else 'BASIC'}")
 
-        reviewed = {}
+        # Only review if entities were found
+        to_review = {entity_type: entities for entity_type, entities in all_entities.items() if len(entities) > 0}
 
-        for entity_type, entities in all_entities.items():
-            if len(entities) > 0:  # Only review if entities were found
-                reviewed[entity_type] = self.review_extraction(
-                    entity_type,
-                    entities,
-                    interview_text,
-                    meta
-                )
+        if self.enable_ensemble:
+            reviewed = self._review_concurrently(to_review, interview_text, meta)
+        else:
+            reviewed = {
+                entity_type: self._basic_review(entity_type, entities, interview_text, meta)
+                for entity_type, entities in to_review.items()
+            }
 
         print(f"\n{'='*60}")
         print(f"✅ VALIDATION COMPLETE")
@@ -717,5 +695,174 @@ class EnsembleReviewer:
         print(f"Entities: {total_original} → {total_synthesized}")
         print(f"Avg Quality: {avg_quality:.2f}")
         print(f"Needs Review: {needs_review_count}/{len(reviewed)}")
+        if self.enable_ensemble:
+            skipped = sum(1 for r in reviewed.values() if r.metrics.model_agreement.get("early_exit"))
+            print(f"Synthesis skipped (models agreed): {skipped}/{len(reviewed)}")
 
         return reviewed
+
+    def _review_concurrently(
+        self,
+        to_review: Dict[str, List[Dict]],
+        interview_text: str,
+        meta: Dict
+    ) -> Dict[str, EnsembleExtraction]:
+        """
+        Ensemble-review several entity types with all calls in flight at once
+
+        Every (entity type, model) extraction is submitted up front to one
+        pool of max_concurrent_calls workers, created for this call and shut
+        down when it returns (per-model rate limits still apply inside each
+        call). As soon as all models of an entity type are back, its
+        synthesis joins the same pool, or is skipped when the models agree
+        (see _agreement).
+
+        Args:
+            to_review: Dict mapping entity_type to the original entities
+            interview_text: Original interview
+            meta: Interview metadata
+
+        Returns:
+            Dict mapping entity_type to EnsembleExtraction (input order)
+        """
+        models = list(self.extractor.ENSEMBLE_MODELS)
+        print(f"\n🔬 ENSEMBLE REVIEW: {len(to_review)} entity types x {len(models)} models "
+              f"(max {self.max_concurrent_calls} concurrent calls)")
+
+        # Scoped to this call: the worker threads exit when the review is done
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_calls, thread_name_prefix="ensemble") as executor:
+            pending = {}  # future -> (entity_type, model or None for synthesis)
+            extractions = {entity_type: {} for entity_type in to_review}
+            for entity_type in to_review:
+                for model in models:
+                    future = executor.submit(self.extractor.extract_with_model, model, entity_type, interview_text, meta)
+                    pending[future] = (entity_type, model)
+
+            reviewed = {}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entity_type, model = pending.pop(future)
+                    entities = to_review[entity_type]
+
+                    if model is not None:
+                        extractions[entity_type][model] = future.result()  # None if the model failed
+                        if len(extractions[entity_type]) < len(models):
+                            continue
+
+                        ensemble_extractions = {m: extractions[entity_type][m] or [] for m in models}
+                        ensemble_extractions["original"] = entities
+                        agreement = self._agreement(extractions[entity_type], entities)
+                        if (
+                            self.early_exit_agreement is not None and
+                            agreement is not None and
+                            agreement >= self.early_exit_agreement
+                        ):
+                            reviewed[entity_type] = self._consensus_review(entity_type, ensemble_extractions, agreement)
+                            continue
+
+                        future = executor.submit(
+                            self.synthesizer.synthesize_extractions,
+                            entity_type,
+                            ensemble_extractions,
+                            interview_text,
+                            meta
+                        )
+                        pending[future] = (entity_type, None)
+                        extractions[entity_type] = ensemble_extractions
+                        continue
+
+                    ensemble_extractions = extractions[entity_type]
+                    try:
+                        synthesized, metrics = future.result()
+                    except Exception as e:
+                        print(f"  ⚠️  Synthesis failed for {entity_type}: {str(e)[:100]}")
+                        synthesized, metrics = self.synthesizer._fallback_majority_vote(ensemble_extractions, entity_type)
+
+                    reviewed[entity_type] = EnsembleExtraction(
+                        entity_type=entity_type,
+                        extractions=ensemble_extractions,
+                        synthesized_result=synthesized,
+                        metrics=metrics,
+                        iteration_count=1,
+                        total_cost_usd=self._estimate_cost(ensemble_extractions)
+                    )
+                    print(f"  ✅ {entity_type}: Original: {len(entities)} | Synthesized: {len(synthesized)} | "
+                          f"Quality: {metrics.overall_quality:.2f}")
+
+        return {entity_type: reviewed[entity_type] for entity_type in to_review}
+
+    def _consensus_review(
+        self,
+        entity_type: str,
+        ensemble_extractions: Dict[str, List[Dict]],
+        agreement: float
+    ) -> EnsembleExtraction:
+        """Result for an entity type whose models agreed: keep the original extraction, no synthesis"""
+        entities = ensemble_extractions["original"]
+        metrics = ReviewMetrics(
+            accuracy_score=agreement,
+            completeness_score=agreement,
+            relevance_score=agreement,
+            consistency_score=agreement,
+            hallucination_score=agreement,
+            overall_quality=agreement,
+            consensus_level=agreement,
+            needs_human_review=False,
+            review_feedback=f"Models agreed ({agreement:.0%}) - synthesis skipped",
+            model_agreement={"early_exit": True, "agreement": agreement}
+        )
+        print(f"  ⚡ {entity_type}: models agree ({agreement:.0%}), synthesis skipped")
+
+        return EnsembleExtraction(
+            entity_type=entity_type,
+            extractions=ensemble_extractions,
+            synthesized_result=entities,
+            metrics=metrics,
+            iteration_count=1,
+            total_cost_usd=self._estimate_cost(ensemble_extractions, synthesized=False)
+        )
+
+    @staticmethod
+    def _agreement(model_extractions: Dict[str, Optional[List[Dict]]], original: List[Dict]) -> Optional[float]:
+        """
+        Lowest pairwise agreement between the original and each model's extraction
+
+        Entities are matched by description/name (fuzzy, one-to-one); a
+        pair agrees by matched / max(len). None when fewer than two models
+        returned results (not enough evidence to skip synthesis).
+        """
+        succeeded = [entities for entities in model_extractions.values() if entities is not None]
+        if len(succeeded) < 2:
+            return None
+
+        key_sets = [_entity_keys(entities) for entities in [original] + succeeded]
+        agreement = 1.0
+        for i in range(len(key_sets)):
+            for j in range(i + 1, len(key_sets)):
+                agreement = min(agreement, _key_agreement(key_sets[i], key_sets[j]))
+        return agreement
+
+
+def _entity_keys(entities: List[Dict]) -> List[str]:
+    """Normalized description/name of each entity (same key as the majority vote)"""
+    keys = []
+    for entity in entities:
+        key = entity.get("description", entity.get("name", "")) if isinstance(entity, dict) else ""
+        keys.append(" ".join(str(key or "").lower().split()))
+    return keys
+
+
+def _key_agreement(keys_a: List[str], keys_b: List[str], min_similarity: float = 0.8) -> float:
+    """Share of entities matched one-to-one between two extractions"""
+    if not keys_a and not keys_b:
+        return 1.0
+    unmatched = list(keys_b)
+    matched = 0
+    for key in keys_a:
+        for index, candidate in enumerate(unmatched):
+            if key and candidate and SequenceMatcher(None, key, candidate).ratio() >= min_similarity:
+                matched += 1
+                del unmatched[index]
+                break
+    return matched / max(len(keys_a), len(keys_b))
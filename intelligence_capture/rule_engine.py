@@ -0,0 +1,197 @@
+"""
+Precompiled Rule Engine for the Rule-based Extractors
+Scans each interview text once for every keyword rule of every extractor,
+instead of one `keyword in text.lower()` pass per keyword and method
+
+- Keyword rules are registered at import (register_keywords) and compiled
+  into one Aho-Corasick automaton
+- scan_text() lowercases the text once, runs the automaton once and
+  splits sentence segments once; scans are cached per text, so all
+  extractors of an interview share one
+- Lookups keep the substring semantics of `keyword in text.lower()`, so
+  rule outputs are unchanged
+"""
+import re
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Text up to and including each "." (the unit the sentence rules match)
+SENTENCE_PATTERN = re.compile(r"[^.]*\.")
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed keyword set
+
+    find() reports every keyword occurring in a text (overlapping and
+    nested occurrences included) in a single left-to-right pass. Failure
+    links are folded into the transition table (a DFA), so each character
+    costs one dict lookup.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Build the automaton
+
+        Args:
+            keywords: Keywords to match (empty strings are ignored)
+        """
+        self.keywords: FrozenSet[str] = frozenset(keyword for keyword in keywords if keyword)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+
+        for keyword in sorted(self.keywords):
+            self._add(keyword)
+        self._delta = self._link()
+
+    def _add(self, keyword: str):
+        """Add a keyword to the trie"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] += (keyword,)
+
+    def _link(self) -> List[Dict[str, int]]:
+        """
+        Compute failure links (breadth-first), merge their outputs and
+        build the DFA transitions
+
+        Returns:
+            Transitions per state (characters missing go to the root)
+        """
+        delta: List[Dict[str, int]] = [{}] * len(self._goto)
+        delta[0] = self._goto[0]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # A state moves like its failure state, except along its own edges
+            delta[state] = {**delta[self._fail[state]], **self._goto[state]}
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                self._fail[next_state] = delta[self._fail[state]].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+        return delta
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Keywords occurring in a text
+
+        Args:
+            text: Text to scan (case-sensitive)
+
+        Returns:
+            Set of keywords that are substrings of the text
+        """
+        delta, output = self._delta, self._output
+        matched = set()  # States that emit keywords
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if output[state]:
+                matched.add(state)
+        return {keyword for state in matched for keyword in output[state]}
+
+
+class RuleScan:
+    """Rule matches of one interview text (shared by all extractors)"""
+
+    def __init__(self, text: str, automaton: KeywordAutomaton):
+        """
+        Scan a text
+
+        Args:
+            text: Interview text
+            automaton: Compiled keyword rules
+        """
+        self.text = text
+        self.lower = text.lower()
+        self._compiled = automaton.keywords
+        self._found = automaton.find(self.lower)
+        self._sentences: Optional[List[Tuple[str, str]]] = None
+
+    def has(self, keyword: str) -> bool:
+        """Same as `keyword in text.lower()` (registered keywords cost a set lookup)"""
+        if keyword in self._compiled:
+            return keyword in self._found
+        return keyword in self.lower
+
+    def has_any(self, keywords: Iterable[str]) -> bool:
+        """Whether any keyword occurs"""
+        return any(self.has(keyword) for keyword in keywords)
+
+    def first(self, keywords: Iterable[str]) -> Optional[str]:
+        """First keyword (in rule order) that occurs, or None"""
+        return next((keyword for keyword in keywords if self.has(keyword)), None)
+
+    def sentences(self) -> List[Tuple[str, str]]:
+        """(segment, lowercased segment) for each "."-terminated segment, in order"""
+        if self._sentences is None:
+            self._sentences = [(sentence, sentence.lower()) for sentence in SENTENCE_PATTERN.findall(self.text)]
+        return self._sentences
+
+
+_registered: Set[str] = set()
+_automaton: Optional[KeywordAutomaton] = None
+_lock = threading.Lock()
+
+
+def register_keywords(keywords: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Add keyword rules to the shared automaton
+
+    Called at import by the extractors for each keyword list they test
+    against lowercased interview text.
+
+    Args:
+        keywords: Keywords, matched as substrings of the lowercased text
+
+    Returns:
+        The keywords as a tuple, in the given (rule) order
+    """
+    global _automaton
+    keywords = tuple(keywords)
+    with _lock:
+        new = set(keywords) - _registered
+        if new:
+            _registered.update(new)
+            _automaton = None
+            scan_text.cache_clear()
+    return keywords
+
+
+def registered_keywords() -> FrozenSet[str]:
+    """All keywords compiled into the shared automaton"""
+    return _get_automaton().keywords
+
+
+def _get_automaton() -> KeywordAutomaton:
+    """The automaton of all registered keywords (compiled on first use)"""
+    global _automaton
+    with _lock:
+        if _automaton is None:
+            _automaton = KeywordAutomaton(_registered)
+        return _automaton
+
+
+@lru_cache(maxsize=32)
+def scan_text(text: str) -> RuleScan:
+    """
+    Scan of an interview text against all registered rules (cached per text)
+
+    Args:
+        text: Interview text
+
+    Returns:
+        RuleScan of the text
+    """
+    return RuleScan(text, _get_automaton())
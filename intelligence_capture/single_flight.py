@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Single-flight Request Coalescing
+
+Concurrent identical requests (same embedding text, same extraction
+prompt) wait on the one call already in flight instead of issuing
+duplicates. Used in front of call_llm_with_fallback,
+DuplicateDetector._get_embedding, EmbeddingPipeline._embed_batch and
+VectorSearchTool's query embedding.
+
+Features:
+- SingleFlight for threads (consolidation workers, ensemble reviewers)
+- AsyncSingleFlight for asyncio callers; the shared call runs as its own
+  task, so a cancelled caller does not cancel the others
+- Only in-flight calls are shared: results are not cached (the LLM cache
+  and embedding stores do that) and errors reach every waiting caller
+- Named process-wide instances with call/coalesced counts
+  (single_flight_statistics)
+
+Coalescing is per process; parallel extraction workers share completed
+results through the LLM response cache instead.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+def request_key(*parts: Any) -> str:
+    """
+    Content address of a request
+
+    Args:
+        parts: JSON-serializable request fields (model, input, options)
+
+    Returns:
+        Hex sha256 digest of the canonical JSON of the parts
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _FlightStats:
+    """Call and coalesced counts shared by both flight types"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0  # Requests that ran
+        self.coalesced = 0  # Requests that waited on one in flight
+
+    def get_statistics(self) -> Dict:
+        """
+        Get coalescing statistics
+
+        Returns:
+            Dict with calls made, requests coalesced and the coalesced rate
+        """
+        requests = self.calls + self.coalesced
+        rate = (self.coalesced / requests * 100) if requests > 0 else 0.0
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "coalesced_rate": f"{rate:.1f}%",
+            "in_flight": self.in_flight
+        }
+
+
+class SingleFlight(_FlightStats):
+    """
+    Thread-safe request coalescing
+
+    Usage:
+        flight = get_single_flight("embeddings")
+        embedding, shared = flight.do(key, request_embedding, text)
+    """
+
+    def __init__(self, name: str = "default"):
+        """
+        Initialize flight group
+
+        Args:
+            name: Name reported in statistics
+        """
+        super().__init__(name)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run fn(*args, **kwargs) unless an identical call is in flight
+
+        Args:
+            key: Request identity (e.g. request_key(...))
+            fn: Call to make
+
+        Returns:
+            (result, shared) - shared is True when the result came from
+            another caller's call
+
+        Raises:
+            Whatever the (shared) call raised
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            shared = future is not None
+            if shared:
+                self.coalesced += 1
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self.calls += 1
+
+        if shared:
+            return future.result(), True
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+
+class AsyncSingleFlight(_FlightStats):
+    """
+    Request coalescing for coroutines
+
+    Usage:
+        flight = get_async_single_flight("query_embeddings")
+        response, shared = await flight.do(key, lambda: client.embeddings.create(...))
+    """
+
+    def __init__(self, name: str = "default"):
+        """
+        Initialize flight group
+
+        Args:
+            name: Name reported in statistics
+        """
+        super().__init__(name)
+        # Keyed by (event loop, key): tasks cannot be awaited across loops
+        self._in_flight: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable]) -> Tuple[Any, bool]:
+        """
+        Await factory() unless an identical call is in flight
+
+        Args:
+            key: Request identity (e.g. request_key(...))
+            factory: Returns the awaitable to run (called by the first caller only)
+
+        Returns:
+            (result, shared) - shared is True when the result came from
+            another caller's call
+
+        Raises:
+            Whatever the (shared) call raised
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        task = self._in_flight.get(flight_key)
+        shared = task is not None
+        if shared:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(factory())
+            self._in_flight[flight_key] = task
+            self.calls += 1
+            task.add_done_callback(lambda _: self._in_flight.pop(flight_key, None))
+
+        # Shielded: cancelling one caller leaves the call running for the others
+        return await asyncio.shield(task), shared
+
+
+# Named process-wide instances
+_flights: Dict[str, _FlightStats] = {}
+_flights_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """
+    Get the process-wide thread flight group with this name
+
+    Args:
+        name: Group name (e.g. "llm_completions", "embeddings")
+
+    Returns:
+        SingleFlight shared by every caller using the name
+    """
+    with _flights_lock:
+        if name not in _flights:
+            _flights[name] = SingleFlight(name)
+        return _flights[name]
+
+
+def get_async_single_flight(name: str) -> AsyncSingleFlight:
+    """
+    Get the process-wide asyncio flight group with this name
+
+    Args:
+        name: Group name (e.g. "chunk_embeddings", "query_embeddings")
+
+    Returns:
+        AsyncSingleFlight shared by every caller using the name
+    """
+    with _flights_lock:
+        if name not in _flights:
+            _flights[name] = AsyncSingleFlight(name)
+        return _flights[name]
+
+
+def single_flight_statistics() -> Dict[str, Dict]:
+    """
+    Get coalescing statistics of every named flight group
+
+    Returns:
+        Dict name -> statistics (calls, coalesced, coalesced_rate, in_flight)
+    """
+    with _flights_lock:
+        flights = list(_flights.values())
+    return {flight.name: flight.get_statistics() for flight in flights}
@@ -109,7 +109,7 @@ class StorageAgent:
         # Systems
         systems = entities.get("systems", [])
         for system in systems:
-            self.db.insert_or_update_system(system, company)
+            self.db.insert_or_update_system(system, company, interview_id)
         counts["systems"] = len(systems)
 
         # KPIs
@@ -215,7 +215,7 @@ class StorageAgent:
 
         enhanced_systems = entities.get("systems_v2", [])
         for system in enhanced_systems:
-            self.db.insert_or_update_enhanced_system(system, company)
+            self.db.insert_or_update_enhanced_system(system, company, interview_id)
         counts["enhanced_systems"] = len(enhanced_systems)
 
         enhanced_automations = entities.get("automation_candidates_v2", [])
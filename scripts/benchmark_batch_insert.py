@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Benchmark IntelligenceDB.insert_entities_batch vs. per-entity inserts
+
+Generates synthetic entities spread over all 19 batch entity types and
+writes them into a fresh database (v1 + v2 + consolidation schema):
+- Per-entity: insert_<type>() for every entity, one commit each
+  (previous behavior of insert_entities_batch)
+- Batch: insert_entities_batch() per type and chunk, one executemany and
+  one commit per call
+
+Both databases are compared row by row afterwards (timestamps excluded).
+
+Usage:
+    python scripts/benchmark_batch_insert.py
+    python scripts/benchmark_batch_insert.py --entities 100000 --chunk-size 500
+    python scripts/benchmark_batch_insert.py --baseline-limit 0  # skip per-entity run
+"""
+import sys
+import io
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from intelligence_capture.database import EnhancedIntelligenceDB, VALID_ENTITY_TYPES
+
+
+# Per-entity insert method (and whether it takes business_unit) per batch type
+SINGLE_INSERTS = {
+    "pain_points": ("insert_pain_point", False),
+    "processes": ("insert_process", False),
+    "systems": ("insert_or_update_system", None),
+    "kpis": ("insert_kpi", False),
+    "automation_candidates": ("insert_automation_candidate", False),
+    "inefficiencies": ("insert_inefficiency", False),
+    "communication_channels": ("insert_communication_channel", True),
+    "decision_points": ("insert_decision_point", True),
+    "data_flows": ("insert_data_flow", True),
+    "temporal_patterns": ("insert_temporal_pattern", True),
+    "failure_modes": ("insert_failure_mode", True),
+    "team_structures": ("insert_team_structure", True),
+    "knowledge_gaps": ("insert_knowledge_gap", True),
+    "success_patterns": ("insert_success_pattern", True),
+    "budget_constraints": ("insert_budget_constraint", True),
+    "external_dependencies": ("insert_external_dependency", True),
+    "pain_points_v2": ("insert_enhanced_pain_point", True),
+    "systems_v2": ("insert_or_update_enhanced_system", None),
+    "automation_candidates_v2": ("insert_enhanced_automation_candidate", True)
+}
+
+VOCABULARY = [
+    "excel", "sap", "whatsapp", "correo", "facturas", "inventario", "planilla",
+    "reportes", "ventas", "compras", "aprobación", "conciliación", "pedidos",
+    "cocina", "reservas", "mantenimiento", "proveedores", "nómina", "caja"
+]
+
+
+def generate_entities(count: int, seed: int = 11) -> dict:
+    """Generate synthetic entities, round-robin over the batch entity types"""
+    rng = random.Random(seed)
+    types = list(SINGLE_INSERTS)
+    entities = {entity_type: [] for entity_type in types}
+    for i in range(count):
+        entity_type = types[i % len(types)]
+        words = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(2, 4)))
+        entity = {
+            # Systems repeat names so the upsert path merges mentions
+            "name": f"{words} {i % 2000 if entity_type.startswith('systems') else i}",
+            "description": " ".join(rng.choice(VOCABULARY) for _ in range(12)),
+            "type": "Process Inefficiency",
+            "department": "Operaciones",
+            "channel_name": "WhatsApp",
+            "activity_name": words,
+            "pattern": words,
+            "constraint": words,
+            "dependency": words,
+            "confidence_score": rng.random(),
+            "pain_points": [rng.choice(VOCABULARY)],
+            "participants": ["Cocina", "Compras"]
+        }
+        entities[entity_type].append(entity)
+    return entities
+
+
+def create_db(path: Path) -> EnhancedIntelligenceDB:
+    """Create a database with the full schema (quietly)"""
+    db = EnhancedIntelligenceDB(path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.connect()
+        db.init_schema()
+        db.init_v2_schema()
+        db.add_consolidation_schema()
+    return db
+
+
+def run_per_entity(db, entities: dict, interview_id: int) -> tuple:
+    """Insert with the per-entity methods (one commit per entity)"""
+    written = 0
+    start = time.perf_counter()
+    for entity_type, batch in entities.items():
+        method_name, takes_business_unit = SINGLE_INSERTS[entity_type]
+        method = getattr(db, method_name)
+        for entity in batch:
+            if takes_business_unit is None:
+                method(entity, "Comversa")
+            elif takes_business_unit:
+                method(interview_id, "Comversa", "Restaurantes", entity)
+            else:
+                method(interview_id, "Comversa", entity)
+            written += 1
+    return written, time.perf_counter() - start
+
+
+def run_batch(db, entities: dict, interview_id: int, chunk_size: int) -> tuple:
+    """Insert with insert_entities_batch"""
+    written = 0
+    failures = 0
+    start = time.perf_counter()
+    for entity_type, batch in entities.items():
+        for offset in range(0, len(batch), chunk_size):
+            result = db.insert_entities_batch(
+                entity_type, batch[offset:offset + chunk_size],
+                interview_id, "Comversa", "Restaurantes"
+            )
+            written += result["inserted"]
+            failures += len(result["errors"])
+    return written, failures, time.perf_counter() - start
+
+
+def snapshot(db) -> dict:
+    """All entity rows without timestamps"""
+    rows = {}
+    for table in sorted(VALID_ENTITY_TYPES):
+        cursor = db.conn.execute(f"SELECT * FROM {table} ORDER BY id")
+        columns = [column[0] for column in cursor.description]
+        rows[table] = [
+            tuple(value for column, value in zip(columns, row) if column not in ("created_at", "updated_at"))
+            for row in cursor.fetchall()
+        ]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk entity inserts")
+    parser.add_argument("--entities", type=int, default=100_000, help="Total entities (spread over 19 types)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Entities per insert_entities_batch call")
+    parser.add_argument(
+        "--baseline-limit", type=int, default=100_000,
+        help="Also run the per-entity path when --entities is at most this (0 skips it)"
+    )
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("BATCH INSERT BENCHMARK")
+    print("=" * 70)
+
+    entities = generate_entities(args.entities)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        batch_db = create_db(Path(tmp) / "batch.db")
+        interview_id = batch_db.insert_interview({"company": "Comversa", "respondent": "Bench", "date": "2025-11-01"}, {})
+        written, failures, batch_time = run_batch(batch_db, entities, interview_id, args.chunk_size)
+
+        print(f"\n{args.entities:,} entities, 19 entity types, chunks of {args.chunk_size:,}")
+        print(f"  Batch:        {batch_time:8.2f}s  ({written / batch_time:10,.0f} entities/s, {failures} errors)")
+
+        if 0 < args.entities <= args.baseline_limit:
+            single_db = create_db(Path(tmp) / "single.db")
+            interview_id = single_db.insert_interview({"company": "Comversa", "respondent": "Bench", "date": "2025-11-01"}, {})
+            single_written, single_time = run_per_entity(single_db, entities, interview_id)
+
+            print(f"  Per-entity:   {single_time:8.2f}s  ({single_written / single_time:10,.0f} entities/s)")
+            print(f"  Speedup:      {single_time / batch_time:8.1f}x")
+            identical = snapshot(batch_db) == snapshot(single_db)
+            print(f"  Identical rows: {'yes' if identical else 'NO'}")
+            single_db.close()
+        else:
+            print("  Per-entity:   skipped (--baseline-limit)")
+
+        batch_db.close()
+
+
+if __name__ == "__main__":
+    main()
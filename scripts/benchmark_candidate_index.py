@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark DuplicateDetector candidate index vs. full linear scan
+
+Generates synthetic Spanish entity names at 10k, 100k and 1M existing
+entities (with the normalized_name/name_profile columns IntelligenceDB
+stores at insert time), then compares stage-1 fuzzy candidate lookup:
+- Linear scan: normalize + score every existing entity (previous behavior)
+- Candidate index: character-count filter + top-k bound + batched rapidfuzz scoring
+
+Results are checked for equality on every query that runs both paths.
+
+Usage:
+    python scripts/benchmark_candidate_index.py
+    python scripts/benchmark_candidate_index.py --sizes 10000 100000 --queries 50
+    python scripts/benchmark_candidate_index.py --scan-limit 1000000  # also scan at 1M (slow)
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from intelligence_capture.duplicate_detector import DuplicateDetector
+from intelligence_capture.name_normalizer import name_profile, normalize_entity
+
+
+VOCABULARY = [
+    "sistema", "excel", "sap", "erp", "whatsapp", "correo", "facturas",
+    "inventario", "planilla", "reportes", "ventas", "compras", "aprobación",
+    "conciliación", "bancaria", "manual", "pedidos", "cocina", "reservas",
+    "habitaciones", "mantenimiento", "proveedores", "nómina", "contabilidad",
+    "producción", "calidad", "logística", "despacho", "almacén", "caja"
+]
+
+
+def generate_entities(count: int, seed: int = 7) -> list:
+    """Generate synthetic system entities"""
+    rng = random.Random(seed)
+    entities = []
+    for i in range(count):
+        name = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(1, 3)))
+        description = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(3, 12)))
+        entities.append({"id": i, "name": f"{name} {i % 997}", "description": description})
+    return entities
+
+
+def benchmark(size: int, queries: int, scan_limit: int):
+    """Run benchmark for one corpus size"""
+    config = {
+        "similarity_thresholds": {"systems": 0.75, "default": 0.75},
+        "performance": {"max_candidates": 10, "use_db_storage": False}
+    }
+    indexed = DuplicateDetector(config)
+    scanning = DuplicateDetector(dict(config, performance=dict(config["performance"], use_candidate_index=False)))
+
+    existing = generate_entities(size)
+    probes = generate_entities(queries, seed=size + 1)
+    threshold = indexed._get_similarity_threshold("systems") * 0.7
+    limit = indexed.max_candidates * 2
+
+    # Stored columns (computed once per row at insert time)
+    start = time.perf_counter()
+    for entity in existing:
+        entity["normalized_name"] = normalize_entity(entity, "systems")
+        entity["name_profile"] = name_profile(entity["normalized_name"])
+    stored_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed.candidate_index.sync("systems", existing)
+    build_time = time.perf_counter() - start
+
+    index_times = []
+    index_results = []
+    for probe in probes:
+        text = indexed._get_entity_text(probe, "systems")
+        start = time.perf_counter()
+        index_results.append(indexed._find_fuzzy_candidates(text, "systems", existing, threshold, limit))
+        index_times.append(time.perf_counter() - start)
+
+    scan_times = []
+    mismatches = 0
+    if size <= scan_limit:
+        for probe, expected in zip(probes, index_results):
+            text = scanning._get_entity_text(probe, "systems")
+            start = time.perf_counter()
+            result = scanning._find_fuzzy_candidates(text, "systems", existing, threshold, limit)
+            scan_times.append(time.perf_counter() - start)
+            if result != expected:
+                mismatches += 1
+
+    stats = indexed.candidate_index.get_statistics()
+    avg_index_ms = sum(index_times) / len(index_times) * 1000
+    scored_per_query = stats["candidates_scored"] / max(1, stats["queries"])
+
+    print(f"\n{size:>9,} existing entities")
+    print(f"  Stored columns:        {stored_time:8.2f}s  (insert time, persisted)")
+    print(f"  Index build:           {build_time:8.2f}s")
+    print(f"  Index query (avg):     {avg_index_ms:8.2f}ms  ({scored_per_query:,.0f} scored/query)")
+    print(f"  Pruned without scoring:{stats['pruning_ratio']:8.1%}")
+    if scan_times:
+        avg_scan_ms = sum(scan_times) / len(scan_times) * 1000
+        print(f"  Linear scan (avg):     {avg_scan_ms:8.2f}ms  ({size:,} scored/query)")
+        print(f"  Speedup:               {avg_scan_ms / avg_index_ms:8.1f}x")
+        print(f"  Mismatches vs scan:    {mismatches}/{len(scan_times)}")
+    else:
+        print(f"  Linear scan:           skipped (size > --scan-limit {scan_limit:,})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the duplicate detection candidate index")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=20, help="Queries per corpus size")
+    parser.add_argument("--scan-limit", type=int, default=100_000, help="Skip the linear scan above this size")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("CANDIDATE INDEX BENCHMARK")
+    print("=" * 70)
+
+    for size in args.sizes:
+        benchmark(size, args.queries, args.scan_limit)
+
+
+if __name__ == "__main__":
+    main()
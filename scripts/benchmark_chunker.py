@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Benchmark SpanishChunker modes on the company_info corpus
+
+Loads every text file of the corpus (Markdown, CSV, HTML, RTF, plain
+text; binary formats such as PDF/DOCX are skipped) as a DocumentPayload
+and measures:
+- Startup time and peak memory of each chunker mode ("fast" rule-based vs
+  "spacy"), each in a fresh interpreter
+- Documents and chunks per second for the "fast" mode and, if spaCy and
+  es_core_news_md are installed:
+  - chunk_document per document with the full es_core_news_md pipeline
+    (previous behavior)
+  - chunk_documents (nlp.pipe, unused components excluded), 1 and N processes
+  - chunk_documents with the rule-based sentencizer instead of the parser
+
+Chunks of the per-document and nlp.pipe runs are compared.
+
+spaCy runs need:
+    python -m spacy download es_core_news_md
+
+Usage:
+    python scripts/benchmark_chunker.py
+    python scripts/benchmark_chunker.py --corpus data/company_info --copies 5 --processes 4
+"""
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from intelligence_capture.chunking import SpanishChunker
+from intelligence_capture.models.document_payload import DocumentPayload
+
+DEFAULT_CORPUS = Path(__file__).parent.parent / "data" / "company_info"
+SKIPPED_SUFFIXES = {".py", ".pdf", ".docx", ".xlsx", ".png", ".jpg"}
+
+
+def load_corpus(corpus: Path, copies: int) -> list:
+    """DocumentPayloads for every UTF-8 text file of the corpus"""
+    payloads = []
+    for path in sorted(corpus.rglob("*")):
+        if not path.is_file() or path.suffix.lower() in SKIPPED_SUFFIXES:
+            continue
+        try:
+            content = path.read_text(encoding="utf-8")
+        except UnicodeDecodeError:
+            continue
+        for copy in range(copies):
+            payloads.append(DocumentPayload(
+                document_id=f"{path.stem}-{copy}",
+                org_id="benchmark",
+                checksum=path.name,
+                source_type="benchmark",
+                source_format=path.suffix.lstrip(".") or "txt",
+                mime_type="text/plain",
+                original_path=path,
+                content=content,
+                language="es",
+                page_count=1
+            ))
+    return payloads
+
+
+STARTUP_PROBE = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from intelligence_capture.chunking import SpanishChunker
+chunker = SpanishChunker(mode={mode!r})
+chunker.nlp("Hola. Listo.")
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+"""
+
+
+def measure_startup(mode: str) -> dict:
+    """Import + construction time and peak RSS of a chunker mode in a fresh interpreter"""
+    code = STARTUP_PROBE.format(root=str(Path(__file__).parent.parent), mode=mode)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def timed(function, payloads: list) -> tuple:
+    """Wall time and chunk lists of chunking every payload"""
+    start = time.perf_counter()
+    results = function(payloads)
+    return time.perf_counter() - start, results
+
+
+def report(label: str, elapsed: float, results: list, baseline: float = None):
+    chunks = sum(len(chunk_list) for chunk_list in results)
+    speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ""
+    print(f"  {label:<32} {elapsed:7.2f}s  {len(results) / elapsed:7.1f} docs/s  "
+          f"{chunks / elapsed:8.1f} chunks/s  {chunks:6d} chunks{speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SpanishChunker on a document corpus")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory of documents")
+    parser.add_argument("--copies", type=int, default=3, help="Times each document is repeated")
+    parser.add_argument("--processes", type=int, default=4, help="n_process for the multiprocess run")
+    parser.add_argument("--batch-size", type=int, default=32, help="nlp.pipe batch size")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("SPANISH CHUNKER BENCHMARK")
+    print("=" * 70)
+
+    payloads = load_corpus(args.corpus, args.copies)
+    characters = sum(len(payload.content) for payload in payloads)
+    print(f"\n{len(payloads)} documents, {characters:,} characters ({args.corpus})")
+
+    print("\nStartup (fresh interpreter, import + model load)")
+    for mode in ("fast", "spacy"):
+        startup = measure_startup(mode)
+        if "error" in startup:
+            print(f"  {mode:<6} unavailable: {startup['error']}")
+        else:
+            print(f"  {mode:<6} {startup['seconds']:7.2f}s  {startup['max_rss_mb']:7.0f} MB peak RSS")
+
+    print("\nThroughput")
+    fast = SpanishChunker(mode="fast")
+    fast_time, fast_results = timed(
+        lambda docs: list(fast.chunk_documents(docs, batch_size=args.batch_size)), payloads
+    )
+    report("fast mode", fast_time, fast_results)
+
+    try:
+        import spacy
+        chunker = SpanishChunker()
+        full_pipeline = spacy.load("es_core_news_md")
+    except (ImportError, ValueError, OSError) as e:
+        print(f"  spaCy modes skipped: {e}")
+        return
+
+    print(f"\nChunking pipeline: {', '.join(chunker.nlp.pipe_names)}")
+    print(f"Full pipeline:     {', '.join(full_pipeline.pipe_names)}")
+
+    chunking_nlp = chunker.nlp
+    chunker.nlp = full_pipeline
+    legacy_time, legacy = timed(lambda docs: [chunker.chunk_document(doc) for doc in docs], payloads)
+    chunker.nlp = chunking_nlp
+    report("chunk_document (full pipeline)", legacy_time, legacy)
+
+    pipe_time, piped = timed(
+        lambda docs: list(chunker.chunk_documents(docs, batch_size=args.batch_size)), payloads
+    )
+    report("chunk_documents", pipe_time, piped, legacy_time)
+
+    multi_time, multi = timed(
+        lambda docs: list(chunker.chunk_documents(docs, batch_size=args.batch_size, n_process=args.processes)),
+        payloads
+    )
+    report(f"chunk_documents (n_process={args.processes})", multi_time, multi, legacy_time)
+
+    sentencizer = SpanishChunker(use_sentencizer=True)
+    sentencizer_time, sentencized = timed(
+        lambda docs: list(sentencizer.chunk_documents(docs, batch_size=args.batch_size)), payloads
+    )
+    report("chunk_documents (sentencizer)", sentencizer_time, sentencized, legacy_time)
+    report("fast mode", fast_time, fast_results, legacy_time)
+
+    print(f"\nIdentical chunks (pipe vs per document): {'yes' if legacy == piped == multi else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
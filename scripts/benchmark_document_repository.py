@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark DocumentRepository.persist_document_bundle: executemany vs COPY
+
+Persists one synthetic document with N chunks and N 1536-dimension
+embeddings against a local Postgres with pgvector (schema from
+scripts/run_pg_migrations.py):
+- executemany: one INSERT ... ON CONFLICT per row, vectors as text
+  literals (previous behavior; bulk_copy_threshold disabled, no codec)
+- COPY: binary copy_records_to_table into staging tables plus one
+  set-based upsert per table, vectors as packed float32
+
+Each path is measured on a fresh insert and on a re-persist of the same
+bundle (every row hits ON CONFLICT DO UPDATE). Benchmark documents are
+deleted afterwards (chunks and embeddings cascade).
+
+Usage:
+    DATABASE_URL=postgresql://localhost/comversa_rag python scripts/benchmark_document_repository.py
+    python scripts/benchmark_document_repository.py --dsn postgresql://localhost/rag --sizes 10000 100000
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+from uuid import uuid4
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import asyncpg
+
+from intelligence_capture.persistence.document_repository import DocumentRepository
+from intelligence_capture.persistence.models import (
+    ChunkEmbeddingPayload,
+    DocumentChunkPayload,
+    DocumentPayload,
+)
+
+DIMENSIONS = 1536
+VOCABULARY = [
+    "conciliación", "facturas", "excel", "sap", "inventario", "reservas",
+    "proveedores", "aprobación", "cocina", "nómina", "reportes", "caja"
+]
+
+
+def build_bundle(chunk_count: int, seed: int) -> tuple:
+    """Synthetic document with chunk_count chunks and one embedding per chunk"""
+    rng = random.Random(seed)
+    payload = DocumentPayload(
+        org_id="benchmark",
+        source_type="benchmark",
+        checksum=uuid4().hex,
+        storage_path="benchmark",
+        metadata={"benchmark": True},
+        source_format="txt",
+        chunks=[
+            DocumentChunkPayload(
+                content=" ".join(rng.choices(VOCABULARY, k=300)),
+                chunk_index=index,
+                token_count=300,
+                page_number=index // 20 + 1,
+                section_title=f"Sección {index // 50}",
+                span_offsets={"start": index * 2000, "end": index * 2000 + 1999},
+                spanish_features={"stopword_ratio": 0.3, "has_accents": True},
+            )
+            for index in range(chunk_count)
+        ],
+    )
+    document_id = payload.resolve_document_id()
+    # A few distinct random vectors, cycled (generating 100k x 1536 floats
+    # would dominate the run)
+    vectors = [[rng.uniform(-1, 1) for _ in range(DIMENSIONS)] for _ in range(64)]
+    embeddings = [
+        ChunkEmbeddingPayload(
+            chunk_id=chunk.chunk_id,
+            document_id=document_id,
+            vector=vectors[index % len(vectors)],
+            cost_cents=0.0002,
+        )
+        for index, chunk in enumerate(payload.chunks)
+    ]
+    return payload, embeddings
+
+
+async def time_persist(repository: DocumentRepository, payload, embeddings) -> float:
+    start = time.perf_counter()
+    await repository.persist_document_bundle(payload, chunk_embeddings=embeddings)
+    return time.perf_counter() - start
+
+
+async def run(dsn: str, sizes: list):
+    # Previous behavior: no vector codec, executemany for every batch size
+    pool = await asyncpg.create_pool(dsn, min_size=1, max_size=2, command_timeout=3600)
+    executemany_repo = DocumentRepository(pool, bulk_copy_threshold=sys.maxsize)
+    copy_repo = await DocumentRepository.create(dsn, min_size=1, max_size=2, timeout=3600)
+
+    document_ids = []
+    try:
+        for size in sizes:
+            print(f"\n{size:,} chunks + {size:,} embeddings ({DIMENSIONS} dims)")
+            results = {}
+            for label, repository in (("executemany", executemany_repo), ("COPY", copy_repo)):
+                payload, embeddings = build_bundle(size, seed=size)
+                document_ids.append(payload.document_id)
+                insert_time = await time_persist(repository, payload, embeddings)
+                upsert_time = await time_persist(repository, payload, embeddings)
+                results[label] = (insert_time, upsert_time)
+
+            base_insert, base_upsert = results["executemany"]
+            for label, (insert_time, upsert_time) in results.items():
+                print(f"  {label:<12} insert {insert_time:8.2f}s ({size / insert_time:9.0f} rows/s, "
+                      f"{base_insert / insert_time:5.1f}x)   re-persist {upsert_time:8.2f}s "
+                      f"({base_upsert / upsert_time:5.1f}x)")
+    finally:
+        async with pool.acquire() as conn:
+            await conn.execute("DELETE FROM documents WHERE id = ANY($1::uuid[])", [str(i) for i in document_ids])
+        await pool.close()
+        await copy_repo.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DocumentRepository bulk persistence")
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL"), help="Postgres DSN (default: $DATABASE_URL)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000], help="Chunks per document")
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error("Postgres DSN required (--dsn or DATABASE_URL)")
+
+    print("=" * 70)
+    print("DOCUMENT REPOSITORY BULK PERSISTENCE BENCHMARK")
+    print("=" * 70)
+    asyncio.run(run(args.dsn, args.sizes))
+
+
+if __name__ == "__main__":
+    main()
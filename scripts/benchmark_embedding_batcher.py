@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark the micro-batching embedding client under concurrent load
+
+Simulates the embeddings endpoint (fixed latency per request plus a small
+cost per input, with a limited number of concurrent connections) and embeds
+the same texts from many worker threads and coroutines:
+- One request per text (previous behavior of _get_embedding,
+  generate_embedding and the query embedding)
+- EmbeddingBatcher / AsyncEmbeddingBatcher
+
+No API key or network is needed.
+
+Usage:
+    python scripts/benchmark_embedding_batcher.py
+    python scripts/benchmark_embedding_batcher.py --texts 2000 --workers 64 --latency-ms 80
+"""
+import sys
+import time
+import asyncio
+import argparse
+import threading
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from intelligence_capture.embedding_batcher import AsyncEmbeddingBatcher, EmbeddingBatcher
+
+
+class SimulatedEndpoint:
+    """Embeddings endpoint with per-request latency and a connection limit"""
+
+    def __init__(self, latency_ms: float, per_input_ms: float, connections: int):
+        self.latency = latency_ms / 1000
+        self.per_input = per_input_ms / 1000
+        self.connections = threading.BoundedSemaphore(connections)
+        self.async_connections = None
+        self.requests = 0
+
+    def _response(self, texts):
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[float(len(text))]) for text in texts])
+
+    def create(self, model, input):
+        texts = input if isinstance(input, list) else [input]
+        with self.connections:
+            self.requests += 1
+            time.sleep(self.latency + self.per_input * len(texts))
+        return self._response(texts)
+
+    async def create_async(self, model, input):
+        texts = input if isinstance(input, list) else [input]
+        async with self.async_connections:
+            self.requests += 1
+            await asyncio.sleep(self.latency + self.per_input * len(texts))
+        return self._response(texts)
+
+
+def endpoint_client(endpoint: SimulatedEndpoint):
+    """OpenAI-shaped client over the simulated endpoint"""
+    return SimpleNamespace(embeddings=SimpleNamespace(create=endpoint.create))
+
+
+def run_threads(embed, texts: list, workers: int) -> float:
+    """Wall time of embedding every text from a pool of worker threads"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(embed, texts))
+    elapsed = time.perf_counter() - start
+    assert results == [[float(len(text))] for text in texts]
+    return elapsed
+
+
+async def run_coroutines(embed, texts: list) -> float:
+    """Wall time of embedding every text from concurrent coroutines"""
+    start = time.perf_counter()
+    results = await asyncio.gather(*(embed(text) for text in texts))
+    elapsed = time.perf_counter() - start
+    assert results == [[float(len(text))] for text in texts]
+    return elapsed
+
+
+def report(label: str, elapsed: float, requests: int, texts: int, baseline: float = None):
+    speedup = f"  ({baseline / elapsed:.1f}x)" if baseline else ""
+    print(f"  {label:<22} {elapsed * 1000:8.1f}ms  {texts / elapsed:8.0f} texts/s  {requests:5d} requests{speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark micro-batched embedding requests")
+    parser.add_argument("--texts", type=int, default=1000, help="Texts to embed")
+    parser.add_argument("--workers", type=int, default=128, help="Concurrent worker threads")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulated latency per request")
+    parser.add_argument("--per-input-ms", type=float, default=0.05, help="Simulated cost per input text")
+    parser.add_argument("--connections", type=int, default=8, help="Concurrent connections to the endpoint")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Batcher collection window")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("EMBEDDING MICRO-BATCHING BENCHMARK")
+    print("=" * 70)
+    print(f"\n{args.texts} texts, {args.workers} workers, {args.latency_ms:.0f}ms/request, "
+          f"{args.connections} connections, {args.max_wait_ms:.0f}ms window")
+
+    texts = [f"Entidad {i}: proceso de conciliación en SAP" for i in range(args.texts)]
+
+    # Worker threads (consolidation, RAG generation)
+    print("\nThreads")
+    endpoint = SimulatedEndpoint(args.latency_ms, args.per_input_ms, args.connections)
+    single = run_threads(lambda text: endpoint.create(model="m", input=text).data[0].embedding, texts, args.workers)
+    report("One request per text", single, endpoint.requests, len(texts))
+
+    endpoint = SimulatedEndpoint(args.latency_ms, args.per_input_ms, args.connections)
+    batcher = EmbeddingBatcher.for_client(endpoint_client(endpoint), "m", max_wait_ms=args.max_wait_ms)
+    batched = run_threads(batcher.embed, texts, args.workers)
+    batcher.close()
+    report("EmbeddingBatcher", batched, endpoint.requests, len(texts), single)
+    print(f"  Avg batch size:        {batcher.get_statistics()['avg_batch_size']:8.1f}")
+
+    # Coroutines (agent query embeddings)
+    print("\nCoroutines")
+
+    async def coroutines():
+        endpoint = SimulatedEndpoint(args.latency_ms, args.per_input_ms, args.connections)
+        endpoint.async_connections = asyncio.Semaphore(args.connections)
+
+        async def embed(text):
+            response = await endpoint.create_async(model="m", input=text)
+            return response.data[0].embedding
+
+        single = await run_coroutines(embed, texts)
+        report("One request per text", single, endpoint.requests, len(texts))
+
+        endpoint.requests = 0
+        client = SimpleNamespace(embeddings=SimpleNamespace(create=endpoint.create_async))
+        batcher = AsyncEmbeddingBatcher.for_client(client, "m", max_wait_ms=args.max_wait_ms)
+        batched = await run_coroutines(batcher.embed, texts)
+        report("AsyncEmbeddingBatcher", batched, endpoint.requests, len(texts), single)
+
+    asyncio.run(coroutines())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-interview extraction latency and LLM usage
+
+Starts a local fake OpenAI server (chat completions with a fixed response
+latency), points the OpenAI client at it and runs
+IntelligenceExtractor.extract_all() on real interviews:
+- Sequential: max_concurrent_extractions=1 (previous behavior, one call per
+  entity type in a row)
+- Concurrent: max_concurrent_extractions=N (all entity types in flight)
+- Grouped: grouped_extraction=True (one multi-section call per group),
+  sequential and concurrent
+
+All runs go through the shared per-model rate limiters; their limit is
+raised (--rpm) so the benchmark measures fan-out, not the quota. Results of
+all runs are compared entity by entity. The fake server counts prompt
+tokens as request characters / 4.
+
+Usage:
+    python scripts/benchmark_extraction_fanout.py
+    python scripts/benchmark_extraction_fanout.py --latency 0.5 --interviews 3 --concurrency 16
+"""
+import os
+import sys
+import io
+import json
+import time
+import argparse
+import threading
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Answers every chat completion with empty sections after a delay"""
+
+    latency = 0.3
+    content = "{}"
+    requests = 0
+    prompt_tokens = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        prompt_tokens = sum(len(message.get("content", "")) for message in request.get("messages", [])) // 4
+        with FakeOpenAIHandler.lock:
+            FakeOpenAIHandler.requests += 1
+            FakeOpenAIHandler.prompt_tokens += prompt_tokens
+
+        time.sleep(self.latency)
+        body = json.dumps({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self.content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 10, "total_tokens": prompt_tokens + 10}
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_server(latency: float) -> ThreadingHTTPServer:
+    """Start the fake server on a free local port"""
+    FakeOpenAIHandler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAIHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(extractor, interviews: list) -> dict:
+    """Extract every interview; returns results, mean latency and server usage per interview"""
+    FakeOpenAIHandler.requests = 0
+    FakeOpenAIHandler.prompt_tokens = 0
+    results = []
+    start = time.perf_counter()
+    for interview in interviews:
+        with contextlib.redirect_stdout(io.StringIO()):
+            results.append(extractor.extract_all(interview["meta"], interview["qa_pairs"]))
+    return {
+        "results": results,
+        "seconds": (time.perf_counter() - start) / len(interviews),
+        "calls": FakeOpenAIHandler.requests / len(interviews),
+        "prompt_tokens": FakeOpenAIHandler.prompt_tokens / len(interviews)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent extraction fan-out")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake server response latency in seconds")
+    parser.add_argument("--interviews", type=int, default=3, help="Interviews to extract")
+    parser.add_argument("--concurrency", type=int, default=16, help="max_concurrent_extractions for the concurrent run")
+    parser.add_argument("--rpm", type=int, default=100_000, help="Requests/minute for the shared rate limiters")
+    args = parser.parse_args()
+
+    server = start_fake_server(args.latency)
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    from intelligence_capture.config import INTERVIEWS_FILE, MODEL_PROVIDER_MAP
+    from intelligence_capture.extractor import IntelligenceExtractor
+    from intelligence_capture.grouped_extraction import SECTION_SCHEMAS
+    from intelligence_capture.interview_source import InterviewSource
+    from intelligence_capture.rate_limiter import get_rate_limiter
+
+    # Pre-create the shared limiters with a benchmark-sized budget
+    for model, info in MODEL_PROVIDER_MAP.items():
+        get_rate_limiter(max_calls_per_minute=args.rpm, key=f"{info.get('provider', 'openai')}:{model}")
+
+    # Every response carries every section, so per-type and grouped calls parse alike
+    FakeOpenAIHandler.content = json.dumps({key: [] for key, _, _ in SECTION_SCHEMAS.values()})
+
+    interviews = []
+    for _, interview in InterviewSource(INTERVIEWS_FILE).iter_interviews():
+        interviews.append(interview)
+        if len(interviews) >= args.interviews:
+            break
+
+    print("=" * 70)
+    print("EXTRACTION FAN-OUT BENCHMARK")
+    print("=" * 70)
+    print(f"\nFake OpenAI server: {os.environ['OPENAI_BASE_URL']} ({args.latency * 1000:.0f}ms per call)")
+    print(f"Interviews: {len(interviews)}")
+
+    modes = [
+        ("Sequential", 1, False),
+        (f"Concurrent (max {args.concurrency})", args.concurrency, False),
+        ("Grouped, sequential", 1, True),
+        (f"Grouped, concurrent (max {args.concurrency})", args.concurrency, True)
+    ]
+    runs = []
+    for label, concurrency, grouped in modes:
+        with contextlib.redirect_stdout(io.StringIO()):
+            extractor = IntelligenceExtractor(max_concurrent_extractions=concurrency, grouped_extraction=grouped)
+        runs.append((label, run(extractor, interviews)))
+
+    baseline = runs[0][1]
+    print(f"\n  {'Mode':<32} {'s/interview':>11} {'speedup':>8} {'calls':>6} {'prompt tokens':>14}")
+    for label, result in runs:
+        print(
+            f"  {label:<32} {result['seconds']:11.2f} {baseline['seconds'] / result['seconds']:7.1f}x "
+            f"{result['calls']:6.0f} {result['prompt_tokens']:14,.0f}"
+        )
+
+    identical = all(result["results"] == baseline["results"] for _, result in runs)
+    print(f"\n  Identical results: {'yes' if identical else 'NO'}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
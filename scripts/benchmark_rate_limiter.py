@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared rate limiter under concurrent load
+
+Simulates N worker threads calling an API through one RateLimiter:
+- Each call reserves its estimated tokens, "runs" for --latency seconds,
+  then reports its actual usage (random around the estimate)
+- Limiters start in steady state (empty buckets / a full window), so the
+  measured requests/min and tokens/min are sustained rates, compared
+  with the limits
+- A monitor thread polls get_current_rate() to measure how long the
+  limiter lock is held; the previous sliding-window limiter is run for
+  comparison (it slept while holding its lock)
+
+Usage:
+    python scripts/benchmark_rate_limiter.py
+    python scripts/benchmark_rate_limiter.py --workers 16 --rpm 600 --tpm 150000 --duration 20
+"""
+import io
+import sys
+import time
+import random
+import argparse
+import threading
+import contextlib
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from intelligence_capture.rate_limiter import RateLimiter
+
+
+class SlidingWindowLimiter:
+    """Previous limiter (requests only, sleeps while holding its lock)"""
+
+    def __init__(self, max_calls_per_minute: int):
+        self.max_calls = max_calls_per_minute
+        self.calls = deque()
+        self.lock = threading.Lock()
+
+    def wait_if_needed(self, tokens: int = 0):
+        with self.lock:
+            now = datetime.now()
+            while self.calls and self.calls[0] < now - timedelta(minutes=1):
+                self.calls.popleft()
+            if len(self.calls) >= self.max_calls:
+                wait_seconds = (self.calls[0] + timedelta(minutes=1) - now).total_seconds()
+                if wait_seconds > 0:
+                    time.sleep(wait_seconds + 0.1)
+                    now = datetime.now()
+                    while self.calls and self.calls[0] < now - timedelta(minutes=1):
+                        self.calls.popleft()
+            self.calls.append(now)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        pass
+
+    def get_current_rate(self):
+        with self.lock:
+            return len(self.calls)
+
+
+def prime(limiter):
+    """Put a limiter in steady state: no burst capacity left"""
+    if isinstance(limiter, SlidingWindowLimiter):
+        now = datetime.now()
+        limiter.calls = deque(
+            now - timedelta(minutes=1) + timedelta(seconds=60 * (i + 1) / limiter.max_calls)
+            for i in range(limiter.max_calls)
+        )
+    else:
+        limiter._updated = time.monotonic()
+        limiter._requests.level = 0
+        if limiter._tokens is not None:
+            limiter._tokens.level = 0
+
+
+def simulate(limiter, workers: int, duration: float, latency: float, tokens: int) -> dict:
+    """Run workers against the limiter; returns call log and monitor stalls"""
+    started = []  # (time, actual tokens)
+    log_lock = threading.Lock()
+    stop = time.perf_counter() + duration
+    stalls = []
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        while time.perf_counter() < stop:
+            limiter.wait_if_needed(tokens)
+            now = time.perf_counter()
+            if now >= stop:
+                break
+            actual = int(tokens * rng.uniform(0.5, 1.5))
+            with log_lock:
+                started.append((now, actual))
+            time.sleep(latency)
+            limiter.record_usage(tokens, actual)
+
+    def monitor():
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            limiter.get_current_rate()
+            stalls.append(time.perf_counter() - start)
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(workers)]
+    threads.append(threading.Thread(target=monitor, daemon=True))
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=duration + 120)
+
+    return {"begin": begin, "calls": sorted(started), "stalls": sorted(stalls)}
+
+
+def sustained(result: dict, duration: float) -> tuple:
+    """Requests/min and tokens/min started during the run"""
+    minutes = duration / 60
+    calls = result["calls"]
+    return len(calls) / minutes, sum(n for _, n in calls) / minutes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the token-bucket rate limiter")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent worker threads")
+    parser.add_argument("--rpm", type=int, default=600, help="Requests/minute limit")
+    parser.add_argument("--tpm", type=int, default=600_000, help="Tokens/minute limit")
+    parser.add_argument("--tokens", type=int, default=1500, help="Estimated tokens per call")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated call latency in seconds")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per run")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("RATE LIMITER BENCHMARK")
+    print("=" * 70)
+    print(f"\nWorkers: {args.workers}, limits: {args.rpm} req/min, {args.tpm:,} tokens/min")
+    print(f"Call: ~{args.tokens} tokens, {args.latency * 1000:.0f}ms; {args.duration:.0f}s per run")
+
+    runs = [
+        ("Token bucket (requests)", RateLimiter(args.rpm)),
+        ("Token bucket (requests + tokens)", RateLimiter(args.rpm, args.tpm)),
+        ("Sliding window (previous)", SlidingWindowLimiter(args.rpm))
+    ]
+
+    print(f"\n  {'Limiter':<34} {'req/min':>8} {'% limit':>8} {'tok/min':>10} {'p99 lock wait':>14}")
+    for label, limiter in runs:
+        prime(limiter)
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = simulate(limiter, args.workers, args.duration, args.latency, args.tokens)
+        rpm, tpm = sustained(result, args.duration)
+        limit_pct = max(rpm / args.rpm, tpm / args.tpm if "tokens" in label else 0) * 100
+        stalls = result["stalls"]
+        p99 = stalls[int(len(stalls) * 0.99)] if stalls else 0.0
+        print(f"  {label:<34} {rpm:8.0f} {limit_pct:7.1f}% {tpm:10,.0f} {p99 * 1000:12.1f}ms")
+
+    print(f"\n  Binding limit: the larger '% limit' column (requests or tokens)")
+
+
+if __name__ == "__main__":
+    main()
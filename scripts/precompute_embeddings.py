@@ -20,7 +20,7 @@ import sys
 import argparse
 import time
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
 from dotenv import load_dotenv
 
@@ -28,16 +28,24 @@ from dotenv import load_dotenv
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from intelligence_capture.database import EnhancedIntelligenceDB, VALID_ENTITY_TYPES
-from intelligence_capture.config import DB_PATH
+from intelligence_capture.config import DB_PATH, EMBEDDING_STORE_PATH
+from intelligence_capture.duplicate_detector import DuplicateDetector
+from intelligence_capture.embedding_store import EmbeddingStore, get_embedding_store
+from intelligence_capture.name_normalizer import get_entity_text as _get_entity_text
 
 # Load environment variables
 load_dotenv()
 
+EMBEDDING_MODEL = DuplicateDetector.EMBEDDING_MODEL
+
 
 def get_entity_text(entity: Dict, entity_type: str) -> str:
     """
     Extract text from entity for embedding generation
     
+    Uses the same text as DuplicateDetector (name + truncated description),
+    so embeddings computed here are found by content hash during consolidation.
+    
     Args:
         entity: Entity dict
         entity_type: Type of entity
@@ -45,25 +53,7 @@ def get_entity_text(entity: Dict, entity_type: str) -> str:
     Returns:
         Text to embed
     """
-    # Combine name and description for better semantic matching
-    parts = []
-    
-    if "name" in entity and entity["name"]:
-        parts.append(str(entity["name"]))
-    
-    if "description" in entity and entity["description"]:
-        # Truncate description to avoid overwhelming name
-        desc = str(entity["description"])[:200]
-        parts.append(desc)
-    
-    # Fallback to other fields
-    if not parts:
-        if "title" in entity and entity["title"]:
-            parts.append(str(entity["title"]))
-        elif "metric_name" in entity and entity["metric_name"]:
-            parts.append(str(entity["metric_name"]))
-    
-    return " ".join(parts) if parts else ""
+    return _get_entity_text(entity, entity_type)
 
 
 def precompute_embeddings_for_type(
@@ -71,7 +61,8 @@ def precompute_embeddings_for_type(
     entity_type: str,
     openai_api_key: str,
     batch_size: int = 100,
-    dry_run: bool = False
+    dry_run: bool = False,
+    store: Optional[EmbeddingStore] = None
 ) -> Dict:
     """
     Pre-compute embeddings for all entities of a specific type
@@ -82,6 +73,7 @@ def precompute_embeddings_for_type(
         openai_api_key: OpenAI API key
         batch_size: Number of entities to process at once
         dry_run: If True, don't actually store embeddings
+        store: Optional content-addressed embedding store (checked before the API)
         
     Returns:
         Dict with statistics
@@ -103,6 +95,7 @@ def precompute_embeddings_for_type(
             "processed": 0,
             "failed": 0,
             "skipped": 0,
+            "store_hits": 0,
             "time": 0.0
         }
     
@@ -118,6 +111,7 @@ def precompute_embeddings_for_type(
         "processed": 0,
         "failed": 0,
         "skipped": 0,
+        "store_hits": 0,
         "time": 0.0
     }
     
@@ -131,6 +125,8 @@ def precompute_embeddings_for_type(
         
         print(f"\n  Processing batch {batch_num}/{total_batches} ({len(batch)} entities)...")
         
+        # Collect texts to embed
+        items = []
         for entity in batch:
             entity_id = entity.get("id")
             if not entity_id:
@@ -144,33 +140,55 @@ def precompute_embeddings_for_type(
                 stats["skipped"] += 1
                 continue
             
+            items.append((entity_id, text))
+        
+        if not items:
+            continue
+        
+        texts = [text for _, text in items]
+        
+        # Reuse embeddings already computed for the same text (any run, any subsystem)
+        embeddings = store.get_many(texts, EMBEDDING_MODEL) if store else [None] * len(texts)
+        stats["store_hits"] += sum(1 for embedding in embeddings if embedding is not None)
+        
+        missing = [position for position, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
             try:
-                # Generate embedding
+                # Generate all missing embeddings in one request
                 response = client.embeddings.create(
-                    model="text-embedding-3-small",
-                    input=text
+                    model=EMBEDDING_MODEL,
+                    input=[texts[position] for position in missing]
                 )
-                embedding = response.data[0].embedding
+                for position, item in zip(missing, response.data):
+                    embeddings[position] = item.embedding
                 
-                # Store in database
-                if not dry_run:
-                    success = db.store_entity_embedding(entity_type, entity_id, embedding)
-                    if success:
-                        stats["processed"] += 1
-                        print(f"    ✓ Entity {entity_id}: Embedding stored")
-                    else:
-                        stats["failed"] += 1
-                        print(f"    ✗ Entity {entity_id}: Failed to store")
-                else:
-                    stats["processed"] += 1
-                    print(f"    ✓ Entity {entity_id}: Would store embedding (dry run)")
+                if store and not dry_run:
+                    store.put_many([texts[position] for position in missing], [embeddings[position] for position in missing], EMBEDDING_MODEL)
                 
                 # Small delay to avoid rate limiting
                 time.sleep(0.05)
                 
             except Exception as e:
+                print(f"    ✗ Batch {batch_num}: Error - {e}")
+        
+        for (entity_id, _), embedding in zip(items, embeddings):
+            if embedding is None:
                 stats["failed"] += 1
-                print(f"    ✗ Entity {entity_id}: Error - {e}")
+                print(f"    ✗ Entity {entity_id}: No embedding generated")
+                continue
+            
+            # Store in database
+            if not dry_run:
+                success = db.store_entity_embedding(entity_type, entity_id, embedding)
+                if success:
+                    stats["processed"] += 1
+                    print(f"    ✓ Entity {entity_id}: Embedding stored")
+                else:
+                    stats["failed"] += 1
+                    print(f"    ✗ Entity {entity_id}: Failed to store")
+            else:
+                stats["processed"] += 1
+                print(f"    ✓ Entity {entity_id}: Would store embedding (dry run)")
         
         # Progress update
         progress = (i + len(batch)) / len(entities) * 100
@@ -185,6 +203,7 @@ def precompute_embeddings_for_type(
     print(f"    Processed: {stats['processed']}")
     print(f"    Failed: {stats['failed']}")
     print(f"    Skipped: {stats['skipped']}")
+    print(f"    Embedding store hits: {stats['store_hits']}")
     print(f"    Time: {stats['time']:.1f}s")
     print(f"    Rate: {stats['processed'] / stats['time']:.1f} entities/second")
     
@@ -213,6 +232,17 @@ def main():
         default=100,
         help="Number of entities to process at once (default: 100)"
     )
+    parser.add_argument(
+        "--embedding-store",
+        type=Path,
+        default=EMBEDDING_STORE_PATH,
+        help="Path to the shared content-addressed embedding store"
+    )
+    parser.add_argument(
+        "--no-embedding-store",
+        action="store_true",
+        help="Always call the API, even for texts embedded before"
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -238,6 +268,7 @@ def main():
     print("="*70)
     print(f"Database: {args.db_path}")
     print(f"Batch size: {args.batch_size}")
+    print(f"Embedding store: {'disabled' if args.no_embedding_store else args.embedding_store}")
     print(f"Dry run: {args.dry_run}")
     print()
     
@@ -245,6 +276,8 @@ def main():
     db = EnhancedIntelligenceDB(args.db_path)
     db.connect()
     
+    store = None if args.no_embedding_store else get_embedding_store(args.embedding_store)
+    
     # Determine which entity types to process
     entity_types = args.entity_types if args.entity_types else list(VALID_ENTITY_TYPES)
     
@@ -263,7 +296,8 @@ def main():
                 entity_type,
                 openai_api_key,
                 args.batch_size,
-                args.dry_run
+                args.dry_run,
+                store
             )
             all_stats.append(stats)
         except Exception as e:
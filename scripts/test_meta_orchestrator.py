@@ -95,6 +95,7 @@ def test_single_interview():
     print(f"Validation Passed: {'✅' if result.validation_passed else '❌'}")
     print(f"Iterations: {result.iterations}")
     print(f"Processing Time: {result.processing_time:.1f}s")
+    print(f"API Cost: ${result.api_cost:.4f}")
 
     if result.missing_entities:
         print(f"\n⚠️  Missing Entity Types:")
@@ -204,12 +205,14 @@ def test_batch_interviews(num_interviews: int = 5):
     avg_quality = sum(r.quality_score for r in results) / len(results) if results else 0
     total_time = sum(r.processing_time for r in results)
     total_iterations = sum(r.iterations for r in results)
+    total_cost = sum(r.api_cost for r in results)
 
     print(f"Successful: {successful}/{len(results)}")
     print(f"Total Entities: {total_entities}")
     print(f"Avg Quality Score: {avg_quality:.2%}")
     print(f"Total Time: {total_time:.1f}s")
     print(f"Avg Time per Interview: {total_time/len(results):.1f}s")
+    print(f"Total API Cost: ${total_cost:.4f}")
     print(f"Total Iterations: {total_iterations}")
     print(f"Avg Iterations: {total_iterations/len(results):.1f}")
 
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for IntelligenceDB.insert_entities_batch
+
+Tests:
+- Bulk path writes the same rows as the per-entity insert methods (all 19 types)
+- Failing entities are reported without dropping the rest of the batch
+- Systems are upserted by name, including repeats inside one batch
+- One commit per batch, full rollback when the batch cannot run
+"""
+import contextlib
+import io
+
+import pytest
+
+from intelligence_capture.database import EnhancedIntelligenceDB, IntelligenceDB, VALID_ENTITY_TYPES
+
+
+# Per-entity insert method per batch type (None: systems signature)
+SINGLE_INSERTS = {
+    "pain_points": ("insert_pain_point", False),
+    "processes": ("insert_process", False),
+    "systems": ("insert_or_update_system", None),
+    "kpis": ("insert_kpi", False),
+    "automation_candidates": ("insert_automation_candidate", False),
+    "inefficiencies": ("insert_inefficiency", False),
+    "communication_channels": ("insert_communication_channel", True),
+    "decision_points": ("insert_decision_point", True),
+    "data_flows": ("insert_data_flow", True),
+    "temporal_patterns": ("insert_temporal_pattern", True),
+    "failure_modes": ("insert_failure_mode", True),
+    "team_structures": ("insert_team_structure", True),
+    "knowledge_gaps": ("insert_knowledge_gap", True),
+    "success_patterns": ("insert_success_pattern", True),
+    "budget_constraints": ("insert_budget_constraint", True),
+    "external_dependencies": ("insert_external_dependency", True),
+    "pain_points_v2": ("insert_enhanced_pain_point", True),
+    "systems_v2": ("insert_or_update_enhanced_system", None),
+    "automation_candidates_v2": ("insert_enhanced_automation_candidate", True)
+}
+
+
+def _entities(entity_type: str) -> list:
+    """Entities for one type; systems repeat a name"""
+    names = ["SAP", "Excel", "SAP"] if entity_type.startswith("systems") else ["SAP", "Excel", "Opera"]
+    return [
+        {
+            "name": name,
+            "description": f"Descripción {i}",
+            "type": "Process Inefficiency",
+            "channel_name": "WhatsApp",
+            "confidence_score": 0.5 + i * 0.2,
+            "pain_points": [f"Problema {i}"],
+            "replicable_to": ["Hotel", "Restaurante"]
+        }
+        for i, name in enumerate(names)
+    ]
+
+
+def _snapshot(db) -> dict:
+    """All entity rows without timestamps"""
+    rows = {}
+    for table in sorted(VALID_ENTITY_TYPES):
+        cursor = db.conn.execute(f"SELECT * FROM {table} ORDER BY id")
+        columns = [column[0] for column in cursor.description]
+        rows[table] = [
+            {column: value for column, value in zip(columns, row) if column not in ("created_at", "updated_at")}
+            for row in cursor.fetchall()
+        ]
+    return rows
+
+
+@pytest.fixture
+def make_db(tmp_path):
+    """Factory for databases with v1, v2 and consolidation schema"""
+    databases = []
+
+    def make(name: str):
+        db = EnhancedIntelligenceDB(tmp_path / f"{name}.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.connect()
+            db.init_schema()
+            db.init_v2_schema()
+            db.add_consolidation_schema()
+        db.interview_id = db.insert_interview({"company": "Comversa", "respondent": "Ana", "date": "2025-11-01"}, {})
+        databases.append(db)
+        return db
+
+    yield make
+    for db in databases:
+        db.close()
+
+
+class TestInsertEntitiesBatch:
+    """Test suite for the bulk insert path"""
+
+    def test_matches_per_entity_inserts(self, make_db):
+        """Test every batch type writes exactly what the single-row methods write"""
+        batch_db = make_db("batch")
+        single_db = make_db("single")
+
+        for entity_type, (method_name, takes_business_unit) in SINGLE_INSERTS.items():
+            result = batch_db.insert_entities_batch(
+                entity_type, _entities(entity_type), batch_db.interview_id, "Comversa", "Restaurantes"
+            )
+            assert result == {"success": True, "inserted": 3, "total": 3, "errors": []}, entity_type
+
+            method = getattr(single_db, method_name)
+            for entity in _entities(entity_type):
+                if takes_business_unit is None:
+                    method(entity, "Comversa")
+                elif takes_business_unit:
+                    method(single_db.interview_id, "Comversa", "Restaurantes", entity)
+                else:
+                    method(single_db.interview_id, "Comversa", entity)
+
+        batch_rows = _snapshot(batch_db)
+        assert batch_rows == _snapshot(single_db)
+        assert all(row["normalized_name"] for row in batch_rows["systems"])
+
+    def test_failing_entity_is_isolated(self, make_db):
+        """Test a row violating a constraint is reported and the others are kept"""
+        db = make_db("errors")
+        entities = [{"name": "Compras"}, {"name": None, "description": "sin nombre"}, {"name": "Ventas"}]
+
+        result = db.insert_entities_batch("processes", entities, db.interview_id, "Comversa")
+
+        assert result["success"] is False
+        assert result["inserted"] == 2
+        assert len(result["errors"]) == 1
+        assert "NOT NULL" in result["errors"][0]
+        assert [row["name"] for row in _snapshot(db)["processes"]] == ["Compras", "Ventas"]
+
+    def test_systems_upsert_merges_repeats(self, make_db):
+        """Test repeated and existing system names update one row"""
+        db = make_db("systems")
+        db.insert_or_update_system({"name": "SAP"}, "Hotel")
+
+        db.insert_entities_batch("systems", [{"name": "SAP"}, {"name": "Excel"}, {"name": "Excel"}], 1, "Comversa")
+
+        rows = {row["name"]: row for row in _snapshot(db)["systems"]}
+        assert rows["SAP"]["usage_count"] == 2
+        assert rows["SAP"]["companies_using"] == '["Hotel", "Comversa"]'
+        assert rows["Excel"]["usage_count"] == 2
+        assert rows["Excel"]["companies_using"] == '["Comversa"]'
+
+    def test_single_commit_per_batch(self, make_db):
+        """Test the batch is written in one transaction"""
+        db = make_db("commit")
+        commits = []
+        db.conn.set_trace_callback(lambda sql: commits.append(sql) if sql.strip().upper() == "COMMIT" else None)
+
+        db.insert_entities_batch("kpis", [{"name": f"KPI {i}"} for i in range(50)], db.interview_id, "Comversa")
+
+        assert len(commits) == 1
+        assert not db.conn.in_transaction
+
+    def test_unknown_type_rolls_back(self, make_db):
+        """Test an unknown entity type fails the whole batch"""
+        db = make_db("unknown")
+
+        result = db.insert_entities_batch("unknown_type", [{"name": "x"}], db.interview_id, "Comversa")
+
+        assert result["success"] is False
+        assert result["inserted"] == 0
+        assert "Unknown entity type" in result["errors"][0]
+
+    def test_v1_database_supports_v1_types(self, tmp_path):
+        """Test the base IntelligenceDB handles v1 types without v2 methods"""
+        db = IntelligenceDB(tmp_path / "v1.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.connect()
+            db.init_schema()
+        interview_id = db.insert_interview({"company": "Comversa", "respondent": "Ana", "date": "2025-11-01"}, {})
+
+        result = db.insert_entities_batch("pain_points", [{"type": "Manual", "description": "Doble digitación"}], interview_id, "Comversa")
+
+        assert result["inserted"] == 1
+        db.close()
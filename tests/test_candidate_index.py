@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for CandidateIndex Component
+
+Tests:
+- Indexed fuzzy candidates match a full linear scan
+- Incremental indexing when the entity list grows in place
+- Rebuild when a different entity list is passed
+- Top-k pruning and the count filter keep the linear scan's results
+- Re-indexing of entities updated in place (gated by the caller's revision)
+"""
+import random
+import pytest
+from intelligence_capture.duplicate_detector import DuplicateDetector
+
+
+WORDS = [
+    "excel", "sap", "erp", "whatsapp", "correo", "facturas", "inventario",
+    "planilla", "reportes", "ventas", "compras", "sistema", "proceso",
+    "aprobación", "conciliación", "bancaria", "manual", "pedidos", "cocina"
+]
+
+
+def _random_entity(rng: random.Random, entity_id: int) -> dict:
+    """Build a random entity from a small Spanish vocabulary"""
+    name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+    description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 6)))
+    return {"id": entity_id, "name": name, "description": description}
+
+
+class TestCandidateIndex:
+    """Test suite for CandidateIndex"""
+
+    @pytest.fixture
+    def config(self):
+        """Standard configuration for tests"""
+        return {
+            "similarity_thresholds": {
+                "systems": 0.75,
+                "pain_points": 0.70,
+                "default": 0.85
+            },
+            "performance": {
+                "max_candidates": 10,
+                "enable_caching": True,
+                "use_db_storage": False
+            }
+        }
+
+    @pytest.fixture
+    def indexed(self, config):
+        """Detector using the candidate index"""
+        return DuplicateDetector(config, openai_api_key=None, db=None)
+
+    @pytest.fixture
+    def scanning(self, config):
+        """Detector using a full linear scan"""
+        scan_config = dict(config)
+        scan_config["performance"] = dict(config["performance"], use_candidate_index=False)
+        return DuplicateDetector(scan_config, openai_api_key=None, db=None)
+
+    @pytest.mark.parametrize("entity_type", ["systems", "pain_points", "processes"])
+    def test_index_matches_full_scan(self, indexed, scanning, entity_type):
+        """Test indexed results are identical to the linear scan"""
+        rng = random.Random(42)
+        existing = [_random_entity(rng, i) for i in range(500)]
+
+        for _ in range(50):
+            entity = _random_entity(rng, -1)
+            assert indexed.find_duplicates(entity, entity_type, existing) == \
+                scanning.find_duplicates(entity, entity_type, existing)
+
+            threshold = indexed._get_similarity_threshold(entity_type) * 0.7
+            text = indexed._get_entity_text(entity, entity_type)
+            assert indexed._find_fuzzy_candidates(text, entity_type, existing, threshold, 20) == \
+                scanning._find_fuzzy_candidates(text, entity_type, existing, threshold, 20)
+
+    @pytest.mark.parametrize("limit", [1, 3, 20])
+    def test_top_k_matches_full_scan(self, indexed, scanning, limit):
+        """Test top-k pruning keeps the linear scan's candidates and tie order"""
+        rng = random.Random(7)
+        existing = [_random_entity(rng, i) for i in range(300)]
+        existing += [dict(entity, id=1000 + i) for i, entity in enumerate(existing[:50])]  # Exact ties
+
+        for _ in range(30):
+            text = indexed._get_entity_text(_random_entity(rng, -1), "systems")
+            assert indexed._find_fuzzy_candidates(text, "systems", existing, 0.5, limit) == \
+                scanning._find_fuzzy_candidates(text, "systems", existing, 0.5, limit)
+
+    def test_statistics_report_pruning(self, indexed):
+        """Test entities that cannot reach the cutoff are never scored"""
+        rng = random.Random(3)
+        existing = [_random_entity(rng, i) for i in range(200)]
+        existing.append({"id": 999, "name": "Zzyzx qqq"})
+
+        indexed.find_duplicates({"name": "Zzyzx qqq"}, "systems", existing)
+        stats = indexed.candidate_index.get_statistics()
+
+        assert stats["candidates_considered"] == 201
+        assert stats["candidates_scored"] < 20
+        assert stats["pruning_ratio"] > 0.9
+
+    def test_uses_stored_profile(self, indexed):
+        """Test stored name_profile values are used instead of recomputed"""
+        from intelligence_capture.name_normalizer import PROFILE_SIZE
+
+        # An all-zero stored profile bounds the entity at 0.0: never scored
+        existing = [{"id": 1, "name": "SAP", "normalized_name": "sap", "name_profile": bytes(PROFILE_SIZE)}]
+        assert indexed.find_duplicates({"name": "SAP"}, "systems", existing) == []
+
+        # Without a profile the index computes it from the stored name
+        existing = [{"id": 1, "name": "SAP", "normalized_name": "sap", "name_profile": None}]
+        assert [d[0]["id"] for d in indexed.find_duplicates({"name": "SAP"}, "systems", existing)] == [1]
+
+    def test_index_grows_incrementally(self, indexed):
+        """Test appending to the same list only indexes the new entities"""
+        existing = [{"id": 1, "name": "Excel", "description": "Hoja de cálculo"}]
+        indexed.find_duplicates({"name": "SAP"}, "systems", existing)
+
+        existing.append({"id": 2, "name": "SAP", "description": ""})
+        duplicates = indexed.find_duplicates({"name": "SAP"}, "systems", existing)
+
+        assert [d[0]["id"] for d in duplicates] == [2]
+        stats = indexed.candidate_index.get_statistics()
+        assert stats["rebuilds"] == 1
+        assert stats["indexed_entities"] == 2
+
+    def test_index_rebuilds_for_new_list(self, indexed):
+        """Test passing a different list rebuilds the index for that type"""
+        indexed.find_duplicates({"name": "SAP"}, "systems", [{"id": 1, "name": "SAP"}])
+        duplicates = indexed.find_duplicates({"name": "SAP"}, "systems", [{"id": 7, "name": "SAP"}])
+
+        assert [d[0]["id"] for d in duplicates] == [7]
+        assert indexed.candidate_index.get_statistics()["rebuilds"] == 2
+
+    def test_update_reindexes_entity(self, indexed):
+        """Test update() picks up an entity changed in place"""
+        existing = [{"id": 1, "name": "Excel"}, {"id": 2, "name": "WhatsApp"}]
+        assert indexed.find_duplicates({"name": "SAP"}, "systems", existing) == []
+
+        existing[1] = {"id": 2, "name": "SAP"}
+        indexed.candidate_index.update("systems", 1, existing[1])
+        duplicates = indexed.find_duplicates({"name": "SAP"}, "systems", existing)
+
+        assert [d[0]["id"] for d in duplicates] == [2]
+
+    def test_sync_detects_in_place_edits(self, indexed):
+        """Test entities edited in place are re-indexed when the revision changes"""
+        existing = [{"id": 1, "name": "Excel"}, {"id": 2, "name": "WhatsApp"}]
+        assert indexed.find_duplicates({"name": "SAP"}, "systems", existing, revision=0) == []
+
+        existing[1]["name"] = "SAP"
+        duplicates = indexed.find_duplicates({"name": "SAP"}, "systems", existing, revision=1)
+
+        assert [d[0]["id"] for d in duplicates] == [2]
+        assert indexed.candidate_index.get_statistics()["rebuilds"] == 1
+
+    def test_sync_without_revision_does_not_rescan(self, indexed):
+        """Test syncs without a revision only index appended entities"""
+        existing = [{"id": 1, "name": "Excel"}, {"id": 2, "name": "WhatsApp"}]
+        indexed.find_duplicates({"name": "SAP"}, "systems", existing)
+
+        existing[1]["name"] = "SAP"
+        existing.append({"id": 3, "name": "SAP"})
+        duplicates = indexed.find_duplicates({"name": "SAP"}, "systems", existing)
+
+        assert [d[0]["id"] for d in duplicates] == [3]
+        assert indexed.candidate_index.get_statistics()["reindexed"] == 0
+
+    def test_revision_gates_the_change_check(self, indexed):
+        """Test entities are only re-checked when the caller's revision changes"""
+        existing = [{"id": 1, "name": "Excel"}, {"id": 2, "name": "WhatsApp"}]
+        indexed.find_duplicates({"name": "SAP"}, "systems", existing, revision=0)
+
+        existing[1] = {"id": 2, "name": "SAP"}
+        assert indexed.find_duplicates({"name": "SAP"}, "systems", existing, revision=0) == []
+        duplicates = indexed.find_duplicates({"name": "SAP"}, "systems", existing, revision=1)
+
+        assert [d[0]["id"] for d in duplicates] == [2]
+        assert indexed.candidate_index.get_statistics()["reindexed"] == 1
+
+    def test_skips_entities_without_text(self, indexed):
+        """Test entities without name or description are never candidates"""
+        existing = [{"id": 1}, {"id": 2, "name": ""}, {"id": 3, "name": "SAP"}]
+        duplicates = indexed.find_duplicates({"name": "SAP"}, "systems", existing)
+
+        assert [d[0]["id"] for d in duplicates] == [3]
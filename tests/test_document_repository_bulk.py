@@ -0,0 +1,186 @@
+"""
+Pruebas para la carga masiva (COPY binario) de DocumentRepository.
+"""
+import asyncio
+
+import pytest
+
+from intelligence_capture.persistence.document_repository import (
+    CHUNK_COLUMNS,
+    EMBEDDING_COLUMNS,
+    DocumentRepository,
+    DocumentRepositoryError,
+    decode_vector,
+    encode_vector,
+)
+from intelligence_capture.persistence.models import (
+    ChunkEmbeddingPayload,
+    DocumentChunkPayload,
+    DocumentPayload,
+)
+
+
+class FakeTransaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        self.conn.calls.append(("BEGIN",))
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.conn.calls.append(("ROLLBACK",) if exc_type else ("COMMIT",))
+        return False
+
+
+class FakeConnection:
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+    async def execute(self, sql, *args):
+        self.calls.append(("execute", " ".join(sql.split()), args))
+        if self.fail_on and self.fail_on in sql:
+            raise RuntimeError("fallo simulado")
+
+    async def executemany(self, sql, params):
+        self.calls.append(("executemany", " ".join(sql.split()), list(params)))
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        self.calls.append(("copy", table, list(records), columns))
+
+
+class FakeAcquire:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        return FakeAcquire(self.conn)
+
+
+def _bundle(chunk_count):
+    payload = DocumentPayload(
+        org_id="los_tajibos",
+        source_type="manual_upload",
+        checksum="abc123",
+        storage_path="data/documents/originals/abc.pdf",
+        metadata={},
+        chunks=[
+            DocumentChunkPayload(content=f"Chunk {index}", chunk_index=index, token_count=2)
+            for index in range(chunk_count)
+        ],
+    )
+    document_id = payload.resolve_document_id()
+    embeddings = [
+        ChunkEmbeddingPayload(chunk_id=chunk.chunk_id, document_id=document_id, vector=[0.5, -1.25, 3.0])
+        for chunk in payload.chunks
+    ]
+    return payload, embeddings
+
+
+def _persist(conn, payload, embeddings, **options):
+    repository = DocumentRepository(FakePool(conn), **options)
+    return asyncio.run(repository.persist_document_bundle(payload, chunk_embeddings=embeddings))
+
+
+def test_vector_codec_roundtrip_is_packed_float32():
+    data = encode_vector([0.5, -1.25, 3.0])
+
+    assert data[:4] == b"\x00\x03\x00\x00"
+    assert len(data) == 4 + 3 * 4
+    assert decode_vector(data) == [0.5, -1.25, 3.0]
+    assert decode_vector(encode_vector([])) == []
+
+
+def test_small_bundle_uses_executemany():
+    conn = FakeConnection()
+    payload, embeddings = _bundle(3)
+
+    result = _persist(conn, payload, embeddings, vector_codec=True, bulk_copy_threshold=10)
+
+    kinds = [call[0] for call in conn.calls]
+    assert "copy" not in kinds
+    assert kinds.count("executemany") == 2
+    assert result.embedding_count == 3
+    # Con codec el vector viaja como secuencia, sin literal de texto
+    embedding_params = [call for call in conn.calls if call[0] == "executemany"][1][2]
+    assert embedding_params[0][6] == [0.5, -1.25, 3.0]
+
+
+def test_large_bundle_copies_into_staging_and_upserts():
+    conn = FakeConnection()
+    payload, embeddings = _bundle(5)
+
+    result = _persist(conn, payload, embeddings, vector_codec=True, bulk_copy_threshold=5)
+
+    copies = [call for call in conn.calls if call[0] == "copy"]
+    assert [(call[1], call[3]) for call in copies] == [
+        ("_staging_document_chunks", list(CHUNK_COLUMNS)),
+        ("_staging_embeddings", list(EMBEDDING_COLUMNS)),
+    ]
+    assert len(copies[0][2]) == 5
+    assert [record[1] for record in copies[1][2]] == [str(chunk.chunk_id) for chunk in payload.chunks]
+
+    statements = [call[1] for call in conn.calls if call[0] == "execute"]
+    assert any(
+        sql.startswith("INSERT INTO document_chunks") and "FROM _staging_document_chunks ON CONFLICT (id)" in sql
+        for sql in statements
+    )
+    assert any(
+        sql.startswith("INSERT INTO embeddings") and "FROM _staging_embeddings ON CONFLICT (chunk_id)" in sql
+        for sql in statements
+    )
+    assert conn.calls[0] == ("BEGIN",) and conn.calls[-1] == ("COMMIT",)
+    assert result.chunk_ids == [chunk.chunk_id for chunk in payload.chunks]
+    assert result.embedding_count == 5
+
+
+def test_large_embeddings_without_codec_use_text_literals():
+    conn = FakeConnection()
+    payload, embeddings = _bundle(5)
+
+    _persist(conn, payload, embeddings, bulk_copy_threshold=5)
+
+    copies = [call[1] for call in conn.calls if call[0] == "copy"]
+    assert copies == ["_staging_document_chunks"]
+    embedding_params = [call for call in conn.calls if call[0] == "executemany"][0][2]
+    assert embedding_params[0][6] == "[0.50000000,-1.25000000,3.00000000]"
+
+
+def test_copy_keeps_last_row_per_conflict_key():
+    conn = FakeConnection()
+    payload, embeddings = _bundle(4)
+    chunk_id = payload.chunks[0].chunk_id
+    embeddings.append(
+        ChunkEmbeddingPayload(chunk_id=chunk_id, document_id=payload.document_id, vector=[9.0, 9.0, 9.0])
+    )
+
+    _persist(conn, payload, embeddings, vector_codec=True, bulk_copy_threshold=4)
+
+    embedding_records = [call for call in conn.calls if call[0] == "copy"][1][2]
+    assert len(embedding_records) == 4
+    assert [record for record in embedding_records if record[1] == str(chunk_id)][0][6] == [9.0, 9.0, 9.0]
+
+
+def test_failed_upsert_rolls_back_bundle():
+    conn = FakeConnection(fail_on="INSERT INTO embeddings")
+    payload, embeddings = _bundle(5)
+
+    with pytest.raises(DocumentRepositoryError):
+        _persist(conn, payload, embeddings, vector_codec=True, bulk_copy_threshold=5)
+
+    assert conn.calls[-1] == ("ROLLBACK",)
+    assert not any(call[0] == "execute" and "ingestion_events" in call[1] for call in conn.calls)
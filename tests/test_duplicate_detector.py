@@ -8,6 +8,7 @@ Tests:
 - Semantic similarity calculation
 - Threshold configuration per entity type
 - Fuzzy-first candidate filtering
+- Bounded embedding cache
 """
 import pytest
 from unittest.mock import Mock, patch, MagicMock
@@ -283,6 +284,28 @@ class TestDuplicateDetector:
         assert stats["memory_cache_misses"] == 0
         assert stats["circuit_breaker_open"] == False
 
+    
+    @patch('intelligence_capture.duplicate_detector.OpenAI')
+    def test_embedding_cache_is_bounded(self, mock_openai_class, config):
+        """Test the embedding cache keeps unit vectors with their embedding and evicts LRU"""
+        mock_client = MagicMock()
+        mock_openai_class.return_value = mock_client
+        vectors = {"uno": [1.0, 0.0], "dos": [0.0, 2.0], "tres": [3.0, 4.0]}
+        mock_client.embeddings.create.side_effect = lambda model, input: MagicMock(
+            data=[MagicMock(embedding=vectors[text]) for text in (input if isinstance(input, list) else [input])]
+        )
+        config["performance"]["max_cached_embeddings"] = 2
+        detector = DuplicateDetector(config, openai_api_key="test-key", db=None)
+        
+        detector.calculate_semantic_similarities("uno", ["dos"])
+        assert [entry[1].tolist() for entry in detector.embedding_cache.values()] == [[1.0, 0.0], [0.0, 1.0]]
+        
+        detector.calculate_semantic_similarities("tres", ["dos"])
+        
+        assert "uno" not in detector.embedding_cache
+        assert sorted(detector.embedding_cache) == ["dos", "tres"]
+        assert detector.embedding_cache["tres"][1].tolist() == pytest.approx([0.6, 0.8])
+        assert detector.get_cache_statistics()["memory_cache_entries"] == 2
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Micro-batching Embedding Client
+
+Tests:
+- Concurrent single-text calls are sent as one batched request and every
+  caller gets its own vector
+- max_batch_size splits batches; identical texts are sent once
+- Errors reach every caller of the batch
+- Async facade and AsyncEmbeddingBatcher batch gathered coroutines
+- Clients of the same account share one registered batcher
+- DuplicateDetector batches embeddings of concurrent workers
+"""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from intelligence_capture import embedding_batcher
+from intelligence_capture.duplicate_detector import DuplicateDetector, EmbeddingError
+from intelligence_capture.embedding_batcher import (
+    AsyncEmbeddingBatcher,
+    EmbeddingBatcher,
+    embedding_batcher_statistics,
+    get_async_embedding_batcher,
+    get_embedding_batcher
+)
+
+
+def _vector(text):
+    return [float(len(text)), float(sum(map(ord, text)) % 97)]
+
+
+class RecordingRequest:
+    """Sync request function that records every batch"""
+
+    def __init__(self, delay=0.0, error=None):
+        self.batches = []
+        self.delay = delay
+        self.error = error
+        self._lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self._lock:
+            self.batches.append(list(texts))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [_vector(text) for text in texts]
+
+
+def _embed_concurrently(batcher, texts):
+    results = [None] * len(texts)
+    errors = [None] * len(texts)
+    start = threading.Barrier(len(texts))
+
+    def run(index):
+        start.wait()
+        try:
+            results[index] = batcher.embed(texts[index])
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class TestEmbeddingBatcher:
+    """Test suite for the thread batcher"""
+
+    def test_concurrent_calls_share_one_request(self):
+        """Test single-text calls arriving together are one batch"""
+        request = RecordingRequest()
+        batcher = EmbeddingBatcher(request, max_wait_ms=200)
+        texts = [f"texto {i}" for i in range(16)]
+
+        results, _ = _embed_concurrently(batcher, texts)
+        batcher.close()
+
+        assert results == [_vector(text) for text in texts]
+        assert len(request.batches) == 1
+        assert sorted(request.batches[0]) == sorted(texts)
+        stats = batcher.get_statistics()
+        assert stats["requests"] == 16
+        assert stats["batches"] == 1
+        assert stats["avg_batch_size"] == 16.0
+
+    def test_max_batch_size_splits_batches(self):
+        """Test no request carries more than max_batch_size texts"""
+        request = RecordingRequest()
+        batcher = EmbeddingBatcher(request, max_batch_size=4, max_wait_ms=50)
+
+        results = batcher.embed_many([f"t{i}" for i in range(10)])
+        batcher.close()
+
+        assert results == [_vector(f"t{i}") for i in range(10)]
+        assert max(len(batch) for batch in request.batches) <= 4
+        assert sum(len(batch) for batch in request.batches) == 10
+
+    def test_identical_texts_sent_once(self):
+        """Test duplicate texts in a batch share one input"""
+        request = RecordingRequest()
+        batcher = EmbeddingBatcher(request, max_wait_ms=50)
+
+        results = batcher.embed_many(["SAP", "Excel", "SAP"])
+        batcher.close()
+
+        assert results == [_vector("SAP"), _vector("Excel"), _vector("SAP")]
+        assert request.batches == [["SAP", "Excel"]]
+        assert batcher.get_statistics()["deduplicated"] == 1
+
+    def test_errors_reach_every_caller(self):
+        """Test a failed batch raises in every waiting caller"""
+        request = RecordingRequest(error=RuntimeError("502"))
+        batcher = EmbeddingBatcher(request, max_wait_ms=100)
+
+        _, errors = _embed_concurrently(batcher, ["a", "b", "c"])
+        batcher.close()
+
+        assert all(isinstance(error, RuntimeError) for error in errors)
+        assert batcher.get_statistics()["failed_batches"] >= 1
+
+    def test_vector_count_mismatch_raises(self):
+        """Test a response with missing vectors is an error, not a misassignment"""
+        batcher = EmbeddingBatcher(lambda texts: [[0.0]], max_wait_ms=50)
+
+        with pytest.raises(ValueError):
+            batcher.embed_many(["a", "b"])
+        batcher.close()
+
+    def test_closed_batcher_rejects_texts(self):
+        """Test close() sends queued texts and refuses new ones"""
+        batcher = EmbeddingBatcher(RecordingRequest(), max_wait_ms=1000)
+        future = batcher.submit("pendiente")
+        batcher.close()
+
+        assert future.result(1) == _vector("pendiente")
+        with pytest.raises(RuntimeError):
+            batcher.submit("tarde")
+
+    def test_async_facade(self):
+        """Test gathered coroutines are batched without blocking the loop"""
+        request = RecordingRequest()
+        batcher = EmbeddingBatcher(request, max_wait_ms=50)
+
+        async def main():
+            return await asyncio.gather(*(batcher.embed_async(f"q{i}") for i in range(5)))
+
+        results = asyncio.run(main())
+        batcher.close()
+
+        assert results == [_vector(f"q{i}") for i in range(5)]
+        assert len(request.batches) == 1
+
+    def test_for_client_sends_list_input(self):
+        """Test the client batcher calls embeddings.create with a list"""
+        client = MagicMock()
+        client.embeddings.create.side_effect = lambda model, input: SimpleNamespace(
+            data=[SimpleNamespace(embedding=_vector(text)) for text in input]
+        )
+        batcher = get_embedding_batcher(client, "text-embedding-3-small", max_wait_ms=50)
+
+        assert get_embedding_batcher(client, "text-embedding-3-small") is batcher
+        assert batcher.embed_many(["uno", "dos"]) == [_vector("uno"), _vector("dos")]
+        client.embeddings.create.assert_called_once_with(model="text-embedding-3-small", input=["uno", "dos"])
+        assert embedding_batcher_statistics()["embeddings:text-embedding-3-small"]["batches"] >= 1
+
+    def test_clients_of_one_account_share_a_batcher(self):
+        """Test separately built clients with the same key and URL reuse one batcher"""
+        def client(api_key, base_url="https://api.openai.com/v1/"):
+            return SimpleNamespace(api_key=api_key, base_url=base_url, embeddings=MagicMock())
+
+        batchers_before = len(embedding_batcher._batchers)
+        first = get_embedding_batcher(client("sk-registry"), "text-embedding-3-large")
+
+        for _ in range(5):
+            assert get_embedding_batcher(client("sk-registry"), "text-embedding-3-large") is first
+        assert get_embedding_batcher(client("sk-other"), "text-embedding-3-large") is not first
+        assert get_embedding_batcher(client("sk-registry", "http://localhost:8080"), "text-embedding-3-large") is not first
+        assert len(embedding_batcher._batchers) == batchers_before + 3
+
+
+class TestAsyncEmbeddingBatcher:
+    """Test suite for the asyncio batcher"""
+
+    def test_gathered_calls_share_one_request(self):
+        """Test coroutines of one loop are one batch"""
+        batches = []
+
+        async def request(texts):
+            batches.append(list(texts))
+            await asyncio.sleep(0.01)
+            return [_vector(text) for text in texts]
+
+        batcher = AsyncEmbeddingBatcher(request, max_wait_ms=20)
+
+        async def main():
+            return await asyncio.gather(*(batcher.embed(text) for text in ["a", "b", "a", "c"]))
+
+        assert asyncio.run(main()) == [_vector(text) for text in ["a", "b", "a", "c"]]
+        assert batches == [["a", "b", "c"]]
+        assert batcher.get_statistics()["pending"] == 0
+
+    def test_full_batch_is_sent_without_waiting(self):
+        """Test max_batch_size flushes before max_wait_ms"""
+        batches = []
+
+        async def request(texts):
+            batches.append(list(texts))
+            return [_vector(text) for text in texts]
+
+        batcher = AsyncEmbeddingBatcher(request, max_batch_size=2, max_wait_ms=10_000)
+
+        async def main():
+            return await asyncio.wait_for(asyncio.gather(batcher.embed("a"), batcher.embed("b")), 1)
+
+        assert asyncio.run(main()) == [_vector("a"), _vector("b")]
+        assert batches == [["a", "b"]]
+
+    def test_errors_reach_every_caller(self):
+        """Test a failed batch raises in every coroutine"""
+        async def request(texts):
+            raise RuntimeError("timeout")
+
+        batcher = AsyncEmbeddingBatcher(request, max_wait_ms=5)
+
+        async def main():
+            return await asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in asyncio.run(main()))
+
+    def test_for_client(self):
+        """Test the shared async client batcher awaits embeddings.create"""
+        calls = []
+
+        async def create(*, model, input):
+            calls.append(input)
+            return SimpleNamespace(data=[SimpleNamespace(embedding=_vector(text)) for text in input])
+
+        client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+        batcher = get_async_embedding_batcher(client, "text-embedding-3-small", max_wait_ms=10)
+
+        async def main():
+            return await asyncio.gather(batcher.embed("x"), batcher.embed("y"))
+
+        assert asyncio.run(main()) == [_vector("x"), _vector("y")]
+        assert calls == [["x", "y"]]
+
+
+class TestDuplicateDetectorBatching:
+    """Test suite for the batched duplicate detector path"""
+
+    def _detector(self, client):
+        config = {"performance": {"embedding_batching": {"enabled": True, "max_wait_ms": 200}}}
+        with patch("intelligence_capture.duplicate_detector.OpenAI", return_value=client), \
+                patch("intelligence_capture.duplicate_detector.HAVE_OPENAI", True):
+            return DuplicateDetector(config, openai_api_key="test-key")
+
+    def test_concurrent_workers_share_one_request(self):
+        """Test distinct texts from worker threads are one embeddings call"""
+        client = MagicMock()
+        client.embeddings.create.side_effect = lambda model, input: SimpleNamespace(
+            data=[SimpleNamespace(embedding=_vector(text)) for text in input]
+        )
+        detector = self._detector(client)
+        texts = [f"Sistema {i}" for i in range(8)]
+
+        results, _ = _embed_concurrently(SimpleNamespace(embed=detector._get_embedding), texts)
+
+        assert results == [_vector(text) for text in texts]
+        assert client.embeddings.create.call_count == 1
+        assert sorted(client.embeddings.create.call_args.kwargs["input"]) == sorted(texts)
+        assert detector.get_cache_statistics()["embedding_batching"]["batches"] == 1
+
+    def test_retries_exhausted_raise_embedding_error(self):
+        """Test the batch's final failure reaches the caller as EmbeddingError"""
+        client = MagicMock()
+        client.embeddings.create.side_effect = Exception("API Error")
+        detector = self._detector(client)
+        detector.max_retries = 1
+
+        with pytest.raises(EmbeddingError):
+            detector._get_embedding("Sistema caído")
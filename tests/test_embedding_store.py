@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for EmbeddingStore
+
+Tests:
+- Content-addressed keys (model + text)
+- Bulk get/put in input order
+- Persistence across store instances
+- LRU-bounded memory residency
+- DuplicateDetector reuses stored embeddings instead of calling the API
+"""
+import pytest
+from unittest.mock import Mock
+from intelligence_capture.embedding_store import EmbeddingStore, get_embedding_store
+from intelligence_capture.duplicate_detector import DuplicateDetector
+
+
+def _vector(seed: float, dimensions: int = 8) -> list:
+    """Build a small deterministic vector"""
+    return [seed + i * 0.25 for i in range(dimensions)]
+
+
+class TestEmbeddingStore:
+    """Test suite for EmbeddingStore"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Store backed by a temporary file"""
+        store = EmbeddingStore(tmp_path / "embeddings.db", max_memory_entries=100)
+        yield store
+        store.close()
+
+    def test_put_and_get_roundtrip(self, store):
+        """Test vectors are returned as float32-rounded lists"""
+        store.put("Sistema SAP", _vector(0.1))
+
+        assert store.get("Sistema SAP") == pytest.approx(_vector(0.1), abs=1e-6)
+        assert store.get("Sistema Excel") is None
+
+    def test_key_includes_model(self, store):
+        """Test the same text under another model is a different entry"""
+        store.put("Sistema SAP", _vector(0.1), model="text-embedding-3-small")
+
+        assert store.get("Sistema SAP", model="text-embedding-3-large") is None
+        assert EmbeddingStore.content_key("a", "m1") != EmbeddingStore.content_key("a", "m2")
+
+    def test_bulk_get_preserves_order(self, store):
+        """Test get_many returns one entry per input text, in order"""
+        assert store.put_many(["a", "b", "c"], [_vector(1), None, _vector(3)]) == 2
+
+        result = store.get_many(["c", "missing", "a", "c"])
+
+        assert result[0] == pytest.approx(_vector(3))
+        assert result[1] is None
+        assert result[2] == pytest.approx(_vector(1))
+        assert result[3] == pytest.approx(_vector(3))
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test a new store on the same file sees earlier writes"""
+        path = tmp_path / "embeddings.db"
+        first = EmbeddingStore(path)
+        first.put_many(["a", "b"], [_vector(1), _vector(2)])
+        first.close()
+
+        second = EmbeddingStore(path)
+        assert second.get("b") == pytest.approx(_vector(2))
+        assert second.get_statistics()["disk_hits"] == 1
+        assert second.count() == 2
+        second.close()
+
+    def test_memory_residency_is_bounded(self, tmp_path):
+        """Test least recently used vectors are evicted from RAM, not disk"""
+        store = EmbeddingStore(tmp_path / "embeddings.db", max_memory_entries=2)
+        store.put_many(["a", "b", "c"], [_vector(1), _vector(2), _vector(3)])
+
+        assert store.get_statistics()["memory_entries"] == 2
+        assert store.get("a") == pytest.approx(_vector(1))
+        assert store.get_statistics()["disk_hits"] == 1
+        store.close()
+
+    def test_shared_instance_per_path(self, tmp_path):
+        """Test get_embedding_store returns one store per file"""
+        path = tmp_path / "shared.db"
+        assert get_embedding_store(path) is get_embedding_store(str(path))
+
+    def test_detector_reuses_stored_embeddings(self, store):
+        """Test a new detector finds embeddings written by an earlier one"""
+        config = {"performance": {"use_db_storage": False}}
+        mock_client = Mock()
+        mock_client.embeddings.create.side_effect = lambda model, input: Mock(
+            data=[Mock(embedding=_vector(len(text))) for text in (input if isinstance(input, list) else [input])]
+        )
+
+        first = DuplicateDetector(config, db=None, embedding_store=store)
+        first.openai_client = mock_client
+        first.calculate_semantic_similarities("Sistema SAP", ["SAP ERP", "Excel"])
+        assert mock_client.embeddings.create.call_count == 1
+
+        second = DuplicateDetector(config, db=None, embedding_store=store)
+        second.openai_client = mock_client
+        second.calculate_semantic_similarities("Sistema SAP", ["SAP ERP", "Excel"])
+        assert second._get_embedding("Excel") == pytest.approx(_vector(5))
+
+        assert mock_client.embeddings.create.call_count == 1
+        assert second.get_cache_statistics()["embedding_store_hits"] == 3
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Concurrent Ensemble Engine in EnsembleReviewer
+
+Tests:
+- All model extractions across entity types run concurrently, capped by
+  max_concurrent_calls
+- Synthesis starts for an entity type as soon as its ensemble completes
+- Synthesis is skipped when models agree, and runs when they disagree
+- Failed models and failed synthesis fall back cleanly
+"""
+import contextlib
+import io
+import threading
+import time
+
+import pytest
+
+from intelligence_capture import reviewer as reviewer_module
+from intelligence_capture.reviewer import EnsembleReviewer, ReviewMetrics, SynthesisAgent
+
+
+class FakeEnsembleExtractor:
+    """Fake EnsembleExtractor: fixed latency per call, tracks concurrency"""
+
+    ENSEMBLE_MODELS = ["model-a", "model-b", "model-c"]
+
+    def __init__(self, openai_api_key=None):
+        self.results = {}  # (model, entity_type) -> entities or None
+        self.latency = {}  # entity_type -> seconds
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = []
+
+    def extract_with_model(self, model, entity_type, interview_text, meta):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            self.calls.append((model, entity_type))
+        try:
+            time.sleep(self.latency.get(entity_type, 0.05))
+            return self.results.get((model, entity_type), [])
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class FakeSynthesisAgent:
+    """Fake SynthesisAgent recording when each synthesis started"""
+
+    def __init__(self, anthropic_api_key=None):
+        self.started = {}
+        self.fail = set()
+
+    def synthesize_extractions(self, entity_type, ensemble_extractions, interview_text, meta):
+        self.started[entity_type] = time.perf_counter()
+        if entity_type in self.fail:
+            raise RuntimeError("synthesis down")
+        metrics = ReviewMetrics(0.9, 0.9, 0.9, 0.9, 0.9, 0.9, 0.6, False, "", {})
+        return [{"description": f"synthesized {entity_type}"}], metrics
+
+    def _fallback_majority_vote(self, ensemble_extractions, entity_type):
+        return SynthesisAgent._fallback_majority_vote(self, ensemble_extractions, entity_type)
+
+
+@pytest.fixture
+def make_reviewer(monkeypatch):
+    """Factory for reviewers with fake extraction and synthesis agents"""
+    monkeypatch.setattr(reviewer_module, "EnsembleExtractor", FakeEnsembleExtractor)
+    monkeypatch.setattr(reviewer_module, "SynthesisAgent", FakeSynthesisAgent)
+
+    def make(**kwargs):
+        return EnsembleReviewer(openai_api_key="test", anthropic_api_key="test", **kwargs)
+
+    return make
+
+
+def _review(reviewer, all_entities):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return reviewer.review_all_entities(all_entities, {"¿Qué hace?": "Compras"}, {"respondent": "Ana"})
+
+
+def _entities(*descriptions):
+    return [{"description": description} for description in descriptions]
+
+
+class TestEnsembleEngine:
+    """Test suite for concurrent ensemble review"""
+
+    def test_extractions_run_concurrently_up_to_the_budget(self, make_reviewer):
+        """Test all entity types x models are in flight together, capped by max_concurrent_calls"""
+        reviewer = make_reviewer(max_concurrent_calls=4, early_exit_agreement=None)
+        all_entities = {entity_type: _entities("x") for entity_type in ("pain_points", "processes", "kpis")}
+
+        start = time.perf_counter()
+        reviewed = _review(reviewer, all_entities)
+        elapsed = time.perf_counter() - start
+
+        assert list(reviewed) == ["pain_points", "processes", "kpis"]
+        assert len(reviewer.extractor.calls) == 9
+        assert reviewer.extractor.peak == 4
+        # 9 calls of 50ms on 4 workers: 3 waves, not 9 sequential calls
+        assert elapsed < 0.3
+
+    def test_synthesis_starts_when_its_ensemble_completes(self, make_reviewer):
+        """Test a fast entity type is synthesized before slow ones finish extracting"""
+        reviewer = make_reviewer(max_concurrent_calls=6, early_exit_agreement=None)
+        reviewer.extractor.latency = {"systems": 0.01, "processes": 0.3}
+
+        start = time.perf_counter()
+        reviewed = _review(reviewer, {"systems": _entities("SAP"), "processes": _entities("Compras")})
+
+        assert reviewer.synthesizer.started["systems"] - start < 0.2
+        assert reviewed["systems"].synthesized_result == [{"description": "synthesized systems"}]
+
+    def test_agreeing_models_skip_synthesis(self, make_reviewer):
+        """Test early exit keeps the original entities and skips the synthesis cost"""
+        reviewer = make_reviewer(early_exit_agreement=0.8)
+        original = _entities("Reportes manuales en Excel", "Aprobaciones por correo")
+        for model in FakeEnsembleExtractor.ENSEMBLE_MODELS:
+            reviewer.extractor.results[(model, "pain_points")] = _entities(
+                "reportes manuales en excel", "Aprobaciones por correo."
+            )
+
+        review = _review(reviewer, {"pain_points": original})["pain_points"]
+
+        assert "pain_points" not in reviewer.synthesizer.started
+        assert review.synthesized_result == original
+        assert review.metrics.model_agreement["early_exit"] is True
+        assert review.metrics.consensus_level >= 0.8
+        assert review.total_cost_usd == pytest.approx(reviewer._estimate_cost(review.extractions) - 0.05)
+
+    def test_disagreeing_models_are_synthesized(self, make_reviewer):
+        """Test synthesis runs when one model disagrees"""
+        reviewer = make_reviewer(early_exit_agreement=0.8)
+        original = _entities("Reportes manuales")
+        reviewer.extractor.results[("model-a", "pain_points")] = _entities("Reportes manuales")
+        reviewer.extractor.results[("model-b", "pain_points")] = _entities("Reportes manuales")
+        reviewer.extractor.results[("model-c", "pain_points")] = _entities("Falta de capacitación")
+
+        review = _review(reviewer, {"pain_points": original})["pain_points"]
+
+        assert "pain_points" in reviewer.synthesizer.started
+        assert review.synthesized_result == [{"description": "synthesized pain_points"}]
+
+    def test_failed_models_prevent_early_exit(self, make_reviewer):
+        """Test a single successful model is not enough evidence to skip synthesis"""
+        reviewer = make_reviewer(early_exit_agreement=0.8)
+        reviewer.extractor.results[("model-a", "kpis")] = _entities("Ventas")
+        reviewer.extractor.results[("model-b", "kpis")] = None
+        reviewer.extractor.results[("model-c", "kpis")] = None
+
+        review = _review(reviewer, {"kpis": _entities("Ventas")})["kpis"]
+
+        assert "kpis" in reviewer.synthesizer.started
+        assert review.extractions["model-b"] == []
+
+    def test_synthesis_failure_falls_back_to_majority_vote(self, make_reviewer):
+        """Test a raising synthesis is replaced by the majority vote fallback"""
+        reviewer = make_reviewer(early_exit_agreement=None)
+        reviewer.synthesizer.fail.add("systems")
+
+        review = _review(reviewer, {"systems": _entities("SAP")})["systems"]
+
+        assert review.metrics.needs_human_review is True
+        assert review.metrics.model_agreement == {"fallback": True}
+        assert review.synthesized_result == _entities("SAP")
+
+    def test_basic_mode_makes_no_calls(self, make_reviewer):
+        """Test basic mode still skips ensemble extraction"""
+        reviewer = make_reviewer(enable_ensemble=False)
+
+        reviewed = _review(reviewer, {"systems": _entities("SAP"), "kpis": []})
+
+        assert list(reviewed) == ["systems"]
+        assert reviewer.extractor.calls == []
+
+    def test_worker_threads_exit_after_review(self, make_reviewer):
+        """Test each review shuts down its worker pool"""
+        reviewer = make_reviewer(max_concurrent_calls=4, early_exit_agreement=None)
+
+        for _ in range(3):
+            _review(reviewer, {"pain_points": _entities("x"), "kpis": _entities("y")})
+
+        assert not [thread for thread in threading.enumerate() if thread.name.startswith("ensemble")]
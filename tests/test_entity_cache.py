@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for EntityWorkingSetCache
+
+Tests:
+- Working set loaded once per entity type
+- Projection to detection columns, full row fetched for merging
+- In-place merge updates
+- Own inserts appended in place; invalidation on external commits
+"""
+import sqlite3
+import pytest
+from unittest.mock import Mock
+from intelligence_capture.entity_cache import EntityWorkingSetCache
+from intelligence_capture.consolidation_agent import KnowledgeConsolidationAgent
+
+
+@pytest.fixture
+def db():
+    """In-memory database with a systems table"""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("""
+        CREATE TABLE systems (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            description TEXT,
+            integration_pain_points TEXT,
+            mentioned_in_interviews TEXT,
+            source_count INTEGER DEFAULT 1,
+            is_consolidated BOOLEAN DEFAULT 1,
+            merged_entity_ids TEXT,
+            embedding_vector BLOB
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE consolidation_audit (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity_type TEXT,
+            merged_entity_ids TEXT,
+            resulting_entity_id INTEGER,
+            similarity_score REAL,
+            consolidation_timestamp TEXT,
+            rollback_timestamp TEXT,
+            rollback_reason TEXT
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO systems (name, description, integration_pain_points, mentioned_in_interviews, merged_entity_ids, embedding_vector) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            ("Excel", "Hoja de cálculo", "Copiar datos a mano", "[1]", "[]", b"\x00" * 16),
+            ("SAP", "ERP corporativo", None, "[1]", "[]", None),
+        ]
+    )
+    conn.commit()
+
+    database = Mock()
+    database.conn = conn
+    yield database
+    conn.close()
+
+
+class TestEntityWorkingSetCache:
+    """Test suite for EntityWorkingSetCache"""
+
+    def test_loads_once_per_type(self, db):
+        """Test repeated access reuses the same list"""
+        cache = EntityWorkingSetCache(db)
+
+        first = cache.get("systems")
+        second = cache.get("systems")
+
+        assert first is second
+        assert len(first) == 2
+        assert cache.get_statistics()["loads"] == 1
+        assert cache.get_statistics()["hits"] == 1
+
+    def test_projects_detection_columns(self, db):
+        """Test working set excludes columns the detector does not read"""
+        cache = EntityWorkingSetCache(db)
+
+        entity = cache.get("systems")[0]
+
+        assert set(entity) == {"id", "name", "description"}
+
+    def test_get_full_entity_returns_complete_row(self, db):
+        """Test merge targets are resolved to the full row"""
+        cache = EntityWorkingSetCache(db)
+
+        full = cache.get_full_entity("systems", cache.get("systems")[0])
+
+        assert full["integration_pain_points"] == "Copiar datos a mano"
+        assert full["embedding_vector"] == b"\x00" * 16
+
+    def test_record_merge_updates_in_place(self, db):
+        """Test merged entities replace the working-set entry"""
+        cache = EntityWorkingSetCache(db)
+        working_set = cache.get("systems")
+
+        merged = dict(cache.get_full_entity("systems", working_set[1]), description="ERP corporativo. Módulo de ventas")
+        revision = cache.revision("systems")
+        position = cache.record_merge("systems", merged)
+
+        assert position == 1
+        assert cache.revision("systems") == revision + 1
+        assert cache.get("systems") is working_set
+        assert working_set[1]["description"] == "ERP corporativo. Módulo de ventas"
+        assert cache.get_full_entity("systems", working_set[1]) is merged
+
+    def test_own_inserts_are_appended_in_place(self, db):
+        """Test rows inserted through the same connection extend the working set"""
+        cache = EntityWorkingSetCache(db)
+        first = cache.get("systems")
+
+        db.conn.execute("INSERT INTO systems (name) VALUES ('WhatsApp')")
+        second = cache.get("systems")
+
+        assert second is first
+        assert [e["name"] for e in second] == ["Excel", "SAP", "WhatsApp"]
+        assert cache.get_full_entity("systems", second[2])["name"] == "WhatsApp"
+        stats = cache.get_statistics()
+        assert stats["loads"] == 1
+        assert stats["appended"] == 1
+
+    def test_own_deletes_reload_only_that_type(self, db):
+        """Test a working set whose loaded rows changed is reloaded alone"""
+        db.conn.execute("CREATE TABLE kpis (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, is_consolidated BOOLEAN DEFAULT 1)")
+        db.conn.execute("INSERT INTO kpis (name) VALUES ('Tiempo de cierre')")
+        cache = EntityWorkingSetCache(db)
+        systems = cache.get("systems")
+        kpis = cache.get("kpis")
+
+        db.conn.execute("DELETE FROM systems WHERE name = 'Excel'")
+
+        assert [e["name"] for e in cache.get("systems")] == ["SAP"]
+        assert cache.get("systems") is not systems
+        assert cache.get("kpis") is kpis
+
+    def test_invalidated_when_another_connection_commits(self, tmp_path):
+        """Test commits by other connections (data_version) drop every working set"""
+        path = tmp_path / "intel.db"
+        conn = sqlite3.connect(str(path))
+        conn.row_factory = sqlite3.Row
+        conn.execute("CREATE TABLE systems (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, is_consolidated BOOLEAN DEFAULT 1)")
+        conn.execute("INSERT INTO systems (name) VALUES ('Excel')")
+        conn.commit()
+        database = Mock()
+        database.conn = conn
+        cache = EntityWorkingSetCache(database)
+        first = cache.get("systems")
+
+        other = sqlite3.connect(str(path))
+        other.execute("UPDATE systems SET name = 'Excel 365'")
+        other.commit()
+        other.close()
+        second = cache.get("systems")
+        conn.close()
+
+        assert second is not first
+        assert [e["name"] for e in second] == ["Excel 365"]
+
+    def test_refresh_version_keeps_working_set(self, db):
+        """Test accepted non-entity writes do not invalidate the cache"""
+        cache = EntityWorkingSetCache(db)
+        first = cache.get("systems")
+
+        db.conn.execute("INSERT INTO consolidation_audit (entity_type) VALUES ('systems')")
+        cache.refresh_version()
+
+        assert cache.get("systems") is first
+
+    def test_agent_reads_table_once_per_type(self, db):
+        """Test the consolidation agent reuses the working set across entities"""
+        config = {
+            "similarity_thresholds": {"default": 0.85},
+            "performance": {"use_db_storage": False}
+        }
+        agent = KnowledgeConsolidationAgent(db, config, openai_api_key=None)
+        agent.relationship_discoverer.discover_relationships = Mock(return_value=[])
+
+        result = agent.consolidate_entities(
+            {"systems": [
+                {"name": "Excel", "description": "Hoja de cálculo"},
+                {"name": "Jira", "description": "Gestión de tareas"},
+                {"name": "Excel", "description": "Hoja de cálculo"}
+            ]},
+            interview_id=2
+        )
+
+        stats = agent.entity_cache.get_statistics()
+        assert stats["loads"] == 1
+        assert stats["hits"] == 2
+        # Merge used the full row
+        assert result["systems"][0]["integration_pain_points"] == "Copiar datos a mano"
+        assert result["systems"][0]["source_count"] == 2
+
+    def test_agent_reuses_working_set_across_interviews(self, db):
+        """Test storing one interview's entities does not drop the working set"""
+        config = {
+            "similarity_thresholds": {"default": 0.85},
+            "performance": {"use_db_storage": False}
+        }
+        agent = KnowledgeConsolidationAgent(db, config, openai_api_key=None)
+        agent.relationship_discoverer.discover_relationships = Mock(return_value=[])
+
+        agent.consolidate_entities({"systems": [{"name": "Jira", "description": "Gestión de tareas"}]}, interview_id=2)
+        # The pipeline stores the new entity on the same connection
+        db.conn.execute("INSERT INTO systems (name, description) VALUES ('Jira', 'Gestión de tareas')")
+        db.conn.commit()
+        result = agent.consolidate_entities({"systems": [{"name": "Jira", "description": "Gestión de tareas"}]}, interview_id=3)
+
+        stats = agent.entity_cache.get_statistics()
+        assert stats["loads"] == 1
+        assert stats["appended"] == 1
+        # Merged into the row stored after the first interview
+        assert result["systems"][0]["id"] == 3
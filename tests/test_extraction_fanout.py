@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Concurrent Extraction Fan-out in IntelligenceExtractor
+
+Tests:
+- Concurrent and sequential runs return the same results in the same order
+- In-flight extractions never exceed max_concurrent_extractions
+- A failing entity type yields [] without affecting the others
+- extract_all works from inside a running event loop
+- track_llm_usage() sees the calls made on worker threads
+- Worker threads do not outlive the extraction
+"""
+import asyncio
+import contextlib
+import io
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from intelligence_capture import extractors
+from intelligence_capture.extractor import IntelligenceExtractor
+
+
+class SlowExtractor:
+    """Fake v2 extractor with a fixed latency that tracks concurrency"""
+
+    def __init__(self, entity_type: str, tracker: dict, latency: float = 0.05, fail: bool = False):
+        self.entity_type = entity_type
+        self.tracker = tracker
+        self.latency = latency
+        self.fail = fail
+
+    def extract_from_interview(self, interview_data, llm_response=None):
+        with self.tracker["lock"]:
+            self.tracker["in_flight"] += 1
+            self.tracker["peak"] = max(self.tracker["peak"], self.tracker["in_flight"])
+        try:
+            time.sleep(self.latency)
+            extractors._record_usage("gpt-4o-mini", SimpleNamespace(prompt_tokens=100, completion_tokens=10))
+            if self.fail:
+                raise RuntimeError("boom")
+            return [{"name": f"{self.entity_type} de {interview_data['meta']['respondent']}"}]
+        finally:
+            with self.tracker["lock"]:
+                self.tracker["in_flight"] -= 1
+
+
+@pytest.fixture
+def make_extractor(monkeypatch):
+    """Factory for extractors whose LLM calls are replaced by SlowExtractor"""
+
+    def make(max_concurrent: int, failing=()):
+        with contextlib.redirect_stdout(io.StringIO()):
+            extractor = IntelligenceExtractor(max_concurrent_extractions=max_concurrent, grouped_extraction=False)
+        tracker = {"lock": threading.Lock(), "in_flight": 0, "peak": 0}
+        extractor.v2_extractors = {
+            entity_type: SlowExtractor(entity_type, tracker, fail=entity_type in failing)
+            for entity_type in extractor.v2_extractors
+        }
+        for entity_type in ("processes", "kpis", "inefficiencies"):
+            slow = SlowExtractor(entity_type, tracker, fail=entity_type in failing)
+            monkeypatch.setattr(
+                extractor, f"_extract_{entity_type}",
+                lambda text, meta, llm_response=None, slow=slow: slow.extract_from_interview({"meta": meta})
+            )
+        return extractor, tracker
+
+    return make
+
+
+def _extract(extractor):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return extractor.extract_all({"respondent": "Ana", "role": "Gerente"}, {"¿Qué hace?": "Compras"})
+
+
+class TestExtractionFanout:
+    """Test suite for concurrent extract_all"""
+
+    def test_matches_sequential(self, make_extractor):
+        """Test concurrent results equal sequential results, in order"""
+        sequential, _ = make_extractor(1)
+        concurrent, _ = make_extractor(16)
+
+        expected = _extract(sequential)
+        results = _extract(concurrent)
+
+        assert results == expected
+        assert list(results) == list(expected)
+        assert results["decision_points"] == [{"name": "decision_points de Ana"}]
+
+    def test_concurrency_cap(self, make_extractor):
+        """Test in-flight extractions are bounded by max_concurrent_extractions"""
+        extractor, tracker = make_extractor(4)
+
+        start = time.perf_counter()
+        _extract(extractor)
+        elapsed = time.perf_counter() - start
+
+        assert tracker["peak"] == 4
+        # 16 calls of 50ms in waves of 4 instead of 0.8s in a row
+        assert elapsed < 0.5
+
+    def test_sequential_mode(self, make_extractor):
+        """Test max_concurrent_extractions=1 runs one call at a time"""
+        extractor, tracker = make_extractor(1)
+
+        _extract(extractor)
+
+        assert tracker["peak"] == 1
+
+    def test_failure_is_isolated(self, make_extractor):
+        """Test a failing entity type returns [] and the rest still complete"""
+        extractor, _ = make_extractor(8, failing={"data_flows", "kpis"})
+
+        results = _extract(extractor)
+
+        assert results["data_flows"] == []
+        assert results["kpis"] == []
+        assert results["failure_modes"] == [{"name": "failure_modes de Ana"}]
+        assert results["processes"] == [{"name": "processes de Ana"}]
+
+    def test_inside_running_loop(self, make_extractor):
+        """Test sync and async entry points work from async code"""
+        extractor, _ = make_extractor(8)
+
+        async def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                sync_results = extractor.extract_all({"respondent": "Ana"}, {})
+                async_results = await extractor.extract_all_async({"respondent": "Ana"}, {})
+            return sync_results, async_results
+
+        sync_results, async_results = asyncio.run(run())
+
+        assert sync_results == async_results
+        assert sync_results["temporal_patterns"] == [{"name": "temporal_patterns de Ana"}]
+
+    def test_usage_is_tracked_across_worker_threads(self, make_extractor):
+        """Test the calls of concurrent jobs are accounted to the caller's block"""
+        extractor, _ = make_extractor(8)
+
+        with extractors.track_llm_usage() as usage:
+            _extract(extractor)
+
+        async def run():
+            with extractors.track_llm_usage() as usage:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    extractor.extract_all({"respondent": "Ana"}, {})
+            return usage
+
+        nested_usage = asyncio.run(run())
+
+        assert usage.llm_calls == nested_usage.llm_calls == 16
+        assert usage.tokens == 16 * 110
+
+    def test_worker_threads_exit(self, make_extractor):
+        """Test each extraction shuts its pool down instead of keeping it"""
+        extractor, _ = make_extractor(8)
+
+        for _ in range(3):
+            _extract(extractor)
+
+        deadline = time.monotonic() + 2
+        while any(t.name.startswith("extractor") for t in threading.enumerate()) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not [t.name for t in threading.enumerate() if t.name.startswith("extractor")]
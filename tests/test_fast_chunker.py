@@ -0,0 +1,214 @@
+"""
+Tests para el modo "fast" de chunking (sin modelo spaCy)
+
+Suite de tests para:
+- SpanishSentenceSplitter (tokens, fines de oración, abreviaturas, WhatsApp)
+- SpanishChunker(mode="fast") (ventanas, metadatos, chunking masivo)
+- Selección de modo por formato de origen (get_chunker)
+- Conteo de tokens facturables del modelo de embeddings
+"""
+
+import math
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from intelligence_capture.chunking import (
+    ChunkMetadata,
+    SpanishChunker,
+    SpanishSentenceSplitter,
+    chunker_mode_for,
+    get_chunker
+)
+from intelligence_capture.chunking.fast_tokenizer import count_tokens
+from intelligence_capture.embeddings import token_counter
+from intelligence_capture.models.document_payload import DocumentPayload
+
+
+def _payload(content: str, source_format: str = "txt") -> DocumentPayload:
+    return DocumentPayload(
+        document_id="fast-doc",
+        org_id="test_org",
+        checksum="abc123",
+        source_type="whatsapp",
+        source_format=source_format,
+        mime_type="text/plain",
+        original_path=Path("/tmp/chat.txt"),
+        content=content,
+        language="es",
+        page_count=1
+    )
+
+
+class TestSpanishSentenceSplitter:
+    """Tests para el separador de oraciones por reglas"""
+
+    @pytest.fixture
+    def splitter(self):
+        return SpanishSentenceSplitter()
+
+    def test_split_sentences(self, splitter):
+        """Cortar en . ? ! seguidos de mayúscula o ¿"""
+        text = "La conciliación toma tres horas. ¿Funciona el POS? ¡No! Hay que reiniciarlo."
+        assert splitter.split(text) == [
+            "La conciliación toma tres horas.",
+            "¿Funciona el POS?",
+            "¡No!",
+            "Hay que reiniciarlo."
+        ]
+
+    def test_abbreviations_and_numbers(self, splitter):
+        """Abreviaturas, iniciales y decimales no cortan"""
+        text = "El Sr. Pérez y la Dra. J. Rojas revisaron 2.500 facturas (aprox. 3,5 horas). Luego salieron."
+        assert splitter.split(text) == [
+            "El Sr. Pérez y la Dra. J. Rojas revisaron 2.500 facturas (aprox. 3,5 horas).",
+            "Luego salieron."
+        ]
+
+    def test_whatsapp_lines(self, splitter):
+        """Cada mensaje de una exportación de WhatsApp es una oración"""
+        text = "[12/01/24, 10:15] Juan: el SAP no carga\n[12/01/24, 10:16] Ana: ya reinicio\nSí, gracias"
+        assert splitter.split(text) == [
+            "[12/01/24, 10:15] Juan: el SAP no carga",
+            "[12/01/24, 10:16] Ana: ya reinicio",
+            "Sí, gracias"
+        ]
+
+    def test_wrapped_line_continues(self, splitter):
+        """Una línea que sigue en minúscula continúa la oración"""
+        text = "El equipo debe revisar cada factura\ncon la orden de compra.\n\nfin"
+        assert splitter.split(text) == [
+            "El equipo debe revisar cada factura\ncon la orden de compra.",
+            "fin"
+        ]
+
+    def test_tokens_match_source_offsets(self, splitter):
+        """Cada token apunta a su texto en el original"""
+        text = "Reconciliación… ¿manual? Sí: 3,5 horas/día, vía e-mail."
+        doc = splitter(text)
+
+        assert [token.text for token in doc] == [
+            "Reconciliación", "…", "¿", "manual", "?", "Sí", ":", "3,5", "horas", "/", "día", ",",
+            "vía", "e-mail", "."
+        ]
+        assert all(text[token.idx:token.idx + len(token.text)] == token.text for token in doc)
+        assert [token.i for token in doc] == list(range(len(doc)))
+        assert doc[-1].is_sent_end
+        assert count_tokens(text) == len(doc)
+
+    def test_empty_text(self, splitter):
+        """Texto vacío no produce tokens ni oraciones"""
+        assert len(splitter("")) == 0
+        assert splitter.split("   \n ") == []
+
+
+class TestFastChunker:
+    """Tests para SpanishChunker en modo fast"""
+
+    @pytest.fixture
+    def chunker(self):
+        return SpanishChunker(mode="fast")
+
+    @pytest.fixture
+    def chat_payload(self):
+        messages = [
+            f"[12/01/24, 10:{minute:02d}] Patricia: La conciliación de facturas del turno {minute} "
+            "sigue pendiente. ¿Alguien revisó el reporte de SAP? Hay diferencias con Excel."
+            for minute in range(60)
+        ]
+        return _payload("\n".join(messages), source_format="whatsapp_json")
+
+    def test_invalid_mode(self):
+        """Modo desconocido es un error"""
+        with pytest.raises(ValueError):
+            SpanishChunker(mode="turbo")
+
+    def test_windows_and_metadata(self, chunker, chat_payload):
+        """Ventanas de 300-500 tokens con los mismos metadatos que el modo spaCy"""
+        chunks = chunker.chunk_document(chat_payload)
+
+        assert len(chunks) > 1
+        expected_keys = set(ChunkMetadata(document_id="x", chunk_index=0, token_count=0, char_count=0,
+                                          span_offsets=(0, 0)).to_dict())
+        for index, chunk in enumerate(chunks):
+            metadata = chunk['metadata']
+            assert set(metadata) == expected_keys
+            assert metadata['chunk_index'] == index
+            if index < len(chunks) - 1:
+                assert chunker.min_tokens <= metadata['token_count'] <= chunker.max_tokens
+
+        # El último chunk termina en el final del documento (sin colas repetidas)
+        assert chunks[-1]['metadata']['span_offsets'][1] == len(chat_payload.content)
+        assert len({tuple(chunk['metadata']['span_offsets']) for chunk in chunks}) == len(chunks)
+
+    def test_chunks_end_on_sentences(self, chunker, chat_payload):
+        """Los cortes caen en fines de oración"""
+        chunks = chunker.chunk_document(chat_payload)
+
+        for chunk in chunks[:-1]:
+            assert chunk['content'].endswith(('?', '.'))
+
+    def test_chunk_documents(self, chunker, chat_payload):
+        """Chunking masivo en modo fast equivale a uno por uno"""
+        results = list(chunker.chunk_documents([chat_payload, _payload("Texto corto.")]))
+
+        assert results[0] == chunker.chunk_document(chat_payload)
+        assert len(results[1]) == 1
+
+
+class TestChunkerSelection:
+    """Tests para la selección de modo por formato"""
+
+    @pytest.mark.parametrize("source_format,mode", [
+        ("txt", "fast"),
+        ("whatsapp_json", "fast"),
+        ("WhatsApp", "fast"),
+        ("pdf", "spacy"),
+        ("docx", "spacy"),
+        (None, "spacy")
+    ])
+    def test_mode_for_format(self, source_format, mode):
+        assert chunker_mode_for(source_format) == mode
+
+    def test_fast_chunker_is_shared(self):
+        """El chunker de un modo se crea una vez"""
+        chunker = get_chunker("whatsapp_json")
+
+        assert chunker.mode == "fast"
+        assert get_chunker("txt") is chunker
+
+
+class TestEmbeddingTokenCounter:
+    """Tests para el conteo de tokens facturables"""
+
+    def test_fallback_heuristic(self):
+        """Sin tiktoken: 4 caracteres ~ 1 token"""
+        token_counter._get_encoding.cache_clear()
+        try:
+            with patch.object(token_counter, "tiktoken", None):
+                assert token_counter.count_embedding_tokens("a" * 10) == math.ceil(10 / 4)
+                assert token_counter.count_embedding_tokens("") == 0
+                assert not token_counter.has_exact_counter()
+        finally:
+            token_counter._get_encoding.cache_clear()
+
+    def test_tiktoken_encoding(self):
+        """Con tiktoken: tokens de la codificación del modelo"""
+        class FakeEncoding:
+            def encode(self, text, disallowed_special=()):
+                return text.split()
+
+        class FakeTiktoken:
+            @staticmethod
+            def get_encoding(name):
+                assert name == "cl100k_base"
+                return FakeEncoding()
+
+        token_counter._get_encoding.cache_clear()
+        try:
+            with patch.object(token_counter, "tiktoken", FakeTiktoken):
+                assert token_counter.count_embedding_tokens("uno dos tres") == 3
+                assert token_counter.has_exact_counter()
+        finally:
+            token_counter._get_encoding.cache_clear()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Grouped Multi-Entity Extraction
+
+Tests:
+- Group prompts send the interview once and ask for every section
+- Grouped responses are split into the per-type responses extractors parse
+- Grouped mode makes one call per group and keeps per-type post-processing
+- Missing sections fall back to the per-type call
+- Token and call savings reach ExtractionMonitor through set_cost_metrics
+- Interviews extracted concurrently get their own stats
+"""
+import asyncio
+import contextlib
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from intelligence_capture import grouped_extraction
+from intelligence_capture.config import DEFAULT_EXTRACTION_GROUPS
+from intelligence_capture.extractor import IntelligenceExtractor
+from intelligence_capture.grouped_extraction import (
+    SECTION_SCHEMAS,
+    GroupedExtractionStats,
+    build_group_messages,
+    split_group_response
+)
+from intelligence_capture.monitor import ExtractionMonitor
+
+
+META = {"company": "Los Tajibos", "respondent": "Ana", "role": "Gerente de Operaciones", "date": "2025-10-01"}
+QA_PAIRS = {"¿Cómo se comunican?": "Usamos WhatsApp para urgencias y Teams con compras."}
+
+
+def _grouped_response(omit=()):
+    """Response with every section; processes and channels have one entity"""
+    response = {key: [] for key, _, _ in SECTION_SCHEMAS.values() if key not in omit}
+    response["processes"] = [{"name": "Compras semanales"}]
+    response["channels"] = [{"channel_name": "WhatsApp", "purpose": "Urgencias", "confidence_score": 0.95}]
+    return json.dumps(response)
+
+
+@pytest.fixture
+def grouped_extractor():
+    """Extractor in grouped mode, sequential for deterministic call order"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return IntelligenceExtractor(max_concurrent_extractions=1, grouped_extraction=True)
+
+
+def _fake_llm(content, calls):
+    def call(client, messages, temperature=0.1, usage=None):
+        calls.append(messages)
+        usage.update(model="gpt-4o-mini", prompt_tokens=1000, completion_tokens=200)
+        return content
+    return call
+
+
+class TestGroupPrompt:
+    """Test suite for grouped prompt building and response splitting"""
+
+    def test_interview_sent_once(self):
+        """Test the prompt contains the interview once and every section key"""
+        messages = build_group_messages(["processes", "decision_points", "data_flows"], "ENTREVISTA única")
+
+        prompt = messages[-1]["content"]
+        assert prompt.count("ENTREVISTA única") == 1
+        for key in ('"processes"', '"decisions"', '"data_flows"'):
+            assert key in prompt
+
+    def test_split_routes_sections(self):
+        """Test each type receives only its own section under its own key"""
+        content = json.dumps({"pain_points": [{"description": "x"}], "failure_modes": "oops"})
+
+        sections = split_group_response(content, ["pain_points_v2", "failure_modes", "inefficiencies"])
+
+        assert sections == {"pain_points_v2": json.dumps({"pain_points": [{"description": "x"}]})}
+
+    def test_split_malformed_response(self):
+        """Test a non-JSON response yields no sections"""
+        assert split_group_response("not json", ["processes"]) == {}
+        assert split_group_response("[]", ["processes"]) == {}
+
+
+class TestGroupedExtraction:
+    """Test suite for IntelligenceExtractor in grouped mode"""
+
+    def test_one_call_per_group(self, grouped_extractor):
+        """Test grouped mode replaces 16 per-type calls with one call per group"""
+        calls = []
+        with patch.object(grouped_extraction, "call_llm_with_fallback", _fake_llm(_grouped_response(), calls)), \
+                patch("intelligence_capture.extractors.call_llm_with_fallback") as per_type_llm, \
+                patch.object(grouped_extractor, "_call_gpt4") as legacy_llm, \
+                contextlib.redirect_stdout(io.StringIO()):
+            results = grouped_extractor.extract_all(META, QA_PAIRS)
+
+        assert len(calls) == len(grouped_extractor.extraction_groups)
+        per_type_llm.assert_not_called()
+        legacy_llm.assert_not_called()
+        assert results["processes"] == [{"name": "Compras semanales"}]
+
+        # Per-type post-processing still runs: rule-based Teams merged with the LLM WhatsApp entry
+        channels = {channel["channel_name"]: channel for channel in results["communication_channels"]}
+        assert set(channels) == {"WhatsApp", "Teams"}
+        assert channels["WhatsApp"]["extraction_source"] == "llm_extraction"
+        assert channels["WhatsApp"]["frequency"] == "As needed"
+
+    def test_missing_section_falls_back(self, grouped_extractor):
+        """Test a type missing from the grouped response gets its own call"""
+        calls = []
+        with patch.object(grouped_extraction, "call_llm_with_fallback", _fake_llm(_grouped_response(omit=("kpis",)), calls)), \
+                patch.object(grouped_extractor, "_call_gpt4", return_value={"kpis": [{"name": "Ocupación"}]}) as legacy_llm, \
+                contextlib.redirect_stdout(io.StringIO()):
+            results = grouped_extractor.extract_all(META, QA_PAIRS)
+
+        legacy_llm.assert_called_once()
+        assert results["kpis"] == [{"name": "Ocupación"}]
+
+    def test_stats_report_savings(self, grouped_extractor):
+        """Test calls and tokens saved are accounted per interview"""
+        calls = []
+        with patch.object(grouped_extraction, "call_llm_with_fallback", _fake_llm(_grouped_response(), calls)), \
+                contextlib.redirect_stdout(io.StringIO()):
+            _, stats = grouped_extractor.extract_all_with_stats(META, QA_PAIRS)
+
+        interview_tokens = grouped_extraction.estimate_tokens(grouped_extractor._format_interview(META, QA_PAIRS))
+        assert stats.llm_calls == 4
+        assert stats.entity_types == 16
+        assert stats.calls_saved == 12
+        assert stats.tokens == 4 * 1200
+        assert stats.tokens_saved == 12 * interview_tokens
+
+    def test_per_type_mode_has_no_stats(self):
+        """Test grouped accounting is only produced in grouped mode"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            extractor = IntelligenceExtractor(max_concurrent_extractions=1, grouped_extraction=False)
+
+        jobs, stats = extractor._extraction_jobs(META, QA_PAIRS)
+
+        assert len(jobs) == 16
+        assert stats is None
+
+    def test_groups_default_to_config_module(self):
+        """Test groups come from DEFAULT_EXTRACTION_GROUPS unless the JSON sets them"""
+        with patch("intelligence_capture.extractor.GROUPED_EXTRACTION_CONFIG", {"enabled": True}), \
+                contextlib.redirect_stdout(io.StringIO()):
+            extractor = IntelligenceExtractor(max_concurrent_extractions=1)
+
+        assert extractor.grouped_extraction is True
+        assert extractor.extraction_groups == DEFAULT_EXTRACTION_GROUPS
+
+    def test_concurrent_interviews_keep_their_own_stats(self):
+        """Test interviews extracted at once on one extractor do not share stats"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            extractor = IntelligenceExtractor(max_concurrent_extractions=4, grouped_extraction=True)
+
+        async def run():
+            return await asyncio.gather(
+                extractor.extract_all_async_with_stats(META, QA_PAIRS),
+                extractor.extract_all_async_with_stats(META, QA_PAIRS, ["processes", "decision_points"])
+            )
+
+        calls = []
+        with patch.object(grouped_extraction, "call_llm_with_fallback", _fake_llm(_grouped_response(), calls)), \
+                contextlib.redirect_stdout(io.StringIO()):
+            (_, full_stats), (_, partial_stats) = asyncio.run(run())
+
+        assert full_stats is not partial_stats
+        assert full_stats.entity_types == 16
+        assert partial_stats.entity_types == 2
+
+
+class TestMonitorSavings:
+    """Test suite for savings reported through ExtractionMonitor"""
+
+    def test_set_cost_metrics_savings(self):
+        """Test savings set on a metric appear in the summary"""
+        stats = GroupedExtractionStats()
+        stats.record_call({"model": "gpt-4o-mini", "prompt_tokens": 3000, "completion_tokens": 500}, 2.0, 4, 800)
+        monitor = ExtractionMonitor(total_interviews=1)
+
+        metric = monitor.start_interview(1, "Los Tajibos", "Ana")
+        metric.set_cost_metrics(
+            stats.tokens, stats.cost, llm_calls=stats.llm_calls, calls_saved=stats.calls_saved,
+            tokens_saved=stats.tokens_saved, latency_saved=stats.latency_saved
+        )
+        monitor.finish_interview(metric)
+        summary = monitor.get_summary()
+
+        assert summary["total_tokens"] == 3500
+        assert summary["calls_saved"] == 3
+        assert summary["tokens_saved"] == 2400
+        assert summary["latency_saved"] == pytest.approx(6.0)
+        assert summary["total_cost"] == pytest.approx((3000 * 0.15 + 500 * 0.60) / 1_000_000)
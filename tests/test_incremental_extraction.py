@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Incremental Re-extraction
+
+Tests:
+- Content hashes ignore question order and change with the transcript
+- An unchanged corpus is skipped with zero extraction calls
+- A changed prompt re-extracts only its entity type
+- A changed transcript re-extracts every type and replaces stored rows
+- Interviews extracted before versions were tracked adopt the current ones
+- Re-extracted systems replace the interview's share of the shared rows
+- Extractor versions follow the prompts and model settings, not the code
+"""
+import contextlib
+import io
+import json
+
+import pytest
+
+from intelligence_capture import grouped_extraction
+from intelligence_capture.extractor import IntelligenceExtractor
+from intelligence_capture.extractors import capture_llm_requests
+from intelligence_capture.interview_source import InterviewSource, interview_content_hash
+from intelligence_capture.model_router import MODEL_ROUTER
+from intelligence_capture.processor import IntelligenceProcessor
+
+CONFIG = {
+    "extraction": {"incremental": True},
+    "ensemble": {"enable_ensemble_review": False},
+    "validation": {"enable_validation_agent": False},
+    "consolidation": {"enabled": False},
+    "monitoring": {"enable_monitor": False}
+}
+
+INTERVIEW = {
+    "meta": {"company": "Acme", "respondent": "Ana", "role": "Gerente", "date": "2024-01-10"},
+    "qa_pairs": {"¿Qué procesos maneja?": "Compras", "¿Qué KPIs mide?": "Ventas"}
+}
+
+
+class FakeExtractor:
+    """Fake IntelligenceExtractor with editable versions that records calls"""
+
+    def __init__(self):
+        self.versions = {"processes": "p1", "kpis": "k1"}
+        self.calls = []
+
+    def extractor_versions(self):
+        return dict(self.versions)
+
+    def extract_all_with_stats(self, meta, qa_pairs, entity_types=None):
+        self.calls.append(list(entity_types))
+        answer = " ".join(qa_pairs.values())
+        entities = {
+            "processes": [{"name": f"Proceso {answer}", "description": answer}],
+            "kpis": [{"name": f"KPI {answer}", "definition": answer}]
+        }
+        return {entity_type: entities[entity_type] for entity_type in entity_types}, None
+
+
+@pytest.fixture
+def processor(tmp_path):
+    """Processor on a fresh database with a FakeExtractor"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor = IntelligenceProcessor(db_path=tmp_path / "intel.db", config=CONFIG)
+        processor.initialize()
+    processor.extractor = FakeExtractor()
+    yield processor
+    processor.close()
+
+
+def _process(processor, interview):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return processor.process_interview(interview)
+
+
+def _count(processor, table):
+    return processor.db.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def _edited(**qa_pairs):
+    return {"meta": INTERVIEW["meta"], "qa_pairs": {**INTERVIEW["qa_pairs"], **qa_pairs}}
+
+
+class TestContentHash:
+    """Test suite for interview_content_hash"""
+
+    def test_ignores_question_order(self):
+        """Test the hash depends on content, not dict order"""
+        reordered = dict(reversed(list(INTERVIEW["qa_pairs"].items())))
+        assert interview_content_hash(reordered) == interview_content_hash(INTERVIEW["qa_pairs"])
+
+    def test_changes_with_answers(self):
+        """Test an edited answer changes the hash"""
+        edited = _edited(**{"¿Qué KPIs mide?": "Margen"})["qa_pairs"]
+        assert interview_content_hash(edited) != interview_content_hash(INTERVIEW["qa_pairs"])
+
+
+class TestIncrementalExtraction:
+    """Test suite for IntelligenceProcessor incremental planning"""
+
+    def test_off_unless_enabled(self, tmp_path):
+        """Test a plain config keeps the full extraction behavior"""
+        config = {**CONFIG, "extraction": {}}
+        with contextlib.redirect_stdout(io.StringIO()):
+            processor = IntelligenceProcessor(db_path=tmp_path / "intel.db", config=config)
+
+        assert processor.incremental is False
+
+    def test_unchanged_interview_is_skipped(self, processor):
+        """Test a second run makes no extraction calls"""
+        assert _process(processor, INTERVIEW) is True
+        assert _process(processor, INTERVIEW) is False
+
+        assert processor.extractor.calls == [["processes", "kpis"]]
+        assert _count(processor, "processes") == 1
+
+    def test_changed_prompt_reextracts_only_its_type(self, processor):
+        """Test a new kpis version re-extracts kpis and replaces their rows"""
+        _process(processor, INTERVIEW)
+        processor.extractor.versions["kpis"] = "k2"
+
+        assert processor.plan_extraction(INTERVIEW["meta"], INTERVIEW["qa_pairs"]) == ["kpis"]
+        assert _process(processor, INTERVIEW) is True
+
+        assert processor.extractor.calls[-1] == ["kpis"]
+        assert _count(processor, "kpis") == 1
+        assert _count(processor, "processes") == 1
+
+    def test_changed_transcript_reextracts_everything(self, processor):
+        """Test an edited transcript replaces every type and the stored raw data"""
+        _process(processor, INTERVIEW)
+        edited = _edited(**{"¿Qué KPIs mide?": "Margen"})
+
+        assert _process(processor, edited) is True
+
+        assert processor.extractor.calls[-1] == ["processes", "kpis"]
+        assert _count(processor, "interviews") == 1
+        assert _count(processor, "kpis") == 1
+        kpi = processor.db.conn.execute("SELECT definition FROM kpis").fetchone()[0]
+        assert kpi == "Compras Margen"
+        state = processor.db.get_extraction_state(edited["meta"])
+        assert state["content_hash"] == interview_content_hash(edited["qa_pairs"])
+
+    def test_failed_interview_is_retried(self, processor):
+        """Test an interview that did not complete is fully re-extracted"""
+        interview_id = processor.db.insert_interview(INTERVIEW["meta"], INTERVIEW["qa_pairs"])
+        processor.db.update_extraction_status(interview_id, "failed", "timeout")
+
+        assert processor.plan_extraction(INTERVIEW["meta"], INTERVIEW["qa_pairs"]) == ["processes", "kpis"]
+
+    def test_legacy_complete_interview_adopts_current_versions(self, processor):
+        """Test interviews extracted before version tracking are not re-extracted"""
+        interview_id = processor.db.insert_interview(INTERVIEW["meta"], INTERVIEW["qa_pairs"])
+        processor.db.conn.execute("UPDATE interviews SET content_hash = NULL WHERE id = ?", (interview_id,))
+        processor.db.update_extraction_status(interview_id, "complete")
+
+        assert processor.plan_extraction(INTERVIEW["meta"], INTERVIEW["qa_pairs"]) == []
+
+        versions = processor.db.get_extraction_state(INTERVIEW["meta"])["versions"]
+        content_hash = interview_content_hash(INTERVIEW["qa_pairs"])
+        assert versions == {"processes": ("p1", content_hash), "kpis": ("k1", content_hash)}
+
+    def test_select_interviews_keeps_only_stale_ones(self, processor, tmp_path):
+        """Test the corpus prefilter reads each interview and drops unchanged ones"""
+        other = {"meta": {**INTERVIEW["meta"], "respondent": "Luis"}, "qa_pairs": {"¿Qué hace?": "Ventas"}}
+        path = tmp_path / "interviews.jsonl"
+        path.write_text("\n".join(json.dumps(i, ensure_ascii=False) for i in (INTERVIEW, other)), encoding="utf-8")
+        _process(processor, INTERVIEW)
+
+        refs = processor.select_interviews(InterviewSource(path))
+
+        assert [ref.respondent for ref in refs] == ["Luis"]
+
+    def test_delete_interview_entities(self, processor):
+        """Test deleting one entity type leaves the others and their versions"""
+        _process(processor, INTERVIEW)
+        interview_id = processor.db.get_extraction_state(INTERVIEW["meta"])["id"]
+
+        assert processor.db.delete_interview_entities(interview_id, ["kpis"]) == 1
+
+        assert _count(processor, "kpis") == 0
+        assert _count(processor, "processes") == 1
+        assert set(processor.db.get_extraction_state(INTERVIEW["meta"])["versions"]) == {"processes"}
+
+
+class TestSystemContributions:
+    """Test suite for re-extracting the shared systems rows"""
+
+    def _system(self, processor, name):
+        row = processor.db.conn.execute(
+            "SELECT usage_count, companies_using, pain_points, integration_pain_points FROM systems WHERE name = ?",
+            (name,)
+        ).fetchone()
+        return None if row is None else (row[0], sorted(json.loads(row[1])), sorted(json.loads(row[2])), sorted(json.loads(row[3])))
+
+    def _store(self, processor, interview_id, company, systems):
+        processor.db.insert_entities_batch("systems_v2", systems, interview_id, company)
+
+    def test_reextraction_does_not_inflate_systems(self, processor):
+        """Test re-extracting an interview's systems leaves the shared rows as before"""
+        db = processor.db
+        first = db.insert_interview(INTERVIEW["meta"], INTERVIEW["qa_pairs"])
+        second = db.insert_interview({**INTERVIEW["meta"], "respondent": "Luis", "company": "Beta"}, {"¿Qué usa?": "SAP"})
+        self._store(processor, first, "Acme", [
+            {"name": "SAP", "integration_pain_points": ["Doble digitación"]},
+            {"name": "Opera", "integration_pain_points": []}
+        ])
+        self._store(processor, second, "Beta", [{"name": "SAP", "integration_pain_points": ["Sin API"]}])
+        expected_sap = self._system(processor, "SAP")
+
+        for _ in range(2):
+            db.delete_interview_entities(first, ["systems_v2"])
+            self._store(processor, first, "Acme", [
+                {"name": "SAP", "integration_pain_points": ["Doble digitación"]},
+                {"name": "Opera", "integration_pain_points": []}
+            ])
+
+        assert self._system(processor, "SAP") == expected_sap == (2, ["Acme", "Beta"], [], ["Doble digitación", "Sin API"])
+        assert self._system(processor, "Opera")[:2] == (1, ["Acme"])
+
+    def test_edited_interview_drops_its_stale_share(self, processor):
+        """Test systems and items only the old transcript mentioned are removed"""
+        db = processor.db
+        first = db.insert_interview(INTERVIEW["meta"], INTERVIEW["qa_pairs"])
+        second = db.insert_interview({**INTERVIEW["meta"], "respondent": "Luis"}, {"¿Qué usa?": "SAP"})
+        self._store(processor, second, "Acme", [{"name": "SAP", "integration_pain_points": ["Sin API"]}])
+        self._store(processor, first, "Acme", [
+            {"name": "SAP", "integration_pain_points": ["Sin API", "Doble digitación"]},
+            {"name": "Opera"}
+        ])
+
+        db.delete_interview_entities(first, ["systems_v2"])
+
+        assert self._system(processor, "SAP") == (1, ["Acme"], [], ["Sin API"])
+        assert self._system(processor, "Opera") is None
+
+
+class TestExtractorVersions:
+    """Test suite for IntelligenceExtractor.extractor_versions"""
+
+    def _versions(self, grouped=False):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return IntelligenceExtractor(max_concurrent_extractions=1, grouped_extraction=grouped).extractor_versions()
+
+    def test_versions_are_stable_and_send_nothing(self):
+        """Test versions are rendered from captured requests without API calls"""
+        with capture_llm_requests() as outer:
+            versions = self._versions()
+
+        assert versions == self._versions()
+        assert len(set(versions.values())) == len(versions)
+        assert outer == []  # Each type captured its own requests
+
+    def test_model_chain_changes_router_types_only(self, monkeypatch):
+        """Test a new fallback model re-versions the types that use the router"""
+        before = self._versions()
+        monkeypatch.setattr(MODEL_ROUTER, "fallback_chain", MODEL_ROUTER.fallback_chain + ["gpt-4.1-mini"])
+
+        after = self._versions()
+
+        changed = {entity_type for entity_type in before if before[entity_type] != after[entity_type]}
+        assert "systems_v2" in changed
+        assert "processes" not in changed  # Fixed model, no fallback chain
+
+    def test_section_schema_changes_only_its_type_in_grouped_mode(self, monkeypatch):
+        """Test editing one grouped section schema re-versions only that type"""
+        before = self._versions(grouped=True)
+        key, definition, fields = grouped_extraction.SECTION_SCHEMAS["kpis"]
+        monkeypatch.setitem(grouped_extraction.SECTION_SCHEMAS, "kpis", (key, definition + " (revisado)", fields))
+
+        after = self._versions(grouped=True)
+
+        assert {entity_type for entity_type in before if before[entity_type] != after[entity_type]} == {"kpis"}
+        assert self._versions(grouped=False) != before
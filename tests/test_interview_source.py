@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Streaming Interview Source
+
+Tests:
+- JSON array and JSONL files stream the same records json.load returns
+- Records are read back by byte offset (what parallel workers receive)
+- Resume filtering skips completed interviews while streaming
+- Malformed files raise instead of silently dropping records
+- Records spanning read chunks are decoded once
+"""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from intelligence_capture.interview_source import InterviewSource, interview_key, read_interview
+from intelligence_capture import parallel_processor
+
+
+INTERVIEWS = [
+    {
+        "meta": {"company": "Los Tajibos", "respondent": f"Persona {i}", "role": "Gerente", "date": "2025-10-01"},
+        "qa_pairs": {"¿Qué sistemas usa?": f"Usamos SAP y Excel — ñandú {i} \"comillas\" [corchetes] {{llaves}}"}
+    }
+    for i in range(25)
+]
+
+
+@pytest.fixture(params=["array", "array_indented", "jsonl"])
+def interviews_file(request, tmp_path):
+    """Interview corpus in each supported layout"""
+    if request.param == "jsonl":
+        path = tmp_path / "interviews.jsonl"
+        path.write_text("\n".join(json.dumps(i, ensure_ascii=False) for i in INTERVIEWS) + "\n\n", encoding="utf-8")
+    else:
+        path = tmp_path / "interviews.json"
+        indent = 2 if request.param == "array_indented" else None
+        path.write_text(json.dumps(INTERVIEWS, ensure_ascii=False, indent=indent), encoding="utf-8")
+    return path
+
+
+class TestInterviewSource:
+    """Test suite for InterviewSource"""
+
+    def test_streams_all_records(self, interviews_file):
+        """Test streamed records equal the parsed file"""
+        source = InterviewSource(interviews_file)
+
+        assert [interview for _, interview in source.iter_interviews()] == INTERVIEWS
+        assert source.scanned == len(INTERVIEWS)
+
+    def test_read_by_offset(self, interviews_file):
+        """Test every record can be read back from its offset"""
+        source = InterviewSource(interviews_file)
+
+        refs = list(source.iter_refs())
+
+        assert [ref.index for ref in refs] == list(range(len(INTERVIEWS)))
+        assert [read_interview(interviews_file, ref.offset, ref.length) for ref in refs] == INTERVIEWS
+        assert refs[3].respondent == "Persona 3"
+        assert refs[3].company == "Los Tajibos"
+
+    def test_resume_filter(self, interviews_file):
+        """Test completed interviews are skipped during the scan"""
+        source = InterviewSource(interviews_file)
+        completed = {interview_key(interview) for interview in INTERVIEWS[:20]}
+
+        refs = list(source.iter_refs(skip_keys=completed))
+
+        assert [source.read(ref) for ref in refs] == INTERVIEWS[20:]
+        assert source.scanned == len(INTERVIEWS)
+
+    def test_records_larger_than_read_chunk(self, tmp_path):
+        """Test records spanning many read chunks are decoded intact"""
+        interviews = [{"meta": {"respondent": "Ana"}, "qa_pairs": {"q": "é" * 200_000}}] * 3
+        path = tmp_path / "large.json"
+        path.write_text(json.dumps(interviews, ensure_ascii=False), encoding="utf-8")
+
+        source = InterviewSource(path)
+
+        assert [source.read(ref) for ref in source.iter_refs()] == interviews
+
+    def test_each_record_is_decoded_once(self, tmp_path):
+        """Test records spanning chunks are scanned incrementally, then decoded once"""
+        interviews = INTERVIEWS + [
+            {"meta": {"respondent": "Ana"}, "qa_pairs": {"q": 'ruta C:\\temp\\ "citas" {[' * 20_000}},
+            {"meta": {"respondent": "Luis"}, "qa_pairs": {"q": "\\", "r": ["]", "}", "\\\""]}}
+        ]
+        path = tmp_path / "escapes.json"
+        path.write_text(json.dumps(interviews, ensure_ascii=False, indent=1), encoding="utf-8")
+        raw_decode = json.JSONDecoder.raw_decode
+
+        with patch("intelligence_capture.interview_source._READ_SIZE", 7), \
+                patch.object(json.JSONDecoder, "raw_decode", autospec=True, side_effect=raw_decode) as decode:
+            records = [interview for _, interview in InterviewSource(path).iter_interviews()]
+
+        assert records == interviews
+        assert decode.call_count == len(interviews)
+
+    @pytest.mark.parametrize("content", ['[{"a": 1},', '[{"a": 1} {"b": 2}]', '[{"a": 1}, {"b": ]'])
+    def test_malformed_array_raises(self, tmp_path, content):
+        """Test truncated or malformed arrays raise"""
+        path = tmp_path / "bad.json"
+        path.write_text(content, encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            list(InterviewSource(path).iter_refs())
+
+
+class TestParallelWorkerInput:
+    """Test suite for offset-based worker input"""
+
+    def test_worker_reads_its_own_record(self, tmp_path):
+        """Test the worker receives a location and processes that interview"""
+        path = tmp_path / "interviews.json"
+        path.write_text(json.dumps(INTERVIEWS, ensure_ascii=False), encoding="utf-8")
+        ref = list(InterviewSource(path).iter_refs())[7]
+
+        with patch.object(parallel_processor, "_process_single_interview", return_value={"success": True}) as worker:
+            parallel_processor._process_interview_at(str(path), ref.offset, ref.length, tmp_path / "db.sqlite")
+
+        worker.assert_called_once_with(INTERVIEWS[7], tmp_path / "db.sqlite", None)
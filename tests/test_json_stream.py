@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Streamed JSON-mode Extraction
+
+Tests:
+- JsonArrayStream yields the same entities however the response is chunked
+- Strings with braces, brackets and escaped quotes do not confuse the scanner
+- Only the top-level entity array is streamed
+- stream_llm_entities yields entities before the completion finishes,
+  caches the full response and falls back before the first entity
+- AutomationCandidateExtractor scores streamed candidates one by one
+"""
+import contextlib
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from intelligence_capture import extractors
+from intelligence_capture.json_stream import JsonArrayStream
+from intelligence_capture.llm_cache import LLMResponseCache
+
+RESPONSE = json.dumps({
+    "summary": {"automation_candidates": [{"name": "nested, ignored"}]},
+    "automation_candidates": [
+        {"name": "Bot {WhatsApp} [consultas]", "systems_involved": ["SAP", "Opera"], "time_wasted_per_occurrence_minutes": 30},
+        {"name": "Conciliación \"diaria\" \\ Excel", "frequency": "Daily", "time_wasted_per_occurrence_minutes": 120,
+         "nested": {"a": [1, {"b": 2}]}},
+        {"name": "Alertas de stock", "time_wasted_per_occurrence_minutes": 15, "estimated_annual_savings_usd": 25000}
+    ],
+    "notes": [{"name": "other array, ignored"}]
+}, ensure_ascii=False)
+
+ENTITIES = json.loads(RESPONSE)["automation_candidates"]
+
+
+def _chunk(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class FakeStreamingClient:
+    """Fake OpenAI client returning a chunked streaming completion"""
+
+    def __init__(self, content, fail_after=None, errors=()):
+        self.content = content
+        self.fail_after = fail_after  # Raise after this many chunks
+        self.errors = list(errors)  # Raised by create() before streaming
+        self.received = []  # Indexes of the chunks delivered so far
+        self.calls = []
+        raw = SimpleNamespace(create=self.create)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(with_raw_response=raw))
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.errors:
+            raise self.errors.pop(0)
+        chunks = self._chunks()
+        return SimpleNamespace(headers={}, parse=lambda: chunks)
+
+    def _chunks(self):
+        for index, text in enumerate(_chunk(self.content, 7)):
+            if self.fail_after is not None and index >= self.fail_after:
+                raise RuntimeError("connection reset")
+            self.received.append(index)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None)
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=50, total_tokens=150)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+
+@pytest.fixture
+def no_cache():
+    with patch.object(extractors, "get_llm_cache", return_value=None), \
+            patch.object(extractors, "get_model_rate_limiter", return_value=MagicMock()):
+        yield
+
+
+def _stream(client, array_key="automation_candidates"):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return list(extractors.stream_llm_entities(client, [{"role": "user", "content": "x"}], array_key))
+
+
+class TestJsonArrayStream:
+    """Test suite for the incremental parser"""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 5, 16, len(RESPONSE)])
+    def test_any_chunking_yields_the_same_entities(self, size):
+        """Test chunk boundaries inside strings, escapes and numbers"""
+        stream = JsonArrayStream("automation_candidates")
+        entities = [entity for chunk in _chunk(RESPONSE, size) for entity in stream.feed(chunk)]
+
+        assert entities == ENTITIES
+        assert stream.emitted == 3
+        assert stream.text == RESPONSE
+
+    def test_entity_is_emitted_when_its_object_closes(self):
+        """Test an entity is returned by the chunk holding its closing brace"""
+        stream = JsonArrayStream("pain_points")
+
+        assert stream.feed('{"pain_points": [{"description": "Reportes') == []
+        assert stream.feed(' manuales"}, {"desc') == [{"description": "Reportes manuales"}]
+        assert stream.feed('ription": "Correo"}]}') == [{"description": "Correo"}]
+
+    def test_missing_key_yields_nothing(self):
+        """Test a response without the entity array streams no entities"""
+        stream = JsonArrayStream("pain_points")
+        assert stream.feed('{"other": [{"description": "x"}], "pain_points_total": 0}') == []
+
+
+class TestStreamLLMEntities:
+    """Test suite for stream_llm_entities"""
+
+    def test_entities_arrive_before_the_stream_ends(self, no_cache):
+        """Test the first entity is yielded long before the last chunk"""
+        client = FakeStreamingClient(RESPONSE)
+        with contextlib.redirect_stdout(io.StringIO()):
+            stream = extractors.stream_llm_entities(client, [{"role": "user", "content": "x"}], "automation_candidates")
+            first = next(stream)
+            chunks_at_first = len(client.received)
+            rest = list(stream)
+
+        assert [first, *rest] == ENTITIES
+        assert chunks_at_first < len(_chunk(RESPONSE, 7)) / 2
+        assert client.calls[0]["stream"] is True
+        assert client.calls[0]["response_format"] == {"type": "json_object"}
+
+    def test_full_response_is_cached_and_replayed(self, tmp_path):
+        """Test a streamed response is cached and a second call makes no request"""
+        cache = LLMResponseCache(tmp_path / "cache.db")
+        client = FakeStreamingClient(RESPONSE)
+        with patch.object(extractors, "get_llm_cache", return_value=cache), \
+                patch.object(extractors, "get_model_rate_limiter", return_value=MagicMock()):
+            assert _stream(client) == ENTITIES
+            assert _stream(client) == ENTITIES
+
+        assert len(client.calls) == 1
+
+    def test_error_before_first_entity_retries(self, no_cache):
+        """Test a failed request is retried before anything was yielded"""
+        client = FakeStreamingClient(RESPONSE, errors=[RuntimeError("502")])
+        with patch.object(extractors.time, "sleep"):
+            assert _stream(client) == ENTITIES
+        assert len(client.calls) == 2
+
+    def test_error_mid_stream_keeps_yielded_entities(self, no_cache):
+        """Test a stream broken after some entities ends without duplicates"""
+        # Connection drops before the third entity's closing brace
+        client = FakeStreamingClient(RESPONSE, fail_after=RESPONSE.index("25000}") // 7)
+        entities = _stream(client)
+
+        assert entities == ENTITIES[:2]
+        assert len(client.calls) == 1
+
+
+class TestStreamingExtractor:
+    """Test suite for streaming mode of AutomationCandidateExtractor"""
+
+    def test_streamed_candidates_are_scored(self, no_cache):
+        """Test streaming mode matches the scores of the non-streaming path"""
+        extractor = extractors.AutomationCandidateExtractor(openai_api_key="test", streaming=True)
+        extractor.client = FakeStreamingClient(RESPONSE)
+        interview = {"meta": {"role": "Contador"}, "qa_pairs": {"¿Qué automatizarías?": "Conciliación"}}
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            streamed = extractor.extract_from_interview(interview)
+            batch = extractor.extract_from_interview(interview, llm_response=RESPONSE)
+
+        assert streamed == batch
+        assert [candidate["priority_quadrant"] for candidate in streamed] == [
+            candidate["priority_quadrant"] for candidate in batch
+        ]
+        assert all("effort_score" in candidate and candidate["owner"] == "Contador" for candidate in streamed)
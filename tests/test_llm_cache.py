@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the LLM Response Cache
+
+Tests:
+- Cache keys are stable and cover model, messages, temperature and format
+- TTL expiry and size-bounded LRU eviction
+- Entries persist across instances (re-runs hit the disk tier)
+- call_llm_with_fallback serves hits without an API call or rate limit slot
+- track_llm_usage() costs sent calls, not cache hits
+- Per-interview hit/miss counts and saved cost reach ExtractionMonitor
+"""
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from intelligence_capture import extractors
+from intelligence_capture.llm_cache import LLMResponseCache, estimate_cost, set_llm_cache
+from intelligence_capture.monitor import ExtractionMonitor
+
+
+MESSAGES = [
+    {"role": "system", "content": "Extrae entidades"},
+    {"role": "user", "content": "Usamos SAP y Excel para la conciliación diaria"}
+]
+JSON_FORMAT = {"type": "json_object"}
+USAGE = {"prompt_tokens": 1000, "completion_tokens": 200}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Disk-backed cache in a temporary directory"""
+    cache = LLMResponseCache(tmp_path / "llm_cache.db")
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def shared_cache(cache):
+    """Cache installed as the process-wide instance"""
+    set_llm_cache(cache)
+    yield cache
+    set_llm_cache(None)
+
+
+class TestLLMResponseCache:
+    """Test suite for LLMResponseCache"""
+
+    def test_key_is_stable_and_specific(self):
+        """Test identical requests share a key and any field change alters it"""
+        key = LLMResponseCache.cache_key("gpt-4o-mini", MESSAGES, 0.1, JSON_FORMAT)
+        reordered = [{"content": m["content"], "role": m["role"]} for m in MESSAGES]
+
+        assert LLMResponseCache.cache_key("gpt-4o-mini", reordered, 0.1, JSON_FORMAT) == key
+        assert LLMResponseCache.cache_key("gpt-4o", MESSAGES, 0.1, JSON_FORMAT) != key
+        assert LLMResponseCache.cache_key("gpt-4o-mini", MESSAGES, 0.2, JSON_FORMAT) != key
+        assert LLMResponseCache.cache_key("gpt-4o-mini", MESSAGES, 0.1, None) != key
+        assert LLMResponseCache.cache_key("gpt-4o-mini", MESSAGES[:1], 0.1, JSON_FORMAT) != key
+
+    def test_hit_and_miss(self, cache):
+        """Test stored completions are returned and counted with cost saved"""
+        assert cache.get("gpt-4o-mini", MESSAGES, 0.1, JSON_FORMAT) is None
+
+        cache.put("gpt-4o-mini", MESSAGES, 0.1, '{"systems": []}', JSON_FORMAT, USAGE)
+
+        assert cache.get("gpt-4o-mini", MESSAGES, 0.1, JSON_FORMAT) == '{"systems": []}'
+        stats = cache.get_statistics()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["tokens_saved"] == 1200
+        assert stats["cost_saved"] == pytest.approx(estimate_cost("gpt-4o-mini", 1000, 200))
+
+    def test_persists_across_instances(self, cache, tmp_path):
+        """Test a new instance (a re-run) hits entries written earlier"""
+        cache.put("gpt-4o-mini", MESSAGES, 0.1, '{"kpis": []}', JSON_FORMAT, USAGE)
+
+        reopened = LLMResponseCache(tmp_path / "llm_cache.db")
+        try:
+            assert reopened.get("gpt-4o-mini", MESSAGES, 0.1, JSON_FORMAT) == '{"kpis": []}'
+            assert reopened.get_statistics()["disk_hits"] == 1
+        finally:
+            reopened.close()
+
+    def test_ttl_expiry(self, tmp_path):
+        """Test expired entries are misses and are purged"""
+        cache = LLMResponseCache(tmp_path / "ttl.db", ttl_seconds=60)
+        try:
+            cache.put("gpt-4o-mini", MESSAGES, 0.1, "{}", JSON_FORMAT)
+            later = time.time() + 120
+            with patch("intelligence_capture.llm_cache.time.time", return_value=later):
+                assert cache.get("gpt-4o-mini", MESSAGES, 0.1, JSON_FORMAT) is None
+            assert cache.count() == 0
+        finally:
+            cache.close()
+
+    def test_lru_eviction(self, tmp_path):
+        """Test the disk tier stays bounded and keeps recently used entries"""
+        cache = LLMResponseCache(tmp_path / "lru.db", max_entries=10, max_memory_entries=0)
+        try:
+            for i in range(10):
+                cache.put("gpt-4o-mini", [{"role": "user", "content": f"q{i}"}], 0.1, f'{{"i": {i}}}')
+            time.sleep(0.01)
+            assert cache.get("gpt-4o-mini", [{"role": "user", "content": "q0"}], 0.1) is not None
+
+            cache.put("gpt-4o-mini", [{"role": "user", "content": "q10"}], 0.1, '{"i": 10}')
+
+            assert cache.count() <= 10
+            assert cache.get_statistics()["evictions"] > 0
+            assert cache.get("gpt-4o-mini", [{"role": "user", "content": "q0"}], 0.1) == '{"i": 0}'
+            assert cache.get("gpt-4o-mini", [{"role": "user", "content": "q1"}], 0.1) is None
+        finally:
+            cache.close()
+
+    def test_get_any_uses_first_cached_model(self, cache):
+        """Test a completion cached for a fallback model answers the chain"""
+        cache.put("gpt-4o", MESSAGES, 0.1, '{"from": "gpt-4o"}', JSON_FORMAT)
+
+        model, content = cache.get_any(["gpt-4o-mini", "gpt-4o"], MESSAGES, 0.1, JSON_FORMAT)
+
+        assert (model, content) == ("gpt-4o", '{"from": "gpt-4o"}')
+        assert cache.get_statistics()["misses"] == 0
+
+
+def _raw_response(response, headers=None):
+    """Stand-in for the SDK's with_raw_response result"""
+    return SimpleNamespace(headers=headers or {}, parse=lambda: response)
+
+
+class TestCachedLLMCalls:
+    """Test suite for cache use in call_llm_with_fallback"""
+
+    def test_hit_skips_api_and_rate_limiter(self, shared_cache):
+        """Test the second identical call is served from the cache"""
+        client = MagicMock()
+        client.chat.completions.with_raw_response.create.return_value = _raw_response(SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"systems": [{"name": "SAP"}]}'))],
+            usage=SimpleNamespace(prompt_tokens=900, completion_tokens=100)
+        ))
+        limiter = MagicMock()
+
+        with patch.object(extractors, "get_model_rate_limiter", return_value=limiter):
+            first = extractors.call_llm_with_fallback(client, MESSAGES)
+            usage = {}
+            second = extractors.call_llm_with_fallback(client, MESSAGES, usage=usage)
+
+        assert first == second == '{"systems": [{"name": "SAP"}]}'
+        assert client.chat.completions.with_raw_response.create.call_count == 1
+        assert limiter.wait_if_needed.call_count == 1
+        assert usage["cached"] is True
+        assert shared_cache.get_statistics()["hits"] == 1
+
+    def test_tracked_usage_counts_sent_calls_only(self, shared_cache):
+        """Test track_llm_usage costs the API call but not the cache hit"""
+        client = MagicMock()
+        client.chat.completions.with_raw_response.create.return_value = _raw_response(SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"systems": []}'))],
+            usage=SimpleNamespace(prompt_tokens=900, completion_tokens=100, total_tokens=1000)
+        ))
+
+        with patch.object(extractors, "get_model_rate_limiter", return_value=MagicMock()):
+            with extractors.track_llm_usage() as tracked:
+                call_usage = {}
+                extractors.call_llm_with_fallback(client, MESSAGES, usage=call_usage)
+                extractors.call_llm_with_fallback(client, MESSAGES)
+            extractors.call_llm_with_fallback(client, MESSAGES[:1])
+
+        assert tracked.llm_calls == 1
+        assert tracked.tokens == 1000
+        assert tracked.cost == pytest.approx(estimate_cost(call_usage["model"], 900, 100))
+
+    def test_invalid_json_is_not_cached(self, shared_cache):
+        """Test unparseable completions are never stored"""
+        client = MagicMock()
+        client.chat.completions.with_raw_response.create.return_value = _raw_response(SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="not json"))],
+            usage=None
+        ))
+
+        with patch.object(extractors, "get_model_rate_limiter", return_value=MagicMock()):
+            extractors.call_llm_with_fallback(client, MESSAGES)
+
+        assert shared_cache.count() == 0
+
+
+class TestCacheMonitoring:
+    """Test suite for cache metrics in ExtractionMonitor"""
+
+    def test_summary_reports_cache_metrics(self):
+        """Test hit/miss counts and cost saved are summed across interviews"""
+        monitor = ExtractionMonitor(total_interviews=2)
+        for interview_id, (hits, misses) in enumerate([(12, 1), (13, 0)], start=1):
+            metric = monitor.start_interview(interview_id, "Los Tajibos", f"Persona {interview_id}")
+            metric.finish(success=True)
+            metric.set_cache_metrics(hits, misses, hits * 0.001)
+            monitor.finish_interview(metric, success=True)
+
+        summary = monitor.get_summary()
+
+        assert summary["cache_hits"] == 25
+        assert summary["cache_misses"] == 1
+        assert summary["cache_hit_rate"] == pytest.approx(25 / 26 * 100)
+        assert summary["cache_cost_saved"] == pytest.approx(0.025)
+        assert json.loads(json.dumps(monitor.metrics[0].to_dict()))["cache_hits"] == 12
@@ -56,3 +56,95 @@ def test_thread_safety_for_next_model() -> None:
 def test_empty_round_robin_chain_is_invalid() -> None:
     with pytest.raises(ValueError):
         ModelRouter(round_robin_chain=[], fallback_chain=["fallback"])
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_next_model_prefers_lower_latency() -> None:
+    router = ModelRouter(round_robin_chain=["fast", "slow"])
+    for _ in range(5):
+        router.record_success("fast", 1.0)
+        router.record_success("slow", 4.0)
+
+    assert [router.next_model() for _ in range(4)] == ["fast"] * 4
+
+
+def test_models_with_similar_latency_keep_rotating() -> None:
+    router = ModelRouter(round_robin_chain=["a", "b"])
+    router.record_success("a", 1.0)
+    router.record_success("b", 1.1)
+
+    assert [router.next_model() for _ in range(4)] == ["a", "b", "a", "b"]
+
+
+def test_next_model_accounts_for_rate_limit_wait() -> None:
+    waits = {"busy": 20.0, "idle": 0.0}
+    router = ModelRouter(round_robin_chain=["busy", "idle"], wait_estimator=waits.get)
+    router.record_success("busy", 1.0)
+    router.record_success("idle", 2.0)
+
+    assert router.next_model() == "idle"
+
+
+def test_rate_limited_model_is_ejected_until_cooldown_ends() -> None:
+    clock = FakeClock()
+    router = ModelRouter(round_robin_chain=["a", "b"], fallback_chain=["a", "b"], clock=clock)
+
+    router.record_failure("a", rate_limited=True, retry_after=10)
+
+    assert not router.is_available("a")
+    assert [router.next_model() for _ in range(3)] == ["b", "b", "b"]
+    assert router.build_sequence(initial="a") == ["b", "a"]
+
+    clock.now = 11
+    assert router.is_available("a")
+
+
+def test_consecutive_errors_open_the_circuit_with_backoff() -> None:
+    clock = FakeClock()
+    router = ModelRouter(round_robin_chain=["a", "b"], clock=clock)
+
+    for _ in range(2):
+        router.record_failure("a")
+    assert router.is_available("a")
+
+    router.record_failure("a")
+    assert router.get_stats()["a"]["cooldown_remaining"] == pytest.approx(30.0)
+
+    clock.now = 31
+    for _ in range(3):
+        router.record_failure("a")
+    assert router.get_stats()["a"]["cooldown_remaining"] == pytest.approx(60.0)
+
+    router.record_success("a", 1.0)
+    assert router.is_available("a")
+
+
+def test_all_models_cooling_down_returns_first_to_recover() -> None:
+    router = ModelRouter(round_robin_chain=["a", "b"], clock=FakeClock())
+    router.record_failure("a", rate_limited=True, retry_after=50)
+    router.record_failure("b", rate_limited=True, retry_after=5)
+
+    assert router.next_model() == "b"
+
+
+def test_get_stats_reports_latency_percentiles_and_error_rate() -> None:
+    router = ModelRouter(round_robin_chain=["a"], fallback_chain=["backup"], wait_estimator=lambda model: 0.5)
+    for latency in range(1, 21):
+        router.record_success("a", float(latency))
+    router.record_failure("a")
+
+    stats = router.get_stats()
+
+    assert stats["a"]["calls"] == 21
+    assert stats["a"]["p50_latency"] == 10.0
+    assert stats["a"]["p95_latency"] == 19.0
+    assert stats["a"]["error_rate"] == pytest.approx(1 / 21)
+    assert stats["a"]["rate_limit_wait"] == 0.5
+    assert stats["backup"]["calls"] == 0 and stats["backup"]["available"]
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Entity Name Normalization
+
+Tests:
+- Precompiled patterns match applying each rule one after another
+- Stored normalized_name is used instead of re-normalizing existing entities
+- IntelligenceDB computes normalized_name (and name_profile) at insert and update time
+"""
+import random
+import re
+
+import pytest
+
+from intelligence_capture.database import EnhancedIntelligenceDB
+from intelligence_capture.duplicate_detector import DuplicateDetector
+from intelligence_capture.name_normalizer import (
+    COMMON_PREFIXES,
+    COMMON_WORDS,
+    name_profile,
+    normalize_entity,
+    normalize_entity_name
+)
+
+
+def _sequential_normalize(name: str, entity_type: str) -> str:
+    """Reference implementation: one re.sub per rule"""
+    if not name:
+        return ""
+    normalized = name.lower().strip()
+    for word in COMMON_WORDS.get(entity_type, []):
+        normalized = re.sub(rf"\b{re.escape(word)}\b", "", normalized, flags=re.IGNORECASE)
+    for prefix in COMMON_PREFIXES.get(entity_type, []):
+        normalized = re.sub(rf"^{re.escape(prefix)}\s*", "", normalized, flags=re.IGNORECASE)
+    return " ".join(normalized.split())
+
+
+class TestNormalizeEntityName:
+    """Test suite for precompiled normalization rules"""
+
+    @pytest.mark.parametrize("entity_type", ["systems", "processes", "pain_points", "kpis"])
+    def test_matches_sequential_rules(self, entity_type):
+        """Test random names normalize exactly like the per-rule loop"""
+        rng = random.Random(7)
+        vocabulary = (
+            COMMON_WORDS.get(entity_type, []) + COMMON_PREFIXES.get(entity_type, [])
+            + ["SAP", "Excel", "de", "ventas", "app-móvil", "  ", "Sistemas", "proceso's"]
+        )
+        for _ in range(2000):
+            name = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 6)))
+            assert normalize_entity_name(name, entity_type) == _sequential_normalize(name, entity_type)
+
+    def test_examples(self):
+        """Test common words and prefixes are removed"""
+        assert normalize_entity_name("Sistema SAP Plataforma", "systems") == "sap"
+        assert normalize_entity_name("Problema de Problema con facturas", "pain_points") == "facturas"
+        assert normalize_entity_name("Sistema SAP", "kpis") == "sistema sap"
+        assert normalize_entity_name(None, "systems") == ""
+
+    def test_normalize_entity_uses_detector_text(self):
+        """Test normalize_entity normalizes name + truncated description"""
+        entity = {"name": "Sistema SAP", "description": "ERP " * 100}
+        detector = DuplicateDetector({"performance": {"use_db_storage": False}})
+
+        expected = detector.normalize_name(detector._get_entity_text(entity, "systems"), "systems")
+        assert normalize_entity(entity, "systems") == expected
+
+
+class TestStoredNormalizedName:
+    """Test suite for candidate comparison against stored values"""
+
+    @pytest.mark.parametrize("use_candidate_index", [True, False])
+    def test_stored_value_is_not_recomputed(self, use_candidate_index):
+        """Test stored normalized_name is compared as-is"""
+        detector = DuplicateDetector({
+            "performance": {"use_db_storage": False, "use_candidate_index": use_candidate_index}
+        })
+        # Stored value deliberately differs from the raw name
+        existing = [{"id": 1, "name": "Legacy name", "normalized_name": "sap"}]
+
+        candidates = detector._find_fuzzy_candidates("Sistema SAP", "systems", existing, 0.9, 5)
+
+        assert [(entity["id"], score) for entity, _, score in candidates] == [(1, 1.0)]
+
+    def test_missing_stored_value_falls_back(self):
+        """Test entities without normalized_name are normalized on the fly"""
+        detector = DuplicateDetector({"performance": {"use_db_storage": False}})
+        existing = [{"id": 1, "name": "SAP Plataforma", "normalized_name": None}]
+
+        candidates = detector._find_fuzzy_candidates("Sistema SAP", "systems", existing, 0.9, 5)
+
+        assert [entity["id"] for entity, _, _ in candidates] == [1]
+
+
+class TestNormalizedNameColumn:
+    """Test suite for the normalized_name column in IntelligenceDB"""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Database with v1, v2 and consolidation schema"""
+        database = EnhancedIntelligenceDB(tmp_path / "intel.db")
+        database.connect()
+        database.init_schema()
+        database.init_v2_schema()
+        database.add_consolidation_schema()
+        yield database
+        database.close()
+
+    def _stored(self, db, table: str) -> list:
+        return [row[0] for row in db.conn.execute(f"SELECT normalized_name FROM {table} ORDER BY id")]
+
+    def test_column_exists_without_index(self, db):
+        """Test the migration adds an unindexed normalized_name column"""
+        db.conn.execute("CREATE INDEX idx_systems_normalized_name ON systems(normalized_name)")
+        db.add_consolidation_schema()
+
+        columns = [row[1] for row in db.conn.execute("PRAGMA table_info(systems)")]
+        indexes = [row[1] for row in db.conn.execute("PRAGMA index_list(systems)")]
+
+        assert "normalized_name" in columns
+        assert "idx_systems_normalized_name" not in indexes
+
+    def test_insert_computes_normalized_name(self, db):
+        """Test inserts store the same value the detector would compute"""
+        interview_id = db.insert_interview({"company": "Comversa", "respondent": "Ana", "date": "2025-10-01"}, {})
+        db.insert_process(interview_id, "Comversa", {"name": "Proceso de Compras", "description": "Compras semanales"})
+        db.insert_or_update_system({"name": "Sistema SAP"}, "Comversa")
+        db.insert_or_update_system({"name": "Sistema SAP"}, "Hotel")
+
+        assert self._stored(db, "processes") == ["de compras compras semanales"]
+        assert self._stored(db, "systems") == ["sap"]
+
+    def test_update_recomputes_normalized_name(self, db):
+        """Test updating name fields refreshes the stored value"""
+        db.insert_or_update_system({"name": "Sistema SAP"}, "Comversa")
+
+        assert db.update_consolidated_entity("systems", 1, {"name": "Excel App"}, interview_id=2)
+
+        assert self._stored(db, "systems") == ["excel"]
+
+    def test_backfill_existing_rows(self, db):
+        """Test refresh_normalized_names fills rows written without the value"""
+        db.conn.execute("INSERT INTO systems (name) VALUES ('Herramienta Slack')")
+        db.conn.commit()
+
+        assert db.refresh_normalized_names("systems") == 1
+        assert self._stored(db, "systems") == ["slack"]
+
+    def test_profile_follows_normalized_name(self, db):
+        """Test name_profile is stored with every normalized_name write"""
+        db.insert_or_update_system({"name": "Sistema SAP"}, "Comversa")
+        db.conn.execute("INSERT INTO systems (name) VALUES ('Herramienta Slack')")
+        db.refresh_normalized_names("systems")
+        db.update_consolidated_entity("systems", 1, {"name": "Excel App"}, interview_id=2)
+
+        rows = db.conn.execute("SELECT normalized_name, name_profile FROM systems ORDER BY id").fetchall()
+
+        assert [row[0] for row in rows] == ["excel", "slack"]
+        assert [row[1] for row in rows] == [name_profile("excel"), name_profile("slack")]
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Parallel Consolidation
+
+Tests:
+- Parallel mode produces byte-identical results to the sequential run
+- Audit rows are written in sequential order by the single writer
+- ConsolidationWriter drains channels in registration order
+- Shared detector counters match the sequential run when types overlap
+"""
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from intelligence_capture.consolidation_agent import KnowledgeConsolidationAgent
+from intelligence_capture.consolidation_writer import ConsolidationWriter
+
+
+ENTITY_TYPES = ["systems", "pain_points", "processes"]
+FIXED_NOW = datetime(2025, 11, 9, 12, 0, 0)
+
+
+def _create_db(path) -> Mock:
+    """File database with three entity tables and an audit table"""
+    conn = sqlite3.connect(str(path), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    for entity_type in ENTITY_TYPES:
+        conn.execute(f"""
+            CREATE TABLE {entity_type} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                description TEXT,
+                mentioned_in_interviews TEXT,
+                source_count INTEGER DEFAULT 1,
+                is_consolidated BOOLEAN DEFAULT 1,
+                merged_entity_ids TEXT
+            )
+        """)
+        conn.executemany(
+            f"INSERT INTO {entity_type} (name, description, mentioned_in_interviews, merged_entity_ids) VALUES (?, ?, '[1]', '[]')",
+            [(f"{entity_type} {i}", f"Descripción de {entity_type} {i}") for i in range(40)]
+        )
+    conn.execute("""
+        CREATE TABLE consolidation_audit (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity_type TEXT,
+            merged_entity_ids TEXT,
+            resulting_entity_id INTEGER,
+            similarity_score REAL,
+            consolidation_timestamp TEXT
+        )
+    """)
+    conn.commit()
+
+    db = Mock()
+    db.conn = conn
+    return db
+
+
+class FakeEmbeddingClient:
+    """Deterministic embeddings (letter counts), slow enough for workers to overlap"""
+
+    def __init__(self):
+        self.texts = []
+        self.embeddings = SimpleNamespace(create=self.create)
+
+    def create(self, model, input):
+        texts = [input] if isinstance(input, str) else list(input)
+        time.sleep(0.002)
+        self.texts.extend(texts)
+        return SimpleNamespace(data=[
+            SimpleNamespace(embedding=[float(text.lower().count(letter)) + 0.1 for letter in "abcdefghijklmnopqrstuvwxyz"])
+            for text in texts
+        ])
+
+
+def _overlapping_db(path) -> Mock:
+    """Every entity type holds the same names (shared embedding texts)"""
+    db = _create_db(path)
+    for entity_type in ENTITY_TYPES:
+        db.conn.execute(f"DELETE FROM {entity_type}")
+        db.conn.executemany(
+            f"INSERT INTO {entity_type} (name, description, mentioned_in_interviews, merged_entity_ids) VALUES (?, ?, '[1]', '[]')",
+            [(f"Sistema de facturacion {i}", f"Descripción {i}") for i in range(20)]
+        )
+    db.conn.commit()
+    return db
+
+
+def _overlapping_entities() -> dict:
+    """Near-duplicate names, identical across entity types"""
+    return {
+        entity_type: [
+            {"name": f"Sistemas de facturación {i}", "description": f"Descripción {i}"}
+            for i in range(0, 20, 2)
+        ]
+        for entity_type in ENTITY_TYPES
+    }
+
+
+def _new_entities() -> dict:
+    """New entities: every third one duplicates an existing entity"""
+    entities = {}
+    for entity_type in ENTITY_TYPES:
+        entities[entity_type] = [
+            {
+                "name": f"{entity_type} {i}" if i % 3 == 0 else f"{['Jira', 'Trello', 'Slack', 'Notion'][i % 4]} {i}",
+                "description": f"Descripción de {entity_type} {i}",
+                "entity_type": entity_type
+            }
+            for i in range(30)
+        ]
+    entities["kpis"] = []
+    return entities
+
+
+def _run(db, parallel: bool):
+    """Run consolidation with a frozen clock"""
+    config = {
+        "similarity_thresholds": {"default": 0.85},
+        "performance": {"use_db_storage": False, "parallel_entity_types": parallel}
+    }
+    agent = KnowledgeConsolidationAgent(db, config, openai_api_key=None)
+    agent.relationship_discoverer.discover_relationships = Mock(return_value=[])
+
+    clock = Mock(wraps=datetime)
+    clock.now.return_value = FIXED_NOW
+    with patch("intelligence_capture.consolidation_agent.datetime", clock), \
+            patch("intelligence_capture.entity_merger.datetime", clock):
+        result = agent.consolidate_entities(_new_entities(), interview_id=2)
+
+    audit = [tuple(row) for row in db.conn.execute("SELECT * FROM consolidation_audit ORDER BY id")]
+    return agent, result, audit
+
+
+class TestParallelConsolidation:
+    """Test suite for parallel consolidation across entity types"""
+
+    def test_parallel_matches_sequential(self, tmp_path):
+        """Test results, audit trail, stats and metrics are identical"""
+        sequential, expected, expected_audit = _run(_create_db(tmp_path / "sequential.db"), parallel=False)
+        parallel, result, audit = _run(_create_db(tmp_path / "parallel.db"), parallel=True)
+
+        assert list(result) == list(expected)
+        assert json.dumps(result, sort_keys=False) == json.dumps(expected, sort_keys=False)
+        assert audit == expected_audit
+        assert 0 < len(audit) < 90
+
+        stats = parallel.get_statistics()
+        expected_stats = sequential.get_statistics()
+        stats.pop("processing_time")
+        expected_stats.pop("processing_time")
+        assert stats == expected_stats
+        assert stats["entities_merged"] == len(audit)
+
+        assert parallel.metrics.duplicates_by_type == sequential.metrics.duplicates_by_type
+        assert parallel.metrics.similarity_scores_by_type == sequential.metrics.similarity_scores_by_type
+        assert parallel.metrics.entity_counts == sequential.metrics.entity_counts
+
+    def test_shared_detector_counters_match_sequential(self, tmp_path):
+        """Test overlapping types share one detector without double-counting"""
+        runs = {}
+        for parallel in (False, True):
+            db = _overlapping_db(tmp_path / f"overlap_{parallel}.db")
+            config = {
+                "similarity_thresholds": {"default": 0.85},
+                "performance": {"use_db_storage": False, "parallel_entity_types": parallel, "max_workers": 3}
+            }
+            agent = KnowledgeConsolidationAgent(db, config, openai_api_key=None)
+            agent.relationship_discoverer.discover_relationships = Mock(return_value=[])
+            client = FakeEmbeddingClient()
+            agent.duplicate_detector.openai_client = client
+            result = agent.consolidate_entities(_overlapping_entities(), interview_id=2)
+            runs[parallel] = (agent, result, client)
+
+        sequential, expected, sequential_client = runs[False]
+        parallel, result, parallel_client = runs[True]
+
+        assert sequential.stats["entities_merged"] > 0
+        assert [entity.get("id") for entities in result.values() for entity in entities] == \
+            [entity.get("id") for entities in expected.values() for entity in entities]
+        assert parallel.stats["entities_merged"] == sequential.stats["entities_merged"]
+
+        detector_stats = parallel.duplicate_detector.get_cache_statistics()
+        expected_detector_stats = sequential.duplicate_detector.get_cache_statistics()
+        for key in ("memory_cache_hits", "memory_cache_misses", "total_api_calls", "consecutive_failures", "candidate_index"):
+            assert detector_stats[key] == expected_detector_stats[key], key
+        # Every distinct text embedded exactly once in both runs
+        assert sorted(parallel_client.texts) == sorted(sequential_client.texts)
+        assert len(set(parallel_client.texts)) == len(parallel_client.texts)
+
+    def test_single_type_uses_sequential_path(self, tmp_path):
+        """Test one non-empty entity type does not start workers"""
+        db = _create_db(tmp_path / "single.db")
+        config = {"performance": {"use_db_storage": False, "parallel_entity_types": True}}
+        agent = KnowledgeConsolidationAgent(db, config, openai_api_key=None)
+        agent.relationship_discoverer.discover_relationships = Mock(return_value=[])
+        agent._consolidate_types_parallel = Mock()
+
+        agent.consolidate_entities({"systems": [{"name": "systems 1"}], "kpis": []}, interview_id=2)
+
+        agent._consolidate_types_parallel.assert_not_called()
+
+
+class TestConsolidationWriter:
+    """Test suite for ConsolidationWriter"""
+
+    @pytest.fixture
+    def db(self):
+        """In-memory database with a log table"""
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.execute("CREATE TABLE log (id INTEGER PRIMARY KEY AUTOINCREMENT, value TEXT)")
+        database = Mock()
+        database.conn = conn
+        yield database
+        conn.close()
+
+    def test_channels_drain_in_registration_order(self, db):
+        """Test later channels wait until earlier channels are closed"""
+        writer = ConsolidationWriter(db, ["a", "b"])
+        writer.start()
+
+        writer.channel("b").execute("INSERT INTO log (value) VALUES (?)", ("b1",))
+        writer.channel("b").close()
+        writer.channel("a").execute("INSERT INTO log (value) VALUES (?)", ("a1",))
+        writer.channel("a").execute("INSERT INTO log (value) VALUES (?)", ("a2",))
+        writer.join()
+
+        values = [row[0] for row in db.conn.execute("SELECT value FROM log ORDER BY id")]
+        assert values == ["a1", "a2", "b1"]
+        assert writer.writes == 3
+
+    def test_failed_write_is_logged_not_raised(self, db):
+        """Test a failing statement does not stop the writer"""
+        writer = ConsolidationWriter(db, ["a"])
+        writer.start()
+
+        writer.channel("a").execute("INSERT INTO missing_table VALUES (1)")
+        writer.channel("a").execute("INSERT INTO log (value) VALUES (?)", ("ok",))
+        writer.join()
+
+        assert writer.failed_writes == 1
+        assert writer.writes == 1
+
+    def test_writes_happen_on_writer_thread(self, db):
+        """Test statements are executed by the single writer thread"""
+        threads = []
+        db.conn.create_function("record_thread", 0, lambda: threads.append(threading.current_thread().name) or 1)
+        writer = ConsolidationWriter(db, ["a"])
+        writer.start()
+
+        writer.channel("a").execute("INSERT INTO log (value) VALUES (record_thread())")
+        writer.join()
+
+        assert threads == ["consolidation-writer"]
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import multiprocessing as mp
+import os
+import sqlite3
 import sys
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -13,8 +19,10 @@ from intelligence_capture import rate_limiter
 @pytest.fixture(autouse=True)
 def reset_rate_limiters() -> None:
     rate_limiter._rate_limiters.clear()
+    rate_limiter._shared_rate_limiters.clear()
     yield
     rate_limiter._rate_limiters.clear()
+    rate_limiter._shared_rate_limiters.clear()
 
 
 def test_get_rate_limiter_returns_keyed_instances() -> None:
@@ -39,3 +47,272 @@ def test_rate_limiters_track_calls_independently() -> None:
     assert len(limiter_a.calls) == 3
     assert len(limiter_b.calls) == 2
     assert set(rate_limiter._rate_limiters.keys()) == {"model-a", "model-b"}
+
+
+def test_token_bucket_limits_requests_and_tokens(monkeypatch) -> None:
+    sleeps = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", sleeps.append)
+    limiter = rate_limiter.RateLimiter(max_calls_per_minute=6000, max_tokens_per_minute=6000)
+
+    assert limiter.wait_if_needed(tokens=6000) == 0
+    waited = limiter.wait_if_needed(tokens=100)
+
+    # 6000 tokens/min refill at 100/s: the second call waits ~1s for its tokens
+    assert waited == pytest.approx(1.0, abs=0.05)
+    assert sleeps == [waited]
+
+
+def test_reservations_are_first_come_first_served(monkeypatch) -> None:
+    monkeypatch.setattr(rate_limiter.time, "sleep", lambda seconds: None)
+    limiter = rate_limiter.RateLimiter(max_calls_per_minute=60)
+    for _ in range(60):
+        limiter.wait_if_needed()
+
+    waits = [limiter.wait_if_needed() for _ in range(3)]
+
+    assert waits == pytest.approx([1.0, 2.0, 3.0], abs=0.05)
+
+
+def test_waiting_does_not_hold_the_lock() -> None:
+    limiter = rate_limiter.RateLimiter(max_calls_per_minute=60)
+    limiter._requests.level = 0  # Next call waits ~1s
+
+    waiter = threading.Thread(target=limiter.wait_if_needed)
+    waiter.start()
+    time.sleep(0.1)
+
+    acquired = limiter.lock.acquire(timeout=0.1)
+    if acquired:
+        limiter.lock.release()
+    waiter.join()
+
+    assert acquired
+
+
+def test_async_acquire() -> None:
+    limiter = rate_limiter.RateLimiter(max_calls_per_minute=600)
+    limiter._requests.level = 0
+
+    async def run() -> list:
+        return await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+
+    start = time.perf_counter()
+    waits = asyncio.run(run())
+
+    assert waits == pytest.approx([0.1, 0.2, 0.3], abs=0.02)
+    assert time.perf_counter() - start < 0.5
+
+
+def test_record_usage_refunds_estimate() -> None:
+    limiter = rate_limiter.RateLimiter(max_calls_per_minute=1000, max_tokens_per_minute=10_000)
+    limiter.wait_if_needed(tokens=4000)
+
+    limiter.record_usage(estimated_tokens=4000, actual_tokens=1000)
+
+    assert limiter.get_statistics()["available_tokens"] == pytest.approx(9000, abs=5)
+    assert limiter.total_tokens == 1000
+
+
+def test_headers_tighten_buckets(monkeypatch) -> None:
+    monkeypatch.setattr(rate_limiter.time, "sleep", lambda seconds: None)
+    limiter = rate_limiter.RateLimiter(max_calls_per_minute=500, max_tokens_per_minute=200_000)
+
+    limiter.update_from_headers({
+        "x-ratelimit-limit-requests": "60",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "2s",
+        "x-ratelimit-limit-tokens": "150000",
+        "x-ratelimit-remaining-tokens": "149000",
+        "x-ratelimit-reset-tokens": "400ms"
+    })
+
+    assert limiter.max_calls == 60
+    assert limiter.max_tokens == 150_000
+    assert limiter.wait_if_needed() == pytest.approx(2.0, abs=0.05)
+
+
+def test_headers_raise_capacity_but_not_level(monkeypatch) -> None:
+    monkeypatch.setattr(rate_limiter.time, "sleep", lambda seconds: None)
+    limiter = rate_limiter.RateLimiter(max_calls_per_minute=500, max_tokens_per_minute=200_000)
+    limiter.update_from_headers({
+        "x-ratelimit-limit-requests": "60",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "2s",
+    })
+
+    # The server reports headroom again (and a limit above the configured one)
+    limiter.update_from_headers({
+        "x-ratelimit-limit-requests": "1000",
+        "x-ratelimit-remaining-requests": "450",
+        "x-ratelimit-remaining-tokens": "180000",
+    })
+
+    assert limiter.max_calls == 500
+    stats = limiter.get_statistics()
+    assert stats["available_requests"] < 1
+    assert stats["available_tokens"] == pytest.approx(180_000, abs=5)
+    assert limiter.estimate_wait() > 0
+
+
+def test_large_quota_headers_do_not_refill_drained_bucket(monkeypatch) -> None:
+    monkeypatch.setattr(rate_limiter.time, "sleep", lambda seconds: None)
+    limiter = rate_limiter.RateLimiter(max_calls_per_minute=50)
+    for _ in range(50):
+        limiter.wait_if_needed()
+    drained_wait = limiter.estimate_wait()
+    assert drained_wait > 0
+
+    limiter.update_from_headers({
+        "x-ratelimit-limit-requests": "5000",
+        "x-ratelimit-remaining-requests": "4950",
+    })
+
+    assert limiter.max_calls == 50
+    assert limiter.get_statistics()["available_requests"] < 1
+    assert limiter.estimate_wait() == pytest.approx(drained_wait, abs=0.05)
+
+
+def test_large_quota_headers_scale_remaining_to_configured_limit() -> None:
+    limiter = rate_limiter.RateLimiter(max_calls_per_minute=50)
+
+    # A tenth of the server's quota is left: a tenth of ours is too
+    limiter.update_from_headers({
+        "x-ratelimit-limit-requests": "5000",
+        "x-ratelimit-remaining-requests": "500",
+    })
+
+    assert limiter.get_statistics()["available_requests"] == pytest.approx(5, abs=0.1)
+
+
+def test_successful_response_headers_update_bucket(monkeypatch) -> None:
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    from intelligence_capture import extractors
+
+    limiter = rate_limiter.RateLimiter(max_calls_per_minute=500, max_tokens_per_minute=200_000)
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content='{"ok": true}'))],
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+    )
+    headers = {
+        "x-ratelimit-limit-requests": "500",
+        "x-ratelimit-remaining-requests": "3",
+        "x-ratelimit-limit-tokens": "200000",
+        "x-ratelimit-remaining-tokens": "5000",
+    }
+    client = MagicMock()
+    client.chat.completions.with_raw_response.create.return_value = SimpleNamespace(
+        headers=headers, parse=lambda: response
+    )
+    monkeypatch.setattr(extractors, "get_llm_cache", lambda: None)
+    monkeypatch.setattr(extractors, "get_model_rate_limiter", lambda model: limiter)
+
+    content = extractors.create_json_completion(client, "gpt-4o-mini", [{"role": "user", "content": "hola"}])
+
+    assert content == '{"ok": true}'
+    stats = limiter.get_statistics()
+    assert stats["available_requests"] == pytest.approx(3, abs=0.1)
+    # Remaining tokens from the headers, then the usage refund of the estimate
+    assert stats["available_tokens"] < 10_000
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("20ms", 0.02), ("1s", 1.0), ("6m0s", 360.0), ("1h2m3.5s", 3723.5), ("0.5", 0.5), ("soon", None), (None, None)
+])
+def test_parse_reset_duration(value, seconds) -> None:
+    assert rate_limiter.parse_reset_duration(value) == (pytest.approx(seconds) if seconds is not None else None)
+
+
+def test_shared_limiters_draw_from_one_budget(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(rate_limiter.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(rate_limiter.SharedRateLimiter, "_clock", staticmethod(lambda: 1000.0))
+    state = tmp_path / "limits.db"
+    limiter_a = rate_limiter.SharedRateLimiter(state, "model", max_calls_per_minute=60)
+    limiter_b = rate_limiter.SharedRateLimiter(state, "model", max_calls_per_minute=60)
+    other_key = rate_limiter.SharedRateLimiter(state, "other", max_calls_per_minute=60)
+
+    for _ in range(30):
+        limiter_a.wait_if_needed()
+        limiter_b.wait_if_needed()
+
+    assert limiter_a.wait_if_needed() == pytest.approx(1.0, abs=0.05)
+    assert limiter_b.wait_if_needed() == pytest.approx(2.0, abs=0.05)
+    assert other_key.wait_if_needed() == 0
+
+
+def test_shared_estimate_wait_reads_without_write_lock(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(rate_limiter.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(rate_limiter.SharedRateLimiter, "_clock", staticmethod(lambda: 1000.0))
+    state = tmp_path / "limits.db"
+    limiter_a = rate_limiter.SharedRateLimiter(state, "model", max_calls_per_minute=60)
+    limiter_b = rate_limiter.SharedRateLimiter(state, "model", max_calls_per_minute=60)
+    for _ in range(60):
+        limiter_a.wait_if_needed()
+
+    writer = sqlite3.connect(str(state), isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")  # Another process mid-reservation
+    try:
+        assert limiter_b.estimate_wait() == pytest.approx(1.0, abs=0.05)
+        assert limiter_b.get_statistics()["available_requests"] == pytest.approx(0.0, abs=0.05)
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+    # Reads reserve nothing
+    assert limiter_b.wait_if_needed() == pytest.approx(1.0, abs=0.05)
+
+
+def test_get_rate_limiter_uses_shared_backend_inside_shared_rate_limits(tmp_path) -> None:
+    state = tmp_path / "limits.db"
+    local = rate_limiter.get_rate_limiter(key="model")
+
+    with rate_limiter.shared_rate_limits(state):
+        shared = rate_limiter.get_rate_limiter(key="model")
+        assert os.environ[rate_limiter.SHARED_RATE_LIMIT_ENV] == str(state)
+        assert isinstance(shared, rate_limiter.SharedRateLimiter)
+        assert rate_limiter.get_rate_limiter(key="model") is shared
+
+    assert rate_limiter.SHARED_RATE_LIMIT_ENV not in os.environ
+    assert rate_limiter.get_rate_limiter(key="model") is local
+    assert not state.exists()
+
+
+def _reserve_from_worker(calls: int) -> float:
+    limiter = rate_limiter.get_rate_limiter(max_calls_per_minute=600, key="model")
+    return max(limiter._reserve(0) for _ in range(calls))
+
+
+def test_worker_processes_share_the_budget(tmp_path) -> None:
+    with rate_limiter.shared_rate_limits(tmp_path / "limits.db"):
+        with mp.get_context("spawn").Pool(4) as pool:
+            waits = pool.map(_reserve_from_worker, [200] * 4)
+
+    # 800 reservations against one 600/min bucket (10/s): the last ~200 are
+    # queued up to ~20s out; per-process buckets would never wait
+    assert max(waits) > 15
+
+
+def _grants_with_large_quota_headers(calls: int) -> int:
+    # Frozen clock: no refill, so every immediate grant comes out of the capacity
+    rate_limiter.SharedRateLimiter._clock = staticmethod(lambda: 1000.0)
+    limiter = rate_limiter.get_rate_limiter(max_calls_per_minute=60, key="model")
+    granted = 0
+    for _ in range(calls):
+        if limiter._reserve(0) == 0:
+            granted += 1
+        limiter.update_from_headers({
+            "x-ratelimit-limit-requests": "5000",
+            "x-ratelimit-remaining-requests": "4950",
+        })
+    return granted
+
+
+def test_worker_headers_do_not_reset_the_shared_budget(tmp_path) -> None:
+    with rate_limiter.shared_rate_limits(tmp_path / "limits.db"):
+        with mp.get_context("spawn").Pool(4) as pool:
+            grants = pool.map(_grants_with_large_quota_headers, [40] * 4)
+
+    # 160 reservations on a 60/min bucket with no refill: headers from any
+    # worker must not hand the shared budget back
+    assert sum(grants) <= 60
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the Precompiled Rule Engine
+
+Tests:
+- KeywordAutomaton finds the same keywords as substring checks, including
+  overlapping and nested keywords
+- RuleScan falls back to substring checks for unregistered keywords
+- Sentence segments reproduce the previous failure-description regex
+- Scans are shared per text and invalidated by new registrations
+"""
+import random
+import re
+
+import pytest
+
+from intelligence_capture import rule_engine
+from intelligence_capture.extractors import FailureModeExtractor
+from intelligence_capture.rule_engine import KeywordAutomaton, register_keywords, scan_text
+
+KEYWORDS = ["he", "she", "his", "hers", "cada día", "día", "diario", "a", "no funciona", "funciona"]
+
+
+def _legacy_failure_descriptions(text):
+    """FailureModeExtractor._extract_failure_descriptions before the rule engine"""
+    descriptions = []
+    for keyword in FailureModeExtractor.FAILURE_KEYWORDS:
+        if keyword in text.lower():
+            for match in re.findall(rf"([^.]*{keyword}[^.]*\.)", text, re.IGNORECASE):
+                if len(match) > 10:
+                    descriptions.append(match.strip())
+    return list(set(descriptions))[:3]
+
+
+class TestKeywordAutomaton:
+    """Test suite for the Aho-Corasick automaton"""
+
+    def test_overlapping_and_nested_keywords(self):
+        """Test keywords inside and across other keywords are all found"""
+        automaton = KeywordAutomaton(KEYWORDS)
+        assert automaton.find("ushers") == {"she", "he", "hers"}
+        assert automaton.find("lo hago cada día") == {"cada día", "día", "a"}
+        assert automaton.find("el sistema no funciona") == {"a", "no funciona", "funciona"}
+
+    def test_matches_substring_checks(self):
+        """Test random texts over a small alphabet against `in`"""
+        rng = random.Random(7)
+        automaton = KeywordAutomaton(KEYWORDS)
+        alphabet = "hesira dícfunoa"
+        for _ in range(300):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+            assert automaton.find(text) == {keyword for keyword in KEYWORDS if keyword in text}
+
+    def test_empty_keywords_are_ignored(self):
+        """Test an empty keyword is not compiled"""
+        automaton = KeywordAutomaton(["", "x"])
+        assert automaton.keywords == frozenset({"x"})
+        assert automaton.find("") == set()
+
+
+class TestRuleScan:
+    """Test suite for scan_text"""
+
+    def test_lookups_match_lowercased_substring_checks(self):
+        """Test registered and unregistered keywords behave like `in`"""
+        scan = scan_text("El SAP se cae CADA DÍA.")
+        assert scan.has("se cae")
+        assert scan.has("cada día")
+        assert scan.has("sap se")  # Not registered: substring fallback
+        assert not scan.has("fuera de servicio")
+        assert scan.first(["semanal", "cada día", "se cae"]) == "cada día"
+        assert scan.has_any(["semanal", "se cae"])
+
+    def test_scan_is_cached_per_text(self):
+        """Test extractors of the same interview share one scan"""
+        text = "Exporto ventas de SAP a Excel cada día."
+        assert scan_text(text) is scan_text(text)
+
+    def test_registration_invalidates_scans(self):
+        """Test keywords registered later are compiled into new scans"""
+        text = "Usamos un tablero zxqv para el turno."
+        before = scan_text(text)
+        register_keywords(["zxqv"])
+        after = scan_text(text)
+
+        assert after is not before
+        assert "zxqv" in rule_engine.registered_keywords()
+        assert after.has("zxqv")
+
+
+class TestFailureDescriptions:
+    """Test suite for sentence-based failure descriptions"""
+
+    @pytest.mark.parametrize("text", [
+        "El sistema falla cada semana. No funciona el POS cuando hay mucha gente. Se cae",
+        "FALLA. Una avería grave en la cámara fría.Otro PROBLEMA con el daño del equipo.",
+        "Sin puntos: el error no termina nunca",
+        "Q: ¿Problemas?\nA: Error de conciliación.\n\nQ: ¿Y?\nA: El equipo está roto desde ayer.",
+        ""
+    ])
+    def test_matches_previous_regex(self, text):
+        """Test sentence segments give the same descriptions as the old findall"""
+        extractor = FailureModeExtractor()
+        assert extractor._extract_failure_descriptions(text) == _legacy_failure_descriptions(text)
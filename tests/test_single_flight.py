@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for Single-flight Request Coalescing
+
+Tests:
+- Concurrent identical calls run once and all callers get the result
+- Errors reach every waiting caller; finished calls are not cached
+- Async callers share one task, and a cancelled caller does not cancel it
+- call_llm_with_fallback and EmbeddingPipeline coalesce identical requests
+"""
+import asyncio
+import contextlib
+import io
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from intelligence_capture import extractors
+from intelligence_capture.embeddings.pipeline import EmbeddingPipeline, EmbeddingPipelineConfig
+from intelligence_capture.persistence.models import DocumentChunkPayload
+from intelligence_capture.single_flight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    get_single_flight,
+    request_key,
+    single_flight_statistics
+)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def _run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+class TestSingleFlight:
+    """Test suite for the thread flight group"""
+
+    def test_concurrent_identical_calls_run_once(self):
+        """Test waiting callers share the leader's result"""
+        flight = SingleFlight("test")
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return "vector"
+
+        threads, results, _ = _run_concurrently(5, lambda: flight.do("key", fetch))
+        _wait_for(lambda: flight.coalesced == 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+        assert {result for result, _ in results} == {"vector"}
+        assert flight.get_statistics() == {"calls": 1, "coalesced": 4, "coalesced_rate": "80.0%", "in_flight": 0}
+
+    def test_errors_reach_every_caller(self):
+        """Test a failed call raises in the leader and all followers"""
+        flight = SingleFlight("test")
+        release = threading.Event()
+
+        def fetch():
+            release.wait(5)
+            raise RuntimeError("502")
+
+        threads, _, errors = _run_concurrently(3, lambda: flight.do("key", fetch))
+        _wait_for(lambda: flight.coalesced == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert all(isinstance(error, RuntimeError) for error in errors)
+
+    def test_finished_calls_are_not_cached(self):
+        """Test sequential calls each run (only in-flight calls are shared)"""
+        flight = SingleFlight("test")
+        counter = iter(range(10))
+
+        assert flight.do("key", lambda: next(counter)) == (0, False)
+        assert flight.do("key", lambda: next(counter)) == (1, False)
+        assert flight.do("other", lambda: next(counter)) == (2, False)
+
+    def test_request_key_is_canonical(self):
+        """Test dict order does not change the key"""
+        assert request_key([{"role": "user", "content": "x"}], 0.1) == request_key([{"content": "x", "role": "user"}], 0.1)
+        assert request_key("model", "a") != request_key("model", "b")
+
+
+class TestAsyncSingleFlight:
+    """Test suite for the asyncio flight group"""
+
+    def test_gathered_calls_share_one_task(self):
+        """Test concurrent coroutines await one call"""
+        flight = AsyncSingleFlight("test")
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return [0.5]
+
+        async def main():
+            return await asyncio.gather(*(flight.do("key", fetch) for _ in range(4)))
+
+        results = asyncio.run(main())
+
+        assert len(calls) == 1
+        assert [shared for _, shared in results] == [False, True, True, True]
+        assert flight.in_flight == 0
+
+    def test_cancelled_caller_does_not_cancel_the_call(self):
+        """Test the leader's cancellation leaves the call running for followers"""
+        flight = AsyncSingleFlight("test")
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def main():
+            leader = asyncio.ensure_future(flight.do("key", fetch))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("key", fetch))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(main()) == ("done", True)
+
+
+class TestCoalescedCallers:
+    """Test suite for the coalesced call sites"""
+
+    def test_identical_llm_calls_share_one_completion(self):
+        """Test two workers sending the same prompt make one API call"""
+        release = threading.Event()
+        client = MagicMock()
+
+        def create(**kwargs):
+            release.wait(5)
+            usage = SimpleNamespace(prompt_tokens=100, completion_tokens=20, total_tokens=120)
+            response = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"ok": true}'))], usage=usage)
+            return SimpleNamespace(headers={}, parse=lambda: response)
+
+        client.chat.completions.with_raw_response.create.side_effect = create
+        messages = [{"role": "user", "content": f"prompt {uuid4()}"}]
+        usages = [{}, {}]
+        flight = get_single_flight("llm_completions")
+        coalesced = flight.coalesced
+
+        with patch.object(extractors, "get_llm_cache", return_value=None), \
+                patch.object(extractors, "get_model_rate_limiter", return_value=MagicMock()), \
+                contextlib.redirect_stdout(io.StringIO()):
+            threads = [
+                threading.Thread(target=lambda u=usage: extractors.call_llm_with_fallback(client, messages, usage=u))
+                for usage in usages
+            ]
+            for thread in threads:
+                thread.start()
+            _wait_for(lambda: flight.coalesced == coalesced + 1)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        assert client.chat.completions.with_raw_response.create.call_count == 1
+        shared = [usage for usage in usages if usage.get("coalesced")]
+        assert len(shared) == 1
+        assert shared[0]["prompt_tokens"] == 0
+        assert sorted(usage["prompt_tokens"] for usage in usages) == [0, 100]
+        assert single_flight_statistics()["llm_completions"]["coalesced"] >= 1
+
+    def test_duplicate_documents_share_one_embedding_batch(self):
+        """Test concurrent pipelines embedding the same batch make one request"""
+        calls = []
+
+        async def create(*, model, input):
+            calls.append(input)
+            await asyncio.sleep(0.02)
+            return SimpleNamespace(data=[SimpleNamespace(embedding=[float(len(text))]) for text in input])
+
+        client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+        config = EmbeddingPipelineConfig(batch_size=10, requests_per_second=1000, max_retries=1)
+        chunks = [DocumentChunkPayload(content=f"Contenido {uuid4()}", chunk_index=0, token_count=5)]
+
+        async def main():
+            pipelines = [EmbeddingPipeline(openai_client=client, config=config) for _ in range(2)]
+            return await asyncio.gather(*(pipeline.embed_document_chunks(uuid4(), chunks) for pipeline in pipelines))
+
+        first, second = asyncio.run(main())
+
+        assert len(calls) == 1
+        assert first[0].vector == second[0].vector
+        assert sorted(payload[0].metadata["coalesced"] for payload in (first, second)) == [False, True]
+        assert sorted(payload[0].cost_cents for payload in (first, second))[0] == 0.0
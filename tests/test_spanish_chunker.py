@@ -86,6 +86,37 @@ class TestSpanishTextUtils:
         assert features['stopword_ratio'] == 0.0
         assert features['unique_stems'] == 0
 
+    def test_extract_features_counts(self, text_utils):
+        """Palabras repetidas cuentan por ocurrencia; stems por palabra distinta"""
+        features = text_utils.extract_features("el trabajo y el trabajo de la trabajadora")
+
+        assert features['total_words'] == 8
+        assert features['stopword_count'] == 5  # el, y, el, de, la
+        assert features['unique_stems'] == len(set(text_utils.stem_text("el trabajo y de la trabajadora")))
+        assert features['has_accents'] is False
+
+    def test_extract_features_batch(self, text_utils):
+        """El lote da lo mismo que texto a texto, en el mismo orden"""
+        texts = [
+            "La reconciliación manual de facturas toma tres horas diarias",
+            "",
+            "The process management is very important",
+            "La reconciliación manual sigue siendo manual"
+        ]
+
+        assert text_utils.extract_features_batch(texts) == [text_utils.extract_features(t) for t in texts]
+        assert text_utils.extract_features_batch(iter(texts[:1])) == [text_utils.extract_features(texts[0])]
+        assert text_utils.extract_features_batch([]) == []
+
+    def test_stem_cache(self, text_utils):
+        """Cada palabra distinta se stemmiza una vez"""
+        text_utils.stem_text("factura facturas factura facturas")
+        info = text_utils.stem_word.cache_info()
+
+        assert info.misses == 2
+        assert info.hits == 2
+        assert text_utils.stem_word("facturas") == text_utils.stemmer.stem("facturas")
+
 
 class TestChunkMetadata:
     """Tests para metadatos de chunks"""
@@ -441,6 +472,116 @@ Descripción de procesos con más contenido para generar chunks adicionales.
         # El chunk debería contener todo el contenido
         assert chunks[0]['content'] == short_content
 
+    def test_chunk_documents_matches_chunk_document(self, chunker, sample_payload):
+        """Chunking masivo produce los mismos chunks que uno por uno"""
+        payloads = [sample_payload, sample_payload]
+
+        results = chunker.chunk_documents(iter(payloads), batch_size=1)
+
+        # Generador: los documentos se procesan a medida que se consumen
+        assert not isinstance(results, list)
+        expected = chunker.chunk_document(sample_payload)
+        assert list(results) == [expected, expected]
+
+    def test_chunk_documents_markdown(self, chunker):
+        """Chunking masivo con Markdown equivale a chunk_with_markdown_preservation"""
+        markdown_content = "## Procesos\n\nLa conciliación toma tres horas.\n\n## Sistemas\n\nSAP no integra con Excel.\n"
+        payloads = [
+            DocumentPayload(
+                document_id=f"md-{i}",
+                org_id="test_org",
+                checksum="abc123",
+                source_type="email",
+                source_format="md",
+                mime_type="text/markdown",
+                original_path=Path("/tmp/test.md"),
+                content=content,
+                language="es",
+                page_count=1
+            )
+            for i, content in enumerate([markdown_content, "Texto sin encabezados.", "## Solo encabezado"])
+        ]
+
+        results = list(chunker.chunk_documents(payloads, preserve_markdown=True))
+
+        assert len(results) == 3
+        for payload, chunks in zip(payloads, results):
+            assert chunks == chunker.chunk_with_markdown_preservation(payload)
+        assert results[0][0]['content'].startswith("## Procesos")
+        assert results[2] == []
+
+    def test_content_is_source_slice(self, chunker, sample_payload):
+        """El contenido de cada chunk es el texto original entre sus offsets"""
+        chunks = chunker.chunk_document(sample_payload)
+
+        for chunk in chunks:
+            start, end = chunk['metadata']['span_offsets']
+            assert chunk['content'] == sample_payload.content[start:end]
+            assert chunk['metadata']['char_count'] == end - start
+
+    def test_markdown_offsets_point_into_document(self, chunker):
+        """Los offsets de chunks de secciones Markdown son del documento completo"""
+        content = "## Procesos\n\nLa conciliación toma tres horas.\n\n## Sistemas\n\nSAP no integra con Excel.\n"
+        payload = DocumentPayload(
+            document_id="md-offsets",
+            org_id="test_org",
+            checksum="abc123",
+            source_type="email",
+            source_format="md",
+            mime_type="text/markdown",
+            original_path=Path("/tmp/test.md"),
+            content=content,
+            language="es",
+            page_count=1
+        )
+
+        chunks = chunker.chunk_with_markdown_preservation(payload)
+
+        assert [chunk['content'] for chunk in chunks] == [
+            "## Procesos\n\nLa conciliación toma tres horas.",
+            "## Sistemas\n\nSAP no integra con Excel."
+        ]
+        for chunk in chunks:
+            start, end = chunk['metadata']['span_offsets']
+            assert chunk['content'].endswith(content[start:end])
+
+    def test_find_section_by_offset(self, chunker):
+        """Cada offset se asigna a la última sección que empieza antes"""
+        content = "Preámbulo.\nINTRODUCCIÓN\nTexto inicial.\n2. ALCANCE\nMás texto.\nANEXO\nFin."
+        sections = [
+            {"title": "INTRODUCCIÓN", "level": 1, "page": 1},
+            {"title": "2. ALCANCE", "level": 1, "page": 1},
+            {"title": "No aparece", "level": 2, "page": 2},
+            {"title": "ANEXO", "level": 1, "page": 3}
+        ]
+        payload = DocumentPayload(
+            document_id="sections",
+            org_id="test_org",
+            checksum="abc123",
+            source_type="email",
+            source_format="pdf",
+            mime_type="application/pdf",
+            original_path=Path("/tmp/test.pdf"),
+            content=content,
+            language="es",
+            page_count=3,
+            sections=sections
+        )
+
+        starts = chunker._section_starts(payload)
+
+        assert starts == [
+            content.index("INTRODUCCIÓN"),
+            content.index("2. ALCANCE"),
+            content.index("2. ALCANCE"),
+            content.index("ANEXO")
+        ]
+        assert chunker._find_section(sections, 0, starts) is sections[0]
+        assert chunker._find_section(sections, content.index("Texto"), starts) is sections[0]
+        assert chunker._find_section(sections, content.index("Más"), starts) is sections[2]
+        assert chunker._find_section(sections, content.index("Fin"), starts) is sections[3]
+        assert chunker._find_section([], 10, []) == {}
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])